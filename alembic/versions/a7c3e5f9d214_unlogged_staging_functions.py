@@ -0,0 +1,100 @@
+"""unlogged staging functions for parallel reloads
+
+A parallel reload (`restore_all_parallel` in app/data_sync/restore.py) loads
+each table over its own connection into a permanent UNLOGGED staging table,
+`public._ds_stage_<table>`. The tables must outlive the loading connection,
+because the other tables' QC reads them, so they cannot be TEMP tables.
+The app user can't create tables in `public`, so these two SECURITY DEFINER
+functions create and drop them, like the `ds_*_version` functions of
+f6e1b7c9d083.
+
+Matches Liquibase changeset changelog/db.changelog-1.11.xml.
+
+Revision ID: a7c3e5f9d214
+Revises: f6e1b7c9d083
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "a7c3e5f9d214"
+down_revision: str | Sequence[str] | None = "f6e1b7c9d083"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Drops a table's staging table and its unattached next-version table, which
+# a failed or interrupted parallel reload leaves behind. Both are gone after
+# a successful one: the next-version table was renamed when it was attached.
+DISCARD_STAGING_SQL = """
+CREATE OR REPLACE FUNCTION public.ds_discard_staging(p_table text)
+RETURNS void
+LANGUAGE plpgsql SECURITY DEFINER
+SET search_path = pg_catalog, pg_temp
+AS $fn$
+BEGIN
+    PERFORM public.ds_version_parent(p_table);
+    EXECUTE format(
+        'DROP TABLE IF EXISTS public.%I, public.%I',
+        '_ds_stage_' || p_table, '_ds_next_' || p_table
+    );
+END
+$fn$;
+"""
+
+# An UNLOGGED copy of the parent's loaded columns (generated ones are dropped,
+# as the dump never fills them) that the caller can COPY into and read.
+PREPARE_STAGE_SQL = """
+CREATE OR REPLACE FUNCTION public.ds_prepare_stage(p_table text)
+RETURNS void
+LANGUAGE plpgsql SECURITY DEFINER
+SET search_path = pg_catalog, pg_temp
+AS $fn$
+DECLARE
+    parent regclass := public.ds_version_parent(p_table);
+    stage text := '_ds_stage_' || p_table;
+    col name;
+BEGIN
+    PERFORM public.ds_discard_staging(p_table);
+    EXECUTE format(
+        'CREATE UNLOGGED TABLE public.%I (LIKE public.%I)', stage, p_table
+    );
+    FOR col IN
+        SELECT attname FROM pg_attribute
+        WHERE attrelid = parent AND attgenerated = 's' AND NOT attisdropped
+    LOOP
+        EXECUTE format('ALTER TABLE public.%I DROP COLUMN %I', stage, col);
+    END LOOP;
+    IF session_user <> current_user THEN
+        EXECUTE format(
+            'GRANT SELECT, INSERT ON public.%I TO %I', stage, session_user
+        );
+    END IF;
+END
+$fn$;
+"""
+
+DEFINER_FUNCTIONS = ("ds_discard_staging", "ds_prepare_stage")
+
+GRANT_SQL = f"""
+DO $$
+BEGIN
+    {" ".join(f"REVOKE EXECUTE ON FUNCTION public.{f}(text) FROM PUBLIC;" for f in DEFINER_FUNCTIONS)}
+    IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'nrf_impact_assessor') THEN
+        {" ".join(f"GRANT EXECUTE ON FUNCTION public.{f}(text) TO nrf_impact_assessor;" for f in DEFINER_FUNCTIONS)}
+    END IF;
+END $$;
+"""  # noqa: S608
+
+
+def upgrade() -> None:
+    for sql in (DISCARD_STAGING_SQL, PREPARE_STAGE_SQL, GRANT_SQL):
+        op.execute(sa.text(sql))
+
+
+def downgrade() -> None:
+    for name in reversed(DEFINER_FUNCTIONS):
+        op.execute(sa.text(f"DROP FUNCTION IF EXISTS public.{name}(text)"))
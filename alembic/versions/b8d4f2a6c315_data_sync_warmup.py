@@ -0,0 +1,126 @@
+"""post-reload warm-up functions and run timing
+
+A reload ends with a warm-up stage (app/data_sync/warmup.py) before its run is
+marked successful. Two SECURITY DEFINER functions let the app user do the
+parts that need table ownership: `ds_analyze_version` refreshes the planner
+statistics of a version-partitioned parent once its new partition is
+attached, and `ds_prewarm_version` reads that partition's GIST indexes into
+shared buffers with pg_prewarm. The extension is created when the server
+offers it; without it `ds_prewarm_version` returns NULL. `data_sync_run`
+records how long the warm-up took.
+
+Matches Liquibase changeset changelog/db.changelog-1.12.xml.
+
+Revision ID: b8d4f2a6c315
+Revises: a7c3e5f9d214
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "b8d4f2a6c315"
+down_revision: str | Sequence[str] | None = "a7c3e5f9d214"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+PREWARM_EXTENSION_SQL = """
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_prewarm') THEN
+        CREATE EXTENSION IF NOT EXISTS pg_prewarm;
+    END IF;
+END $$;
+"""
+
+# ANALYZE of a partitioned parent samples every partition and refreshes the
+# parent's own statistics, which ds_index_version's per-partition ANALYZE
+# leaves stale.
+ANALYZE_VERSION_SQL = """
+CREATE OR REPLACE FUNCTION public.ds_analyze_version(p_table text)
+RETURNS void
+LANGUAGE plpgsql SECURITY DEFINER
+SET search_path = pg_catalog, pg_temp
+AS $fn$
+BEGIN
+    PERFORM public.ds_version_parent(p_table);
+    EXECUTE format('ANALYZE public.%I', p_table);
+END
+$fn$;
+"""
+
+# Returns the number of blocks read, or NULL when pg_prewarm is not installed
+# or the version has no partition.
+PREWARM_VERSION_SQL = """
+CREATE OR REPLACE FUNCTION public.ds_prewarm_version(p_table text, p_version integer)
+RETURNS bigint
+LANGUAGE plpgsql SECURITY DEFINER
+SET search_path = pg_catalog, pg_temp
+AS $fn$
+DECLARE
+    part regclass;
+    ext_schema name;
+    idx regclass;
+    warmed bigint;
+    total bigint := 0;
+BEGIN
+    PERFORM public.ds_version_parent(p_table);
+    SELECT ns.nspname INTO ext_schema
+    FROM pg_extension e JOIN pg_namespace ns ON ns.oid = e.extnamespace
+    WHERE e.extname = 'pg_prewarm';
+    part := to_regclass(format('public.%I', p_table || '_v' || p_version));
+    IF ext_schema IS NULL OR part IS NULL THEN
+        RETURN NULL;
+    END IF;
+    FOR idx IN
+        SELECT i.indexrelid::regclass
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        JOIN pg_am am ON am.oid = c.relam
+        WHERE i.indrelid = part AND am.amname = 'gist'
+    LOOP
+        EXECUTE format('SELECT %I.pg_prewarm($1)', ext_schema) INTO warmed USING idx;
+        total := total + warmed;
+    END LOOP;
+    RETURN total;
+END
+$fn$;
+"""
+
+DEFINER_FUNCTIONS = ("ds_analyze_version(text)", "ds_prewarm_version(text, integer)")
+
+GRANT_SQL = f"""
+DO $$
+BEGIN
+    {" ".join(f"REVOKE EXECUTE ON FUNCTION public.{f} FROM PUBLIC;" for f in DEFINER_FUNCTIONS)}
+    IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'nrf_impact_assessor') THEN
+        {" ".join(f"GRANT EXECUTE ON FUNCTION public.{f} TO nrf_impact_assessor;" for f in DEFINER_FUNCTIONS)}
+    END IF;
+END $$;
+"""  # noqa: S608
+
+
+def upgrade() -> None:
+    for sql in (
+        PREWARM_EXTENSION_SQL,
+        ANALYZE_VERSION_SQL,
+        PREWARM_VERSION_SQL,
+        GRANT_SQL,
+    ):
+        op.execute(sa.text(sql))
+    op.add_column(
+        "data_sync_run",
+        sa.Column("warmup_seconds", sa.Float(), nullable=True),
+        schema="public",
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("data_sync_run", "warmup_seconds", schema="public")
+    # pg_prewarm is left installed: it holds no data, and other tooling may
+    # have come to rely on it.
+    for name in reversed(DEFINER_FUNCTIONS):
+        op.execute(sa.text(f"DROP FUNCTION IF EXISTS public.{name}"))
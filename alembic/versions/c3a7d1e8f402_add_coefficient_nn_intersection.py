@@ -0,0 +1,74 @@
+"""add coefficient_nn_intersection derived table
+
+Coefficient polygons pre-split by NN catchment, rebuilt at data-sync time by
+app/data_sync/derived.py. Keyed by the (coefficient_layer, nn_catchments)
+version pair it was built from rather than a single `version` column.
+
+Revision ID: c3a7d1e8f402
+Revises: b2e5f0a1c9d4
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+import geoalchemy2
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "c3a7d1e8f402"
+down_revision: str | Sequence[str] | None = "b2e5f0a1c9d4"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+NOW = sa.text("now()")
+TABLE = "coefficient_nn_intersection"
+
+
+def upgrade() -> None:
+    op.create_table(
+        TABLE,
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("coeff_version", sa.Integer(), nullable=False),
+        sa.Column("nn_version", sa.Integer(), nullable=False),
+        sa.Column(
+            "geometry",
+            geoalchemy2.types.Geometry(
+                geometry_type="MULTIPOLYGON",
+                srid=27700,
+                spatial_index=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column("crome_id", sa.String(), nullable=True),
+        sa.Column("lu_curr_n_coeff", sa.Float(), nullable=True),
+        sa.Column("lu_curr_p_coeff", sa.Float(), nullable=True),
+        sa.Column("n_resi_coeff", sa.Float(), nullable=True),
+        sa.Column("p_resi_coeff", sa.Float(), nullable=True),
+        sa.Column("n2k_site_n", sa.String(), nullable=True),
+        sa.Column("oid", sa.String(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=NOW,
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        schema="public",
+    )
+    op.create_index(
+        f"ix_public_{TABLE}_versions",
+        TABLE,
+        ["coeff_version", "nn_version"],
+        schema="public",
+    )
+    op.execute(
+        sa.text(
+            f"CREATE INDEX ix_public_{TABLE}_geometry "
+            f"ON public.{TABLE} USING GIST (geometry)"
+        )
+    )
+
+
+def downgrade() -> None:
+    op.execute(f"DROP TABLE IF EXISTS public.{TABLE} CASCADE")
@@ -0,0 +1,66 @@
+"""add assessment_result_cache
+
+Content-addressed store of completed assessment results, keyed by a
+fingerprint of the inputs and reference-data generation (see
+app/repositories/result_cache.py).
+
+Matches Liquibase changeset changelog/db.changelog-1.8.xml.
+
+Revision ID: d4b8e2f1a503
+Revises: c3a7d1e8f402
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "d4b8e2f1a503"
+down_revision: str | Sequence[str] | None = "c3a7d1e8f402"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+NOW = sa.text("now()")
+TABLE = "assessment_result_cache"
+
+
+def upgrade() -> None:
+    op.create_table(
+        TABLE,
+        sa.Column("fingerprint", sa.String(), nullable=False),
+        sa.Column("assessment_type", sa.String(), nullable=False),
+        sa.Column("payload", sa.LargeBinary(), nullable=False),
+        sa.Column("size_bytes", sa.Integer(), nullable=False),
+        sa.Column("hit_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=NOW,
+            nullable=False,
+        ),
+        sa.Column(
+            "last_used_at",
+            sa.DateTime(timezone=True),
+            server_default=NOW,
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("fingerprint"),
+        schema="public",
+    )
+    op.create_index(
+        "ix_public_assessment_result_cache_last_used_at",
+        TABLE,
+        ["last_used_at"],
+        schema="public",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_public_assessment_result_cache_last_used_at",
+        table_name=TABLE,
+        schema="public",
+    )
+    op.drop_table(TABLE, schema="public")
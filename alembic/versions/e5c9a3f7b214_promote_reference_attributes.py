@@ -0,0 +1,53 @@
+"""promote hot reference attributes to generated columns
+
+The JSONB attributes the spatial queries read on every job (WwTW id, LPA name,
+N2K site name and OID, operational catchment name, EDP name) become stored
+generated columns, so queries read a short text column instead of detoasting
+the whole `attributes` document. Kept in step with `attributes` by PostgreSQL
+itself; data sync never writes them (see app/data_sync/restore.py).
+
+Matches Liquibase changeset changelog/db.changelog-1.9.xml.
+
+Revision ID: e5c9a3f7b214
+Revises: d4b8e2f1a503
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "e5c9a3f7b214"
+down_revision: str | Sequence[str] | None = "d4b8e2f1a503"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# (table, column, JSONB key); mirrors the `attribute_key` columns in
+# app/models/db.py.
+PROMOTED = [
+    ("wwtw_catchments", "wwtw_id", "WwTw_ID"),
+    ("lpa_boundaries", "lpa_name", "NAME"),
+    ("nn_catchments", "n2k_site_n", "N2K_Site_N"),
+    ("nn_catchments", "oid", "OID"),
+    ("subcatchments", "opcat_name", "OPCAT_NAME"),
+    ("edp_boundary_layer", "edp_name", "EDP_Name"),
+]
+
+
+def upgrade() -> None:
+    for table, column, key in PROMOTED:
+        op.execute(
+            sa.text(
+                f"ALTER TABLE public.{table} ADD COLUMN {column} varchar "
+                f"GENERATED ALWAYS AS (attributes->>'{key}') STORED"
+            )
+        )
+    for table in dict.fromkeys(table for table, _, _ in PROMOTED):
+        op.execute(sa.text(f"ANALYZE public.{table}"))
+
+
+def downgrade() -> None:
+    for table, column, _ in reversed(PROMOTED):
+        op.execute(sa.text(f"ALTER TABLE public.{table} DROP COLUMN {column}"))
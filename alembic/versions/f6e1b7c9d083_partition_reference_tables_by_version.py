@@ -0,0 +1,402 @@
+"""partition reference tables by version
+
+Every data-sync reference table becomes LIST-partitioned on `version`. The
+existing table is kept as the DEFAULT partition (`<table>_default`), so the
+rows already loaded, and rows written outside data sync (local loads, test
+fixtures), need no copying. A reload loads and indexes a standalone table and
+attaches it as the new version's partition. Cleanup detaches and drops whole
+partitions instead of deleting rows (see app/data_sync/restore.py).
+
+The reload runs as a role that does not own the tables, and creating,
+attaching and dropping partitions needs ownership. The `ds_*_version`
+functions are therefore SECURITY DEFINER, and only accept a version-partitioned
+table in `public`.
+
+Matches Liquibase changeset changelog/db.changelog-1.10.xml.
+
+Revision ID: f6e1b7c9d083
+Revises: e5c9a3f7b214
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "f6e1b7c9d083"
+down_revision: str | Sequence[str] | None = "e5c9a3f7b214"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# app/data_sync/service.py REFERENCE_TABLES
+TABLES = (
+    "coefficient_layer",
+    "edp_boundary_layer",
+    "edp_edges",
+    "edp_excluded_areas",
+    "gcn_ponds",
+    "gcn_risk_zones",
+    "lookup_table",
+    "lpa_boundaries",
+    "nn_catchments",
+    "subcatchments",
+    "wwtw_catchments",
+)
+TABLE_ARRAY = "ARRAY[" + ", ".join(f"'{t}'" for t in TABLES) + "]"
+
+# The table becomes the DEFAULT partition of a new parent with the same
+# columns, grants and index definitions. Its primary key becomes (id, version):
+# a partitioned table's unique constraints must include the partition key.
+# Its indexes are renamed and then adopted by ATTACH, so none of them are rebuilt.
+PARTITION_SQL = f"""
+DO $$
+DECLARE
+    t text;
+    legacy text;
+    acl record;
+    con record;
+    idx record;
+BEGIN
+    FOREACH t IN ARRAY {TABLE_ARRAY} LOOP
+        legacy := t || '_default';
+        EXECUTE format('ALTER TABLE public.%I RENAME TO %I', t, legacy);
+        EXECUTE format(
+            'CREATE TABLE public.%I (LIKE public.%I INCLUDING DEFAULTS '
+            || 'INCLUDING GENERATED) PARTITION BY LIST (version)',
+            t, legacy
+        );
+        FOR acl IN
+            SELECT a.privilege_type, a.grantee
+            FROM pg_class c, aclexplode(c.relacl) a
+            WHERE c.oid = format('public.%I', legacy)::regclass
+              AND a.grantee <> c.relowner
+        LOOP
+            EXECUTE format(
+                'GRANT %s ON public.%I TO %s', acl.privilege_type, t,
+                CASE WHEN acl.grantee = 0 THEN 'PUBLIC'
+                     ELSE quote_ident(pg_get_userbyid(acl.grantee)) END
+            );
+        END LOOP;
+        FOR con IN
+            SELECT conname, contype, pg_get_constraintdef(oid) AS def
+            FROM pg_constraint
+            WHERE conrelid = format('public.%I', legacy)::regclass
+              AND contype IN ('p', 'u')
+        LOOP
+            EXECUTE format(
+                'ALTER TABLE public.%I DROP CONSTRAINT %I', legacy, con.conname
+            );
+            IF con.contype = 'u' THEN
+                EXECUTE format(
+                    'ALTER TABLE public.%I ADD CONSTRAINT %I %s',
+                    t, con.conname, con.def
+                );
+            END IF;
+        END LOOP;
+        EXECUTE format('ALTER TABLE public.%I ADD PRIMARY KEY (id, version)', t);
+        FOR idx IN
+            SELECT c.relname, pg_get_indexdef(i.indexrelid) AS def
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE i.indrelid = format('public.%I', legacy)::regclass
+              AND NOT EXISTS (
+                  SELECT 1 FROM pg_constraint k WHERE k.conindid = i.indexrelid
+              )
+        LOOP
+            EXECUTE format(
+                'ALTER INDEX public.%I RENAME TO %I', idx.relname, idx.relname || '_default'
+            );
+            EXECUTE replace(
+                idx.def, format(' ON public.%I ', legacy), format(' ON public.%I ', t)
+            );
+        END LOOP;
+        EXECUTE format(
+            'ALTER TABLE public.%I ATTACH PARTITION public.%I DEFAULT', t, legacy
+        );
+        EXECUTE format('ANALYZE public.%I', t);
+    END LOOP;
+END $$;
+"""  # noqa: S608
+
+UNPARTITION_SQL = f"""
+DO $$
+DECLARE
+    t text;
+    legacy text;
+    cols text;
+    keys text;
+    con record;
+    idx record;
+BEGIN
+    FOREACH t IN ARRAY {TABLE_ARRAY} LOOP
+        legacy := t || '_default';
+        SELECT string_agg(
+                   format('ADD CONSTRAINT %I %s', conname, pg_get_constraintdef(oid)),
+                   ', '
+               )
+        INTO keys
+        FROM pg_constraint
+        WHERE conrelid = format('public.%I', t)::regclass AND contype = 'u';
+        EXECUTE format(
+            'ALTER TABLE public.%I DETACH PARTITION public.%I', t, legacy
+        );
+        SELECT string_agg(quote_ident(column_name), ', ' ORDER BY ordinal_position)
+        INTO cols
+        FROM information_schema.columns
+        WHERE table_schema = 'public' AND table_name = legacy
+          AND is_generated = 'NEVER';
+        EXECUTE format(
+            'INSERT INTO public.%I (%s) SELECT %s FROM public.%I',
+            legacy, cols, cols, t
+        );
+        EXECUTE format('DROP TABLE public.%I', t);
+        FOR con IN
+            SELECT conname FROM pg_constraint
+            WHERE conrelid = format('public.%I', legacy)::regclass
+              AND contype IN ('p', 'u')
+        LOOP
+            EXECUTE format(
+                'ALTER TABLE public.%I DROP CONSTRAINT %I', legacy, con.conname
+            );
+        END LOOP;
+        FOR idx IN
+            SELECT c.relname
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE i.indrelid = format('public.%I', legacy)::regclass
+              AND c.relname LIKE '%\\_default'
+        LOOP
+            EXECUTE format(
+                'ALTER INDEX public.%I RENAME TO %I',
+                idx.relname, left(idx.relname, -length('_default'))
+            );
+        END LOOP;
+        EXECUTE format('ALTER TABLE public.%I RENAME TO %I', legacy, t);
+        EXECUTE format('ALTER TABLE public.%I ADD PRIMARY KEY (id)', t);
+        IF keys IS NOT NULL THEN
+            EXECUTE format('ALTER TABLE public.%I %s', t, keys);
+        END IF;
+    END LOOP;
+END $$;
+"""  # noqa: S608
+
+VERSION_PARENT_SQL = """
+CREATE OR REPLACE FUNCTION public.ds_version_parent(p_table text)
+RETURNS regclass
+LANGUAGE plpgsql STABLE
+SET search_path = pg_catalog, pg_temp
+AS $fn$
+DECLARE
+    parent regclass;
+BEGIN
+    SELECT c.oid INTO parent
+    FROM pg_partitioned_table pt
+    JOIN pg_class c ON c.oid = pt.partrelid
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = 'public' AND c.relname = p_table;
+    IF parent IS NULL THEN
+        RAISE EXCEPTION 'public.% is not a version-partitioned table', p_table;
+    END IF;
+    RETURN parent;
+END
+$fn$;
+"""
+
+# An unindexed copy of the parent's columns that the caller loads the new
+# version into. Only the caller may insert, and only until it is attached.
+PREPARE_VERSION_SQL = """
+CREATE OR REPLACE FUNCTION public.ds_prepare_version(p_table text)
+RETURNS void
+LANGUAGE plpgsql SECURITY DEFINER
+SET search_path = pg_catalog, pg_temp
+AS $fn$
+DECLARE
+    next_table text := '_ds_next_' || p_table;
+BEGIN
+    PERFORM public.ds_version_parent(p_table);
+    EXECUTE format(
+        'CREATE TABLE public.%I (LIKE public.%I INCLUDING DEFAULTS INCLUDING GENERATED)',
+        next_table, p_table
+    );
+    IF session_user <> current_user THEN
+        EXECUTE format('GRANT INSERT ON public.%I TO %I', next_table, session_user);
+    END IF;
+END
+$fn$;
+"""
+
+# Builds the parent's keys and indexes on the loaded table in bulk, so ATTACH
+# adopts them instead of building them under its locks.
+INDEX_VERSION_SQL = """
+CREATE OR REPLACE FUNCTION public.ds_index_version(p_table text)
+RETURNS void
+LANGUAGE plpgsql SECURITY DEFINER
+SET search_path = pg_catalog, pg_temp
+AS $fn$
+DECLARE
+    parent regclass := public.ds_version_parent(p_table);
+    next_table text := '_ds_next_' || p_table;
+    def text;
+    v integer;
+BEGIN
+    FOR def IN
+        SELECT pg_get_constraintdef(oid) FROM pg_constraint
+        WHERE conrelid = parent AND contype IN ('p', 'u')
+    LOOP
+        EXECUTE format('ALTER TABLE public.%I ADD %s', next_table, def);
+    END LOOP;
+    FOR def IN
+        SELECT pg_get_indexdef(i.indexrelid)
+        FROM pg_index i
+        WHERE i.indrelid = parent
+          AND NOT EXISTS (
+              SELECT 1 FROM pg_constraint k WHERE k.conindid = i.indexrelid
+          )
+    LOOP
+        EXECUTE regexp_replace(
+            def,
+            '^CREATE (UNIQUE )?INDEX \\S+ ON (ONLY )?\\S+ ',
+            format('CREATE \\1INDEX ON public.%I ', next_table)
+        );
+    END LOOP;
+    -- Lets ATTACH prove the partition constraint from the catalog instead of
+    -- scanning every row inside the promote transaction.
+    EXECUTE format('SELECT version FROM public.%I LIMIT 1', next_table) INTO v;
+    IF v IS NOT NULL THEN
+        EXECUTE format(
+            'ALTER TABLE public.%I ADD CONSTRAINT ds_version_check '
+            'CHECK (version IS NOT NULL AND version = %s)',
+            next_table, v
+        );
+    END IF;
+    EXECUTE format('ANALYZE public.%I', next_table);
+END
+$fn$;
+"""
+
+# Renames the loaded table to <table>_v<version> and attaches it. The CHECK
+# added by ds_index_version spares ATTACH a scan of the new partition, and is
+# dropped once attached. Attaching still scans the DEFAULT partition for rows
+# of the new version, which is cheap once cleanup has emptied it of the rows
+# loaded before partitioning.
+ATTACH_VERSION_SQL = """
+CREATE OR REPLACE FUNCTION public.ds_attach_version(p_table text)
+RETURNS integer
+LANGUAGE plpgsql SECURITY DEFINER
+SET search_path = pg_catalog, pg_temp
+AS $fn$
+DECLARE
+    parent regclass := public.ds_version_parent(p_table);
+    next_table text := '_ds_next_' || p_table;
+    v integer;
+BEGIN
+    EXECUTE format('SELECT version FROM public.%I LIMIT 1', next_table) INTO v;
+    IF v IS NULL THEN
+        RAISE EXCEPTION 'public.% has no rows to attach', next_table;
+    END IF;
+    IF session_user <> current_user THEN
+        EXECUTE format('REVOKE INSERT ON public.%I FROM %I', next_table, session_user);
+    END IF;
+    EXECUTE format(
+        'ALTER TABLE public.%I RENAME TO %I', next_table, p_table || '_v' || v
+    );
+    EXECUTE format(
+        'ALTER TABLE %s ATTACH PARTITION public.%I FOR VALUES IN (%s)',
+        parent, p_table || '_v' || v, v
+    );
+    EXECUTE format(
+        'ALTER TABLE public.%I DROP CONSTRAINT IF EXISTS ds_version_check',
+        p_table || '_v' || v
+    );
+    RETURN v;
+END
+$fn$;
+"""
+
+# Keeps MAX(version) and MAX(version)-1. Partitions holding only older versions
+# are detached and dropped. The DEFAULT partition can hold several versions,
+# so its older rows are deleted, or truncated once none are retained.
+DROP_SUPERSEDED_SQL = """
+CREATE OR REPLACE FUNCTION public.ds_drop_superseded_versions(p_table text)
+RETURNS integer
+LANGUAGE plpgsql SECURITY DEFINER
+SET search_path = pg_catalog, pg_temp
+AS $fn$
+DECLARE
+    parent regclass := public.ds_version_parent(p_table);
+    cutoff integer;
+    part record;
+    part_max integer;
+    dropped integer := 0;
+BEGIN
+    EXECUTE format('SELECT MAX(version) - 1 FROM %s', parent) INTO cutoff;
+    IF cutoff IS NULL THEN
+        RETURN 0;
+    END IF;
+    FOR part IN
+        SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) = 'DEFAULT' AS is_default
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = parent
+    LOOP
+        EXECUTE format('SELECT MAX(version) FROM public.%I', part.relname)
+        INTO part_max;
+        IF part.is_default THEN
+            IF part_max IS NOT NULL AND part_max < cutoff THEN
+                EXECUTE format('TRUNCATE public.%I', part.relname);
+            ELSIF part_max IS NOT NULL THEN
+                EXECUTE format(
+                    'DELETE FROM public.%I WHERE version < %s', part.relname, cutoff
+                );
+            END IF;
+        ELSIF part_max IS NULL OR part_max < cutoff THEN
+            EXECUTE format(
+                'ALTER TABLE %s DETACH PARTITION public.%I', parent, part.relname
+            );
+            EXECUTE format('DROP TABLE public.%I', part.relname);
+            dropped := dropped + 1;
+        END IF;
+    END LOOP;
+    RETURN dropped;
+END
+$fn$;
+"""
+
+DEFINER_FUNCTIONS = (
+    "ds_prepare_version",
+    "ds_index_version",
+    "ds_attach_version",
+    "ds_drop_superseded_versions",
+)
+
+GRANT_SQL = f"""
+DO $$
+BEGIN
+    {" ".join(f"REVOKE EXECUTE ON FUNCTION public.{f}(text) FROM PUBLIC;" for f in DEFINER_FUNCTIONS)}
+    IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'nrf_impact_assessor') THEN
+        {" ".join(f"GRANT EXECUTE ON FUNCTION public.{f}(text) TO nrf_impact_assessor;" for f in DEFINER_FUNCTIONS)}
+    END IF;
+END $$;
+"""  # noqa: S608
+
+
+def upgrade() -> None:
+    op.execute(sa.text(PARTITION_SQL))
+    for sql in (
+        VERSION_PARENT_SQL,
+        PREPARE_VERSION_SQL,
+        INDEX_VERSION_SQL,
+        ATTACH_VERSION_SQL,
+        DROP_SUPERSEDED_SQL,
+        GRANT_SQL,
+    ):
+        op.execute(sa.text(sql))
+
+
+def downgrade() -> None:
+    for name in reversed(DEFINER_FUNCTIONS):
+        op.execute(sa.text(f"DROP FUNCTION IF EXISTS public.{name}(text)"))
+    op.execute(sa.text("DROP FUNCTION IF EXISTS public.ds_version_parent(text)"))
+    op.execute(sa.text(UNPARTITION_SQL))
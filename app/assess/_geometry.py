@@ -8,6 +8,7 @@ import zipfile
 from pathlib import Path
 
 import geopandas as gpd
+import pandas as pd
 from fastapi import HTTPException
 
 
@@ -103,3 +104,57 @@ def inject_job_fields(
     gdf["dwellings"] = dwellings
     gdf["shape_area"] = gdf.geometry.to_crs("EPSG:27700").area
     return gdf
+
+
+_BATCH_COLUMN_ALIASES = {
+    "Name": "name",
+    "Dwel_Cat": "dwelling_category",
+    "Source": "source",
+    "Dwellings": "dwellings",
+}
+
+
+def prepare_batch_fields(
+    gdf: gpd.GeoDataFrame,
+    job_id: str,
+    dwelling_type: str,
+) -> gpd.GeoDataFrame:
+    """Normalise a multi-RLB upload into the columns assessments require.
+
+    Unlike `inject_job_fields`, dwellings come from each row (a `dwellings` or
+    `Dwellings` attribute is required). `name` and `dwelling_category` fall
+    back to a per-row default when the upload doesn't carry them.
+
+    Raises:
+        HTTPException: If the dwellings column is missing or not numeric.
+    """
+    gdf = gdf.rename(
+        columns={
+            k: v
+            for k, v in _BATCH_COLUMN_ALIASES.items()
+            if k in gdf.columns and v not in gdf.columns
+        }
+    )
+    if "dwellings" not in gdf.columns:
+        raise HTTPException(
+            status_code=400,
+            detail="Batch upload must have a per-feature 'dwellings' attribute",
+        )
+    dwellings = pd.to_numeric(gdf["dwellings"], errors="coerce")
+    if dwellings.isna().any():
+        bad = [int(i) for i in dwellings.index[dwellings.isna()][:10]]
+        raise HTTPException(
+            status_code=400,
+            detail=f"Non-numeric or missing 'dwellings' at feature index(es): {bad}",
+        )
+
+    positions = range(1, len(gdf) + 1)
+    gdf["id"] = [f"{job_id}-{i}" for i in positions]
+    if "name" not in gdf.columns:
+        gdf["name"] = [f"Site {i}" for i in positions]
+    if "dwelling_category" not in gdf.columns:
+        gdf["dwelling_category"] = dwelling_type
+    gdf["source"] = "api-batch"
+    gdf["dwellings"] = dwellings.astype(int)
+    gdf["shape_area"] = gdf.geometry.to_crs("EPSG:27700").area
+    return gdf
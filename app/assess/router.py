@@ -7,26 +7,37 @@ stays responsive for /health and other requests.
 Endpoints:
     POST /assess          - Submit an assessment job (returns 202 with job_id)
     GET  /assess/{job_id} - Poll job status and retrieve results
+    POST /assess/batch    - Assess many RLBs in chunks, streaming NDJSON results
+    POST /assess/what-if  - Re-evaluate one boundary for several dwelling / SuDS /
+                            greenspace scenarios (synchronous)
 """
 
 import asyncio
+import json
 import logging
 import tempfile
 import time
+from collections.abc import Iterator
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Annotated
 from uuid import uuid4
 
+import geopandas as gpd
 from fastapi import APIRouter, Form, HTTPException, Query, UploadFile
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError
 
-from app.assess._geometry import inject_job_fields, read_geometry_from_upload
+from app.assess._geometry import (
+    inject_job_fields,
+    prepare_batch_fields,
+    read_geometry_from_upload,
+)
+from app.assessments.nutrient import WhatIfScenario
 from app.config import ApiServerConfig
 from app.repositories.engine import get_shared_repository
 from app.repositories.repository import Repository
-from app.runner.runner import run_assessment
+from app.runner.runner import run_assessment, run_assessment_batch, run_what_if
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +50,8 @@ _config = ApiServerConfig()
 _JOB_TTL_SECONDS = _config.assess_job_ttl_seconds
 _MAX_JOBS = 100
 _max_upload_bytes = _config.max_upload_bytes
+_batch_max_upload_bytes = _config.batch_max_upload_bytes
+_MAX_WHAT_IF_SCENARIOS = 50
 
 # ---------------------------------------------------------------------------
 # Job store
@@ -78,6 +91,42 @@ class AssessStatusResponse(BaseModel):
     timing_s: float | None = None
 
 
+class SuDsOverrides(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    threshold_dwellings: int | None = Field(default=None, ge=0)
+    removal_rate_percent: float | None = Field(default=None, ge=0, le=100)
+
+
+class GreenspaceOverrides(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    threshold_area_ha: float | None = Field(default=None, ge=0)
+    greenspace_percent: float | None = Field(default=None, ge=0, le=100)
+    nitrogen_coeff: float | None = Field(default=None, ge=0)
+    phosphorus_coeff: float | None = Field(default=None, ge=0)
+
+
+class WhatIfScenarioRequest(BaseModel):
+    """One what-if scenario; omitted fields keep the submitted / configured value."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    dwellings: int | None = Field(default=None, ge=0)
+    suds: SuDsOverrides = Field(default_factory=SuDsOverrides)
+    greenspace: GreenspaceOverrides = Field(default_factory=GreenspaceOverrides)
+
+    def to_scenario(self) -> WhatIfScenario:
+        return WhatIfScenario(
+            dwellings=self.dwellings,
+            suds=self.suds.model_dump(exclude_none=True),
+            greenspace=self.greenspace.model_dump(exclude_none=True),
+        )
+
+
+_scenario_list = TypeAdapter(list[WhatIfScenarioRequest])
+
+
 def _get_repository() -> Repository:
     """Return the process-wide shared Repository."""
     return get_shared_repository()
@@ -255,6 +304,227 @@ async def submit_assessment(
     )
 
 
+def _read_batch_upload(
+    content: bytes, filename: str, job_id: str, dwelling_type: str
+) -> gpd.GeoDataFrame:
+    """Parse and normalise a batch upload (called from a thread)."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        gdf = read_geometry_from_upload(content, filename, Path(tmpdir))
+    if len(gdf) == 0:
+        raise HTTPException(status_code=400, detail="Batch upload has no features")
+    if len(gdf) > _config.batch_max_features:
+        raise HTTPException(
+            status_code=413,
+            detail=(
+                f"Batch upload has {len(gdf)} features; the maximum is "
+                f"{_config.batch_max_features}."
+            ),
+        )
+    return prepare_batch_fields(gdf, job_id, dwelling_type)
+
+
+def _records(df) -> list[dict]:
+    """JSON-safe records (NaN -> null, numpy scalars -> Python) for one frame."""
+    if "geometry" in df.columns:
+        df = df.drop(columns=["geometry"])
+    return json.loads(df.to_json(orient="records"))
+
+
+def _stream_batch(gdf: gpd.GeoDataFrame, job_id: str, chunk_size: int) -> Iterator[str]:
+    """Yield NDJSON lines: a header, one line per chunk, then a summary."""
+    start = time.perf_counter()
+    n_chunks = (len(gdf) + chunk_size - 1) // chunk_size
+    yield (
+        json.dumps(
+            {
+                "type": "start",
+                "job_id": job_id,
+                "features": len(gdf),
+                "chunk_size": chunk_size,
+                "chunks": n_chunks,
+            }
+        )
+        + "\n"
+    )
+    failed = 0
+    for chunk in run_assessment_batch(
+        assessment_type="nutrient",
+        rlb_gdf=gdf,
+        metadata={"unique_ref": job_id},
+        repository=_get_repository(),
+        chunk_size=chunk_size,
+    ):
+        line: dict = {
+            "type": "chunk",
+            "chunk": chunk.index,
+            "start": chunk.start,
+            "size": chunk.size,
+            "timing_s": round(chunk.timing_s, 3),
+        }
+        if chunk.error is not None:
+            failed += 1
+            line["error"] = chunk.error
+        else:
+            line["results"] = {
+                key: _records(df) for key, df in chunk.dataframes.items()
+            }
+        yield json.dumps(line) + "\n"
+    timing_s = round(time.perf_counter() - start, 2)
+    logger.info(
+        "Batch assessment %s: %d feature(s), %d chunk(s), %d failed in %.2fs",
+        job_id,
+        len(gdf),
+        n_chunks,
+        failed,
+        timing_s,
+    )
+    yield (
+        json.dumps(
+            {
+                "type": "end",
+                "chunks": n_chunks,
+                "failed_chunks": failed,
+                "timing_s": timing_s,
+            }
+        )
+        + "\n"
+    )
+
+
+@router.post(
+    "/assess/batch",
+    responses={
+        200: {"content": {"application/x-ndjson": {}}},
+        400: {"description": "Unreadable upload or missing per-feature dwellings"},
+        413: {"description": "File too large or too many features"},
+    },
+)
+async def submit_batch_assessment(
+    geometry_file: UploadFile,
+    dwelling_type: Annotated[str, Form()] = "house",
+    chunk_size: Annotated[int | None, Form(ge=1)] = None,
+):
+    """Assess every feature of a multi-RLB upload (e.g. local plan allocations).
+
+    Each feature needs its own `dwellings` attribute. Features are assessed in
+    chunks of `chunk_size` (default API_BATCH_CHUNK_SIZE) and the response
+    streams newline-delimited JSON as chunks finish: a `start` line, one
+    `chunk` line per chunk carrying its results (rlb_id is the 1-based
+    feature position in the upload) or its error, then an `end` line.
+    """
+    content = await geometry_file.read(_batch_max_upload_bytes + 1)
+    if len(content) > _batch_max_upload_bytes:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File too large. Maximum batch upload size is {_batch_max_upload_bytes // (1024 * 1024)} MB.",
+        )
+
+    job_id = str(uuid4())
+    filename = geometry_file.filename or "input.geojson"
+    gdf = await asyncio.to_thread(
+        _read_batch_upload, content, filename, job_id, dwelling_type
+    )
+    return StreamingResponse(
+        _stream_batch(gdf, job_id, chunk_size or _config.batch_chunk_size),
+        media_type="application/x-ndjson",
+    )
+
+
+def _parse_scenarios(raw: str) -> list[WhatIfScenarioRequest]:
+    """Validate the `scenarios` form field (a JSON array of scenarios)."""
+    try:
+        scenarios = _scenario_list.validate_json(raw)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=400, detail=f"Invalid scenarios: {e.errors()}"
+        ) from e
+    if not 1 <= len(scenarios) <= _MAX_WHAT_IF_SCENARIOS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Provide between 1 and {_MAX_WHAT_IF_SCENARIOS} scenarios.",
+        )
+    return scenarios
+
+
+def _run_what_if_sync(
+    content: bytes,
+    filename: str,
+    job_id: str,
+    name: str,
+    dwelling_type: str,
+    dwellings: int,
+    scenarios: list[WhatIfScenarioRequest],
+) -> list[dict]:
+    """Evaluate what-if scenarios synchronously (called from a thread)."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        gdf = read_geometry_from_upload(content, filename, Path(tmpdir))
+    inject_job_fields(gdf, job_id, name, dwelling_type, dwellings)
+
+    results = run_what_if(
+        rlb_gdf=gdf,
+        scenarios=[scenario.to_scenario() for scenario in scenarios],
+        metadata={"unique_ref": job_id},
+        repository=_get_repository(),
+    )
+    return [
+        {
+            "scenario": scenario.model_dump(exclude_none=True),
+            "results": {key: _records(df) for key, df in dataframes.items()},
+        }
+        for scenario, dataframes in zip(scenarios, results, strict=True)
+    ]
+
+
+@router.post(
+    "/assess/what-if",
+    responses={
+        400: {"description": "Unreadable upload or invalid scenarios"},
+        413: {"description": "File too large (max 50 MB)"},
+    },
+)
+async def assess_what_if(
+    geometry_file: UploadFile,
+    scenarios: Annotated[str, Form()],
+    dwelling_type: Annotated[str, Form()] = "house",
+    dwellings: Annotated[int, Form()] = 1,
+    name: Annotated[str, Form()] = "Development",
+):
+    """Evaluate a nutrient assessment for several what-if scenarios at once.
+
+    `scenarios` is a JSON array; each entry may set `dwellings` and override
+    fields of `suds` (`threshold_dwellings`, `removal_rate_percent`) and
+    `greenspace` (`threshold_area_ha`, `greenspace_percent`, `nitrogen_coeff`,
+    `phosphorus_coeff`). The boundary's spatial queries run once (or not at
+    all if it was assessed recently) and every scenario is pure arithmetic on
+    top, so the response comes back synchronously with one result per
+    scenario, in order.
+    """
+    parsed = _parse_scenarios(scenarios)
+
+    content = await geometry_file.read(_max_upload_bytes + 1)
+    if len(content) > _max_upload_bytes:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File too large. Maximum upload size is {_max_upload_bytes // (1024 * 1024)} MB.",
+        )
+
+    job_id = str(uuid4())
+    start = time.perf_counter()
+    results = await asyncio.to_thread(
+        _run_what_if_sync,
+        content,
+        geometry_file.filename or "input.geojson",
+        job_id,
+        name,
+        dwelling_type,
+        dwellings,
+        parsed,
+    )
+    timing_s = round(time.perf_counter() - start, 3)
+    logger.info("What-if %s: %d scenario(s) in %.3fs", job_id, len(parsed), timing_s)
+    return {"job_id": job_id, "timing_s": timing_s, "scenarios": results}
+
+
 @router.get(
     "/assess/{job_id}",
     response_model=AssessStatusResponse,
@@ -8,20 +8,33 @@ provides data access through the repository.
 import logging
 import threading
 import time
+from dataclasses import dataclass, field
+from typing import Any
 
 import geopandas as gpd
 import numpy as np
 import pandas as pd
+from cachetools import TTLCache
 from sqlalchemy import select
 
 from app.calculators import (
+    LandUseMatrix,
+    LandUseTerms,
+    ScenarioParameters,
+    ScenarioTotals,
     apply_buffer,
     apply_suds_mitigation,
-    calculate_land_use_uplift,
     calculate_wastewater_load,
+    evaluate_scenarios,
 )
-from app.config import CONSTANTS, AssessmentConfig, DebugConfig, RequiredColumns
-from app.data_sync.active_version import get_active_version
+from app.config import (
+    CONSTANTS,
+    AssessmentConfig,
+    DebugConfig,
+    RequiredColumns,
+    SpatialCacheConfig,
+)
+from app.data_sync.active_version import cached_active_version
 from app.debug import save_debug_gdf
 from app.models.db import (
     LookupTable,
@@ -30,7 +43,13 @@ from app.models.db import (
     Subcatchments,
     WwtwCatchments,
 )
-from app.repositories.repository import Repository
+from app.repositories.context import RepositoryContext
+from app.repositories.generation import get_reference_generations
+from app.repositories.repository import (
+    Repository,
+    _gdf_key,
+    _spatial_cache_generation,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +63,120 @@ _lookup_cache: dict[tuple[str, int], pd.DataFrame] = {}
 _lookup_cache_lock = threading.Lock()
 
 
+# ---------------------------------------------------------------------------
+# Process-level spatial stage cache
+# The reference-data half of an assessment (majority assignments and the
+# land-use intersection) depends only on the RLB geometries and the reference
+# data, not on dwellings or the SuDS / greenspace settings. Caching it lets a
+# re-run with different dwellings, or a what-if evaluation, skip every
+# spatial query.
+# Key: (geometry key, layer versions, fallback WwTW, spatial generation)
+#      → NutrientSpatialStage
+# ---------------------------------------------------------------------------
+_spatial_cache_cfg = SpatialCacheConfig()
+_spatial_stage_cache: TTLCache = TTLCache(
+    maxsize=_spatial_cache_cfg.max_size, ttl=_spatial_cache_cfg.ttl_seconds
+)
+_spatial_stage_cache_lock = threading.Lock()
+
+_MAJORITY_COLUMNS = ("majority_wwtw_id", "majority_name", "majority_opcat_name")
+
+# WwTW permit concentrations by period: 2025-2030 ("temp"), 2030 onwards
+# ("perm"). Totals use the permanent period.
+_N_CONC_COLUMNS = ("nitrogen_conc_2025_2030_mg_L", "nitrogen_conc_2030_onwards_mg_L")
+_P_CONC_COLUMNS = (
+    "phosphorus_conc_2025_2030_mg_L",
+    "phosphorus_conc_2030_onwards_mg_L",
+)
+_PERMANENT = 1
+
+
+# The lookup_table rows the arithmetic stage reads.
+_LOOKUP_NAMES = ("rates_lookup", "wwtw_lookup")
+
+
+def _cached_lookup(repository: Repository, name: str, version: int) -> pd.DataFrame:
+    """Return the `name` lookup at `version`, from `_lookup_cache` if loaded."""
+    cache_key = (name, version)
+    with _lookup_cache_lock:
+        if cache_key in _lookup_cache:
+            return _lookup_cache[cache_key]
+
+    stmt = (
+        select(LookupTable)
+        .where(LookupTable.name == name, LookupTable.version == version)
+        .limit(1)
+    )
+    rows = repository.execute_query(stmt, as_gdf=False)
+    if not rows:
+        msg = f"no lookup_table row for name={name!r} at version={version}"
+        raise ValueError(msg)
+    df = pd.DataFrame(rows[0].data)
+
+    with _lookup_cache_lock:
+        _lookup_cache[cache_key] = df
+
+    return df
+
+
+def clear_spatial_stage_cache() -> None:
+    """Drop every cached nutrient spatial stage."""
+    with _spatial_stage_cache_lock:
+        _spatial_stage_cache.clear()
+
+
+# Reference data changed in some process: cached stages may be stale.
+get_reference_generations().add_invalidation_callback(clear_spatial_stage_cache)
+
+
+@dataclass(frozen=True)
+class NutrientSpatialStage:
+    """Reference-data results for a set of prepared RLBs.
+
+    `assignments` holds one row per `rlb_id` with the majority WwTW, LPA and
+    subcatchment; `land_use` is the repository's row-level land-use
+    intersection. Treat both as read-only: the same instance is shared by
+    every run that hits the cache.
+    """
+
+    assignments: pd.DataFrame
+    land_use: pd.DataFrame
+
+
+@dataclass(frozen=True)
+class WhatIfScenario:
+    """One variation of an assessment to evaluate against its spatial stage.
+
+    `dwellings` replaces the dwelling count of every RLB when set; `suds` and
+    `greenspace` override individual fields of the configured `SuDsConfig`
+    and `GreenspaceConfig` (e.g. ``{"removal_rate_percent": 40.0}``).
+    """
+
+    dwellings: int | None = None
+    suds: dict[str, Any] = field(default_factory=dict)
+    greenspace: dict[str, Any] = field(default_factory=dict)
+
+    def apply(self, config: AssessmentConfig) -> AssessmentConfig:
+        """Return a copy of `config` with this scenario's overrides applied."""
+        return config.model_copy(
+            update={
+                "suds": _override(config.suds, self.suds),
+                "greenspace": _override(config.greenspace, self.greenspace),
+            }
+        )
+
+
+def _override(settings: Any, overrides: dict[str, Any]) -> Any:
+    """Validated copy of a settings object with some fields replaced."""
+    if not overrides:
+        return settings
+    unknown = sorted(set(overrides) - set(type(settings).model_fields))
+    if unknown:
+        msg = f"Unknown {type(settings).__name__} field(s): {unknown}"
+        raise ValueError(msg)
+    return type(settings)(**{**settings.model_dump(), **overrides})
+
+
 class NutrientAssessment:
     """Nutrient impact assessment.
 
@@ -63,9 +196,13 @@ class NutrientAssessment:
         self.rlb_gdf = rlb_gdf
         self.metadata = metadata
         self.repository = repository
+        # Repository (or assessment-scoped RepositoryContext) used for queries.
+        self._repo = repository
         self.config = AssessmentConfig()
         self._debug_config = DebugConfig.from_env()
         self._version_cache: dict[str, int] = {}
+        # Lookups read alongside the spatial stage, in its transaction.
+        self._lookups: dict[str, pd.DataFrame] = {}
 
     def run(self) -> dict[str, pd.DataFrame]:
         """Run nutrient impact assessment."""
@@ -78,14 +215,192 @@ class NutrientAssessment:
             f"[timing] validate_and_prepare_input: {time.perf_counter() - t0:.3f}s"
         )
 
+        spatial = self._spatial_stage(rlb_gdf)
+        results = self._arithmetic_stage(rlb_gdf, spatial)
+
+        logger.info(
+            f"Nutrient assessment complete in {time.perf_counter() - t_total:.3f}s"
+        )
+        return results
+
+    def what_if(self, scenarios: list[WhatIfScenario]) -> list[dict[str, pd.DataFrame]]:
+        """Evaluate each scenario against one (cached) spatial stage.
+
+        Returns one result dict per scenario, in order, each shaped like (and
+        equal to) the result of `run` with that scenario's dwellings and
+        settings. Only a new geometry pays for the spatial queries; the
+        scenarios themselves go through `evaluate_scenarios` together.
+        """
+        t_total = time.perf_counter()
+        configs = [scenario.apply(self.config) for scenario in scenarios]
+        rlb_gdf = self._validate_and_prepare_input(self.rlb_gdf)
+        spatial = self._spatial_stage(rlb_gdf)
+
+        # Everything that does not depend on the scenario (assignments,
+        # rates, permit concentrations, the out-of-scope filter) comes from
+        # one ordinary evaluation; the kernel then computes every scenario's
+        # uplift, SuDS, wastewater and totals in one pass.
+        base = self._arithmetic_stage(rlb_gdf, spatial)["impact_summary"]
+
         t0 = time.perf_counter()
-        rlb_gdf = self._assign_spatial_features(rlb_gdf)
+        dwellings = np.column_stack(
+            [
+                base["dwellings"].to_numpy(dtype=float)
+                if scenario.dwellings is None
+                else np.full(len(base), float(scenario.dwellings))
+                for scenario in scenarios
+            ]
+        )
+        totals = evaluate_scenarios(
+            dev_area_ha=base["dev_area_ha"].to_numpy(dtype=float),
+            dwellings=dwellings,
+            occupancy_rate=base["occupancy_rate"].to_numpy(dtype=float),
+            water_usage_litres_per_person_per_day=base[
+                "water_usage_L_per_person_day"
+            ].to_numpy(dtype=float),
+            nitrogen_conc_mg_per_litre=base[list(_N_CONC_COLUMNS)]
+            .to_numpy(dtype=float)
+            .T,
+            phosphorus_conc_mg_per_litre=base[list(_P_CONC_COLUMNS)]
+            .to_numpy(dtype=float)
+            .T,
+            land_use=self._land_use_terms(spatial.land_use, base["rlb_id"]),
+            params=ScenarioParameters.from_configs(configs),
+        )
         logger.info(
-            f"[timing] assign_spatial_features: {time.perf_counter() - t0:.3f}s"
+            f"[timing] what-if: scenario kernel ({len(base)} x {len(scenarios)}): "
+            f"{time.perf_counter() - t0:.3f}s"
         )
 
+        results = [
+            {"impact_summary": self._scenario_frame(base, scenario, totals, k)}
+            for k, scenario in enumerate(scenarios)
+        ]
+
+        logger.info(
+            f"[timing] what-if: {len(scenarios)} scenario(s): "
+            f"{time.perf_counter() - t_total:.3f}s"
+        )
+        return results
+
+    def _land_use_terms(
+        self, land_use: pd.DataFrame, rlb_ids: pd.Series
+    ) -> LandUseTerms:
+        """Kernel input from the spatial stage's land-use result.
+
+        Rows of RLBs that are not in `rlb_ids` (filtered out of scope) are
+        dropped; the rest are indexed by their RLB's position in `rlb_ids`.
+        """
+        position = pd.Series(np.arange(len(rlb_ids)), index=rlb_ids.to_numpy())
+        land_use = land_use[land_use["rlb_id"].isin(position.index)]
+
+        def column(name: str) -> np.ndarray:
+            return pd.to_numeric(land_use[name], errors="coerce").to_numpy(dtype=float)
+
+        development = position[land_use["rlb_id"]].to_numpy()
+        area = column("area_in_nn_catchment_ha")
+        return LandUseTerms(
+            development=development,
+            n_area_ha=area,
+            p_area_ha=area,
+            n_current=column("lu_curr_n_coeff"),
+            n_residential=column("n_resi_coeff"),
+            p_current=column("lu_curr_p_coeff"),
+            p_residential=column("p_resi_coeff"),
+        )
+
+    @staticmethod
+    def _scenario_frame(
+        base: pd.DataFrame,
+        scenario: WhatIfScenario,
+        totals: ScenarioTotals,
+        k: int,
+    ) -> pd.DataFrame:
+        """`base` with scenario `k`'s dwellings and kernel outputs written in.
+
+        Rounds the same columns as `_calculate_totals`. Without any land-use
+        rows the land-use columns do not vary by scenario and are kept.
+        """
+        frame = base.copy()
+        if scenario.dwellings is not None:
+            frame["dwellings"] = scenario.dwellings
+        if frame["n_lu_uplift"].notna().any():
+            frame["n_lu_uplift"] = totals.n_lu_uplift[:, k]
+            frame["p_lu_uplift"] = totals.p_lu_uplift[:, k]
+            frame["n_lu_post_suds"] = totals.n_lu_post_suds[:, k]
+            frame["p_lu_post_suds"] = totals.p_lu_post_suds[:, k]
+        frame["daily_water_usage_L"] = totals.daily_water_litres[:, k]
+        for period, suffix in enumerate(("temp", "perm")):
+            frame[f"n_wwtw_{suffix}"] = np.round(totals.n_wastewater[period, :, k], 2)
+            frame[f"p_wwtw_{suffix}"] = np.round(totals.p_wastewater[period, :, k], 2)
+        frame["n_total"] = np.round(totals.n_total[_PERMANENT, :, k], 2)
+        frame["p_total"] = np.round(totals.p_total[_PERMANENT, :, k], 2)
+        frame["dwelling_density"] = frame["dwellings"] / frame["dev_area_ha"]
+        return frame
+
+    def _spatial_stage(self, rlb_gdf: gpd.GeoDataFrame) -> NutrientSpatialStage:
+        """Majority assignments and land-use intersections, cached on geometry."""
+        t0 = time.perf_counter()
+        # Every read from here on (versions, cache generation, lookups and the
+        # spatial queries) shares one connection and transaction, with the
+        # RLBs staged once if a spatial query needs them (see
+        # app/repositories/context.py).
+        with RepositoryContext.scope(
+            self.repository, rlb_gdf, concurrent=self.config.concurrent_land_use
+        ) as repo:
+            self._repo = repo
+            try:
+                self._resolve_versions()
+                for name in _LOOKUP_NAMES:
+                    self._lookups[name] = self._load_lookup(name)
+                with repo.session() as session:
+                    generation = _spatial_cache_generation(session)
+                cache_key = (
+                    _gdf_key(rlb_gdf, ["rlb_id"]),
+                    tuple(sorted(self._version_cache.items())),
+                    self.config.fallback_wwtw_id,
+                    generation,
+                )
+                with _spatial_stage_cache_lock:
+                    spatial = _spatial_stage_cache.get(cache_key)
+                if spatial is not None:
+                    logger.info(
+                        f"[timing] spatial stage (cached): "
+                        f"{time.perf_counter() - t0:.3f}s"
+                    )
+                    return spatial
+
+                if isinstance(repo, RepositoryContext):
+                    self._prefetch_land_use(repo)
+
+                t1 = time.perf_counter()
+                assignments = self._query_spatial_assignments(rlb_gdf)
+                logger.info(
+                    f"[timing] assign_spatial_features: {time.perf_counter() - t1:.3f}s"
+                )
+
+                t1 = time.perf_counter()
+                land_use = self._query_land_use(rlb_gdf)
+                logger.info(
+                    f"[timing] land_use_intersection: {time.perf_counter() - t1:.3f}s"
+                )
+            finally:
+                self._repo = self.repository
+
+        spatial = NutrientSpatialStage(assignments=assignments, land_use=land_use)
+        with _spatial_stage_cache_lock:
+            _spatial_stage_cache[cache_key] = spatial
+        logger.info(f"[timing] spatial stage: {time.perf_counter() - t0:.3f}s")
+        return spatial
+
+    def _arithmetic_stage(
+        self, rlb_gdf: gpd.GeoDataFrame, spatial: NutrientSpatialStage
+    ) -> dict[str, pd.DataFrame]:
+        """Uplift, SuDS, wastewater and totals for `rlb_gdf` from a spatial stage."""
+        rlb_gdf = self._assign_spatial_features(rlb_gdf, spatial.assignments)
+
         t0 = time.perf_counter()
-        rlb_gdf = self._calculate_land_use_impacts(rlb_gdf)
+        rlb_gdf = self._calculate_land_use_impacts(rlb_gdf, spatial.land_use.copy())
         logger.info(
             f"[timing] calculate_land_use_impacts: {time.perf_counter() - t0:.3f}s"
         )
@@ -108,10 +423,6 @@ class NutrientAssessment:
             rlb_gdf, "99_final_rlb", self.metadata["unique_ref"], self._debug_config
         )
 
-        logger.info(
-            f"Nutrient assessment complete in {time.perf_counter() - t_total:.3f}s"
-        )
-
         return {"impact_summary": rlb_gdf.drop(columns=["geometry"])}
 
     def _validate_and_prepare_input(
@@ -159,25 +470,44 @@ class NutrientAssessment:
 
         return rlb_gdf
 
+    @staticmethod
+    def resolve_layer_versions(repository: Repository) -> dict[str, int]:
+        """Resolve the active version of every reference table this assessment reads.
+
+        Callers that split one submission across several assessments (see
+        `run_assessment_batch`) resolve once and pass the result as
+        `metadata["layer_versions"]`, so a reload or rollback mid-batch cannot
+        leave chunks assessed against different reference data.
+        """
+        with repository.session() as session:
+            return {
+                table: cached_active_version(session, table)
+                for table in (
+                    WwtwCatchments.__tablename__,
+                    LpaBoundaries.__tablename__,
+                    NnCatchments.__tablename__,
+                    Subcatchments.__tablename__,
+                    "coefficient_layer",
+                    "lookup_table",
+                )
+            }
+
     def _resolve_versions(self) -> None:
         """Fetch all required layer versions and populate the cache.
 
         Reads the active-version pointer (app/data_sync/active_version.py) so
         a rollback (DM-4) changes what an assessment reads without needing a
         new reload. Falls back to MAX(version) per table when no pointer row
-        exists yet.
+        exists yet. Versions pinned in `metadata["layer_versions"]` win.
         """
         if self._version_cache:
             return  # already populated for this instance
 
-        with self.repository.session() as session:
-            for model in (WwtwCatchments, LpaBoundaries, NnCatchments, Subcatchments):
-                self._version_cache[model.__tablename__] = get_active_version(
-                    session, model.__tablename__
-                )
-            self._version_cache["coefficient_layer"] = get_active_version(
-                session, "coefficient_layer"
-            )
+        pinned = self.metadata.get("layer_versions")
+        if pinned:
+            self._version_cache.update(pinned)
+            return
+        self._version_cache.update(self.resolve_layer_versions(self._repo))
 
     def _load_lookup(self, name: str) -> pd.DataFrame:
         """Return lookup table data as a DataFrame, using the process-level cache.
@@ -185,32 +515,26 @@ class NutrientAssessment:
         The cache is keyed by (name, version) so a new active version (from a
         reload or a rollback) automatically causes a fresh load while the old
         version remains available if needed. Lookup data is static once
-        written, so there is no TTL.
+        written, so there is no TTL. The spatial stage loads every lookup the
+        assessment reads, at the version it resolved, inside its transaction.
         """
-        with self.repository.session() as session:
-            version = get_active_version(session, "lookup_table")
-
-        cache_key = (name, version)
-        with _lookup_cache_lock:
-            if cache_key in _lookup_cache:
-                return _lookup_cache[cache_key]
-
-        stmt = (
-            select(LookupTable)
-            .where(LookupTable.name == name, LookupTable.version == version)
-            .limit(1)
-        )
-        rows = self.repository.execute_query(stmt, as_gdf=False)
-        if not rows:
-            msg = f"no lookup_table row for name={name!r} at version={version}"
-            raise ValueError(msg)
-        obj = rows[0]
-        df = pd.DataFrame(obj.data)
-
-        with _lookup_cache_lock:
-            _lookup_cache[cache_key] = df
-
-        return df
+        if name in self._lookups:
+            return self._lookups[name]
+        self._resolve_versions()
+        version = self._version_cache.get("lookup_table")
+        if version is None:
+            with self._repo.session() as session:
+                version = cached_active_version(session, "lookup_table")
+        return _cached_lookup(self._repo, name, version)
+
+    @staticmethod
+    def preload_lookups(repository: Repository) -> None:
+        """Load the active version of every lookup this assessment reads into
+        the process-level cache (the post-reload warm-up calls this)."""
+        with repository.session() as session:
+            version = cached_active_version(session, "lookup_table")
+        for name in _LOOKUP_NAMES:
+            _cached_lookup(repository, name, version)
 
     def _resolve_latest_version(self, model: type) -> int:
         """Return the latest version for a spatial layer table (batch-fetched)."""
@@ -222,8 +546,8 @@ class NutrientAssessment:
         self._resolve_versions()
         return self._version_cache.get("coefficient_layer", 1)
 
-    def _assign_spatial_features(self, rlb_gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
-        """Assign spatial features via batched majority overlap."""
+    def _query_spatial_assignments(self, rlb_gdf: gpd.GeoDataFrame) -> pd.DataFrame:
+        """Majority WwTW, LPA and subcatchment per RLB via batched overlap."""
         logger.info("Assigning spatial features via batched PostGIS overlap")
 
         t0 = time.perf_counter()
@@ -232,84 +556,94 @@ class NutrientAssessment:
         lpa_ver = self._resolve_latest_version(LpaBoundaries)
         sub_ver = self._resolve_latest_version(Subcatchments)
 
-        batch_results = self.repository.batch_majority_overlap_postgis(
+        batch_results = self._repo.batch_majority_overlap_postgis(
             input_gdf=rlb_gdf,
             input_id_col="rlb_id",
             assignments=[
                 {
                     "overlay_table": WwtwCatchments,
                     "overlay_filter": WwtwCatchments.version == wwtw_ver,
-                    "overlay_attr_col": WwtwCatchments.attributes["WwTw_ID"].astext,
+                    "overlay_attr_col": WwtwCatchments.wwtw_id,
                     "output_field": "majority_wwtw_id",
                     "default_value": self.config.fallback_wwtw_id,
                 },
                 {
                     "overlay_table": LpaBoundaries,
                     "overlay_filter": LpaBoundaries.version == lpa_ver,
-                    "overlay_attr_col": LpaBoundaries.attributes["NAME"].astext,
+                    "overlay_attr_col": LpaBoundaries.lpa_name,
                     "output_field": "majority_name",
                     "default_value": "UNKNOWN",
                 },
                 {
                     "overlay_table": Subcatchments,
                     "overlay_filter": Subcatchments.version == sub_ver,
-                    "overlay_attr_col": Subcatchments.attributes["OPCAT_NAME"].astext,
+                    "overlay_attr_col": Subcatchments.opcat_name,
                     "output_field": "majority_opcat_name",
                     "default_value": None,
                 },
             ],
         )
 
-        rlb_gdf = rlb_gdf.merge(
-            batch_results["majority_wwtw_id"], on="rlb_id", how="left"
-        )
-        rlb_gdf["majority_wwtw_id"] = (
-            pd.to_numeric(rlb_gdf["majority_wwtw_id"], errors="coerce")
+        assignments = rlb_gdf[["rlb_id"]].copy()
+        for output_field in _MAJORITY_COLUMNS:
+            assignments = assignments.merge(
+                batch_results[output_field], on="rlb_id", how="left"
+            )
+        assignments["majority_wwtw_id"] = (
+            pd.to_numeric(assignments["majority_wwtw_id"], errors="coerce")
             .fillna(self.config.fallback_wwtw_id)
             .astype(int)
         )
-        save_debug_gdf(
-            rlb_gdf,
-            "04_after_wwtw_assignment",
-            self.metadata["unique_ref"],
-            self._debug_config,
-        )
-
-        rlb_gdf = rlb_gdf.merge(batch_results["majority_name"], on="rlb_id", how="left")
-        save_debug_gdf(
-            rlb_gdf,
-            "05_after_lpa_assignment",
-            self.metadata["unique_ref"],
-            self._debug_config,
-        )
-
-        rlb_gdf = rlb_gdf.merge(
-            batch_results["majority_opcat_name"], on="rlb_id", how="left"
-        )
-        save_debug_gdf(
-            rlb_gdf,
-            "06_after_subcatchment_assignment",
-            self.metadata["unique_ref"],
-            self._debug_config,
-        )
 
         elapsed = time.perf_counter() - t0
         logger.info(
             f"[timing] spatial: batched PostGIS majority_overlap (3 layers): {elapsed:.3f}s"
         )
 
-        return rlb_gdf
+        return assignments
 
-    def _calculate_land_use_impacts(
-        self, rlb_gdf: gpd.GeoDataFrame
+    def _assign_spatial_features(
+        self, rlb_gdf: gpd.GeoDataFrame, assignments: pd.DataFrame
     ) -> gpd.GeoDataFrame:
-        """Calculate land use change nutrient impacts."""
-        logger.info("Calculating land use impacts")
+        """Merge the spatial stage's majority assignments onto the RLBs."""
+        for output_field, step in zip(
+            _MAJORITY_COLUMNS,
+            (
+                "04_after_wwtw_assignment",
+                "05_after_lpa_assignment",
+                "06_after_subcatchment_assignment",
+            ),
+            strict=True,
+        ):
+            rlb_gdf = rlb_gdf.merge(
+                assignments[["rlb_id", output_field]], on="rlb_id", how="left"
+            )
+            save_debug_gdf(
+                rlb_gdf, step, self.metadata["unique_ref"], self._debug_config
+            )
+        return rlb_gdf
 
+    def _prefetch_land_use(self, repo: RepositoryContext) -> None:
+        """Start the land-use query alongside majority overlap (if configured).
+
+        It only needs the validated RLBs and the layer versions, so with
+        IAT_CONCURRENT_LAND_USE it runs on a second pooled connection while
+        the spatial assignment runs on the context's own.
+        """
+        if not self.config.concurrent_land_use:
+            return
+        repo.prefetch(
+            "land_use_intersection_postgis",
+            coeff_version=self._resolve_latest_coeff_version(),
+            nn_version=self._resolve_latest_version(NnCatchments),
+        )
+
+    def _query_land_use(self, rlb_gdf: gpd.GeoDataFrame) -> pd.DataFrame:
+        """Land-use intersection rows for the RLBs."""
         nn_version = self._resolve_latest_version(NnCatchments)
         coeff_version = self._resolve_latest_coeff_version()
 
-        land_use_intersections = self.repository.land_use_intersection_postgis(
+        land_use_intersections = self._repo.land_use_intersection_postgis(
             input_gdf=rlb_gdf,
             coeff_version=coeff_version,
             nn_version=nn_version,
@@ -317,6 +651,13 @@ class NutrientAssessment:
         logger.info(
             f"PostGIS land use intersection returned {len(land_use_intersections):,} rows"
         )
+        return land_use_intersections
+
+    def _calculate_land_use_impacts(
+        self, rlb_gdf: gpd.GeoDataFrame, land_use_intersections: pd.DataFrame
+    ) -> gpd.GeoDataFrame:
+        """Calculate land use change nutrient impacts."""
+        logger.info("Calculating land use impacts")
 
         if len(land_use_intersections) == 0:
             logger.info("No 3-way intersections found - no land use impacts")
@@ -329,63 +670,19 @@ class NutrientAssessment:
             rlb_gdf["p_lu_post_suds"] = 0.0
             return rlb_gdf
 
-        land_use_intersections["n_resi_coeff"] = pd.to_numeric(
-            land_use_intersections["n_resi_coeff"], errors="coerce"
-        )
-        land_use_intersections["lu_curr_n_coeff"] = pd.to_numeric(
-            land_use_intersections["lu_curr_n_coeff"], errors="coerce"
-        )
-        land_use_intersections["p_resi_coeff"] = pd.to_numeric(
-            land_use_intersections["p_resi_coeff"], errors="coerce"
-        )
-        land_use_intersections["lu_curr_p_coeff"] = pd.to_numeric(
-            land_use_intersections["lu_curr_p_coeff"], errors="coerce"
-        )
-
-        land_use_intersections = land_use_intersections.merge(
-            rlb_gdf[["rlb_id", "dev_area_ha", "dwellings"]], on="rlb_id", how="left"
+        matrix, n_uplift, p_uplift = self._uplift_from_rows(
+            land_use_intersections, rlb_gdf
         )
 
-        n_uplift, p_uplift = calculate_land_use_uplift(
-            area_hectares=land_use_intersections["area_in_nn_catchment_ha"],
-            dev_area_ha=land_use_intersections["dev_area_ha"],
-            current_nitrogen_coeff=land_use_intersections["lu_curr_n_coeff"],
-            residential_nitrogen_coeff=land_use_intersections["n_resi_coeff"],
-            current_phosphorus_coeff=land_use_intersections["lu_curr_p_coeff"],
-            residential_phosphorus_coeff=land_use_intersections["p_resi_coeff"],
-            greenspace_config=self.config.greenspace,
-        )
-        land_use_intersections["n_lu_uplift"] = n_uplift
-        land_use_intersections["p_lu_uplift"] = p_uplift
-
-        land_use_intersections["_nn_entry"] = [
-            (s, n) if pd.notna(s) and pd.notna(n) else None
-            for s, n in zip(
-                land_use_intersections["oid"],
-                land_use_intersections["n2k_site_n"],
-                strict=True,
-            )
-        ]
-        uplift_sum = (
-            land_use_intersections.groupby("rlb_id")
-            .agg(
-                {
-                    "area_in_nn_catchment_ha": "sum",
-                    "n_lu_uplift": "sum",
-                    "p_lu_uplift": "sum",
-                    "n2k_site_n": lambda x: "; ".join(sorted(set(x.dropna()))),
-                    "_nn_entry": lambda x: (
-                        sorted({e for e in x if e is not None}) or None
-                    ),
-                }
-            )
-            .reset_index()
-            .rename(
-                columns={
-                    "n2k_site_n": "nn_catchment",
-                    "_nn_entry": "nn_catchment_entries",
-                }
-            )
+        uplift_sum = pd.DataFrame(
+            {
+                "rlb_id": matrix.rlb_ids,
+                "area_in_nn_catchment_ha": matrix.row_sums(matrix.area_ha),
+                "n_lu_uplift": matrix.row_sums(n_uplift),
+                "p_lu_uplift": matrix.row_sums(p_uplift),
+                "nn_catchment": matrix.joined_site_names(),
+                "nn_catchment_entries": matrix.catchment_entries(),
+            }
         )
 
         rlb_gdf = rlb_gdf.merge(uplift_sum, on="rlb_id", how="left")
@@ -402,6 +699,26 @@ class NutrientAssessment:
 
         return rlb_gdf
 
+    def _uplift_from_rows(
+        self, land_use_intersections: pd.DataFrame, rlb_gdf: gpd.GeoDataFrame
+    ) -> tuple[LandUseMatrix, np.ndarray, np.ndarray]:
+        """Per-intersection uplift from row-level land-use intersections."""
+        matrix = LandUseMatrix.from_columns(
+            rlb_id=land_use_intersections["rlb_id"],
+            area_ha=land_use_intersections["area_in_nn_catchment_ha"],
+            n2k_site_n=land_use_intersections["n2k_site_n"],
+            oid=land_use_intersections["oid"],
+            crome_id=land_use_intersections["crome_id"],
+            n_current=land_use_intersections["lu_curr_n_coeff"],
+            n_residential=land_use_intersections["n_resi_coeff"],
+            p_current=land_use_intersections["lu_curr_p_coeff"],
+            p_residential=land_use_intersections["p_resi_coeff"],
+        )
+        positions = pd.Index(rlb_gdf["rlb_id"]).get_indexer(matrix.rlb_ids)
+        dev_area_ha = rlb_gdf["dev_area_ha"].to_numpy(dtype=float)[positions]
+        n_uplift, p_uplift = matrix.uplift(dev_area_ha, self.config.greenspace)
+        return matrix, n_uplift, p_uplift
+
     def _calculate_wastewater_impacts(
         self, rlb_gdf: gpd.GeoDataFrame
     ) -> gpd.GeoDataFrame:
@@ -502,37 +819,26 @@ class NutrientAssessment:
         )
 
         t0 = time.perf_counter()
-        _, n_wwtw_temp, p_wwtw_temp = calculate_wastewater_load(
-            dwellings=rlb_gdf["dwellings"],
-            occupancy_rate=rlb_gdf["occupancy_rate"].fillna(0),
-            water_usage_litres_per_person_per_day=rlb_gdf[
-                "water_usage_L_per_person_day"
-            ].fillna(0),
-            nitrogen_conc_mg_per_litre=rlb_gdf["nitrogen_conc_2025_2030_mg_L"].fillna(
-                0
-            ),
-            phosphorus_conc_mg_per_litre=rlb_gdf[
-                "phosphorus_conc_2025_2030_mg_L"
-            ].fillna(0),
-        )
-        rlb_gdf["n_wwtw_temp"] = n_wwtw_temp
-        rlb_gdf["p_wwtw_temp"] = p_wwtw_temp
-
-        _, n_wwtw_perm, p_wwtw_perm = calculate_wastewater_load(
-            dwellings=rlb_gdf["dwellings"],
-            occupancy_rate=rlb_gdf["occupancy_rate"].fillna(0),
+        # Both permit periods in one call: concentrations are (N, period)
+        # columns, as in _N_CONC_COLUMNS / _P_CONC_COLUMNS, and the per-RLB
+        # water usage broadcasts across them.
+        _, n_wwtw, p_wwtw = calculate_wastewater_load(
+            dwellings=rlb_gdf["dwellings"].to_numpy(dtype=float)[:, None],
+            occupancy_rate=rlb_gdf["occupancy_rate"].fillna(0).to_numpy()[:, None],
             water_usage_litres_per_person_per_day=rlb_gdf[
                 "water_usage_L_per_person_day"
-            ].fillna(0),
-            nitrogen_conc_mg_per_litre=rlb_gdf[
-                "nitrogen_conc_2030_onwards_mg_L"
-            ].fillna(0),
-            phosphorus_conc_mg_per_litre=rlb_gdf[
-                "phosphorus_conc_2030_onwards_mg_L"
-            ].fillna(0),
-        )
-        rlb_gdf["n_wwtw_perm"] = n_wwtw_perm
-        rlb_gdf["p_wwtw_perm"] = p_wwtw_perm
+            ]
+            .fillna(0)
+            .to_numpy()[:, None],
+            nitrogen_conc_mg_per_litre=rlb_gdf[list(_N_CONC_COLUMNS)]
+            .fillna(0)
+            .to_numpy(),
+            phosphorus_conc_mg_per_litre=rlb_gdf[list(_P_CONC_COLUMNS)]
+            .fillna(0)
+            .to_numpy(),
+        )
+        rlb_gdf["n_wwtw_temp"], rlb_gdf["n_wwtw_perm"] = n_wwtw.T
+        rlb_gdf["p_wwtw_temp"], rlb_gdf["p_wwtw_perm"] = p_wwtw.T
         elapsed = time.perf_counter() - t0
         logger.info(
             f"[timing] wastewater: calculate loads (vectorized): {elapsed:.3f}s"
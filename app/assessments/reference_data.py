@@ -8,12 +8,20 @@ dropping work that should have been retried once the data is reloaded.
 
 `assert_reference_data_present` is called before the assessment runs so an empty
 required table raises instead, leaving the message on the queue for redelivery.
+
+The check runs before every job, so it must stay cheap: each table is probed
+with `SELECT 1 ... WHERE version = <active> LIMIT 1` (an index lookup, where a
+`count(*)` over the coefficient layer scanned millions of rows), and the answer
+is remembered in the reference generation registry, so it is only re-checked
+after a reload or rollback notifies a change.
 """
 
 import logging
 
-from sqlalchemy import func, select
+from sqlalchemy import literal, select
+from sqlalchemy.orm import Session
 
+from app.data_sync.active_version import cached_active_version
 from app.models.db import (
     CoefficientLayer,
     LookupTable,
@@ -22,6 +30,7 @@ from app.models.db import (
     Subcatchments,
     WwtwCatchments,
 )
+from app.repositories.generation import get_reference_generations
 from app.repositories.repository import Repository
 
 logger = logging.getLogger(__name__)
@@ -45,19 +54,51 @@ _REQUIRED_TABLES: dict[str, list[tuple[type, str]]] = {
 }
 
 
+def has_rows(session: Session, model: type, version: int | None = None) -> bool:
+    """Whether `model`'s table has any row (of `version`, when given).
+
+    Stops at the first matching row instead of counting them all.
+    """
+    stmt = select(literal(1)).select_from(model)
+    if version is not None:
+        stmt = stmt.where(model.version == version)
+    return session.scalar(stmt.limit(1)) is not None
+
+
+def _active_version_has_rows(session: Session, model: type, table: str) -> bool:
+    return has_rows(session, model, cached_active_version(session, table))
+
+
+def reference_generation(session: Session, assessment_type: str) -> dict[str, int]:
+    """Active version of every reference table `assessment_type` reads.
+
+    Together with the assessment inputs this identifies a result: any reload
+    or rollback of one of these tables changes it.
+    """
+    return {
+        label: cached_active_version(session, label)
+        for _model, label in _REQUIRED_TABLES.get(assessment_type, [])
+    }
+
+
 def assert_reference_data_present(repository: Repository, assessment_type: str) -> None:
     """Raise EmptyReferenceDataError if any reference table the assessment needs
-    is empty. Unknown assessment types are not guarded (no-op).
+    has no rows in its active version. Unknown assessment types are not guarded
+    (no-op).
     """
     required = _REQUIRED_TABLES.get(assessment_type)
     if not required:
         return
 
+    registry = get_reference_generations()
     empty: list[str] = []
     with repository.session() as session:
         for model, label in required:
-            count = session.scalar(select(func.count()).select_from(model))
-            if not count:
+            present = registry.get(
+                f"{label}:present",
+                lambda m=model, t=label: _active_version_has_rows(session, m, t),
+            )
+            if not present:
                 empty.append(label)
 
     if empty:
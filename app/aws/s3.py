@@ -1,6 +1,10 @@
 """Minimal S3 client for reference-data dump objects."""
 
+import io
 import logging
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
@@ -9,6 +13,7 @@ from botocore.exceptions import ClientError
 logger = logging.getLogger(__name__)
 
 _NOT_FOUND_CODES = {"404", "NoSuchKey", "NoSuchBucket"}
+_CHANGED_CODES = {"412", "PreconditionFailed"}
 
 
 class S3ObjectError(RuntimeError):
@@ -39,6 +44,10 @@ class S3Client:
                 "(check DATA_SYNC_S3_BUCKET/DATA_SYNC_S3_PREFIX and the manifest key; "
                 "do not repeat the prefix in the key)"
             )
+        if code in _CHANGED_CODES:
+            return S3ObjectError(
+                f"reference data dump changed while it was being read: {location}"
+            )
         return S3ObjectError(f"S3 {code or 'error'} accessing {location}")
 
     def object_etag(self, name: str) -> str:
@@ -56,3 +65,166 @@ class S3Client:
             self._client.download_file(self._bucket, key, str(dest))
         except ClientError as exc:
             raise self._wrap(key, exc) from exc
+
+    def open_stream(
+        self,
+        name: str,
+        etag: str | None = None,
+        *,
+        part_size: int = 8 * 1024 * 1024,
+        max_concurrency: int = 4,
+        buffer_parts: int | None = None,
+    ) -> "S3RangeStream":
+        """Open an object for sequential reading over parallel ranged GETs.
+
+        With `etag`, every GET is conditional on it, so the bytes read are
+        exactly that version of the object (e.g. the one recorded in
+        DataLoadHistory). Fetching starts straight away.
+        """
+        key = self._key(name)
+        try:
+            resp = self._client.head_object(
+                Bucket=self._bucket,
+                Key=key,
+                **({"IfMatch": f'"{etag}"'} if etag else {}),
+            )
+        except ClientError as exc:
+            raise self._wrap(key, exc) from exc
+        return S3RangeStream(
+            self,
+            key,
+            size=resp["ContentLength"],
+            etag=resp["ETag"].strip('"'),
+            part_size=part_size,
+            max_concurrency=max_concurrency,
+            buffer_parts=buffer_parts or 2 * max_concurrency,
+        )
+
+    def _get_range(self, key: str, start: int, end: int, etag: str) -> bytes:
+        """Bytes `start`..`end` (inclusive) of `key`, only if it is still `etag`."""
+        try:
+            resp = self._client.get_object(
+                Bucket=self._bucket,
+                Key=key,
+                Range=f"bytes={start}-{end}",
+                IfMatch=f'"{etag}"',
+            )
+            return resp["Body"].read()
+        except ClientError as exc:
+            raise self._wrap(key, exc) from exc
+
+
+class S3RangeStream(io.RawIOBase):
+    """A read-only, sequential file over an S3 object, fetched in parts.
+
+    Up to `max_concurrency` ranged GETs run at once, and at most
+    `buffer_parts` parts are fetched or held ahead of the reader, so memory
+    stays at about `buffer_parts * part_size` however large the object is.
+    Parts are handed out in order as the reader catches up, and each freed
+    slot starts the next GET.
+
+    Each GET is conditional on the object's ETag, so a dump replaced mid-read
+    fails with a clear error rather than mixing two versions. Once every part
+    has been read, the byte count is checked against the object's size. The
+    content isn't hashed against the ETag: that is an MD5 only for single-part
+    uploads without SSE-KMS.
+
+    `wait_seconds` is how long the reader spent waiting on the network.
+    """
+
+    def __init__(
+        self,
+        client: S3Client,
+        key: str,
+        *,
+        size: int,
+        etag: str,
+        part_size: int,
+        max_concurrency: int,
+        buffer_parts: int,
+    ) -> None:
+        super().__init__()
+        self.name = f"s3://{client._bucket}/{key}"
+        self._client = client
+        self._key = key
+        self._size = size
+        self._etag = etag
+        self._part_size = part_size
+        self._buffer_parts = max(buffer_parts, 1)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="s3-range"
+        )
+        self._pending: deque[Future[tuple[bytes, float]]] = deque()
+        self._next_start = 0
+        self._part = memoryview(b"")
+        self._read = 0
+        self._get_seconds = 0.0
+        self._opened = time.perf_counter()
+        self.wait_seconds = 0.0
+        self._fill()
+
+    def _fetch(self, start: int, end: int) -> tuple[bytes, float]:
+        t0 = time.perf_counter()
+        data = self._client._get_range(self._key, start, end, self._etag)
+        return data, time.perf_counter() - t0
+
+    def _fill(self) -> None:
+        """Start GETs for the next parts until the buffer is full."""
+        while len(self._pending) < self._buffer_parts and self._next_start < self._size:
+            end = min(self._next_start + self._part_size, self._size) - 1
+            self._pending.append(
+                self._executor.submit(self._fetch, self._next_start, end)
+            )
+            self._next_start = end + 1
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        if not self._part:
+            if not self._pending:
+                self._verify()
+                return 0
+            t0 = time.perf_counter()
+            data, get_seconds = self._pending.popleft().result()
+            self.wait_seconds += time.perf_counter() - t0
+            self._get_seconds += get_seconds
+            self._part = memoryview(data)
+            self._fill()
+        n = min(len(buffer), len(self._part))
+        buffer[:n] = self._part[:n]
+        self._part = self._part[n:]
+        self._read += n
+        return n
+
+    def _verify(self) -> None:
+        if self._read != self._size:
+            msg = (
+                f"read {self._read} of {self._size} bytes from {self.name}; "
+                "the object was truncated in transit"
+            )
+            raise S3ObjectError(msg)
+
+    def close(self) -> None:
+        if not self.closed:
+            for future in self._pending:
+                future.cancel()
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._part = memoryview(b"")
+            if self._read:
+                self._log()
+        super().close()
+
+    def _log(self) -> None:
+        mib = self._read / (1024 * 1024)
+        elapsed = max(time.perf_counter() - self._opened, 1e-9)
+        logger.info(
+            "Fetched %s: %.1f MiB in %.2fs (%.1f MiB/s), %.1f MiB/s per GET, "
+            "reader waited %.2fs on the network",
+            self.name,
+            mib,
+            elapsed,
+            mib / elapsed,
+            mib / max(self._get_seconds, 1e-9),
+            self.wait_seconds,
+        )
@@ -69,20 +69,26 @@ class SQSClient:
             client_kwargs["endpoint_url"] = endpoint_url
         self.sqs = boto3.client("sqs", **client_kwargs)
 
-    def receive_messages(self) -> list[tuple[ImpactAssessmentJob, str]]:
+    def receive_messages(
+        self, max_messages: int | None = None
+    ) -> list[tuple[ImpactAssessmentJob, str]]:
         """Poll SQS for job messages.
 
         Uses long polling to reduce empty receives. Returns empty list if queue is empty.
         Invalid messages are logged but not deleted - they retry until maxReceiveCount
         then move to DLQ.
 
+        Args:
+            max_messages: Receive at most this many messages (default: the
+                client's configured `max_messages`).
+
         Returns:
             List of (ImpactAssessmentJob, receipt_handle) tuples. Empty if no valid messages.
         """
         try:
             response = self.sqs.receive_message(
                 QueueUrl=self.queue_url,
-                MaxNumberOfMessages=self.max_messages,
+                MaxNumberOfMessages=max_messages or self.max_messages,
                 WaitTimeSeconds=self.wait_time_seconds,
                 VisibilityTimeout=self.visibility_timeout,
                 MessageAttributeNames=["All"],
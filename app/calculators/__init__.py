@@ -6,6 +6,13 @@ All calculators are stateless and testable without spatial data dependencies.
 
 from app.calculators.buffering import apply_buffer
 from app.calculators.land_use import calculate_land_use_uplift
+from app.calculators.land_use_matrix import CsrLayout, LandUseMatrix
+from app.calculators.scenarios import (
+    LandUseTerms,
+    ScenarioParameters,
+    ScenarioTotals,
+    evaluate_scenarios,
+)
 from app.calculators.suds import apply_suds_mitigation
 from app.calculators.wastewater import calculate_wastewater_load
 
@@ -14,4 +21,10 @@ __all__ = [
     "apply_suds_mitigation",
     "calculate_wastewater_load",
     "apply_buffer",
+    "evaluate_scenarios",
+    "LandUseTerms",
+    "ScenarioParameters",
+    "ScenarioTotals",
+    "LandUseMatrix",
+    "CsrLayout",
 ]
@@ -0,0 +1,279 @@
+"""Sparse (CSR) form of land-use intersections.
+
+The land-use query returns one row per (RLB, coefficient polygon, NN catchment)
+intersection. For a batch that is a sparse RLB x polygon matrix of
+intersection areas, and `LandUseMatrix` keeps it in compressed sparse row form
+built straight from the query's columns: row pointers per RLB, the polygon
+column and area of every stored entry, one coefficient vector per polygon,
+and an RLB x NN-catchment membership matrix. Memory is proportional to the
+number of intersections, and per-RLB and per-catchment aggregates are segment
+sums over contiguous slices instead of a groupby with Python callbacks.
+
+SciPy is not a dependency, so the CSR arrays are plain NumPy and products are
+per-row sums over each row's entries. That keeps the 2dp rounding of each
+entry's uplift, which a pure `A @ x` product would fold into the sum. Row sums
+are Kahan-compensated in entry order, as `groupby().sum()` is, so they agree
+with it bit for bit.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from app.config import GreenspaceConfig
+
+
+@dataclass(frozen=True)
+class CsrLayout:
+    """Entries grouped into rows: `order` sorts entries by row, stably."""
+
+    order: np.ndarray
+    indptr: np.ndarray
+
+    @classmethod
+    def from_rows(cls, rows: np.ndarray, n_rows: int) -> "CsrLayout":
+        """Layout of entries whose row positions (0..n_rows-1) are `rows`."""
+        rows = np.asarray(rows, dtype=np.intp)
+        indptr = np.zeros(n_rows + 1, dtype=np.intp)
+        np.cumsum(np.bincount(rows, minlength=n_rows), out=indptr[1:])
+        return cls(order=np.argsort(rows, kind="stable"), indptr=indptr)
+
+    def row_sums(self, values: np.ndarray, *, sorted_entries: bool = False):
+        """Per-row sums of entry `values`, shape (R,) or (R, K).
+
+        Each row is a Kahan-compensated sum in entry order that skips NaN
+        entries, the same arithmetic as `groupby().sum()`, so a row of NaNs
+        sums to 0 and results match it exactly. Rows with no entries are NaN,
+        as after a left merge. Pass `sorted_entries=True` when `values` are
+        already in row order.
+        """
+        values = np.asarray(values, dtype=float)
+        gathered = values if sorted_entries else values[self.order]
+        lengths = np.diff(self.indptr)
+        # Step j adds the j-th entry of every row that has one; with rows
+        # longest first, those rows are a prefix.
+        by_length = np.argsort(-lengths, kind="stable")
+        neg_lengths = -lengths[by_length]
+        starts = self.indptr[:-1][by_length]
+        total = np.zeros((len(lengths), *values.shape[1:]))
+        compensation = np.zeros_like(total)
+        for j in range(lengths.max(initial=0)):
+            n_active = np.searchsorted(neg_lengths, -j, side="left")
+            value = gathered[starts[:n_active] + j]
+            present = ~np.isnan(value)
+            running = total[:n_active]
+            y = value - compensation[:n_active]
+            t = running + y
+            # An infinite sum leaves a NaN compensation; reset it as pandas does.
+            c = t - running - y
+            c[np.isnan(c)] = 0.0
+            compensation[:n_active] = np.where(present, c, compensation[:n_active])
+            total[:n_active] = np.where(present, t, running)
+        out = np.full_like(total, np.nan)
+        occupied = neg_lengths < 0
+        out[by_length[occupied]] = total[occupied]
+        return out
+
+
+@dataclass(frozen=True)
+class LandUseMatrix:
+    """RLB x polygon intersection areas in CSR form, plus catchment membership.
+
+    Entry arrays (`area_ha`, `polygon`, `site`, `membership_entry`) are in row
+    order; `layout.order` maps them back to the input rows. `polygon` is None
+    for pre-aggregated input, which has no per-polygon coefficients.
+    """
+
+    rlb_ids: np.ndarray
+    layout: CsrLayout
+    area_ha: np.ndarray
+    polygon: np.ndarray | None
+    n_current: np.ndarray | None
+    n_residential: np.ndarray | None
+    p_current: np.ndarray | None
+    p_residential: np.ndarray | None
+    site: np.ndarray
+    site_names: np.ndarray
+    membership_entry: np.ndarray
+    membership_indptr: np.ndarray
+    membership_catchment: np.ndarray
+    catchments: list[tuple]
+
+    @classmethod
+    def from_columns(
+        cls,
+        *,
+        rlb_id,
+        area_ha,
+        n2k_site_n,
+        oid,
+        crome_id=None,
+        n_current=None,
+        n_residential=None,
+        p_current=None,
+        p_residential=None,
+    ) -> "LandUseMatrix":
+        """Build from the land-use query's columns (one value per row).
+
+        With `crome_id` and the four coefficient columns, each distinct
+        polygon gets one column and one entry in each coefficient vector. If
+        rows sharing a `crome_id` disagree on a coefficient, every row keeps
+        its own column instead.
+        """
+        rlb_codes, rlb_ids = pd.factorize(np.asarray(rlb_id), sort=True)
+        layout = CsrLayout.from_rows(rlb_codes, len(rlb_ids))
+        order = layout.order
+
+        coefficients = None
+        polygon = None
+        if crome_id is not None:
+            rows = [
+                pd.to_numeric(pd.Series(np.asarray(c)), errors="coerce").to_numpy(
+                    dtype=float
+                )[order]
+                for c in (n_current, n_residential, p_current, p_residential)
+            ]
+            polygon, first = _first_of_each(np.asarray(crome_id, dtype=object)[order])
+            coefficients = [r[first] for r in rows]
+            if not all(
+                np.array_equal(c[polygon], r, equal_nan=True)
+                for c, r in zip(coefficients, rows, strict=True)
+            ):
+                polygon = np.arange(len(order))
+                coefficients = rows
+
+        sites = pd.Series(np.asarray(n2k_site_n, dtype=object)[order])
+        site, site_names = pd.factorize(sites, sort=True)
+
+        # NN catchment entries: (oid, site) pairs where both are known.
+        oids = pd.Series(np.asarray(oid, dtype=object)[order])
+        known = (oids.notna() & sites.notna()).to_numpy()
+        pairs = list(zip(oids[known], sites[known], strict=True))
+        catchments = sorted(set(pairs))
+        catchment = np.full(len(order), -1, dtype=np.intp)
+        if pairs:
+            code = {pair: i for i, pair in enumerate(catchments)}
+            catchment[known] = [code[pair] for pair in pairs]
+
+        # Membership: one stored (RLB, catchment) pair per RLB and catchment.
+        width = max(len(catchments), 1)
+        keyed = np.flatnonzero(catchment >= 0)
+        keys, inverse = np.unique(
+            rlb_codes[order][keyed] * width + catchment[keyed], return_inverse=True
+        )
+        membership_entry = np.full(len(order), -1, dtype=np.intp)
+        membership_entry[keyed] = inverse
+        membership_indptr = np.zeros(len(rlb_ids) + 1, dtype=np.intp)
+        np.cumsum(
+            np.bincount(keys // width, minlength=len(rlb_ids)),
+            out=membership_indptr[1:],
+        )
+
+        return cls(
+            rlb_ids=np.asarray(rlb_ids),
+            layout=layout,
+            area_ha=pd.to_numeric(
+                pd.Series(np.asarray(area_ha)), errors="coerce"
+            ).to_numpy(dtype=float)[order],
+            polygon=polygon,
+            n_current=coefficients[0] if coefficients else None,
+            n_residential=coefficients[1] if coefficients else None,
+            p_current=coefficients[2] if coefficients else None,
+            p_residential=coefficients[3] if coefficients else None,
+            site=site,
+            site_names=np.asarray(site_names, dtype=object),
+            membership_entry=membership_entry,
+            membership_indptr=membership_indptr,
+            membership_catchment=(keys % width).astype(np.intp),
+            catchments=catchments,
+        )
+
+    def __len__(self) -> int:
+        return len(self.area_ha)
+
+    def sorted_entries(self, values) -> np.ndarray:
+        """Per-input-row `values` in the matrix's entry order."""
+        return np.asarray(values)[self.layout.order]
+
+    def row_sums(self, values: np.ndarray) -> np.ndarray:
+        """Per-RLB sums of entry `values` (in entry order)."""
+        return self.layout.row_sums(values, sorted_entries=True)
+
+    def catchment_sums(self, values: np.ndarray) -> np.ndarray:
+        """Sums of entry `values` per stored (RLB, catchment) membership pair.
+
+        Aligned with `membership_catchment`; NaN values count as 0.
+        """
+        keyed = self.membership_entry >= 0
+        return np.bincount(
+            self.membership_entry[keyed],
+            weights=np.nan_to_num(np.asarray(values, dtype=float)[keyed]),
+            minlength=len(self.membership_catchment),
+        )
+
+    def matvec(self, x: np.ndarray) -> np.ndarray:
+        """Product of the RLB x polygon area matrix with a per-polygon vector."""
+        return self.row_sums(self.area_ha * np.asarray(x)[self.polygon])
+
+    def uplift(
+        self, dev_area_ha: np.ndarray, greenspace_config: GreenspaceConfig
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Rounded N and P uplift of every entry, as `calculate_land_use_uplift`.
+
+        The greenspace-adjusted coefficient differences are computed once per
+        polygon for developments below and above the greenspace threshold,
+        then scaled by each entry's area and rounded to 2dp, with the same
+        operation order as the per-row calculator.
+
+        Args:
+            dev_area_ha: Development area of each RLB, aligned with `rlb_ids`
+            greenspace_config: Greenspace configuration
+        """
+        if self.polygon is None:
+            msg = "LandUseMatrix built without polygon coefficients"
+            raise ValueError(msg)
+        gs_fraction = greenspace_config.greenspace_percent / 100
+        above = (
+            np.repeat(np.asarray(dev_area_ha, dtype=float), np.diff(self.layout.indptr))
+            >= greenspace_config.threshold_area_ha
+        )
+        results = []
+        for current, residential, gs_coeff in (
+            (self.n_current, self.n_residential, greenspace_config.nitrogen_coeff),
+            (self.p_current, self.p_residential, greenspace_config.phosphorus_coeff),
+        ):
+            below_delta = residential - current
+            above_delta = (residential * (1 - gs_fraction) + gs_fraction * gs_coeff) - (
+                current
+            )
+            delta = np.where(
+                above, above_delta[self.polygon], below_delta[self.polygon]
+            )
+            results.append(np.round(delta * self.area_ha, 2))
+        return results[0], results[1]
+
+    def joined_site_names(self) -> list[str]:
+        """Per RLB, its distinct N2K site names sorted and joined with "; "."""
+        indptr = self.layout.indptr
+        names = []
+        for start, end in zip(indptr[:-1], indptr[1:], strict=True):
+            codes = np.unique(self.site[start:end])
+            names.append("; ".join(self.site_names[codes[codes >= 0]]))
+        return names
+
+    def catchment_entries(self) -> list[list[tuple] | None]:
+        """Per RLB, its sorted (oid, N2K site name) pairs, or None if none."""
+        indptr = self.membership_indptr
+        return [
+            [self.catchments[c] for c in self.membership_catchment[start:end]] or None
+            for start, end in zip(indptr[:-1], indptr[1:], strict=True)
+        ]
+
+
+def _first_of_each(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Column code of each value and the position of each code's first value."""
+    codes, uniques = pd.factorize(pd.Series(values), use_na_sentinel=False)
+    first = np.full(len(uniques), len(codes), dtype=np.intp)
+    np.minimum.at(first, codes, np.arange(len(codes)))
+    return codes, first
@@ -2,6 +2,7 @@ import os
 import tempfile
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Literal
 
 from pydantic import Field, HttpUrl, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -139,6 +140,13 @@ class AssessmentConfig(BaseSettings):
     fallback_wwtw_id: int = Field(
         default=141, description="WwTW ID for developments outside modeled catchments"
     )
+    concurrent_land_use: bool = Field(
+        default=False,
+        description=(
+            "Run the land-use intersection on a second pooled connection while "
+            "the majority-overlap assignment runs on the assessment's own"
+        ),
+    )
 
     @property
     def precautionary_buffer_factor(self) -> float:
@@ -415,6 +423,21 @@ class ApiServerConfig(BaseSettings):
         ge=1,
         description="Maximum file upload size in bytes (default: 2 MB)",
     )
+    batch_max_upload_bytes: int = Field(
+        default=50 * 1024 * 1024,
+        ge=1,
+        description="Maximum file upload size for /assess/batch in bytes (default: 50 MB)",
+    )
+    batch_max_features: int = Field(
+        default=20000,
+        ge=1,
+        description="Maximum number of RLBs accepted by /assess/batch",
+    )
+    batch_chunk_size: int = Field(
+        default=250,
+        ge=1,
+        description="RLBs assessed per chunk by /assess/batch",
+    )
 
 
 class SpatialCacheConfig(BaseSettings):
@@ -432,6 +455,140 @@ class SpatialCacheConfig(BaseSettings):
     ttl_seconds: int = Field(default=3600, description="Cache entry TTL in seconds")
 
 
+class ResultCacheConfig(BaseSettings):
+    """Configuration for the persistent assessment result cache."""
+
+    model_config = SettingsConfigDict(
+        env_prefix="RESULT_CACHE_",
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore",
+    )
+
+    enabled: bool = Field(
+        default=True,
+        description=(
+            "Serve jobs whose inputs and reference data match an earlier run "
+            "from the stored result instead of re-running the assessment"
+        ),
+    )
+    max_bytes: int = Field(
+        default=256 * 1024 * 1024,
+        ge=0,
+        description=(
+            "Total stored payload size; least-recently-used results are evicted "
+            "beyond it"
+        ),
+    )
+
+
+class SpatialPoolConfig(BaseSettings):
+    """Configuration for the shared spatial worker pool (app/spatial/pool.py)."""
+
+    model_config = SettingsConfigDict(
+        env_prefix="SPATIAL_POOL_",
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore",
+    )
+
+    max_workers: int | None = Field(
+        default=None,
+        ge=1,
+        description=(
+            "Worker processes when a call does not ask for a number "
+            "(default: 80% of the CPUs)"
+        ),
+    )
+    max_layers: int = Field(
+        default=8,
+        ge=1,
+        description="Registered overlay layers each worker keeps in memory",
+    )
+
+
+class SpatialQueryConfig(BaseSettings):
+    """Configuration for how repository spatial queries are executed."""
+
+    model_config = SettingsConfigDict(
+        env_prefix="SPATIAL_QUERY_",
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore",
+    )
+
+    majority_overlap_backend: Literal["postgis", "memory"] = Field(
+        default="postgis",
+        description=(
+            "Backend for batch majority-overlap assignments: 'postgis' runs the "
+            "lateral query server-side, 'memory' answers from an in-process "
+            "STRtree over the active version of each overlay layer"
+        ),
+    )
+    staging_method: Literal["copy", "wkt"] = Field(
+        default="copy",
+        description=(
+            "How inputs are loaded into temp tables: 'copy' streams EWKB with a "
+            "binary COPY, 'wkt' runs an executemany INSERT with ST_GeomFromText"
+        ),
+    )
+    inline_input_max_features: int = Field(
+        default=10,
+        ge=0,
+        description=(
+            "Inputs with at most this many features are passed to the batch "
+            "majority-overlap and land-use queries as bound arrays instead of "
+            "a staged temp table (0 always stages)"
+        ),
+    )
+    use_coefficient_nn_intersection: bool = Field(
+        default=True,
+        description=(
+            "Answer land-use intersections from the pre-intersected "
+            "coefficient_nn_intersection table when it has been built for the "
+            "requested version pair, instead of the 3-way intersection"
+        ),
+    )
+
+
+class ReferenceGenerationConfig(BaseSettings):
+    """Configuration for the push-based reference-data generation registry."""
+
+    model_config = SettingsConfigDict(
+        env_prefix="REFERENCE_GENERATION_",
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore",
+    )
+
+    listen_enabled: bool = Field(
+        default=True,
+        description=(
+            "LISTEN for reference-data change notifications and serve active "
+            "versions from memory; when off, every lookup queries the database"
+        ),
+    )
+    channel: str = Field(
+        default="nrf_reference_data",
+        pattern=r"^[a-z_][a-z0-9_]*$",
+        description="PostgreSQL NOTIFY channel for reference-data changes",
+    )
+    reconcile_seconds: float = Field(
+        default=300.0,
+        gt=0,
+        description="Drop remembered versions this often even without a notification",
+    )
+    retry_seconds: float = Field(
+        default=30.0,
+        gt=0,
+        description="Delay before re-opening a dropped LISTEN connection",
+    )
+
+
 class TileServerConfig(BaseSettings):
     """Configuration for the XYZ vector tile endpoint."""
 
@@ -455,6 +612,39 @@ class TileServerConfig(BaseSettings):
     log_sample_n: int = Field(default=50)
     log_slow_ms: float = Field(default=250.0)
 
+    # Concurrent misses for one tile share a single render (see _get_tile).
+    coalesce_timeout_seconds: float = Field(
+        default=10.0,
+        gt=0,
+        description=(
+            "How long a request waits for another's render of the same tile "
+            "before rendering it itself"
+        ),
+    )
+    stale_while_revalidate_seconds: int = Field(
+        default=0,
+        ge=0,
+        description=(
+            "For this long after a cached tile expires, serve it at once and "
+            "refresh it in the background (0: render expired tiles inline)"
+        ),
+    )
+    refresh_workers: int = Field(
+        default=2, ge=1, description="Background threads refreshing stale tiles"
+    )
+
+    # Pre-rendered archives (app/tiles/archive.py). Empty archive_dir renders
+    # every tile live.
+    archive_dir: str = Field(
+        default="",
+        description="Directory of pre-rendered per-version MBTiles archives",
+    )
+    archive_max_zoom: int = Field(
+        default=12,
+        ge=0,
+        description="Highest zoom seeded into an archive; above it tiles render live",
+    )
+
 
 class DataSyncConfig(BaseSettings):
     """Configuration for S3-triggered reference-data reload."""
@@ -494,6 +684,60 @@ class DataSyncConfig(BaseSettings):
         ],
         description="Fallback allow-list; manifest 'tables' map is authoritative",
     )
+    build_coefficient_nn_intersection: bool = Field(
+        default=True,
+        description=(
+            "Rebuild the pre-intersected coefficient_nn_intersection table after "
+            "a reload that touches coefficient_layer or nn_catchments"
+        ),
+    )
+    parallel_restore: bool = Field(
+        default=False,
+        description=(
+            "Load each table over its own connection into an UNLOGGED staging "
+            "table and run QC per table concurrently; only the promote step "
+            "shares a transaction"
+        ),
+    )
+    restore_workers: int = Field(
+        default=4, ge=1, description="Concurrent psql connections for a parallel reload"
+    )
+    stream_dumps: bool = Field(
+        default=False,
+        description=(
+            "Stream each dump from S3 into psql over parallel ranged GETs "
+            "instead of downloading it to local disk first"
+        ),
+    )
+    stream_part_mib: int = Field(
+        default=8, ge=1, description="Size of each ranged GET when streaming, in MiB"
+    )
+    stream_concurrency: int = Field(
+        default=4,
+        ge=1,
+        description=(
+            "Concurrent ranged GETs per streamed dump; twice this many parts "
+            "are buffered in memory"
+        ),
+    )
+    warmup_enabled: bool = Field(
+        default=True,
+        description=(
+            "After a reload, analyze and prewarm the new version and rebuild "
+            "the process caches before the run is marked successful"
+        ),
+    )
+    warmup_boundaries_path: str = Field(
+        default="",
+        description=(
+            "GeoJSON/shapefile of representative red line boundaries to run a "
+            "nutrient assessment over during warm-up (empty: skip)"
+        ),
+    )
+    warmup_tiles: list[str] = Field(
+        default_factory=list,
+        description="Hot tiles to render during warm-up, as 'layer/z/x/y'",
+    )
 
 
 class DebugConfig:
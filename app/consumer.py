@@ -17,7 +17,6 @@ import logging.config
 import multiprocessing
 import signal
 import sys
-import threading
 import time
 from pathlib import Path
 
@@ -29,11 +28,24 @@ from app.aws.sqs import SQSClient
 from app.clients.backend_client import BackendClient
 from app.common.proxy_utils import configure_proxy_settings
 from app.common.tls import init_custom_certificates
-from app.config import ApiServerConfig, AWSConfig, BackendConfig, DatabaseSettings
+from app.config import (
+    ApiServerConfig,
+    AWSConfig,
+    BackendConfig,
+    DatabaseSettings,
+    ResultCacheConfig,
+)
 from app.models.enums import AssessmentType
 from app.orchestrator import JobOrchestrator
 from app.repositories.engine import create_db_engine
+from app.repositories.generation import start_reference_listener
 from app.repositories.repository import Repository
+from app.repositories.result_cache import ResultCache
+from app.worker_pool import (
+    SqsWorkerPool,
+    VisibilityHeartbeat,
+    forkserver_worker_factory,
+)
 
 
 class WorkerConfig:
@@ -43,6 +55,12 @@ class WorkerConfig:
         self.wait_time_seconds = int(os.environ.get("SQS_WAIT_TIME_SECONDS", "20"))
         self.visibility_timeout = int(os.environ.get("SQS_VISIBILITY_TIMEOUT", "300"))
         self.max_messages = int(os.environ.get("SQS_MAX_MESSAGES", "1"))
+        # Jobs processed concurrently, each in its own worker process. 1 keeps
+        # the single-process SqsConsumer loop.
+        self.concurrency = max(1, int(os.environ.get("SQS_WORKER_CONCURRENCY", "1")))
+        # Seconds in-flight jobs get to finish after SIGTERM; keep below the
+        # ECS stopTimeout (30s by default).
+        self.drain_timeout = float(os.environ.get("SQS_DRAIN_TIMEOUT_SECONDS", "25"))
 
 
 def is_running_in_ecs() -> bool:
@@ -107,25 +125,16 @@ def run_api_server(host: str, port: int) -> None:
 def _with_visibility_heartbeat(fn, sqs_client, receipt_handle, visibility_timeout):
     """Run fn() while periodically extending the SQS message visibility timeout.
 
-    Renews at 2/3 of the timeout so there is always a comfortable margin before
-    the window expires. Without this, any job exceeding visibility_timeout seconds
-    would be re-delivered by SQS and processed twice.
+    See `VisibilityHeartbeat`: without it, any job exceeding visibility_timeout
+    seconds would be re-delivered by SQS and processed twice.
     """
-    interval = max(30, visibility_timeout * 2 // 3)
-    stop = threading.Event()
-
-    def _heartbeat():
-        while not stop.wait(interval):
-            sqs_client.change_message_visibility(receipt_handle, visibility_timeout)
-            logger.debug(f"Extended SQS visibility timeout by {visibility_timeout}s")
-
-    thread = threading.Thread(target=_heartbeat, daemon=True)
-    thread.start()
+    heartbeat = VisibilityHeartbeat(
+        sqs_client, receipt_handle, visibility_timeout
+    ).start()
     try:
         return fn()
     finally:
-        stop.set()
-        thread.join(timeout=5)
+        heartbeat.stop()
 
 
 class SqsConsumer:
@@ -236,6 +245,59 @@ def check_database_connection(
         return False
 
 
+def build_orchestrator(
+    aws_config: AWSConfig,
+    db_settings: DatabaseSettings,
+    *,
+    pool_size: int = 5,
+    max_overflow: int = 10,
+) -> JobOrchestrator:
+    """Build the job orchestrator and the repository it reuses across jobs.
+
+    Uses IAM authentication in CDP cloud, static password locally.
+    """
+    engine = create_db_engine(
+        db_settings, aws_config, pool_size=pool_size, max_overflow=max_overflow
+    )
+    repository = Repository(engine)
+    start_reference_listener(engine)
+
+    # Initialize backend client for result callbacks (if configured)
+    backend_config = BackendConfig()
+    logger.info(f"BACKEND_BASE_URL={backend_config.base_url or '<unset>'}")
+    backend_client = None
+    if backend_config.base_url:
+        backend_client = BackendClient(
+            base_url=backend_config.base_url,
+            timeout=backend_config.callback_timeout,
+            max_retries=backend_config.callback_max_retries,
+            api_key=backend_config.api_key,
+        )
+        logger.info(f"Backend callback enabled: {backend_config.base_url}")
+
+    result_cache = None
+    if ResultCacheConfig().enabled:
+        result_cache = ResultCache(repository)
+        logger.info("Assessment result cache enabled")
+
+    return JobOrchestrator(
+        aws_config=aws_config,
+        repository=repository,
+        backend_client=backend_client,
+        result_cache=result_cache,
+    )
+
+
+def build_worker_orchestrator() -> JobOrchestrator:
+    """Orchestrator factory run inside each `SqsWorkerPool` worker process."""
+    init_custom_certificates()
+    # One assessment at a time per worker: a small pool per process keeps the
+    # total connection count in line with the single-process consumer.
+    return build_orchestrator(
+        AWSConfig(), DatabaseSettings(), pool_size=2, max_overflow=3
+    )
+
+
 def main():
     """Main entry point for the SQS consumer worker."""
     api_server_process = None
@@ -267,11 +329,6 @@ def main():
         else:
             logger.info("API_TESTING_ENABLED=false: test endpoints disabled")
 
-        # Initialize PostGIS repository (ONCE - reused across jobs)
-        # Uses IAM authentication in CDP cloud, static password locally
-        engine = create_db_engine(db_settings, aws_config)
-        repository = Repository(engine)
-
         sqs_client = SQSClient(
             queue_url=aws_config.sqs_queue_url,
             region=aws_config.region,
@@ -281,28 +338,21 @@ def main():
             endpoint_url=aws_config.endpoint_url,
         )
 
-        # Initialize backend client for result callbacks (if configured)
-        backend_config = BackendConfig()
-        logger.info(f"BACKEND_BASE_URL={backend_config.base_url or '<unset>'}")
-        backend_client = None
-        if backend_config.base_url:
-            backend_client = BackendClient(
-                base_url=backend_config.base_url,
-                timeout=backend_config.callback_timeout,
-                max_retries=backend_config.callback_max_retries,
-                api_key=backend_config.api_key,
+        if worker_config.concurrency > 1:
+            # Each worker process builds its own orchestrator and engine.
+            pool = SqsWorkerPool(
+                sqs_client,
+                forkserver_worker_factory(build_worker_orchestrator),
+                concurrency=worker_config.concurrency,
+                visibility_timeout=worker_config.visibility_timeout,
+                drain_timeout=worker_config.drain_timeout,
             )
-            logger.info(f"Backend callback enabled: {backend_config.base_url}")
-
-        orchestrator = JobOrchestrator(
-            aws_config=aws_config,
-            repository=repository,
-            backend_client=backend_client,
-        )
+            pool.run()
+            return
 
         consumer = SqsConsumer(
             sqs_client=sqs_client,
-            orchestrator=orchestrator,
+            orchestrator=build_orchestrator(aws_config, db_settings),
             worker_config=worker_config,
         )
         consumer.run()
@@ -7,11 +7,20 @@ rollback (moving the pointer back one step) actually changes what reads see.
 When no pointer row exists yet for a table (e.g. before the first reload or
 rollback after this feature ships), get_active_version falls back to
 MAX(version) so behaviour is unchanged until a rollback actually happens.
+
+Moving the pointer also queues a reference-data NOTIFY (see
+app/repositories/generation.py), so every process drops its remembered
+versions as soon as the change commits; hot read paths use
+`cached_active_version` to take advantage of that.
 """
 
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from app.repositories.generation import (
+    get_reference_generations,
+    notify_reference_change,
+)
 from app.repositories.repository import _assert_safe_identifier
 
 
@@ -23,6 +32,13 @@ def get_active_version(session: Session, table: str) -> int:
     return row[0] if row and row[0] is not None else 1
 
 
+def cached_active_version(session: Session, table: str) -> int:
+    """`get_active_version`, served from the generation registry when it is live."""
+    return get_reference_generations().get(
+        table, lambda: get_active_version(session, table)
+    )
+
+
 def set_active_version(session: Session, table: str, version: int) -> None:
     """Point `table`'s active version at `version` (upsert)."""
     _assert_safe_identifier(table, "table")
@@ -35,6 +51,7 @@ def set_active_version(session: Session, table: str, version: int) -> None:
         ),
         {"t": table, "v": version},
     )
+    notify_reference_change(session, table)
 
 
 def rollback_table(session: Session, table: str) -> tuple[int, int]:
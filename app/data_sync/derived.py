@@ -0,0 +1,103 @@
+"""Derived tables rebuilt from freshly loaded reference data.
+
+`coefficient_nn_intersection` holds the coefficient polygons already split by
+NN catchment, with the N2K site name and OID copied in from `nn_catchments`.
+The nutrient land-use query then intersects each red-line boundary with this
+one table instead of re-deriving `coefficient_layer ∩ nn_catchments` on every
+job (see `Repository.land_use_intersection_postgis`).
+
+Rows are keyed by the (coefficient_layer, nn_catchments) version pair they were
+built from. A reload builds the pair for the newly active versions; cleanup
+mirrors `old_version_cleanup_sql` and drops pairs whose source versions are no
+longer retained. A pair that was never built (e.g. after rolling back only one
+of the two source tables) is not an error: the repository falls back to the
+3-way query for it.
+"""
+
+import logging
+import time
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.data_sync.active_version import get_active_version
+
+logger = logging.getLogger(__name__)
+
+COEFFICIENT_NN_TABLE = "coefficient_nn_intersection"
+COEFFICIENT_NN_SOURCES = ("coefficient_layer", "nn_catchments")
+
+# ST_CollectionExtract keeps only the polygonal part of each split: a pair that
+# merely touches contributes no area to any RLB, so it is not stored at all.
+_BUILD_SQL = f"""
+    INSERT INTO public.{COEFFICIENT_NN_TABLE} (
+        id, coeff_version, nn_version, geometry, crome_id,
+        lu_curr_n_coeff, lu_curr_p_coeff, n_resi_coeff, p_resi_coeff,
+        n2k_site_n, oid
+    )
+    SELECT gen_random_uuid(), :coeff_version, :nn_version, split.geom, split.crome_id,
+           split.lu_curr_n_coeff, split.lu_curr_p_coeff,
+           split.n_resi_coeff, split.p_resi_coeff,
+           split.n2k_site_n, split.oid
+    FROM (
+        SELECT ST_Multi(
+                   ST_CollectionExtract(ST_Intersection(c.geometry, nn.geometry), 3)
+               ) AS geom,
+               c.crome_id, c.lu_curr_n_coeff, c.lu_curr_p_coeff,
+               c.n_resi_coeff, c.p_resi_coeff,
+               nn.n2k_site_n, nn.oid
+        FROM public.coefficient_layer c
+        JOIN public.nn_catchments nn
+            ON nn.version = :nn_version
+            AND ST_Intersects(c.geometry, nn.geometry)
+        WHERE c.version = :coeff_version
+    ) split
+    WHERE NOT ST_IsEmpty(split.geom)
+"""  # noqa: S608
+
+_DELETE_PAIR_SQL = (
+    f"DELETE FROM public.{COEFFICIENT_NN_TABLE} "  # noqa: S608
+    "WHERE coeff_version = :coeff_version AND nn_version = :nn_version"
+)
+
+
+def coefficient_nn_cleanup_sql() -> str:
+    """SQL that deletes pairs built from a source version no longer retained.
+
+    Same retention as `old_version_cleanup_sql`: anything below MAX(version)-1
+    of either source table has already been deleted from that table.
+    """
+    # noqa justified: module constants only, no caller-supplied identifiers
+    sql = (
+        f"DELETE FROM public.{COEFFICIENT_NN_TABLE} "  # noqa: S608
+        "WHERE coeff_version < (SELECT MAX(version) FROM public.coefficient_layer) - 1 "
+        "OR nn_version < (SELECT MAX(version) FROM public.nn_catchments) - 1;"
+    )
+    return sql
+
+
+def rebuild_coefficient_nn_intersection(session: Session) -> int:
+    """Build `coefficient_nn_intersection` for the active source versions.
+
+    Replaces any rows already stored for that version pair and commits.
+    Returns the number of rows written.
+    """
+    coeff_version = get_active_version(session, "coefficient_layer")
+    nn_version = get_active_version(session, "nn_catchments")
+    params = {"coeff_version": coeff_version, "nn_version": nn_version}
+
+    start = time.perf_counter()
+    session.execute(text(_DELETE_PAIR_SQL), params)
+    result = session.execute(text(_BUILD_SQL), params)
+    session.execute(text(f"ANALYZE public.{COEFFICIENT_NN_TABLE}"))
+    session.commit()
+    rows = result.rowcount
+    logger.info(
+        "Built %s for coefficient_layer v%d x nn_catchments v%d: %d row(s) in %.2fs",
+        COEFFICIENT_NN_TABLE,
+        coeff_version,
+        nn_version,
+        rows,
+        time.perf_counter() - start,
+    )
+    return rows
@@ -5,10 +5,18 @@ passes of `restore_all_atomic`, checking every DM-2-confirmed rule against every
 staged table and accumulating failures into a PL/pgSQL array. A single
 `RAISE EXCEPTION` at the end aborts the enclosing `psql --single-transaction`,
 rolling back the whole manifest so bad data never reaches the live tables.
+
+`restore_all_parallel` runs the same checks as one block per table instead
+(`build_table_qc_sql`), each on its own connection, against staging tables in
+`public`. A failure there stops every table from being promoted.
+
+Each staged table is read once for all of its row-level rules (one
+`COUNT(*) FILTER (WHERE ...)` aggregate), plus one pass per uniqueness or
+lookup-row check and one anti-join per referential check.
 """
 
 import re
-from pathlib import Path
+from collections.abc import Sequence
 from typing import NamedTuple
 
 from app.data_sync.qc_rules import (
@@ -20,16 +28,30 @@ from app.data_sync.qc_rules import (
 from app.data_sync.restore import staging_name
 
 
+class _Check(NamedTuple):
+    """One rule's count of failing rows, and the failure it then reports.
+
+    A `predicate` check is folded into its table's single aggregate scan as a
+    `COUNT(*) FILTER (WHERE predicate)`. A `rows_sql` check needs a pass of
+    its own (grouping, or exploding a JSONB array) and counts that query's
+    rows. `failure` is a `format()` pattern; `%s` is the count.
+    """
+
+    failure: str
+    predicate: str | None = None
+    rows_sql: str | None = None
+
+
 def _row_count_sql(table: str, rules: TableRules, floor_pct: float) -> str:
     """Rule 2: staged row count is non-zero and >= floor_pct% of the live
     table's current (pre-promotion) row count. `floor_pct` is the table's
-    override if set, else the global default.
+    override if set, else the global default. Expects `staged_count` to hold
+    the staged row count already (see `_table_sql`).
 
     The `staged_count = 0` hard fail below is unconditional per the DM-2
     sign-off, which applies it to all 10 reference tables; there is no
     per-table flag to disable it.
     """
-    stage = staging_name(table)
     pct = (
         rules.row_count_floor_pct
         if rules.row_count_floor_pct is not None
@@ -37,8 +59,7 @@ def _row_count_sql(table: str, rules: TableRules, floor_pct: float) -> str:
     )
     ratio = pct / 100
     return (
-        f"SELECT COUNT(*) INTO staged_count FROM pg_temp.{stage};\n"  # noqa: S608
-        f"SELECT COUNT(*) INTO prev_count FROM public.{table} "
+        f"SELECT COUNT(*) INTO prev_count FROM public.{table} "  # noqa: S608
         f"WHERE version = (SELECT MAX(version) FROM public.{table});\n"
         "IF staged_count = 0 THEN\n"
         f"  failures := array_append(failures, "
@@ -53,44 +74,44 @@ def _row_count_sql(table: str, rules: TableRules, floor_pct: float) -> str:
     )
 
 
-def _column_key_sql(table: str, rules: TableRules) -> str:
+def _unique_check(table: str, stage: str, expr: str, failure: str) -> _Check:
+    """Rule 8: one grouping pass counting the key values held by 2+ rows."""
+    return _Check(
+        failure=f"table={table} rule=key_unique detail={failure}",
+        rows_sql=(
+            f"SELECT {expr} FROM {stage} "  # noqa: S608
+            f"GROUP BY {expr} HAVING COUNT(*) > 1"
+        ),
+    )
+
+
+def _column_key_checks(table: str, rules: TableRules, stage: str) -> list[_Check]:
     """Rules 3 & 8 for a plain-column business key: no NULLs, unique within the
     staged set, plus any additional required-non-null columns.
     """
-    stage = staging_name(table)
     key = rules.key
     cols = ", ".join(key.columns)
-    null_predicate = " OR ".join(f"{c} IS NULL" for c in key.columns)
-    sql = (
-        f"SELECT COUNT(*) INTO detail_count FROM pg_temp.{stage} "  # noqa: S608
-        f"WHERE {null_predicate};\n"
-        "IF detail_count > 0 THEN\n"
-        "  failures := array_append(failures, format("
-        f"'table={table} rule=key_not_null detail=%s row(s) with NULL key "
-        f"({cols})', detail_count));\n"
-        "END IF;\n"
-    )
+    checks = [
+        _Check(
+            failure=(
+                f"table={table} rule=key_not_null detail=%s row(s) with NULL key "
+                f"({cols})"
+            ),
+            predicate=" OR ".join(f"{c} IS NULL" for c in key.columns),
+        )
+    ]
     if key.unique:
-        sql += (
-            f"SELECT COUNT(*) INTO detail_count FROM (SELECT {cols} "  # noqa: S608
-            f"FROM pg_temp.{stage} GROUP BY {cols} HAVING COUNT(*) > 1) dup;\n"
-            "IF detail_count > 0 THEN\n"
-            "  failures := array_append(failures, format("
-            f"'table={table} rule=key_unique detail=%s duplicate key value(s) "
-            f"({cols})', detail_count));\n"
-            "END IF;\n"
+        checks.append(
+            _unique_check(table, stage, cols, f"%s duplicate key value(s) ({cols})")
         )
-    for extra in rules.non_null_columns:
-        sql += (
-            f"SELECT COUNT(*) INTO detail_count FROM pg_temp.{stage} "  # noqa: S608
-            f"WHERE {extra} IS NULL;\n"
-            "IF detail_count > 0 THEN\n"
-            "  failures := array_append(failures, format("
-            f"'table={table} rule=non_null detail=%s row(s) with NULL {extra}', "
-            "detail_count));\n"
-            "END IF;\n"
+    checks.extend(
+        _Check(
+            failure=f"table={table} rule=non_null detail=%s row(s) with NULL {extra}",
+            predicate=f"{extra} IS NULL",
         )
-    return sql
+        for extra in rules.non_null_columns
+    )
+    return checks
 
 
 def _json_path_expr(path: str) -> str:
@@ -100,14 +121,13 @@ def _json_path_expr(path: str) -> str:
     return f"{col}->>'{key}'"
 
 
-def _json_key_sql(table: str, rules: TableRules) -> str:
+def _json_key_checks(table: str, rules: TableRules, stage: str) -> list[_Check]:
     """Rules 3 & 8 for a JSONB-attribute business key, plus any additional
     required-non-null JSON columns and any allowed-value enum constraints.
 
     Only single-column JSON keys are supported; composite JSON keys are not
-    implemented (unlike `_column_key_sql`, which does support composite keys).
+    implemented (unlike `_column_key_checks`, which does support composite keys).
     """
-    stage = staging_name(table)
     key = rules.key
     if len(key.columns) != 1:
         msg = (
@@ -117,164 +137,219 @@ def _json_key_sql(table: str, rules: TableRules) -> str:
         raise ValueError(msg)
     path = key.columns[0]
     expr = _json_path_expr(path)
-    sql = (
-        f"SELECT COUNT(*) INTO detail_count FROM pg_temp.{stage} "  # noqa: S608
-        f"WHERE {expr} IS NULL;\n"
-        "IF detail_count > 0 THEN\n"
-        "  failures := array_append(failures, format("
-        f"'table={table} rule=key_not_null detail=%s row(s) with NULL {path}', "
-        "detail_count));\n"
-        "END IF;\n"
-    )
+    checks = [
+        _Check(
+            failure=f"table={table} rule=key_not_null detail=%s row(s) with NULL {path}",
+            predicate=f"{expr} IS NULL",
+        )
+    ]
     if key.unique:
-        sql += (
-            f"SELECT COUNT(*) INTO detail_count FROM (SELECT {expr} AS k "  # noqa: S608
-            f"FROM pg_temp.{stage} GROUP BY {expr} HAVING COUNT(*) > 1) dup;\n"
-            "IF detail_count > 0 THEN\n"
-            "  failures := array_append(failures, format("
-            f"'table={table} rule=key_unique detail=%s duplicate {path} "
-            "value(s)', detail_count));\n"
-            "END IF;\n"
+        checks.append(
+            _unique_check(table, stage, expr, f"%s duplicate {path} value(s)")
         )
-    for extra in rules.non_null_json_columns:
-        extra_expr = _json_path_expr(extra)
-        sql += (
-            f"SELECT COUNT(*) INTO detail_count FROM pg_temp.{stage} "  # noqa: S608
-            f"WHERE {extra_expr} IS NULL;\n"
-            "IF detail_count > 0 THEN\n"
-            "  failures := array_append(failures, format("
-            f"'table={table} rule=non_null detail=%s row(s) with NULL {extra}', "
-            "detail_count));\n"
-            "END IF;\n"
+    checks.extend(
+        _Check(
+            failure=f"table={table} rule=non_null detail=%s row(s) with NULL {extra}",
+            predicate=f"{_json_path_expr(extra)} IS NULL",
         )
+        for extra in rules.non_null_json_columns
+    )
     for path2, allowed in rules.allowed_values.items():
-        expr2 = _json_path_expr(path2)
         values = ", ".join(f"'{v}'" for v in allowed)
+        # The message is embedded in a format('...') literal, so its quotes
+        # are doubled; the predicate is plain SQL.
         values_display = ", ".join(f"''{v}''" for v in allowed)
-        sql += (
-            f"SELECT COUNT(*) INTO detail_count FROM pg_temp.{stage} "  # noqa: S608
-            f"WHERE {expr2} NOT IN ({values});\n"
-            "IF detail_count > 0 THEN\n"
-            "  failures := array_append(failures, format("
-            f"'table={table} rule=allowed_values detail=%s row(s) with {path2} "
-            f"outside {{{values_display}}}', detail_count));\n"
-            "END IF;\n"
+        checks.append(
+            _Check(
+                failure=(
+                    f"table={table} rule=allowed_values detail=%s row(s) with "
+                    f"{path2} outside {{{values_display}}}"
+                ),
+                predicate=f"{_json_path_expr(path2)} NOT IN ({values})",
+            )
         )
-    return sql
+    return checks
 
 
-def _lookup_row_sql(table: str, rules: TableRules) -> str:
+def _lookup_row_checks(table: str, rules: TableRules, stage: str) -> list[_Check]:
     """Rules 3 & 8 for `lookup_table` rows whose business key lives inside the
     JSONB `data` array (identified by `name`), e.g. `wwtw_lookup`/`rates_lookup`.
+    These read the array's elements, not the staged rows, so each is a pass of
+    its own (over a handful of rows).
     """
-    stage = staging_name(table)
-    sql = ""
+    checks = []
     for row_name, row_rule in rules.lookup_rows.items():
         jk = row_rule.json_key
-        sql += (
-            f"SELECT COUNT(*) INTO detail_count FROM pg_temp.{stage}, "  # noqa: S608
-            f"jsonb_array_elements(data) elem WHERE name = '{row_name}' "
-            f"AND elem->>'{jk}' IS NULL;\n"
-            "IF detail_count > 0 THEN\n"
-            "  failures := array_append(failures, format("
-            f"'table={table} rule=key_not_null detail=%s row(s) in {row_name} "
-            f"with NULL {jk}', detail_count));\n"
-            "END IF;\n"
-            "SELECT COUNT(*) INTO detail_count FROM (SELECT elem->>'"
-            f"{jk}' AS k FROM pg_temp.{stage}, jsonb_array_elements(data) elem "
-            f"WHERE name = '{row_name}' GROUP BY k HAVING COUNT(*) > 1) dup;\n"
-            "IF detail_count > 0 THEN\n"
-            "  failures := array_append(failures, format("
-            f"'table={table} rule=key_unique detail=%s duplicate {jk} value(s) "
-            f"in {row_name}', detail_count));\n"
-            "END IF;\n"
+        elements = (
+            f"FROM {stage}, jsonb_array_elements(data) elem WHERE name = '{row_name}'"
         )
-    return sql
+        checks.append(
+            _Check(
+                failure=(
+                    f"table={table} rule=key_not_null detail=%s row(s) in "
+                    f"{row_name} with NULL {jk}"
+                ),
+                rows_sql=f"SELECT 1 {elements} AND elem->>'{jk}' IS NULL",
+            )
+        )
+        checks.append(
+            _Check(
+                failure=(
+                    f"table={table} rule=key_unique detail=%s duplicate {jk} "
+                    f"value(s) in {row_name}"
+                ),
+                rows_sql=(
+                    f"SELECT elem->>'{jk}' AS k {elements} "
+                    "GROUP BY k HAVING COUNT(*) > 1"
+                ),
+            )
+        )
+    return checks
 
 
-def _geometry_sql(table: str, rules: TableRules) -> str:
+def _geometry_checks(table: str, rules: TableRules) -> list[_Check]:
     """Rules 4-6: geometry validity (with ST_MakeValid repair check), SRID
     (0 is treated as unset-and-therefore-27700 per DM-2), and declared type.
     """
-    stage = staging_name(table)
     geom = rules.geometry
     expected_types = ", ".join(f"'{t.upper()}'" for t in geom.expected_types)
     expected_label = "/".join(geom.expected_types)
-    return (
-        f"SELECT COUNT(*) INTO detail_count FROM pg_temp.{stage} "  # noqa: S608
-        "WHERE NOT ST_IsValid(geometry) AND NOT ST_IsValid(ST_MakeValid(geometry));\n"
-        "IF detail_count > 0 THEN\n"
-        "  failures := array_append(failures, format("
-        f"'table={table} rule=geometry_valid detail=%s row(s) with invalid, "
-        "unrepairable geometry', detail_count));\n"
-        "END IF;\n"
-        f"SELECT COUNT(*) INTO detail_count FROM pg_temp.{stage} "
-        f"WHERE ST_SRID(geometry) NOT IN (0, {geom.expected_srid});\n"
-        "IF detail_count > 0 THEN\n"
-        "  failures := array_append(failures, format("
-        f"'table={table} rule=geometry_srid detail=%s row(s) with SRID other "
-        f"than {geom.expected_srid}', detail_count));\n"
-        "END IF;\n"
-        f"SELECT COUNT(*) INTO detail_count FROM pg_temp.{stage} "
-        f"WHERE GeometryType(geometry) NOT IN ({expected_types});\n"
-        "IF detail_count > 0 THEN\n"
-        "  failures := array_append(failures, format("
-        f"'table={table} rule=geometry_type detail=%s row(s) with geometry "
-        f"type other than {expected_label}', detail_count));\n"
-        "END IF;\n"
-    )
+    return [
+        _Check(
+            failure=(
+                f"table={table} rule=geometry_valid detail=%s row(s) with "
+                "invalid, unrepairable geometry"
+            ),
+            predicate=(
+                "NOT ST_IsValid(geometry) AND NOT ST_IsValid(ST_MakeValid(geometry))"
+            ),
+        ),
+        _Check(
+            failure=(
+                f"table={table} rule=geometry_srid detail=%s row(s) with SRID "
+                f"other than {geom.expected_srid}"
+            ),
+            predicate=f"ST_SRID(geometry) NOT IN (0, {geom.expected_srid})",
+        ),
+        _Check(
+            failure=(
+                f"table={table} rule=geometry_type detail=%s row(s) with "
+                f"geometry type other than {expected_label}"
+            ),
+            predicate=f"GeometryType(geometry) NOT IN ({expected_types})",
+        ),
+    ]
 
 
-def _coefficient_range_sql(table: str, rules: TableRules) -> str:
+def _coefficient_range_checks(table: str, rules: TableRules) -> list[_Check]:
     """Rule 7: each declared coefficient column, when non-NULL, must be a
     finite number within its confirmed hard bounds.
     """
-    stage = staging_name(table)
-    sql = ""
-    for col, rng in rules.coefficient_ranges.items():
+    return [
+        _Check(
+            failure=(
+                f"table={table} rule=coefficient_range detail=%s row(s) with "
+                f"{col} outside [{rng.min}, {rng.max}]"
+            ),
+            predicate=(
+                f"{col} IS NOT NULL AND ({col} < {rng.min} OR {col} > {rng.max} "
+                f"OR {col} = 'NaN'::float8 OR {col} = 'Infinity'::float8 "
+                f"OR {col} = '-Infinity'::float8)"
+            ),
+        )
+        for col, rng in rules.coefficient_ranges.items()
+    ]
+
+
+def _table_checks(table: str, rules: TableRules, stage: str) -> list[_Check]:
+    """Every applicable per-table rule after the row count, in check order."""
+    checks = []
+    if rules.key is not None:
+        if rules.key.source == "column":
+            checks.extend(_column_key_checks(table, rules, stage))
+        else:
+            checks.extend(_json_key_checks(table, rules, stage))
+    if rules.lookup_rows:
+        checks.extend(_lookup_row_checks(table, rules, stage))
+    if rules.geometry is not None:
+        checks.extend(_geometry_checks(table, rules))
+    if rules.coefficient_ranges:
+        checks.extend(_coefficient_range_checks(table, rules))
+    return checks
+
+
+def _table_sql(
+    table: str, rules: TableRules, floor_pct: float, schema: str = "pg_temp"
+) -> str:
+    """Every per-table rule for one staged table, reading it as few times as
+    possible.
+
+    One aggregate scan counts the staged rows and, per `predicate` check, the
+    rows failing it, into `counts`. Only uniqueness and lookup-row checks
+    read the table again, once each. Failures are then reported in check
+    order, with the same messages as when each rule ran its own COUNT(*).
+    """
+    stage = f"{schema}.{staging_name(table)}"
+    checks = _table_checks(table, rules, stage)
+    filters = "".join(
+        f",\n  COUNT(*) FILTER (WHERE {c.predicate})" for c in checks if c.predicate
+    )
+    sql = (
+        f"SELECT ARRAY[COUNT(*){filters}]\nINTO counts FROM {stage};\n"  # noqa: S608
+        "staged_count := counts[1];\n"
+    )
+    sql += _row_count_sql(table, rules, floor_pct)
+    index = 1
+    for check in checks:
+        if check.predicate is not None:
+            index += 1
+            count = f"counts[{index}]"
+        else:
+            sql += (
+                "SELECT COUNT(*) INTO detail_count "  # noqa: S608
+                f"FROM ({check.rows_sql}) failing;\n"
+            )
+            count = "detail_count"
         sql += (
-            f"SELECT COUNT(*) INTO detail_count FROM pg_temp.{stage} "  # noqa: S608
-            f"WHERE {col} IS NOT NULL AND ({col} < {rng.min} OR {col} > {rng.max} "
-            f"OR {col} = 'NaN'::float8 OR {col} = 'Infinity'::float8 "
-            f"OR {col} = '-Infinity'::float8);\n"
-            "IF detail_count > 0 THEN\n"
-            "  failures := array_append(failures, format("
-            f"'table={table} rule=coefficient_range detail=%s row(s) with "
-            f"{col} outside [{rng.min}, {rng.max}]', detail_count));\n"
+            f"IF {count} > 0 THEN\n"
+            f"  failures := array_append(failures, format('{check.failure}', "
+            f"{count}));\n"
             "END IF;\n"
         )
     return sql
 
 
-def _referential_source(side: ReferentialSide, staged_tables: set[str]) -> str:
+def _referential_source(
+    side: ReferentialSide, staged_tables: set[str], schema: str = "pg_temp"
+) -> str:
     if side.table in staged_tables:
-        return f"pg_temp.{staging_name(side.table)}"
+        return f"{schema}.{staging_name(side.table)}"
     return f"public.{side.table}"
 
 
-def _referential_side_select(side: ReferentialSide, source: str, alias: str) -> str:
+def _referential_side_select(side: ReferentialSide, source: str) -> str:
     if side.lookup_row is not None:
         return (
             f"SELECT elem->>'{side.json_key}' AS v FROM {source}, "  # noqa: S608
             f"jsonb_array_elements(data) elem WHERE name = '{side.lookup_row}'"
         )
     if side.json_key is not None:
-        return (
-            f"SELECT {'DISTINCT ' if alias == 'to_' else ''}"  # noqa: S608
-            f"{_json_path_expr(side.json_key)} AS v FROM {source}"
-        )
-    return f"SELECT {'DISTINCT ' if alias == 'to_' else ''}{side.column} AS v FROM {source}"  # noqa: S608
+        return f"SELECT {_json_path_expr(side.json_key)} AS v FROM {source}"  # noqa: S608
+    return f"SELECT {side.column} AS v FROM {source}"  # noqa: S608
 
 
-def _referential_sql(check: ReferentialCheck, staged_tables: set[str]) -> str:
+def _referential_sql(
+    check: ReferentialCheck, staged_tables: set[str], schema: str = "pg_temp"
+) -> str:
     """Rule 9: every value on the `from` side of a confirmed referential pair
     must exist on the `to` side, after any declared numeric coercion or
-    null-guarding.
+    null-guarding. NOT EXISTS plans as a hashed anti-join: one pass over each
+    side, with no DISTINCT (which would add a sort or hash of its own).
     """
-    from_source = _referential_source(check.from_, staged_tables)
-    to_source = _referential_source(check.to, staged_tables)
-    from_select = _referential_side_select(check.from_, from_source, "from_")
-    to_select = _referential_side_select(check.to, to_source, "to_")
+    from_source = _referential_source(check.from_, staged_tables, schema)
+    to_source = _referential_source(check.to, staged_tables, schema)
+    from_select = _referential_side_select(check.from_, from_source)
+    to_select = _referential_side_select(check.to, to_source)
 
     cast = "::numeric" if check.numeric_coercion else ""
     null_guard = "f.v IS NOT NULL AND " if check.allow_null_from else ""
@@ -290,69 +365,99 @@ def _referential_sql(check: ReferentialCheck, staged_tables: set[str]) -> str:
     )
 
 
-def _table_parts(table: str, rules: TableRules, floor_pct: float) -> list[str]:
-    """Every applicable per-table rule for one staged table, in check order."""
-    parts = [_row_count_sql(table, rules, floor_pct)]
-    if rules.key is not None:
-        if rules.key.source == "column":
-            parts.append(_column_key_sql(table, rules))
-        else:
-            parts.append(_json_key_sql(table, rules))
-    if rules.lookup_rows:
-        parts.append(_lookup_row_sql(table, rules))
-    if rules.geometry is not None:
-        parts.append(_geometry_sql(table, rules))
-    if rules.coefficient_ranges:
-        parts.append(_coefficient_range_sql(table, rules))
-    return parts
+def _referential_owner(check: ReferentialCheck, staged_tables: set[str]) -> str:
+    """The staged table whose QC block runs `check`: its `from` side when that
+    is staged (failures are reported against it), else its `to` side."""
+    if check.from_.table in staged_tables:
+        return check.from_.table
+    return check.to.table
 
 
 def _referential_parts(
-    checks: list[ReferentialCheck], staged_tables: set[str]
+    checks: list[ReferentialCheck],
+    staged_tables: set[str],
+    schema: str = "pg_temp",
+    owner: str | None = None,
 ) -> list[str]:
     """Rule 9 for every referential check touching a staged table, de-duplicated
-    by check name so a check shared across tables is emitted only once.
+    by check name so a check shared across tables is emitted only once. With
+    `owner`, only the checks `_referential_owner` assigns to that table.
     """
     seen_checks: set[str] = set()
     parts = []
     for check in checks:
         if check.name in seen_checks:
             continue
-        if check.from_.table in staged_tables or check.to.table in staged_tables:
-            parts.append(_referential_sql(check, staged_tables))
-            seen_checks.add(check.name)
+        if (
+            check.from_.table not in staged_tables
+            and check.to.table not in staged_tables
+        ):
+            continue
+        if owner is not None and _referential_owner(check, staged_tables) != owner:
+            continue
+        parts.append(_referential_sql(check, staged_tables, schema))
+        seen_checks.add(check.name)
     return parts
 
 
-def build_qc_sql(items: list[tuple[str, Path]], rules: QcRules) -> str:
+def _qc_block(parts: list[str]) -> str:
+    """Wrap rule checks in a `DO $qc$` block that raises once, with every
+    failure joined by newlines, if any check recorded one."""
+    return "".join(
+        [
+            "DO $qc$\n"
+            "DECLARE\n"
+            "  failures text[] := ARRAY[]::text[];\n"
+            "  detail_count bigint;\n"
+            "  staged_count bigint;\n"
+            "  prev_count bigint;\n"
+            "  counts bigint[];\n"
+            "BEGIN\n",
+            *parts,
+            "IF array_length(failures, 1) > 0 THEN\n"
+            "  RAISE EXCEPTION '%', array_to_string(failures, E'\\n');\n"
+            "END IF;\n"
+            "END;\n"
+            "$qc$;\n",
+        ]
+    )
+
+
+def build_qc_sql(items: Sequence[tuple[str, object]], rules: QcRules) -> str:
     """Build the full `DO $qc$ ... $qc$;` block checking every applicable rule
     against every table in `items`. Raises (via the generated SQL) once, with
     every failing rule across every table joined by newlines, if any rule
     fails — the caller's enclosing transaction then rolls back atomically.
     """
     staged_tables = {table for table, _ in items}
-    parts = [
-        "DO $qc$\n"
-        "DECLARE\n"
-        "  failures text[] := ARRAY[]::text[];\n"
-        "  detail_count bigint;\n"
-        "  staged_count bigint;\n"
-        "  prev_count bigint;\n"
-        "BEGIN\n"
-    ]
+    parts = []
     for table in staged_tables:
         table_rules = rules.tables.get(table)
         if table_rules is not None:
-            parts.extend(_table_parts(table, table_rules, rules.row_count_floor_pct))
+            parts.append(_table_sql(table, table_rules, rules.row_count_floor_pct))
     parts.extend(_referential_parts(rules.referential_checks, staged_tables))
-    parts.append(
-        "IF array_length(failures, 1) > 0 THEN\n"
-        "  RAISE EXCEPTION '%', array_to_string(failures, E'\\n');\n"
-        "END IF;\n"
-        "END;\n"
-        "$qc$;\n"
+    return _qc_block(parts)
+
+
+def build_table_qc_sql(
+    table: str, staged_tables: set[str], rules: QcRules, schema: str = "public"
+) -> str:
+    """Build the `DO $qc$` block for one table of a parallel restore.
+
+    Checks `table`'s own rules against its staging table in `schema`, plus
+    the referential checks it owns, reading the other side from that side's
+    staging table when it is in `staged_tables`. Across every staged table
+    the blocks run each check of `build_qc_sql` exactly once, and fail with
+    the same `table=X rule=Y detail=...` lines.
+    """
+    parts = []
+    table_rules = rules.tables.get(table)
+    if table_rules is not None:
+        parts.append(_table_sql(table, table_rules, rules.row_count_floor_pct, schema))
+    parts.extend(
+        _referential_parts(rules.referential_checks, staged_tables, schema, table)
     )
-    return "".join(parts)
+    return _qc_block(parts)
 
 
 class QcFailure(NamedTuple):
@@ -2,18 +2,37 @@
 
 Each dump is `COPY ... FROM stdin`. All tables in a run stream into one
 `psql --single-transaction` process. Per table we: create a TEMP staging table
-shaped like the live table, redirect the dump's COPY into that staging table,
-then stamp a fresh id + `version = MAX(version)+1` and `INSERT ... SELECT *`
-into the live table. Because the whole batch shares one transaction, readers
+shaped like the live table and redirect the dump's COPY into it. The rows are
+then copied, with a fresh id and `version = MAX(version)+1`, into a standalone
+table, which is indexed in bulk and attached as the new version's partition
+of the live table (reference tables are LIST-partitioned on version, see
+app/models/db.py). Because the whole batch shares one transaction, readers
 keep seeing the prior version of every table until the final COMMIT, then flip
 to the new version together; any error rolls back all tables.
 
-This avoids the ACCESS EXCLUSIVE lock of TRUNCATE and needs no table ownership
-(only INSERT, plus the database-default TEMPORARY privilege). Superseded
-versions are removed by a best-effort post-commit cleanup in the service layer
-(see app/data_sync/service.py). Indexes are defined once by Liquibase and
-persist; index maintenance happens inline on INSERT (see NRF2-694 review for the
-SECURITY DEFINER index-reset fallback if load time ever becomes a problem).
+Nothing is inserted into, or deleted from, a live partition, so a reload
+leaves no dead tuples or index bloat behind. Superseded versions are
+detached and dropped whole by a best-effort post-commit cleanup in the service
+layer (see app/data_sync/service.py). Creating and attaching partitions needs
+table ownership, which the app user doesn't have, so that DDL goes through the
+SECURITY DEFINER `ds_*_version` functions (migration f6e1b7c9d083). Beyond
+those, a reload needs only the database-default TEMPORARY privilege.
+
+`restore_all_parallel` is the same reload spread over one connection per
+table: each dump loads into an UNLOGGED staging table in `public` instead of a
+TEMP one, and QC and the next-version build run per table, concurrently. Only
+the attaches share a transaction, so the reload takes about as long as its
+slowest table rather than the sum of all of them, and stays all-or-nothing.
+
+A dump is either a downloaded file or, streamed, an `S3RangeStream` opened
+when the restore reaches it (see `DumpSource`). Either way it is decompressed
+on the fly into psql's stdin, and the next dump is opened while the current
+one COPYs.
+
+Attributes promoted to generated columns (`promoted_attribute` in
+app/models/db.py) are computed by PostgreSQL from `attributes` as rows are
+copied. Staging drops them, and the copy names every other column, since a
+generated column can't be written to.
 """
 
 import gzip
@@ -21,11 +40,16 @@ import logging
 import os
 import subprocess
 import time
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from pathlib import Path
-from typing import IO
+from typing import IO, NamedTuple
 
+from app.aws.s3 import S3RangeStream
 from app.config import DatabaseSettings
 from app.data_sync.qc_rules import QcRules
+from app.models.db import Base, promoted_attributes
 from app.repositories.repository import _assert_safe_identifier
 
 logger = logging.getLogger(__name__)
@@ -48,42 +72,101 @@ def pre_sql(table: str) -> str:
     transaction is supplied by `psql --single-transaction`.
     """
     stage = staging_name(table)
-    return f"CREATE TEMP TABLE {stage} (LIKE public.{table});\n"
+    sql = f"CREATE TEMP TABLE {stage} (LIKE public.{table});\n"
+    # LIKE copies generated columns as plain ones; the dump never fills them.
+    for column in promoted_attributes(table):
+        sql += f"ALTER TABLE pg_temp.{stage} DROP COLUMN {column};\n"
+    return sql
+
+
+def next_version_table(table: str) -> str:
+    """The standalone table a reload loads `table`'s new version into."""
+    _assert_safe_identifier(table, "table")
+    return f"_ds_next_{table}"
+
+
+def _loaded_columns(table: str) -> list[str]:
+    """Columns a reload writes: all but the promoted (generated) ones."""
+    model = Base.metadata.tables.get(f"public.{table}")
+    if model is None:
+        msg = f"no model for reference table {table!r}"
+        raise ValueError(msg)
+    promoted = promoted_attributes(table)
+    return [c.name for c in model.columns if c.name not in promoted]
 
 
-def post_sql(table: str) -> str:
-    """SQL emitted after a table's COPY data: stamp a fresh id + new version,
-    load the live table from staging, then drop staging.
+def post_sql(table: str, staging_schema: str = "pg_temp") -> str:
+    """SQL emitted after a table's COPY data: copy staging into the new
+    version's table with a fresh id and version, drop staging, then index it.
 
     `id` is regenerated (no FK references these ids) to avoid PK collisions with
     the rows already present; `version` is MAX(version)+1 computed once against
-    the pre-insert snapshot. `LIKE` preserves column order, so `SELECT *` aligns.
+    the pre-load snapshot. The new table is not yet part of the live table;
+    `attach_sql` attaches it. A parallel restore's staging tables are in
+    `public` (`staging_schema`); they are left for the other tables' QC and
+    dropped by `discard_staging_sql` once every table has promoted.
     """
-    stage = staging_name(table)
+    stage = f"{staging_schema}.{staging_name(table)}"
+    next_table = next_version_table(table)
+    columns = _loaded_columns(table)
+    values = {
+        "id": "gen_random_uuid()",
+        "version": f"(SELECT COALESCE(MAX(version),0)+1 FROM public.{table})",  # noqa: S608
+    }
     # noqa justified: identifiers validated by staging_name/_assert_safe_identifier
     sql = (
-        f"UPDATE pg_temp.{stage} SET id = gen_random_uuid(), "  # noqa: S608
-        f"version = (SELECT COALESCE(MAX(version),0)+1 FROM public.{table});\n"
-        f"INSERT INTO public.{table} SELECT * FROM pg_temp.{stage};\n"
-        f"DROP TABLE pg_temp.{stage};\n"
+        f"SELECT public.ds_prepare_version('{table}');\n"  # noqa: S608
+        f"INSERT INTO public.{next_table} ({', '.join(columns)}) "
+        f"SELECT {', '.join(values.get(c, c) for c in columns)} "
+        f"FROM {stage};\n"
     )
+    if staging_schema == "pg_temp":
+        sql += f"DROP TABLE {stage};\n"
+    sql += f"SELECT public.ds_index_version('{table}');\n"
     return sql
 
 
+def attach_sql(table: str) -> str:
+    """SQL that attaches the loaded, indexed new version as a partition.
+
+    Emitted once every table's `post_sql` has run: attaching briefly locks the
+    live table's DEFAULT partition until COMMIT, so no loading or index build
+    happens after the first attach.
+    """
+    _assert_safe_identifier(table, "table")
+    return f"SELECT public.ds_attach_version('{table}');\n"
+
+
+def prepare_stage_sql(table: str) -> str:
+    """SQL that creates a parallel restore's UNLOGGED staging table.
+
+    `public.<staging_name>` is shaped like `pre_sql`'s temp table but outlives
+    the loading connection, so the other tables' QC can read it. Unlogged, so
+    the load writes no WAL. Any staging or unattached next-version table a
+    failed run left behind is dropped first.
+    """
+    _assert_safe_identifier(table, "table")
+    return f"SELECT public.ds_prepare_stage('{table}');\n"
+
+
+def discard_staging_sql(table: str) -> str:
+    """SQL that drops a parallel restore's staging table, and its next-version
+    table if that was never attached."""
+    _assert_safe_identifier(table, "table")
+    return f"SELECT public.ds_discard_staging('{table}');\n"
+
+
 def old_version_cleanup_sql(table: str) -> str:
-    """SQL that deletes every version older than the retained pair.
+    """SQL that drops every version older than the retained pair.
 
     Retention keeps MAX(version) and MAX(version)-1 (not latest-only), so a
     rollback (app/data_sync/active_version.py) always has a previous version's
-    rows to point back at.
+    rows to point back at. Superseded partitions are detached and dropped; only
+    rows in the DEFAULT partition (loaded before partitioning, or outside data
+    sync) are deleted.
     """
     _assert_safe_identifier(table, "table")
-    # noqa justified: identifier validated by _assert_safe_identifier
-    sql = (
-        f"DELETE FROM public.{table} "  # noqa: S608
-        f"WHERE version < (SELECT MAX(version) FROM public.{table}) - 1;"
-    )
-    return sql
+    return f"SELECT public.ds_drop_superseded_versions('{table}');"
 
 
 def build_psql_env(settings: DatabaseSettings, region: str) -> dict[str, str]:
@@ -126,44 +209,169 @@ def assert_gzip(table: str, dump_path: Path) -> None:
         raise ValueError(msg)
 
 
-def _rewrite_copy_line(line: bytes, table: str, stage: str) -> bytes:
-    """Redirect a dump's `COPY public.<table> ...` header to the temp staging
+def _rewrite_copy_line(
+    line: bytes, table: str, stage: str, schema: str = "pg_temp"
+) -> bytes:
+    """Redirect a dump's `COPY public.<table> ...` header to the staging
     table. Lines that don't start with the exact header prefix are returned
     unchanged, so data rows containing the table name are never touched.
     """
     prefix = f"COPY public.{table} ".encode()
     if line.startswith(prefix):
-        return f"COPY pg_temp.{stage} ".encode() + line[len(prefix) :]
+        return f"COPY {schema}.{stage} ".encode() + line[len(prefix) :]
     return line
 
 
+# A dump to restore: a downloaded file, or a callable that opens one as a
+# stream (e.g. `S3Client.open_stream` bound to a key), called only when the
+# restore reaches it.
+DumpSource = Path | Callable[[], IO[bytes]]
+
+
+def _assert_gzip_files(items: Sequence[tuple[str, DumpSource]]) -> None:
+    """`assert_gzip` every downloaded dump. A streamed dump's magic bytes are
+    only seen once it is read, so `_stream_dump_to_staging` checks those."""
+    for table, source in items:
+        if isinstance(source, Path):
+            assert_gzip(table, source)
+
+
+def _open_dump(source: DumpSource) -> IO[bytes]:
+    return source.open("rb") if isinstance(source, Path) else source()
+
+
+def _dump_name(dump: IO[bytes]) -> str:
+    """A file's path, or a stream's URL (`S3RangeStream.name`), for logs."""
+    return str(getattr(dump, "name", "stream"))
+
+
+def _open_one_ahead(sources: list[DumpSource]) -> Iterator[IO[bytes]]:
+    """Yield each dump opened, opening the next one before yielding, so a
+    streamed dump fills its buffer from S3 while the one before it COPYs."""
+    opened: list[IO[bytes]] = []
+    try:
+        for i in range(len(sources)):
+            if i == 0:
+                opened.append(_open_dump(sources[0]))
+            if i + 1 < len(sources):
+                opened.append(_open_dump(sources[i + 1]))
+            yield opened[i]
+            opened[i].close()
+    finally:
+        for dump in opened:
+            dump.close()
+
+
+class StreamStats(NamedTuple):
+    """What one dump streamed into psql after its COPY header: data rows and
+    decompressed bytes, and where the time went. `network_seconds` is time
+    spent waiting on S3 (zero for a downloaded dump), `inflate_seconds` reading
+    and decompressing, and `pipe_seconds` blocked writing to psql, i.e. on
+    the COPY itself."""
+
+    rows: int
+    bytes: int
+    network_seconds: float = 0.0
+    inflate_seconds: float = 0.0
+    pipe_seconds: float = 0.0
+
+
+# Enough of the end of a dump to hold the `\.` end-of-data line and the short
+# pg_dump footer after it.
+_TAIL_BYTES = 64 * 1024
+
+
 def _stream_dump_to_staging(
-    stdin: IO[bytes], dump_path: Path, table: str, stage: str
-) -> None:
-    """Stream a gzipped data-only dump into psql, redirecting its single COPY
-    header to `pg_temp.<stage>`. The (small) preamble is read line-by-line until
-    the header; the (large) data body is then streamed in 1 MiB chunks.
+    stdin: IO[bytes],
+    dump: Path | IO[bytes],
+    table: str,
+    stage: str,
+    schema: str = "pg_temp",
+) -> StreamStats:
+    """Stream a gzipped data-only dump (a file, or an open binary stream) into
+    psql, redirecting its single COPY header to `<schema>.<stage>`. The (small)
+    preamble is read line-by-line until the header; the (large) data body is
+    then streamed in 1 MiB chunks.
+
+    Rows are counted as the data body's newlines (COPY text format escapes
+    newlines inside values) up to the `\\.` end-of-data line.
     """
     prefix = f"COPY public.{table} ".encode()
-    with gzip.open(dump_path, "rb") as gz:
-        found = False
-        for line in gz:
-            if line.startswith(prefix):
-                stdin.write(_rewrite_copy_line(line, table, stage))
-                found = True
-                break
-            stdin.write(line)
-        if not found:
-            msg = f"no COPY header for table {table!r} found in dump {dump_path}"
-            raise ValueError(msg)
-        for chunk in iter(lambda: gz.read(1024 * 1024), b""):
-            stdin.write(chunk)
+    label = dump if isinstance(dump, Path) else _dump_name(dump)
+    newlines = size = 0
+    tail = b""
+    read_seconds = pipe_seconds = 0.0
+    try:
+        with gzip.open(dump, "rb") as gz:
+            found = False
+            for line in gz:
+                if line.startswith(prefix):
+                    stdin.write(_rewrite_copy_line(line, table, stage, schema))
+                    found = True
+                    break
+                stdin.write(line)
+            if not found:
+                msg = f"no COPY header for table {table!r} found in dump {label}"
+                raise ValueError(msg)
+            while True:
+                t0 = time.perf_counter()
+                chunk = gz.read(1024 * 1024)
+                t1 = time.perf_counter()
+                read_seconds += t1 - t0
+                if not chunk:
+                    break
+                stdin.write(chunk)
+                pipe_seconds += time.perf_counter() - t1
+                newlines += chunk.count(b"\n")
+                size += len(chunk)
+                tail = (tail + chunk[-_TAIL_BYTES:])[-_TAIL_BYTES:]
+    except gzip.BadGzipFile as exc:
+        msg = (
+            f"dump for table {table!r} is not gzip-compressed ({label}: {exc}); "
+            "the S3 object must be a gzipped data-only pg_dump"
+        )
+        raise ValueError(msg) from exc
+    # The body starts a line, so with the whole body in view a leading newline
+    # lets an immediate `\.` (no rows) match too.
+    window = tail if size > len(tail) else b"\n" + tail
+    end = window.rfind(b"\n\\.\n")
+    rows = newlines - window[end + 1 :].count(b"\n") if end >= 0 else newlines
+    network_seconds = dump.wait_seconds if isinstance(dump, S3RangeStream) else 0.0
+    return StreamStats(
+        rows=rows,
+        bytes=size,
+        network_seconds=network_seconds,
+        inflate_seconds=max(read_seconds - network_seconds, 0.0),
+        pipe_seconds=pipe_seconds,
+    )
+
+
+def _log_stream(table: str, stats: StreamStats, seconds: float) -> None:
+    """Log a table's load throughput, in rows/s and MiB/s, and the time spent
+    in each stage. The stage with the most time is the bottleneck."""
+    seconds = max(seconds, 1e-9)
+    mib = stats.bytes / (1024 * 1024)
+    logger.info(
+        "Streamed table %s in %.2fs: %d rows (%.0f rows/s), %.1f MiB (%.1f MiB/s); "
+        "network wait %.2fs, inflate %.2fs (%.1f MiB/s), pipe %.2fs (%.1f MiB/s)",
+        table,
+        seconds,
+        stats.rows,
+        stats.rows / seconds,
+        mib,
+        mib / seconds,
+        stats.network_seconds,
+        stats.inflate_seconds,
+        mib / max(stats.inflate_seconds, 1e-9),
+        stats.pipe_seconds,
+        mib / max(stats.pipe_seconds, 1e-9),
+    )
 
 
 def restore_all_atomic(
     settings: DatabaseSettings,
     region: str,
-    items: list[tuple[str, Path]],
+    items: list[tuple[str, DumpSource]],
     qc_rules: QcRules | None = None,
 ) -> None:
     """Load every (table, dump) in a single psql transaction. All-or-nothing.
@@ -178,12 +386,11 @@ def restore_all_atomic(
     before any table promotes, so a QC failure rolls back the whole batch
     exactly like any other error.
     """
-    for table, dump in items:
-        assert_gzip(table, dump)
+    _assert_gzip_files(items)
     # staging_name validates each identifier before psql is spawned.
     plans = [
-        (table, dump, staging_name(table), pre_sql(table), post_sql(table))
-        for table, dump in items
+        (table, staging_name(table), pre_sql(table), post_sql(table))
+        for table, _ in items
     ]
 
     env = build_psql_env(settings, region)
@@ -205,15 +412,16 @@ def restore_all_atomic(
         msg = "failed to open psql stdin"
         raise RuntimeError(msg)
     try:
-        # STAGE: every table's staging table + COPY data, in order.
-        for table, dump, stage, pre, _post in plans:
-            logger.info("Loading table %s from %s", table, dump)
-            start = time.perf_counter()
-            proc.stdin.write(pre.encode())
-            _stream_dump_to_staging(proc.stdin, dump, table, stage)
-            logger.info(
-                "Streamed table %s in %.2fs", table, time.perf_counter() - start
-            )
+        # STAGE: every table's staging table + COPY data, in order. The next
+        # dump is opened as each one starts, so a streamed dump downloads
+        # while the one before it COPYs.
+        with closing(_open_one_ahead([source for _, source in items])) as dumps:
+            for (table, stage, pre, _post), dump in zip(plans, dumps, strict=True):
+                logger.info("Loading table %s from %s", table, _dump_name(dump))
+                start = time.perf_counter()
+                proc.stdin.write(pre.encode())
+                stats = _stream_dump_to_staging(proc.stdin, dump, table, stage)
+                _log_stream(table, stats, time.perf_counter() - start)
         # QC: one generated block checking every applicable rule against every
         # staged table, reached only after all tables have staged (referential
         # checks need every side of a pair available).
@@ -225,18 +433,27 @@ def restore_all_atomic(
             from app.data_sync.qc import build_qc_sql
 
             proc.stdin.write(build_qc_sql(items, qc_rules).encode())
-        # PROMOTE: reached only if QC didn't raise. Not individually timed per table:
+        # PROMOTE: reached only if QC didn't raise. Every table's new version is
+        # copied and indexed, then all are attached. Not individually timed per table:
         # post_sql's writes are too small to be backpressure-limited by the pipe (unlike
         # STAGE's bulk COPY data), so a per-table timer here would report near-zero
-        # durations regardless of actual INSERT/index-maintenance cost, misleadingly
-        # implying promotion is cheap. The INSERT/index-maintenance cost (the NRF2-694
-        # tripwire) is only visible in aggregate via the "Committed" log below, which
-        # also includes QC evaluation time and the final COMMIT.
-        for _table, _dump, _stage, _pre, post in plans:
+        # durations regardless of actual copy/index-build cost, misleadingly
+        # implying promotion is cheap. That cost (the NRF2-694 tripwire) is only
+        # visible in aggregate via the "Committed" log below, which also includes
+        # QC evaluation time and the final COMMIT.
+        for _table, _stage, _pre, post in plans:
             proc.stdin.write(post.encode())
+        for table, _stage, _pre, _post in plans:
+            proc.stdin.write(attach_sql(table).encode())
         proc.stdin.close()
     except BrokenPipeError:  # psql already exited with an error
         pass
+    except BaseException:
+        # e.g. a dump that fails mid-stream: stop psql rather than let it
+        # reach EOF and commit.
+        proc.kill()
+        proc.communicate()
+        raise
     commit_start = time.perf_counter()
     _, stderr = proc.communicate()
     if proc.returncode != 0:
@@ -248,3 +465,176 @@ def restore_all_atomic(
         time.perf_counter() - commit_start,
         ", ".join(tables),
     )
+
+
+def _run_psql(
+    settings: DatabaseSettings,
+    region: str,
+    label: str,
+    write: Callable[[IO[bytes]], None],
+) -> None:
+    """Run one `psql --single-transaction` fed by `write(stdin)`; raise on error.
+
+    The environment is built per call, so with IAM authentication every
+    connection gets a fresh token: the tokens expire after 15 minutes, and a
+    parallel reload opens its later connections well after it starts.
+
+    Output is discarded as in `restore_all_atomic`. If `write` itself raises,
+    psql is killed so its transaction rolls back rather than waiting on stdin.
+    """
+    cmd = ["psql", "-v", "ON_ERROR_STOP=1", "--single-transaction", "--quiet"]
+    proc = subprocess.Popen(  # noqa: S603
+        cmd,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        env=build_psql_env(settings, region),
+    )
+    if proc.stdin is None:
+        msg = "failed to open psql stdin"
+        raise RuntimeError(msg)
+    try:
+        write(proc.stdin)
+        proc.stdin.close()
+    except BrokenPipeError:  # psql already exited with an error
+        pass
+    except BaseException:
+        proc.kill()
+        proc.communicate()
+        raise
+    _, stderr = proc.communicate()
+    if proc.returncode != 0:
+        msg = f"psql {label} failed: {stderr.decode(errors='replace')}"
+        raise RuntimeError(msg)
+
+
+def _run_per_table(
+    pool: ThreadPoolExecutor, tables: list[str], fn: Callable[[str], None]
+) -> None:
+    """Run `fn(table)` for every table on `pool` and wait for all of them.
+
+    Every table runs to completion even if another fails, so a QC failure on
+    one table doesn't hide those on the others. Errors from several tables are
+    raised as one RuntimeError, one message per line, which
+    `app.data_sync.qc.parse_qc_failures` reads like `restore_all_atomic`'s.
+    """
+    futures = [pool.submit(fn, table) for table in tables]
+    errors = [exc for f in futures if (exc := f.exception()) is not None]
+    if not errors:
+        return
+    for exc in errors:
+        if not isinstance(exc, RuntimeError):
+            raise exc
+    if len(errors) == 1:
+        raise errors[0]
+    raise RuntimeError("\n".join(str(exc) for exc in errors))
+
+
+def restore_all_parallel(
+    settings: DatabaseSettings,
+    region: str,
+    items: list[tuple[str, DumpSource]],
+    qc_rules: QcRules | None = None,
+    max_workers: int = 4,
+) -> None:
+    """Load every (table, dump) concurrently, then promote them all in one
+    short transaction. All-or-nothing, like `restore_all_atomic`.
+
+    Each phase runs per table on its own connection, up to `max_workers` at a
+    time, and every table finishes a phase before the next phase starts:
+
+    - LOAD: the dump's COPY into an UNLOGGED `public.<staging_name>` table
+      (`prepare_stage_sql`), committed so other connections can read it.
+    - QC and BUILD: the table's QC block (`build_table_qc_sql`, whose
+      referential checks read the other tables' staging tables), then
+      `post_sql` into its next-version table, committed but not attached.
+    - PROMOTE: one transaction attaching every table's new version
+      (`attach_sql`). Readers flip to the new versions together at its COMMIT.
+
+    Nothing is attached unless every table has loaded, passed QC and been
+    indexed, so readers never see a partial reload. Staging and unattached
+    next-version tables are dropped whether or not the reload succeeded.
+    The wait is roughly the slowest single table's load and build rather
+    than the sum over all tables.
+    """
+    _assert_gzip_files(items)
+    # post_sql validates each identifier before psql is spawned.
+    post = {table: post_sql(table, staging_schema="public") for table, _ in items}
+    dumps = dict(items)
+    tables = list(dumps)
+    staged_tables = set(tables)
+
+    logger.info(
+        "Restoring %d table(s) in parallel (%d connections): %s",
+        len(tables),
+        max_workers,
+        ", ".join(tables),
+    )
+
+    def load(table: str) -> None:
+        stage = staging_name(table)
+        start = time.perf_counter()
+        stats = StreamStats(rows=0, bytes=0)
+
+        def write(stdin: IO[bytes]) -> None:
+            nonlocal stats
+            stdin.write(prepare_stage_sql(table).encode())
+            with _open_dump(dumps[table]) as dump:
+                stats = _stream_dump_to_staging(
+                    stdin, dump, table, stage, schema="public"
+                )
+
+        _run_psql(settings, region, f"load of {table}", write)
+        _log_stream(table, stats, time.perf_counter() - start)
+
+    def check_and_build(table: str) -> None:
+        sql = post[table]
+        if qc_rules is not None:
+            # Local import: see restore_all_atomic.
+            from app.data_sync.qc import build_table_qc_sql
+
+            sql = build_table_qc_sql(table, staged_tables, qc_rules) + sql
+        start = time.perf_counter()
+        _run_psql(
+            settings,
+            region,
+            f"QC and build of {table}",
+            lambda stdin: stdin.write(sql.encode()),
+        )
+        logger.info(
+            "Checked and indexed table %s in %.2fs", table, time.perf_counter() - start
+        )
+
+    reload_start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="data-sync-restore"
+        ) as pool:
+            _run_per_table(pool, tables, load)
+            _run_per_table(pool, tables, check_and_build)
+        promote_start = time.perf_counter()
+        attach = "".join(attach_sql(table) for table in tables)
+        _run_psql(
+            settings, region, "promote", lambda stdin: stdin.write(attach.encode())
+        )
+    finally:
+        discard = "".join(discard_staging_sql(table) for table in tables)
+        try:
+            _run_psql(
+                settings,
+                region,
+                "staging cleanup",
+                lambda stdin: stdin.write(discard.encode()),
+            )
+        except Exception:  # noqa: BLE001
+            logger.warning(
+                "staging cleanup failed; the next parallel reload drops it",
+                exc_info=True,
+            )
+    logger.info(
+        "Committed %d table(s) in %.2fs (promote %.2fs): %s",
+        len(tables),
+        time.perf_counter() - reload_start,
+        time.perf_counter() - promote_start,
+        ", ".join(tables),
+    )
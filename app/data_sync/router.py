@@ -134,6 +134,7 @@ def get_data_sync(run_id: UUID) -> dict:
             "started_at": run.started_at.isoformat() if run.started_at else None,
             "finished_at": (run.finished_at.isoformat() if run.finished_at else None),
             "error": run.error,
+            "warmup_seconds": run.warmup_seconds,
         }
 
 
@@ -4,21 +4,35 @@ import logging
 import tempfile
 from collections import defaultdict
 from datetime import UTC, datetime
+from functools import partial
 from pathlib import Path
 from uuid import UUID, uuid4
 
 import boto3
+from botocore.config import Config as BotoConfig
 from sqlalchemy import func, select, text
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
+from app.assessments.reference_data import has_rows
 from app.aws.s3 import S3Client, S3ObjectError
 from app.config import AWSConfig, DatabaseSettings, DataSyncConfig
 from app.data_sync.active_version import set_active_version
+from app.data_sync.derived import (
+    COEFFICIENT_NN_SOURCES,
+    coefficient_nn_cleanup_sql,
+    rebuild_coefficient_nn_intersection,
+)
 from app.data_sync.manifest import Manifest
 from app.data_sync.qc import parse_qc_failures
 from app.data_sync.qc_rules import load_qc_rules
-from app.data_sync.restore import old_version_cleanup_sql, restore_all_atomic
+from app.data_sync.restore import (
+    DumpSource,
+    old_version_cleanup_sql,
+    restore_all_atomic,
+    restore_all_parallel,
+)
+from app.data_sync.warmup import warm_up
 from app.models.db import (
     CoefficientLayer,
     DataLoadHistory,
@@ -36,6 +50,7 @@ from app.models.db import (
 )
 from app.models.domain import DataProvenance
 from app.repositories.engine import create_db_engine, get_shared_repository
+from app.repositories.generation import notify_reference_change
 from app.repositories.repository import clear_spatial_caches
 
 logger = logging.getLogger(__name__)
@@ -58,27 +73,61 @@ REFERENCE_TABLES = [
 _MODEL_BY_TABLE_NAME = {label: model for model, label in REFERENCE_TABLES}
 
 
+def _estimated_row_counts(session: Session) -> dict[str, int]:
+    """Planner row estimates (`pg_class.reltuples`) for the reference tables.
+
+    Summed over each table's version partitions. -1 means no partition has
+    been vacuumed or analyzed.
+    """
+    rows = session.execute(
+        text(
+            "SELECT parent.relname, "
+            "COALESCE(SUM(c.reltuples) FILTER (WHERE c.reltuples >= 0), -1)::bigint "
+            "FROM pg_class parent "
+            "JOIN pg_namespace n ON n.oid = parent.relnamespace "
+            "JOIN pg_inherits i ON i.inhparent = parent.oid "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE n.nspname = 'public' AND parent.relname = ANY(:names) "
+            "GROUP BY parent.relname"
+        ),
+        {"names": [label for _model, label in REFERENCE_TABLES]},
+    ).all()
+    return {name: int(n) for name, n in rows}
+
+
 def _log_table_status(session: Session, *, context: str = "Post-sync") -> None:
     """Log one line of per-table row counts so an empty reference table is
     visible in the logs. `context` labels the message (e.g. "Post-sync",
     "No-op sync", "Startup"). Never raises: callers run it best-effort, so a
     failed count must not fail the surrounding operation.
+
+    Emptiness is exact: each table is probed for a first row rather than
+    counted. The counts shown are planner estimates (`~N`) from one catalog
+    query; a non-empty table that has never been analyzed shows `>0`.
     """
     try:
+        try:
+            estimates = _estimated_row_counts(session)
+        except Exception:  # noqa: BLE001
+            session.rollback()
+            estimates = {}
         parts: list[str] = []
         empty: list[str] = []
         errors: list[str] = []
         for model, label in REFERENCE_TABLES:
             try:
-                n = session.scalar(select(func.count()).select_from(model))
+                present = has_rows(session, model)
             except Exception as exc:  # noqa: BLE001
                 session.rollback()
                 parts.append(f"{label}=error")
                 errors.append(f"{label} ({exc})")
                 continue
-            parts.append(f"{label}={n}")
-            if not n:
+            if not present:
+                parts.append(f"{label}=0")
                 empty.append(label)
+                continue
+            estimate = estimates.get(label, -1)
+            parts.append(f"{label}=~{estimate}" if estimate > 0 else f"{label}=>0")
         summary = f"{context} table status: " + " ".join(parts)
         if empty or errors:
             if empty:
@@ -141,7 +190,17 @@ def resolve_active_provenance(session: Session) -> DataProvenance:
 
 
 def _build_s3_client(cfg: DataSyncConfig, aws: AWSConfig) -> S3Client:
-    boto = boto3.client("s3", region_name=aws.region, endpoint_url=aws.endpoint_url)
+    # Enough connections for every dump streaming at once: one per parallel
+    # restore worker, or the current and next dump of an atomic restore.
+    streams = cfg.restore_workers if cfg.parallel_restore else 2
+    boto = boto3.client(
+        "s3",
+        region_name=aws.region,
+        endpoint_url=aws.endpoint_url,
+        config=BotoConfig(
+            max_pool_connections=max(10, streams * cfg.stream_concurrency)
+        ),
+    )
     return S3Client(boto, bucket=cfg.s3_bucket, prefix=cfg.s3_prefix)
 
 
@@ -161,7 +220,7 @@ def _restore_all(
         raise ValueError(msg)
 
     with tempfile.TemporaryDirectory() as tmp:
-        items: list[tuple[str, Path]] = []
+        items: list[tuple[str, DumpSource]] = []
         audit: list[tuple[str, str, str]] = []
         for table, key in manifest.tables.items():
             if table not in allowed:
@@ -170,11 +229,23 @@ def _restore_all(
             dest = Path(tmp) / Path(key).name
             try:
                 etag = s3.object_etag(key)
-                s3.download_object(key, dest)
+                if cfg.stream_dumps:
+                    # Opened by the restore when it reaches the table, pinned
+                    # to the ETag recorded below.
+                    source: DumpSource = partial(
+                        s3.open_stream,
+                        key,
+                        etag,
+                        part_size=cfg.stream_part_mib * 1024 * 1024,
+                        max_concurrency=cfg.stream_concurrency,
+                    )
+                else:
+                    s3.download_object(key, dest)
+                    source = dest
             except S3ObjectError as exc:
                 msg = f"{exc} (table {table!r})"
                 raise S3ObjectError(msg) from exc
-            items.append((table, dest))
+            items.append((table, source))
             audit.append((table, key, etag))
 
         # Single transaction across all tables: either every table is loaded or
@@ -188,9 +259,19 @@ def _restore_all(
         # always see MAX(version) — and any momentary under-report is repaired by
         # _reconcile_load_history at the start of the next sync (status =
         # 'reconciled'). Treat DataLoadHistory as an audit log, not the source of
-        # truth.
+        # truth. The parallel restore loads tables over separate connections
+        # but still promotes them in one transaction.
         try:
-            restore_all_atomic(db, region, items, qc_rules=load_qc_rules())
+            if cfg.parallel_restore:
+                restore_all_parallel(
+                    db,
+                    region,
+                    items,
+                    qc_rules=load_qc_rules(),
+                    max_workers=cfg.restore_workers,
+                )
+            else:
+                restore_all_atomic(db, region, items, qc_rules=load_qc_rules())
         except RuntimeError as exc:
             _record_failed_history(session, run_id, manifest, str(exc))
             raise
@@ -227,6 +308,16 @@ def _restore_all(
         # Cutover has committed; remove superseded versions (best-effort).
         _cleanup_old_versions(session, [table for table, _ in items])
 
+        if cfg.build_coefficient_nn_intersection and set(COEFFICIENT_NN_SOURCES) & {
+            table for table, _ in items
+        }:
+            _refresh_coefficient_nn_intersection(session)
+
+        # Load history (the spatial cache generation) and derived tables have
+        # changed too, not just the active-version pointers.
+        notify_reference_change(session)
+        session.commit()
+
 
 def _record_failed_history(
     session: Session, run_id: UUID, manifest: Manifest, error: str
@@ -321,9 +412,10 @@ def _reconcile_load_history(
 
 
 def _cleanup_old_versions(session: Session, tables: list[str]) -> None:
-    """Delete superseded versions per table (keep-latest). Best-effort: a
-    failure is logged and skipped, since stale rows are ignored by MAX(version)
-    and removed on the next reload. Cutover has already committed by this point.
+    """Drop superseded version partitions per table (keep the latest two).
+    Best-effort: a failure is logged and skipped, since stale versions are
+    ignored by MAX(version) and dropped on the next reload. Cutover has already
+    committed by this point.
     """
     for table in tables:
         try:
@@ -338,6 +430,26 @@ def _cleanup_old_versions(session: Session, tables: list[str]) -> None:
             )
 
 
+def _refresh_coefficient_nn_intersection(session: Session) -> None:
+    """Rebuild the pre-intersected coefficient x NN table for the newly active
+    versions and drop pairs built from versions no longer retained.
+    Best-effort: without it the land-use query falls back to intersecting
+    coefficient_layer and nn_catchments directly, so a failure is logged and
+    the reload still succeeds.
+    """
+    try:
+        rebuild_coefficient_nn_intersection(session)
+        session.execute(text(coefficient_nn_cleanup_sql()))
+        session.commit()
+    except Exception:  # noqa: BLE001
+        session.rollback()
+        logger.warning(
+            "coefficient_nn_intersection rebuild failed; land-use queries will "
+            "use the 3-way intersection until the next reload",
+            exc_info=True,
+        )
+
+
 def run_data_sync(run_id: UUID, manifest: Manifest, *, force: bool) -> None:
     """Execute a reload run end-to-end. Always updates the run row's status.
 
@@ -407,6 +519,12 @@ def _do_run(
         # next assessment re-reads from the database rather than serving
         # pre-reload results until their TTL expires.
         clear_spatial_caches()
+        # Then fill them again for the new version, so the first jobs after
+        # the reload aren't the slow ones. The run only reports success once
+        # this has finished; its duration is recorded separately.
+        if cfg.warmup_enabled:
+            report = warm_up(session, cfg, list(manifest.tables))
+            run.warmup_seconds = report.total_seconds
         _finish(session, run, status="success")
     except Exception as exc:
         logger.exception("data sync run %s failed", run_id)
@@ -0,0 +1,205 @@
+"""Post-reload warm-up for a freshly loaded reference-data version.
+
+A reload leaves the new version cold: its partitions were written moments ago
+and are not in shared buffers, the partitioned parents' planner statistics
+predate it, and `clear_spatial_caches()` has just emptied the in-process
+caches. Without a warm-up the first real assessments and tiles after a reload
+pay for all of that.
+
+`warm_up` runs, in order and each timed:
+
+1. `analyze`: refresh the planner statistics of every reloaded table.
+2. `prewarm`: read the GIST indexes of the nutrient layers' new partitions
+   into shared buffers (needs pg_prewarm; skipped without it).
+3. `caches`: resolve the active versions (nutrient layers and tile layers)
+   and load the lookup tables into the process caches.
+4. `seed_tiles`: when `TILE_ARCHIVE_DIR` is set, render each reloaded tile
+   layer's pyramid into its version's archive (see app/tiles/archive.py).
+5. `boundaries`: run a nutrient assessment over a configured file of
+   representative red line boundaries, which also loads the in-memory
+   overlay layers and warms the spatial query plans.
+6. `tiles`: render a configured list of hot tiles into the tile cache.
+
+Every step is best-effort: a failure is logged and recorded in the report,
+and the remaining steps still run, since the reload itself has already
+committed.
+"""
+
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+import geopandas as gpd
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.assessments.nutrient import NutrientAssessment
+from app.config import DataSyncConfig, RequiredColumns, TileServerConfig
+from app.data_sync.active_version import cached_active_version, get_active_version
+from app.repositories.engine import get_shared_repository
+from app.repositories.repository import Repository
+from app.runner.runner import run_assessment
+from app.tiles.router import TILE_LAYERS, seed_tile_archive, warm_tile
+
+logger = logging.getLogger(__name__)
+
+# The nutrient assessment's spatial layers; every job probes their GIST
+# indexes, so these are the ones worth holding in shared buffers.
+PREWARM_TABLES = (
+    "coefficient_layer",
+    "lpa_boundaries",
+    "nn_catchments",
+    "subcatchments",
+    "wwtw_catchments",
+)
+
+_PG_PREWARM_INSTALLED = text("SELECT 1 FROM pg_extension WHERE extname = 'pg_prewarm'")
+
+# Filled in for any required column a warm-up boundaries file leaves out.
+_BOUNDARY_DEFAULTS = {
+    RequiredColumns.ID: "data-sync-warmup",
+    RequiredColumns.NAME: "data-sync-warmup",
+    RequiredColumns.DWELLING_CATEGORY: "house",
+    RequiredColumns.SOURCE: "data-sync-warmup",
+    RequiredColumns.DWELLINGS: 1,
+    RequiredColumns.SHAPE_AREA: 0.0,
+}
+
+
+@dataclass
+class WarmupReport:
+    """Seconds spent per warm-up step, and the steps that failed."""
+
+    steps: dict[str, float] = field(default_factory=dict)
+    failed: list[str] = field(default_factory=list)
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(self.steps.values())
+
+
+def parse_tile(spec: str) -> tuple[str, int, int, int]:
+    """Parse a `layer/z/x/y` tile spec; raise ValueError if it is malformed."""
+    parts = spec.strip("/").split("/")
+    if len(parts) != 4 or parts[0] not in TILE_LAYERS:
+        msg = f"tile {spec!r} is not 'layer/z/x/y' with a served layer"
+        raise ValueError(msg)
+    layer, z, x, y = parts
+    return layer, int(z), int(x), int(y)
+
+
+def _analyze(session: Session, tables: list[str]) -> str:
+    for table in tables:
+        session.execute(text("SELECT public.ds_analyze_version(:t)"), {"t": table})
+        session.commit()
+    return f"{len(tables)} table(s)"
+
+
+def _prewarm(session: Session, tables: list[str]) -> str:
+    tables = [t for t in tables if t in PREWARM_TABLES]
+    if tables and session.scalar(_PG_PREWARM_INSTALLED) is None:
+        return "skipped (pg_prewarm is not installed)"
+    blocks = 0
+    unpartitioned = []
+    for table in tables:
+        version = get_active_version(session, table)
+        warmed = session.scalar(
+            text("SELECT public.ds_prewarm_version(:t, :v)"),
+            {"t": table, "v": version},
+        )
+        session.commit()
+        # With the extension present, NULL means the version has no partition.
+        if warmed is None:
+            unpartitioned.append(table)
+            continue
+        blocks += warmed
+    if unpartitioned:
+        return f"{blocks} block(s); no partition: {', '.join(unpartitioned)}"
+    return f"{blocks} block(s)"
+
+
+def _rebuild_caches(repository: Repository) -> str:
+    versions = NutrientAssessment.resolve_layer_versions(repository)
+    with repository.session() as session:
+        for table in TILE_LAYERS.values():
+            cached_active_version(session, table.removeprefix("public."))
+    NutrientAssessment.preload_lookups(repository)
+    return f"{len(versions)} nutrient version(s)"
+
+
+def _seed_tiles(session: Session, slugs: list[str]) -> str:
+    stored = 0
+    for slug in slugs:
+        table = TILE_LAYERS[slug].removeprefix("public.")
+        stored += seed_tile_archive(slug, get_active_version(session, table))
+    return f"{len(slugs)} layer(s), {stored} tile(s)"
+
+
+def _replay_boundaries(repository: Repository, path: str) -> str:
+    rlb_gdf = gpd.read_file(path)
+    for column, value in _BOUNDARY_DEFAULTS.items():
+        if column not in rlb_gdf.columns:
+            rlb_gdf[column] = value
+    run_assessment("nutrient", rlb_gdf, {"unique_ref": "data-sync-warmup"}, repository)
+    return f"{len(rlb_gdf)} boundary(ies)"
+
+
+def _render_tiles(specs: list[str]) -> str:
+    size = sum(warm_tile(*parse_tile(spec)) for spec in specs)
+    return f"{len(specs)} tile(s), {size} bytes"
+
+
+def _run_step(
+    report: WarmupReport,
+    name: str,
+    step: Callable[[], str],
+    session: Session | None = None,
+) -> None:
+    t0 = time.perf_counter()
+    try:
+        detail = step()
+    except Exception:  # noqa: BLE001
+        if session is not None:
+            session.rollback()
+        report.failed.append(name)
+        logger.warning("warm-up step %s failed", name, exc_info=True)
+        detail = "failed"
+    report.steps[name] = time.perf_counter() - t0
+    logger.info("warm-up %s: %s in %.2fs", name, detail, report.steps[name])
+
+
+def warm_up(session: Session, cfg: DataSyncConfig, tables: list[str]) -> WarmupReport:
+    """Warm the database and this process for the reference data just loaded.
+
+    `tables` are the reloaded tables. `session` runs the database-side steps;
+    the cache steps go through the shared repository, as assessments and
+    tiles do. Never raises.
+    """
+    report = WarmupReport()
+    _run_step(report, "analyze", lambda: _analyze(session, tables), session)
+    _run_step(report, "prewarm", lambda: _prewarm(session, tables), session)
+    _run_step(report, "caches", lambda: _rebuild_caches(get_shared_repository()))
+    seeded = [
+        slug
+        for slug, table in TILE_LAYERS.items()
+        if table.removeprefix("public.") in tables
+    ]
+    if seeded and TileServerConfig().archive_dir:
+        _run_step(report, "seed_tiles", lambda: _seed_tiles(session, seeded), session)
+    if cfg.warmup_boundaries_path:
+        _run_step(
+            report,
+            "boundaries",
+            lambda: _replay_boundaries(
+                get_shared_repository(), cfg.warmup_boundaries_path
+            ),
+        )
+    if cfg.warmup_tiles:
+        _run_step(report, "tiles", lambda: _render_tiles(cfg.warmup_tiles))
+    logger.info(
+        "Warm-up finished in %.2fs%s",
+        report.total_seconds,
+        f" (failed: {', '.join(report.failed)})" if report.failed else "",
+    )
+    return report
@@ -17,7 +17,8 @@ from app.common.tracing import TraceIdMiddleware
 from app.config import ApiServerConfig, DataSyncConfig, config
 from app.data_sync.service import log_startup_table_status
 from app.health.router import router as health_router
-from app.repositories.engine import warm_shared_engine
+from app.repositories.engine import get_shared_engine, warm_shared_engine
+from app.repositories.generation import start_reference_listener
 from app.tiles.router import router as tiles_router
 from app.version.router import router as version_router
 from app.wwtw.router import router as wwtw_router
@@ -35,10 +36,14 @@ async def lifespan(_: FastAPI):
         warm_shared_engine()
     except Exception:
         logger.exception("Shared DB engine warmup failed; continuing startup")
+    # Without a listener, reference versions are simply queried on every use.
+    reference_listener = start_reference_listener(get_shared_engine())
     # Surface an empty reference table at boot, independent of any data-sync run.
     log_startup_table_status()
     yield
     # Shutdown
+    if reference_listener is not None:
+        reference_listener.stop()
     if client:
         await client.close()
         logger.info("MongoDB client closed")
@@ -7,11 +7,13 @@ from uuid import UUID, uuid4
 from geoalchemy2 import Geometry
 from sqlalchemy import (
     Boolean,
+    Computed,
     DateTime,
     Float,
     ForeignKey,
     Index,
     Integer,
+    LargeBinary,
     String,
     UniqueConstraint,
     func,
@@ -25,11 +27,19 @@ class Base(DeclarativeBase):
     """Base class for all database models."""
 
 
+# Reference tables are LIST-partitioned on version: one partition per version
+# loaded by data sync, plus a DEFAULT partition for rows written any other way
+# (see app/data_sync/restore.py). Keys must include the partition key.
+VERSION_PARTITIONED = {"schema": "public", "postgresql_partition_by": "LIST (version)"}
+
+
 class SpatialLayerMixin:
     """Shared columns for spatial layers with name and JSONB attributes."""
 
     id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
-    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, index=True)
+    version: Mapped[int] = mapped_column(
+        Integer, primary_key=True, nullable=False, default=1, index=True
+    )
 
     geometry: Mapped[Any] = mapped_column(
         Geometry(geometry_type="GEOMETRY", srid=27700, spatial_index=True),
@@ -44,14 +54,31 @@ class SpatialLayerMixin:
     )
 
 
+def promoted_attribute(key: str) -> Any:
+    """A stored generated column holding `attributes->>key`.
+
+    For the attributes the spatial queries read on every job: a short text
+    column is read without detoasting the whole JSONB document. PostgreSQL
+    keeps it in step with `attributes`, so inserts must never name it.
+    """
+    return mapped_column(
+        String,
+        Computed(f"attributes->>'{key}'", persisted=True),
+        nullable=True,
+        info={"attribute_key": key},
+    )
+
+
 class CoefficientLayer(Base):
     """Dedicated model for coefficient polygons (5.4M records)."""
 
     __tablename__ = "coefficient_layer"
-    __table_args__ = {"schema": "public"}
+    __table_args__ = VERSION_PARTITIONED
 
     id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
-    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, index=True)
+    version: Mapped[int] = mapped_column(
+        Integer, primary_key=True, nullable=False, default=1, index=True
+    )
 
     geometry: Mapped[Any] = mapped_column(
         Geometry(geometry_type="MULTIPOLYGON", srid=27700, spatial_index=True),
@@ -76,6 +103,53 @@ class CoefficientLayer(Base):
         return f"<CoefficientLayer(id={self.id}, crome_id={self.crome_id})>"
 
 
+class CoefficientNnIntersection(Base):
+    """Coefficient polygons pre-split by NN catchment.
+
+    Derived at data-sync time (app/data_sync/derived.py), not loaded from a
+    dump. Keyed by the (coefficient_layer, nn_catchments) version pair it was
+    built from.
+    """
+
+    __tablename__ = "coefficient_nn_intersection"
+    __table_args__ = (
+        Index(
+            "ix_public_coefficient_nn_intersection_versions",
+            "coeff_version",
+            "nn_version",
+        ),
+        {"schema": "public"},
+    )
+
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
+    coeff_version: Mapped[int] = mapped_column(Integer, nullable=False)
+    nn_version: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    geometry: Mapped[Any] = mapped_column(
+        Geometry(geometry_type="MULTIPOLYGON", srid=27700, spatial_index=True),
+        nullable=False,
+    )
+
+    crome_id: Mapped[str | None] = mapped_column(String, nullable=True)
+    lu_curr_n_coeff: Mapped[float | None] = mapped_column(Float, nullable=True)
+    lu_curr_p_coeff: Mapped[float | None] = mapped_column(Float, nullable=True)
+    n_resi_coeff: Mapped[float | None] = mapped_column(Float, nullable=True)
+    p_resi_coeff: Mapped[float | None] = mapped_column(Float, nullable=True)
+
+    n2k_site_n: Mapped[str | None] = mapped_column(String, nullable=True)
+    oid: Mapped[str | None] = mapped_column(String, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<CoefficientNnIntersection(id={self.id}, "
+            f"versions=({self.coeff_version}, {self.nn_version}))>"
+        )
+
+
 # ---------------------------------------------------------------------------
 # Nutrient mitigation layers
 # ---------------------------------------------------------------------------
@@ -85,7 +159,9 @@ class WwtwCatchments(SpatialLayerMixin, Base):
     """WwTW (wastewater treatment works) catchment polygons."""
 
     __tablename__ = "wwtw_catchments"
-    __table_args__ = {"schema": "public"}
+    __table_args__ = VERSION_PARTITIONED
+
+    wwtw_id: Mapped[str | None] = promoted_attribute("WwTw_ID")
 
     def __repr__(self) -> str:
         return f"<WwtwCatchments(id={self.id}, name={self.name})>"
@@ -95,7 +171,9 @@ class LpaBoundaries(SpatialLayerMixin, Base):
     """Local planning authority boundary polygons."""
 
     __tablename__ = "lpa_boundaries"
-    __table_args__ = {"schema": "public"}
+    __table_args__ = VERSION_PARTITIONED
+
+    lpa_name: Mapped[str | None] = promoted_attribute("NAME")
 
     def __repr__(self) -> str:
         return f"<LpaBoundaries(id={self.id}, name={self.name})>"
@@ -105,7 +183,10 @@ class NnCatchments(SpatialLayerMixin, Base):
     """Nutrient neutrality catchment polygons."""
 
     __tablename__ = "nn_catchments"
-    __table_args__ = {"schema": "public"}
+    __table_args__ = VERSION_PARTITIONED
+
+    n2k_site_n: Mapped[str | None] = promoted_attribute("N2K_Site_N")
+    oid: Mapped[str | None] = promoted_attribute("OID")
 
     def __repr__(self) -> str:
         return f"<NnCatchments(id={self.id}, name={self.name})>"
@@ -115,7 +196,9 @@ class Subcatchments(SpatialLayerMixin, Base):
     """Sub-catchment polygons."""
 
     __tablename__ = "subcatchments"
-    __table_args__ = {"schema": "public"}
+    __table_args__ = VERSION_PARTITIONED
+
+    opcat_name: Mapped[str | None] = promoted_attribute("OPCAT_NAME")
 
     def __repr__(self) -> str:
         return f"<Subcatchments(id={self.id}, name={self.name})>"
@@ -130,7 +213,7 @@ class GcnRiskZones(SpatialLayerMixin, Base):
     """GCN (great crested newt) risk zone polygons (red/amber/green)."""
 
     __tablename__ = "gcn_risk_zones"
-    __table_args__ = {"schema": "public"}
+    __table_args__ = VERSION_PARTITIONED
 
     def __repr__(self) -> str:
         return f"<GcnRiskZones(id={self.id}, name={self.name})>"
@@ -140,7 +223,7 @@ class GcnPonds(SpatialLayerMixin, Base):
     """National ponds dataset used for GCN assessment."""
 
     __tablename__ = "gcn_ponds"
-    __table_args__ = {"schema": "public"}
+    __table_args__ = VERSION_PARTITIONED
 
     def __repr__(self) -> str:
         return f"<GcnPonds(id={self.id}, name={self.name})>"
@@ -150,7 +233,7 @@ class EdpEdges(SpatialLayerMixin, Base):
     """Environmental designation polygon edges used in GCN assessment."""
 
     __tablename__ = "edp_edges"
-    __table_args__ = {"schema": "public"}
+    __table_args__ = VERSION_PARTITIONED
 
     def __repr__(self) -> str:
         return f"<EdpEdges(id={self.id}, name={self.name})>"
@@ -160,7 +243,9 @@ class EdpBoundaryLayer(SpatialLayerMixin, Base):
     """Dedicated model for EDP boundary polygons."""
 
     __tablename__ = "edp_boundary_layer"
-    __table_args__ = {"schema": "public"}
+    __table_args__ = VERSION_PARTITIONED
+
+    edp_name: Mapped[str | None] = promoted_attribute("EDP_Name")
 
     def __repr__(self) -> str:
         return f"<EdpBoundaryLayer(id={self.id}, name={self.name})>"
@@ -170,24 +255,38 @@ class EdpExcludedAreas(SpatialLayerMixin, Base):
     """Buffered SSSI exclusion-area polygons (nutrient EDP)."""
 
     __tablename__ = "edp_excluded_areas"
-    __table_args__ = {"schema": "public"}
+    __table_args__ = VERSION_PARTITIONED
 
     def __repr__(self) -> str:
         return f"<EdpExcludedAreas(id={self.id}, name={self.name})>"
 
 
+def promoted_attributes(table: str) -> dict[str, str]:
+    """Promoted columns of a public table, mapped to their JSONB key."""
+    model = Base.metadata.tables.get(f"public.{table}")
+    if model is None:
+        return {}
+    return {
+        column.name: column.info["attribute_key"]
+        for column in model.columns
+        if "attribute_key" in column.info
+    }
+
+
 class LookupTable(Base):
     """JSONB-based storage for lookup tables (WwTW, rates)."""
 
     __tablename__ = "lookup_table"
     __table_args__ = (
         UniqueConstraint("name", "version", name="uq_lookup_name_version"),
-        {"schema": "public"},
+        VERSION_PARTITIONED,
     )
 
     id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
     name: Mapped[str] = mapped_column(String, nullable=False, index=True)
-    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, index=True)
+    version: Mapped[int] = mapped_column(
+        Integer, primary_key=True, nullable=False, default=1, index=True
+    )
 
     data: Mapped[list[dict[str, Any]]] = mapped_column(JSONB, nullable=False)
     schema: Mapped[dict[str, str] | None] = mapped_column(JSONB, nullable=True)
@@ -228,6 +327,8 @@ class DataSyncRun(Base):
         DateTime(timezone=True), nullable=True
     )
     error: Mapped[str | None] = mapped_column(String, nullable=True)
+    # Post-reload warm-up duration; NULL for no-op or failed runs.
+    warmup_seconds: Mapped[float | None] = mapped_column(Float, nullable=True)
 
 
 class DataLoadHistory(Base):
@@ -282,3 +383,32 @@ class DataRollbackEvent(Base):
     rolled_back_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=func.now()
     )
+
+
+class AssessmentResultCache(Base):
+    """A completed assessment's results, keyed by a fingerprint of its inputs.
+
+    See app/repositories/result_cache.py. `payload` is gzipped JSON of the
+    result DataFrames; rows are evicted least-recently-used first once the
+    table exceeds its configured size.
+    """
+
+    __tablename__ = "assessment_result_cache"
+    __table_args__ = (
+        Index("ix_public_assessment_result_cache_last_used_at", "last_used_at"),
+        {"schema": "public"},
+    )
+
+    fingerprint: Mapped[str] = mapped_column(String, primary_key=True)
+    assessment_type: Mapped[str] = mapped_column(String, nullable=False)
+    payload: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
+    hit_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, server_default=text("0")
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    last_used_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
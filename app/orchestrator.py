@@ -7,19 +7,32 @@ import geopandas as gpd
 from shapely.geometry import shape
 
 from app.assessments.adapters import nutrient_adapter
-from app.assessments.reference_data import assert_reference_data_present
+from app.assessments.reference_data import (
+    assert_reference_data_present,
+    reference_generation,
+)
 from app.clients.backend_client import BackendClient
 from app.clients.payload_mapper import build_quote_patch_payload
 from app.common.tracing import ctx_trace_id
-from app.config import AWSConfig
+from app.config import AssessmentConfig, AWSConfig
 from app.data_sync.service import resolve_active_provenance
 from app.models.enums import AssessmentType
 from app.models.job import ImpactAssessmentJob
 from app.repositories.repository import Repository
+from app.repositories.result_cache import ResultCache, assessment_fingerprint
 from app.runner.runner import run_assessment
+from app.version.router import get_app_version
 
 logger = logging.getLogger(__name__)
 
+# Configuration that shapes each assessment type's results; only these types
+# are served from the result cache.
+_RESULT_CONFIGS = {AssessmentType.NUTRIENT: AssessmentConfig}
+
+# Job identity columns carried through to the results. They do not affect the
+# numbers, so a stored result is re-stamped with the current job's values.
+_IDENTITY_COLUMNS = ("id", "name", "source")
+
 
 class JobProcessingError(RuntimeError):
     """Raised when a job cannot be completed (bad input, no results, etc.).
@@ -37,10 +50,12 @@ class JobOrchestrator:
         aws_config: AWSConfig,
         repository: Repository,
         backend_client: BackendClient | None = None,
+        result_cache: ResultCache | None = None,
     ):
         self.aws_config = aws_config
         self.repository = repository
         self.backend_client = backend_client
+        self.result_cache = result_cache
 
     def process_job(
         self, job: ImpactAssessmentJob, assessment_type: AssessmentType
@@ -136,14 +151,60 @@ class JobOrchestrator:
         logger.info("Step 3: Injecting job data")
         gdf = self._inject_job_data(gdf, job)
 
+        fingerprint = self._result_fingerprint(gdf, assessment_type)
+        if fingerprint is not None:
+            cached = self.result_cache.get(fingerprint)
+            if cached is not None:
+                logger.info(
+                    f"Step 4: Serving stored {assessment_type.value} result "
+                    f"{fingerprint[:12]} for job {job_id}"
+                )
+                return self._restamp_identity(cached, gdf)
+
         logger.info(f"Step 4: Running {assessment_type.value} assessment via runner")
         metadata = {"unique_ref": job_id}
-        return run_assessment(
+        dataframes = run_assessment(
             assessment_type=assessment_type.value,
             rlb_gdf=gdf,
             metadata=metadata,
             repository=self.repository,
         )
+        if fingerprint is not None and dataframes:
+            self.result_cache.put(fingerprint, assessment_type.value, dataframes)
+        return dataframes
+
+    def _result_fingerprint(
+        self, gdf: gpd.GeoDataFrame, assessment_type: AssessmentType
+    ) -> str | None:
+        """Fingerprint of this job's inputs and reference data, or None when
+        the result cache does not apply (disabled, or an uncached type)."""
+        config_cls = _RESULT_CONFIGS.get(assessment_type)
+        if self.result_cache is None or config_cls is None:
+            return None
+        try:
+            with self.repository.session() as session:
+                generation = reference_generation(session, assessment_type.value)
+            return assessment_fingerprint(
+                gdf,
+                assessment_type.value,
+                config=config_cls().model_dump(mode="json"),
+                generation=generation,
+                app_version=get_app_version(),
+            )
+        except Exception:
+            logger.warning("Could not fingerprint job inputs", exc_info=True)
+            return None
+
+    @staticmethod
+    def _restamp_identity(dataframes: dict, gdf: gpd.GeoDataFrame) -> dict:
+        """Replace identity columns in stored results with this job's values."""
+        for df in dataframes.values():
+            if len(df) != len(gdf):
+                continue
+            for col in _IDENTITY_COLUMNS:
+                if col in df.columns and col in gdf.columns:
+                    df[col] = gdf[col].to_numpy()
+        return dataframes
 
     def _validate_geodataframe(self, gdf: gpd.GeoDataFrame) -> list[str]:
         """Validate an in-memory GeoDataFrame.
@@ -0,0 +1,223 @@
+"""Assessment-scoped repository access on one connection.
+
+An assessment used to open a fresh session (and pool checkout) for every
+repository call: version resolution, each lookup, the batched majority
+overlap and the land-use intersection, with the RLB geometries staged twice
+(`_tmp_input_geom` and `_tmp_rlb`). `RepositoryContext` checks out one
+session for the whole assessment, makes the RLBs available once as `_tmp_rlb`
+the first time a query needs them (staged with a GIST index, or inlined for
+small inputs, see `Repository._rlb_source`) and answers the same repository calls against it
+inside a single transaction. The majority-overlap query reads the staged
+table through a `_tmp_input_geom` CTE, so nothing is inserted twice.
+
+With ``concurrent=True`` an independent query can be started up front with
+`prefetch`; it runs on a second pooled connection (staging or inlining its
+own copy of the input) while the main session carries on, and the matching
+call later returns its result.
+"""
+
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import AbstractContextManager, nullcontext
+from typing import Any
+
+import geopandas as gpd
+import pandas as pd
+from sqlalchemy import Select
+from sqlalchemy.orm import Session
+
+from app.models.db import Base
+from app.repositories.repository import (
+    Repository,
+    _empty_majority_results,
+    _majority_overlap_backend,
+)
+
+logger = logging.getLogger(__name__)
+
+# Exposes the staged RLBs under the name the majority-overlap query reads.
+# Appended to the `_tmp_rlb` source: a CTE list when the RLBs are inline,
+# otherwise a fresh WITH over the staged temp table.
+_INPUT_GEOM_FROM_RLB = (
+    "_tmp_input_geom AS (SELECT rlb_id AS input_id, geom FROM _tmp_rlb) "
+)
+
+_PREFETCHABLE = ("land_use_intersection_postgis",)
+
+
+class RepositoryContext:
+    """Repository calls for one assessment input on one session.
+
+    Implements the subset of the `Repository` interface assessments use
+    (`session`, `execute_query`, `batch_majority_overlap_postgis`,
+    `land_use_intersection_postgis`), so it can stand in for the repository
+    for the duration of a run. Use `scope` rather
+    than constructing it directly.
+    """
+
+    def __init__(
+        self,
+        repository: Repository,
+        input_gdf: gpd.GeoDataFrame,
+        *,
+        concurrent: bool = False,
+    ) -> None:
+        self._repository = repository
+        self._input_gdf = input_gdf
+        self._concurrent = concurrent
+        self._session: Session | None = None
+        self._rlb_source: tuple[str, dict[str, Any]] | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._prefetched: dict[tuple, Future] = {}
+
+    @staticmethod
+    def scope(
+        repository: Any, input_gdf: gpd.GeoDataFrame, *, concurrent: bool = False
+    ) -> AbstractContextManager:
+        """Open a context for `input_gdf`, or pass other repositories through.
+
+        Only a concrete `Repository` can be shared this way; anything else
+        (e.g. a test double) is yielded unchanged.
+        """
+        if isinstance(repository, Repository) and len(input_gdf) > 0:
+            return RepositoryContext(repository, input_gdf, concurrent=concurrent)
+        return nullcontext(repository)
+
+    def __enter__(self) -> "RepositoryContext":
+        self._session = self._repository.session()
+        if self._concurrent:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="repository-context"
+            )
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+        # Read-only transaction: closing rolls it back, which also drops the
+        # ON COMMIT DROP temp table.
+        self._session.close()
+
+    # -- Repository interface -------------------------------------------------
+
+    def session(self) -> AbstractContextManager[Session]:
+        """The shared session, as a context manager that does not close it."""
+        return nullcontext(self._session)
+
+    def execute_query(
+        self, stmt: Select, as_gdf: bool = False
+    ) -> gpd.GeoDataFrame | list[Base]:
+        """Execute a SQLAlchemy SELECT statement on the shared session."""
+        if as_gdf:
+            return gpd.read_postgis(
+                stmt, self._session.connection(), geom_col="geometry", crs="EPSG:27700"
+            )
+        return list(self._session.scalars(stmt).all())
+
+    def batch_majority_overlap_postgis(
+        self,
+        input_gdf: gpd.GeoDataFrame,
+        input_id_col: str,
+        assignments: list[dict[str, Any]],
+        backend: str | None = None,
+    ) -> dict[str, pd.DataFrame]:
+        """`Repository.batch_majority_overlap_postgis` against the staged RLBs."""
+        if len(input_gdf) == 0:
+            return _empty_majority_results(input_id_col, assignments)
+        backend = _majority_overlap_backend(backend)
+        if backend == "memory":
+            return Repository._batch_majority_overlap_memory(
+                self._session, input_gdf, input_id_col, assignments
+            )
+        if not self._is_staged_input(input_gdf, input_id_col):
+            return self._repository.batch_majority_overlap_postgis(
+                input_gdf, input_id_col, assignments, backend
+            )
+
+        rlb_cte, rlb_params = self._staged_source()
+        input_cte = (
+            f"{rlb_cte}, {_INPUT_GEOM_FROM_RLB}"
+            if rlb_cte
+            else f"WITH {_INPUT_GEOM_FROM_RLB}"
+        )
+        return Repository._batch_majority_overlap_query(
+            self._session, input_id_col, assignments, input_cte, rlb_params
+        )
+
+    def land_use_intersection_postgis(
+        self, input_gdf: gpd.GeoDataFrame, coeff_version: int, nn_version: int
+    ) -> pd.DataFrame:
+        """`Repository.land_use_intersection_postgis` against the staged RLBs."""
+        return self._land_use(
+            "land_use_intersection_postgis", input_gdf, coeff_version, nn_version
+        )
+
+    # -- Concurrency ----------------------------------------------------------
+
+    def prefetch(self, method: str, coeff_version: int, nn_version: int) -> None:
+        """Start a land-use query for the context's input on a second connection.
+
+        No-op unless the context was opened with ``concurrent=True``. The next
+        call to `method` with the same versions returns the prefetched result.
+        """
+        if self._executor is None:
+            return
+        if method not in _PREFETCHABLE:
+            msg = f"Cannot prefetch {method!r}; expected one of {_PREFETCHABLE}"
+            raise ValueError(msg)
+        key = (method, coeff_version, nn_version)
+        if key not in self._prefetched:
+            self._prefetched[key] = self._executor.submit(
+                getattr(self._repository, method),
+                self._input_gdf,
+                coeff_version,
+                nn_version,
+            )
+
+    # -- Internals ------------------------------------------------------------
+
+    def _staged_source(self) -> tuple[str, dict[str, Any]]:
+        """The `_tmp_rlb` source, staged on first use.
+
+        Calls that never reach a spatial query (e.g. a run answered from the
+        spatial stage cache) do not pay for staging.
+        """
+        if self._rlb_source is None:
+            t0 = time.perf_counter()
+            self._rlb_source = Repository._rlb_source(self._session, self._input_gdf)
+            logger.info(
+                f"[timing] repository context staging "
+                f"({len(self._input_gdf)} RLBs): {time.perf_counter() - t0:.3f}s"
+            )
+        return self._rlb_source
+
+    def _is_staged_input(self, input_gdf: gpd.GeoDataFrame, input_id_col: str) -> bool:
+        """Whether `input_gdf` is (a re-ordering of) the staged RLBs."""
+        return (
+            input_id_col == "rlb_id"
+            and len(input_gdf) == len(self._input_gdf)
+            and set(input_gdf["rlb_id"]) == set(self._input_gdf["rlb_id"])
+        )
+
+    def _land_use(
+        self,
+        method: str,
+        input_gdf: gpd.GeoDataFrame,
+        coeff_version: int,
+        nn_version: int,
+    ) -> pd.DataFrame:
+        future = self._prefetched.pop((method, coeff_version, nn_version), None)
+        if len(input_gdf) == 0 or not self._is_staged_input(input_gdf, "rlb_id"):
+            return getattr(self._repository, method)(
+                input_gdf, coeff_version, nn_version
+            )
+        if future is not None:
+            return future.result()
+        return Repository._land_use_query(
+            self._session,
+            input_gdf,
+            coeff_version,
+            nn_version,
+            rlb_source=self._staged_source(),
+        )
@@ -0,0 +1,212 @@
+"""Process-wide registry of reference-data generations.
+
+Hot paths (spatial cache keys, nutrient version resolution, tile and lookup
+caches) need the active version of a reference table, or the latest
+successful load, before they can do anything else. Asking the database every
+time costs a round-trip per request for a value that only changes when a
+reload or rollback runs.
+
+`ReferenceGenerations` remembers those values in memory. Writers call
+`notify_reference_change` inside the transaction that changes them
+(`set_active_version`, `rollback_table`, `_restore_all`); PostgreSQL delivers
+the NOTIFY on commit to every process running a `ReferenceGenerationListener`,
+which drops the remembered values and runs the registered invalidation
+callbacks (e.g. `clear_spatial_caches`). The listener also drops them every
+`reconcile_seconds` as a safety net for a missed notification.
+
+Values are only remembered while a listener holds an open LISTEN connection.
+Without one (CLI scripts, tests, a dropped connection) `get` simply calls the
+loader, so behaviour falls back to querying on every call.
+"""
+
+import logging
+import select
+import threading
+import time
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.config import ReferenceGenerationConfig
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Registry key for the latest successful data load (see
+# `_spatial_cache_generation`); table names are used as keys for versions.
+SPATIAL_GENERATION = "__spatial_generation__"
+
+# Notification payload meaning "anything may have changed".
+ALL_TABLES = "*"
+
+
+class ReferenceGenerations:
+    """Remembered reference-data versions, valid while a listener is live."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._values: dict[str, Any] = {}
+        self._epoch = 0
+        self._live = False
+        self._callbacks: list[Callable[[], None]] = []
+
+    @property
+    def live(self) -> bool:
+        """True while change notifications are being received."""
+        return self._live
+
+    def get(self, key: str, load: Callable[[], T]) -> T:
+        """Return the remembered value for `key`, calling `load` on a miss.
+
+        A value loaded while an invalidation ran concurrently is returned but
+        not remembered, so a notification can never be overwritten by the
+        value it was meant to replace.
+        """
+        with self._lock:
+            if not self._live:
+                remember = False
+            elif key in self._values:
+                return self._values[key]
+            else:
+                remember = True
+            epoch = self._epoch
+        value = load()
+        if remember:
+            with self._lock:
+                if self._live and self._epoch == epoch:
+                    self._values[key] = value
+        return value
+
+    def add_invalidation_callback(self, callback: Callable[[], None]) -> None:
+        """Run `callback` whenever another process reports a change."""
+        with self._lock:
+            if callback not in self._callbacks:
+                self._callbacks.append(callback)
+
+    def invalidate(self, reason: str, *, run_callbacks: bool = True) -> None:
+        """Forget every remembered value (and optionally run the callbacks)."""
+        with self._lock:
+            self._values.clear()
+            self._epoch += 1
+            callbacks = list(self._callbacks) if run_callbacks else []
+        logger.info("Reference generations invalidated (%s)", reason)
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                logger.exception("Reference generation invalidation callback failed")
+
+    def set_live(self, live: bool) -> None:
+        """Start or stop remembering values; either way starts from empty."""
+        with self._lock:
+            self._live = live
+            self._values.clear()
+            self._epoch += 1
+
+
+_REGISTRY = ReferenceGenerations()
+
+
+def get_reference_generations() -> ReferenceGenerations:
+    """Return the process-wide reference generation registry."""
+    return _REGISTRY
+
+
+def notify_reference_change(session: Session, table: str = ALL_TABLES) -> None:
+    """Queue a change notification, delivered when `session` commits."""
+    channel = ReferenceGenerationConfig().channel
+    session.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": channel, "payload": table},
+    )
+
+
+class ReferenceGenerationListener:
+    """Background thread holding a LISTEN connection for the registry.
+
+    Uses its own connection detached from `engine`'s pool, so it never takes
+    a slot from request handling. If the connection drops the registry goes
+    back to querying on every call until the listener reconnects.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        registry: ReferenceGenerations | None = None,
+        config: ReferenceGenerationConfig | None = None,
+    ) -> None:
+        self._engine = engine
+        self._registry = registry or get_reference_generations()
+        self._config = config or ReferenceGenerationConfig()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="reference-generation-listener", daemon=True
+        )
+
+    def start(self) -> "ReferenceGenerationListener":
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._thread.join(timeout=timeout)
+        self._registry.set_live(False)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._listen()
+            except Exception:
+                logger.exception(
+                    "Reference generation listener failed; retrying in %.0fs",
+                    self._config.retry_seconds,
+                )
+            self._registry.set_live(False)
+            self._stop.wait(self._config.retry_seconds)
+
+    def _listen(self) -> None:
+        proxy = self._engine.raw_connection()
+        proxy.detach()
+        conn = proxy.driver_connection
+        try:
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                # channel is validated against a plain-identifier pattern in config
+                cur.execute(f"LISTEN {self._config.channel}")
+            self._registry.set_live(True)
+            logger.info(
+                "Listening for reference-data changes on %r", self._config.channel
+            )
+            self._poll(conn)
+        finally:
+            conn.close()
+
+    def _poll(self, conn: Any) -> None:
+        reconcile = self._config.reconcile_seconds
+        next_reconcile = time.monotonic() + reconcile
+        while not self._stop.is_set():
+            # Wake at least once a second so stop() is honoured promptly.
+            timeout = min(1.0, max(0.0, next_reconcile - time.monotonic()))
+            readable, _, _ = select.select([conn], [], [], timeout)
+            if readable:
+                conn.poll()
+                payloads = sorted({n.payload for n in conn.notifies})
+                conn.notifies.clear()
+                if payloads:
+                    self._registry.invalidate(f"notify: {', '.join(payloads)}")
+            if time.monotonic() >= next_reconcile:
+                self._registry.invalidate("reconcile", run_callbacks=False)
+                next_reconcile = time.monotonic() + reconcile
+
+
+def start_reference_listener(engine: Engine) -> ReferenceGenerationListener | None:
+    """Start the listener for this process unless disabled by config."""
+    config = ReferenceGenerationConfig()
+    if not config.listen_enabled:
+        logger.info("Reference generation listener disabled")
+        return None
+    return ReferenceGenerationListener(engine, config=config).start()
@@ -0,0 +1,253 @@
+"""In-process majority-overlap engine for the small nutrient overlay layers.
+
+`Repository.batch_majority_overlap_postgis` normally stages the input into a
+temp table and runs one lateral query per overlay layer. The layers it reads
+(wwtw_catchments, lpa_boundaries, subcatchments) are only a few thousand
+polygons, so this module keeps the active version of each one in memory as a
+shapely geometry array plus an `STRtree`, and answers the same assignments with
+vectorized `shapely.intersection`/`shapely.area` calls and no DB round-trip.
+
+Layers are keyed by (table, version), so a reload or rollback that changes the
+active version is picked up on the next call; `clear_spatial_caches()` also
+drops them so a reload that reuses a version number is re-read.
+"""
+
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+from shapely import STRtree
+from sqlalchemy import text
+from sqlalchemy.orm import QueryableAttribute, Session
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import BinaryExpression, BindParameter, ColumnElement
+
+from app.models.db import promoted_attributes
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class _LayerIndex:
+    """One overlay layer version held in memory."""
+
+    geometries: np.ndarray
+    attributes: list[dict[str, Any] | None]
+    tree: STRtree
+
+
+@dataclass(frozen=True)
+class _AssignmentSpec:
+    """What an assignment dict asks for, reduced to plain values."""
+
+    table: str
+    version: int
+    attr_column: str
+    attr_key: str | None
+    output_field: str
+    default_value: Any
+
+
+def _json_astext(value: Any) -> str | None:
+    """Render a JSONB value the way PostgreSQL's `->>` operator does."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value
+    return json.dumps(value)
+
+
+def _describe_assignment(assignment: dict[str, Any]) -> _AssignmentSpec:
+    """Reduce a `batch_majority_overlap_postgis` assignment to plain values.
+
+    Only the shapes the nutrient assessment uses are supported: a
+    `Model.version == <int>` filter and either the `attributes` column, a
+    `Model.attributes["KEY"].astext` extraction or a column promoted from
+    `attributes` (read here as the same extraction). Anything else raises
+    ValueError so callers fall back to the PostGIS backend explicitly.
+    """
+    overlay_table = assignment["overlay_table"]
+    overlay_filter = assignment["overlay_filter"]
+    overlay_attr_col = assignment["overlay_attr_col"]
+    table = overlay_table.__table__.name
+
+    if not (
+        isinstance(overlay_filter, BinaryExpression)
+        and overlay_filter.operator is operators.eq
+        and getattr(overlay_filter.left, "key", None) == "version"
+        and isinstance(overlay_filter.right, BindParameter)
+    ):
+        msg = (
+            f"in-memory majority overlap for {table!r} needs a "
+            f"'version == <int>' filter, got: {overlay_filter}"
+        )
+        raise ValueError(msg)
+    version = int(overlay_filter.right.value)
+
+    if isinstance(overlay_attr_col, str):
+        attr_column, attr_key = overlay_attr_col, None
+    elif (
+        isinstance(overlay_attr_col, BinaryExpression)
+        and getattr(overlay_attr_col.operator, "opstring", None) == "->>"
+        and isinstance(overlay_attr_col.right, BindParameter)
+    ):
+        attr_column = overlay_attr_col.left.key
+        attr_key = str(overlay_attr_col.right.value)
+    elif isinstance(overlay_attr_col, ColumnElement | QueryableAttribute) and hasattr(
+        overlay_attr_col, "key"
+    ):
+        attr_column, attr_key = overlay_attr_col.key, None
+    else:
+        msg = (
+            f"in-memory majority overlap for {table!r} supports a column or "
+            f"a JSONB ->> extraction, got: {overlay_attr_col}"
+        )
+        raise ValueError(msg)
+
+    promoted = promoted_attributes(table)
+    if attr_key is None and attr_column in promoted:
+        attr_column, attr_key = "attributes", promoted[attr_column]
+
+    if attr_column != "attributes":
+        msg = (
+            f"in-memory layer {table!r} only holds the 'attributes' column, "
+            f"not {attr_column!r}"
+        )
+        raise ValueError(msg)
+
+    return _AssignmentSpec(
+        table=table,
+        version=version,
+        attr_column=attr_column,
+        attr_key=attr_key,
+        output_field=assignment["output_field"],
+        default_value=assignment.get("default_value"),
+    )
+
+
+def majority_indices(
+    inputs: np.ndarray, layer_geoms: np.ndarray, tree: STRtree
+) -> np.ndarray:
+    """Return, per input geometry, the index of the overlay polygon with the
+    largest intersection area, or -1 when nothing intersects.
+
+    Mirrors the PostGIS lateral: every `ST_Intersects` candidate is eligible
+    (a touching polygon with zero overlap area still wins over no match).
+    """
+    result = np.full(len(inputs), -1, dtype=np.int64)
+    if len(inputs) == 0 or len(layer_geoms) == 0:
+        return result
+
+    input_idx, tree_idx = tree.query(inputs, predicate="intersects")
+    if len(input_idx) == 0:
+        return result
+
+    areas = shapely.area(shapely.intersection(inputs[input_idx], layer_geoms[tree_idx]))
+    # Sort by input, then area descending, then overlay index for a stable
+    # tie-break; the first row of each input group is its majority polygon.
+    order = np.lexsort((tree_idx, -areas, input_idx))
+    sorted_inputs = input_idx[order]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = sorted_inputs[1:] != sorted_inputs[:-1]
+    result[sorted_inputs[first]] = tree_idx[order][first]
+    return result
+
+
+class ReferenceEngine:
+    """Process-level in-memory index of overlay layers, keyed by (table, version)."""
+
+    def __init__(self) -> None:
+        self._layers: dict[tuple[str, int], _LayerIndex] = {}
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        """Drop every loaded layer; the next call reloads from the database."""
+        with self._lock:
+            self._layers.clear()
+
+    def loaded_layers(self) -> list[tuple[str, int]]:
+        """Return the (table, version) pairs currently held in memory."""
+        with self._lock:
+            return sorted(self._layers)
+
+    def _load_layer(self, session: Session, table: str, version: int) -> _LayerIndex:
+        t0 = time.perf_counter()
+        rows = session.execute(
+            text(
+                f"SELECT ST_AsBinary(geometry), attributes FROM public.{table} "  # noqa: S608
+                "WHERE version = :v ORDER BY id"
+            ),
+            {"v": version},
+        ).fetchall()
+        geometries = shapely.from_wkb([bytes(r[0]) for r in rows])
+        if len(geometries):
+            shapely.prepare(geometries)
+        layer = _LayerIndex(
+            geometries=np.asarray(geometries, dtype=object),
+            attributes=[r[1] for r in rows],
+            tree=STRtree(geometries),
+        )
+        logger.info(
+            f"[timing] reference_engine: loaded {table} v{version} "
+            f"({len(rows)} features): {time.perf_counter() - t0:.3f}s"
+        )
+        return layer
+
+    def layer(self, session: Session, table: str, version: int) -> _LayerIndex:
+        """Return the in-memory index for (table, version), loading it once."""
+        key = (table, version)
+        with self._lock:
+            cached = self._layers.get(key)
+        if cached is not None:
+            return cached
+        loaded = self._load_layer(session, table, version)
+        with self._lock:
+            # Another thread may have loaded it meanwhile; keep the first copy.
+            return self._layers.setdefault(key, loaded)
+
+    def batch_majority_overlap(
+        self,
+        session: Session,
+        input_gdf: gpd.GeoDataFrame,
+        input_id_col: str,
+        assignments: list[dict[str, Any]],
+    ) -> dict[str, pd.DataFrame]:
+        """In-memory equivalent of `Repository.batch_majority_overlap_postgis`."""
+        specs = [_describe_assignment(a) for a in assignments]
+        inputs = np.asarray(input_gdf.geometry.values, dtype=object)
+        input_ids = input_gdf[input_id_col].astype(int).to_numpy()
+
+        results: dict[str, pd.DataFrame] = {}
+        for spec in specs:
+            layer = self.layer(session, spec.table, spec.version)
+            best = majority_indices(inputs, layer.geometries, layer.tree)
+            values = [
+                self._attr_value(layer, spec, idx) if idx >= 0 else None for idx in best
+            ]
+            df = pd.DataFrame({input_id_col: input_ids, spec.output_field: values})
+            if spec.default_value is not None:
+                df[spec.output_field] = df[spec.output_field].fillna(spec.default_value)
+            results[spec.output_field] = df
+        return results
+
+    @staticmethod
+    def _attr_value(layer: _LayerIndex, spec: _AssignmentSpec, idx: int) -> Any:
+        attrs = layer.attributes[idx]
+        if spec.attr_key is None:
+            return attrs
+        return _json_astext(attrs.get(spec.attr_key)) if attrs else None
+
+
+_ENGINE = ReferenceEngine()
+
+
+def get_reference_engine() -> ReferenceEngine:
+    """Return the process-wide in-memory reference engine."""
+    return _ENGINE
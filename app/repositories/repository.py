@@ -18,10 +18,14 @@ from sqlalchemy import Select, func, select, text
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, sessionmaker
 
-from app.config import SpatialCacheConfig
+from app.config import SpatialCacheConfig, SpatialQueryConfig
 from app.models.db import Base, DataLoadHistory
+from app.repositories.generation import SPATIAL_GENERATION, get_reference_generations
+from app.repositories.reference_engine import get_reference_engine
+from app.repositories.staging import copy_binary, encode_copy_binary, ewkb_array
 
 _cache_cfg = SpatialCacheConfig()
+_query_cfg = SpatialQueryConfig()
 _land_use_cache: TTLCache = TTLCache(
     maxsize=_cache_cfg.max_size, ttl=_cache_cfg.ttl_seconds
 )
@@ -43,9 +47,15 @@ def clear_spatial_caches() -> None:
     """
     _land_use_cache.clear()
     _intersection_cache.clear()
+    get_reference_engine().clear()
     logger.info("Cleared spatial query caches")
 
 
+# Reloads and rollbacks in other processes arrive as reference-data
+# notifications; drop cached results as soon as one does.
+get_reference_generations().add_invalidation_callback(clear_spatial_caches)
+
+
 def _coerce_param(value: Any) -> Any:
     """Convert Python Enum instances to their .name string for psycopg2.
 
@@ -105,13 +115,197 @@ def _gdf_key(gdf: gpd.GeoDataFrame, cols: list[str]) -> str:
 
 
 def _spatial_cache_generation(session: Session) -> str:
-    """Return DB-visible generation for reference data used by spatial caches."""
-    loaded_at = session.scalar(
-        select(func.max(DataLoadHistory.loaded_at)).where(
-            DataLoadHistory.status == "success"
+    """Return DB-visible generation for reference data used by spatial caches.
+
+    Served from the reference generation registry while it is live, so the
+    lookup only reaches the database after a reload notification.
+    """
+
+    def _load() -> str:
+        loaded_at = session.scalar(
+            select(func.max(DataLoadHistory.loaded_at)).where(
+                DataLoadHistory.status == "success"
+            )
         )
+        return loaded_at.isoformat() if loaded_at else "no-successful-data-load"
+
+    return get_reference_generations().get(SPATIAL_GENERATION, _load)
+
+
+# ST_Area is computed directly in the subquery so only a float is returned up
+# the stack — no intermediate geometry object is materialised and then
+# discarded by the outer ST_Area call.
+_LAND_USE_3WAY_SQL = """
+    SELECT rlb_id, dwellings, name, dwelling_category, source,
+           crome_id, lu_curr_n_coeff, lu_curr_p_coeff,
+           n_resi_coeff, p_resi_coeff, n2k_site_n, oid,
+           area_in_nn_catchment_ha
+    FROM (
+        SELECT
+            r.rlb_id, r.dwellings, r.name, r.dwelling_category, r.source,
+            c.crome_id, c.lu_curr_n_coeff, c.lu_curr_p_coeff,
+            c.n_resi_coeff, c.p_resi_coeff,
+            nn.n2k_site_n, nn.oid,
+            ST_Area(
+                ST_Intersection(ST_Intersection(r.geom, c.geometry), nn.geometry)
+            ) / 10000.0 AS area_in_nn_catchment_ha
+        FROM _tmp_rlb r
+        JOIN public.coefficient_layer c
+            ON c.version = :coeff_version
+            AND ST_Intersects(r.geom, c.geometry)
+        JOIN public.nn_catchments nn
+            ON nn.version = :nn_version
+            AND ST_Intersects(r.geom, nn.geometry)
+            AND ST_Intersects(c.geometry, nn.geometry)
+    ) sub
+    WHERE area_in_nn_catchment_ha > 0
+"""
+
+# Same result columns from coefficient_nn_intersection, where coefficient_layer
+# is already split by NN catchment (app/data_sync/derived.py): one 2-way
+# intersection per candidate instead of two.
+_LAND_USE_PREINTERSECTED_SQL = """
+    SELECT rlb_id, dwellings, name, dwelling_category, source,
+           crome_id, lu_curr_n_coeff, lu_curr_p_coeff,
+           n_resi_coeff, p_resi_coeff, n2k_site_n, oid,
+           area_in_nn_catchment_ha
+    FROM (
+        SELECT
+            r.rlb_id, r.dwellings, r.name, r.dwelling_category, r.source,
+            ci.crome_id, ci.lu_curr_n_coeff, ci.lu_curr_p_coeff,
+            ci.n_resi_coeff, ci.p_resi_coeff, ci.n2k_site_n, ci.oid,
+            ST_Area(ST_Intersection(r.geom, ci.geometry)) / 10000.0
+                AS area_in_nn_catchment_ha
+        FROM _tmp_rlb r
+        JOIN public.coefficient_nn_intersection ci
+            ON ci.coeff_version = :coeff_version
+            AND ci.nn_version = :nn_version
+            AND ST_Intersects(r.geom, ci.geometry)
+    ) sub
+    WHERE area_in_nn_catchment_ha > 0
+"""
+
+
+# Inline stand-ins for the staged temp tables. Small inputs (the usual
+# single-RLB SQS job) skip CREATE TEMPORARY TABLE / load / CREATE INDEX /
+# ANALYZE: the rows arrive as bound arrays and the queries above run unchanged
+# against a CTE of the same name. With a handful of rows the planner drives the
+# join from the overlay's GIST index either way, so the temp-table index buys
+# nothing.
+_INLINE_RLB_CTE = """
+    WITH _tmp_rlb AS MATERIALIZED (
+        SELECT rlb_id, dwellings, name, dwelling_category, source,
+               ST_GeomFromEWKB(geom_ewkb) AS geom
+        FROM unnest(
+            CAST(:rlb_ids AS integer[]),
+            CAST(:rlb_dwellings AS integer[]),
+            CAST(:rlb_names AS text[]),
+            CAST(:rlb_dwelling_categories AS text[]),
+            CAST(:rlb_sources AS text[]),
+            CAST(:rlb_geoms AS bytea[])
+        ) AS t(rlb_id, dwellings, name, dwelling_category, source, geom_ewkb)
+    )
+"""
+
+_INLINE_INPUT_GEOM_CTE = """
+    WITH _tmp_input_geom AS MATERIALIZED (
+        SELECT input_id, ST_GeomFromEWKB(geom_ewkb) AS geom
+        FROM unnest(
+            CAST(:input_ids AS integer[]),
+            CAST(:input_geoms AS bytea[])
+        ) AS t(input_id, geom_ewkb)
+    )
+"""
+
+
+def _use_inline_input(input_gdf: gpd.GeoDataFrame) -> bool:
+    """Whether `input_gdf` is small enough to pass inline instead of staging."""
+    return len(input_gdf) <= _query_cfg.inline_input_max_features
+
+
+def _inline_rlb_params(input_gdf: gpd.GeoDataFrame) -> dict[str, list]:
+    """Bound arrays for `_INLINE_RLB_CTE` (same coercions as `_stage_rlb`)."""
+    return {
+        "rlb_ids": [int(v) for v in input_gdf["rlb_id"]],
+        "rlb_dwellings": [int(v) for v in input_gdf["dwellings"]],
+        "rlb_names": input_gdf["name"].astype(str).tolist(),
+        "rlb_dwelling_categories": input_gdf["dwelling_category"].astype(str).tolist(),
+        "rlb_sources": input_gdf["source"].astype(str).tolist(),
+        "rlb_geoms": list(ewkb_array(input_gdf.geometry)),
+    }
+
+
+def _inline_input_geom_params(
+    input_gdf: gpd.GeoDataFrame, input_id_col: str
+) -> dict[str, list]:
+    """Bound arrays for `_INLINE_INPUT_GEOM_CTE`."""
+    return {
+        "input_ids": [int(v) for v in input_gdf[input_id_col]],
+        "input_geoms": list(ewkb_array(input_gdf.geometry)),
+    }
+
+
+_LAND_USE_ROW_COLUMNS = [
+    "rlb_id",
+    "dwellings",
+    "name",
+    "dwelling_category",
+    "source",
+    "crome_id",
+    "lu_curr_n_coeff",
+    "lu_curr_p_coeff",
+    "n_resi_coeff",
+    "p_resi_coeff",
+    "n2k_site_n",
+    "oid",
+    "area_in_nn_catchment_ha",
+]
+
+
+def _majority_overlap_backend(backend: str | None) -> str:
+    """Resolve and validate the majority-overlap backend name."""
+    backend = backend or _query_cfg.majority_overlap_backend
+    if backend not in ("postgis", "memory"):
+        msg = f"Unknown majority overlap backend: {backend!r}"
+        raise ValueError(msg)
+    return backend
+
+
+def _empty_majority_results(
+    input_id_col: str, assignments: list[dict[str, Any]]
+) -> dict[str, pd.DataFrame]:
+    """Per-assignment empty frames for an empty input."""
+    return {
+        a["output_field"]: pd.DataFrame(columns=[input_id_col, a["output_field"]])
+        for a in assignments
+    }
+
+
+def _has_coefficient_nn_intersection(
+    session: Session, coeff_version: int, nn_version: int
+) -> bool:
+    """Whether coefficient_nn_intersection was built for this version pair.
+
+    It is rebuilt after each reload, so it can lag the active versions briefly
+    (or never exist for a pair reached by rolling back only one source table).
+    Served from the reference generation registry while it is live; the
+    reload notifies again once the rebuild has committed.
+    """
+
+    def _load() -> bool:
+        row = session.execute(
+            text(
+                "SELECT 1 FROM public.coefficient_nn_intersection "
+                "WHERE coeff_version = :coeff_version AND nn_version = :nn_version "
+                "LIMIT 1"
+            ),
+            {"coeff_version": coeff_version, "nn_version": nn_version},
+        ).fetchone()
+        return row is not None
+
+    return get_reference_generations().get(
+        f"coefficient_nn_intersection:{coeff_version}:{nn_version}:present", _load
     )
-    return loaded_at.isoformat() if loaded_at else "no-successful-data-load"
 
 
 def _land_use_cache_key(
@@ -121,17 +315,31 @@ def _land_use_cache_key(
     nn_version: int,
     generation: str,
 ) -> tuple[str, int, int, str]:
+    # Geometry only: the intersection does not depend on the RLB attributes,
+    # so a re-run with different dwellings must still hit. The attribute
+    # columns of a cached row-level result are re-stamped from the input.
     return (
-        _gdf_key(
-            input_gdf,
-            ["rlb_id", "dwellings", "name", "dwelling_category", "source"],
-        ),
+        _gdf_key(input_gdf, ["rlb_id"]),
         coeff_version,
         nn_version,
         generation,
     )
 
 
+def _restamp_rlb_attributes(
+    rows: pd.DataFrame, input_gdf: gpd.GeoDataFrame
+) -> pd.DataFrame:
+    """Overwrite the per-RLB attribute columns of land-use rows from `input_gdf`.
+
+    Mirrors what `_stage_rlb` / the inline CTE would have sent the database.
+    """
+    by_id = input_gdf.set_index("rlb_id")
+    rows["dwellings"] = rows["rlb_id"].map(by_id["dwellings"].astype(int))
+    for col in ("name", "dwelling_category", "source"):
+        rows[col] = rows["rlb_id"].map(by_id[col].astype(str))
+    return rows
+
+
 def _intersection_cache_key(
     *,
     input_wkt: str,
@@ -198,30 +406,7 @@ class Repository:
             overlay_attr = overlay_attr_col
 
         with self.session() as session:
-            session.execute(
-                text(
-                    "CREATE TEMPORARY TABLE _tmp_input_geom ("
-                    "  input_id integer, "
-                    "  geom geometry(Geometry, 27700)"
-                    ") ON COMMIT DROP"
-                )
-            )
-
-            insert_values = [
-                {"input_id": int(input_id), "geom_wkt": wkt}
-                for input_id, wkt in zip(
-                    input_gdf[input_id_col], input_gdf.geometry.to_wkt(), strict=False
-                )
-            ]
-            session.execute(
-                text(
-                    "INSERT INTO _tmp_input_geom (input_id, geom) "
-                    "VALUES (:input_id, ST_SetSRID(ST_GeomFromText(:geom_wkt), 27700))"
-                ),
-                insert_values,
-            )
-
-            session.execute(text("CREATE INDEX ON _tmp_input_geom USING GIST (geom)"))
+            self._stage_input_geom(session, input_gdf, input_id_col)
 
             table = overlay_table.__table__
             schema = table.schema
@@ -271,121 +456,148 @@ class Repository:
         input_gdf: gpd.GeoDataFrame,
         input_id_col: str,
         assignments: list[dict[str, Any]],
+        backend: str | None = None,
     ) -> dict[str, pd.DataFrame]:
-        """Perform multiple majority overlap assignments in a single SQL query."""
+        """Perform multiple majority overlap assignments in a single SQL query.
+
+        ``backend`` overrides ``SPATIAL_QUERY_MAJORITY_OVERLAP_BACKEND``. With
+        ``"memory"`` the assignments are answered from the in-process STRtree
+        engine instead of a lateral query; results are identical.
+        """
         if len(input_gdf) == 0:
-            return {
-                a["output_field"]: pd.DataFrame(
-                    columns=[input_id_col, a["output_field"]]
-                )
-                for a in assignments
-            }
+            return _empty_majority_results(input_id_col, assignments)
 
+        backend = _majority_overlap_backend(backend)
         with self.session() as session:
-            t0 = time.perf_counter()
-
-            session.execute(
-                text(
-                    "CREATE TEMPORARY TABLE _tmp_input_geom ("
-                    "  input_id integer, "
-                    "  geom geometry(Geometry, 27700)"
-                    ") ON COMMIT DROP"
+            if backend == "memory":
+                return self._batch_majority_overlap_memory(
+                    session, input_gdf, input_id_col, assignments
                 )
-            )
 
-            insert_values = [
-                {"input_id": int(input_id), "geom_wkt": wkt}
-                for input_id, wkt in zip(
-                    input_gdf[input_id_col], input_gdf.geometry.to_wkt(), strict=False
-                )
-            ]
-            session.execute(
-                text(
-                    "INSERT INTO _tmp_input_geom (input_id, geom) "
-                    "VALUES (:input_id, ST_SetSRID(ST_GeomFromText(:geom_wkt), 27700))"
-                ),
-                insert_values,
-            )
+            t0 = time.perf_counter()
 
-            session.execute(text("CREATE INDEX ON _tmp_input_geom USING GIST (geom)"))
-            session.execute(text("ANALYZE _tmp_input_geom"))
+            if _use_inline_input(input_gdf):
+                input_cte = _INLINE_INPUT_GEOM_CTE
+                input_params = _inline_input_geom_params(input_gdf, input_id_col)
+                setup_label = "inline input"
+            else:
+                self._stage_input_geom(session, input_gdf, input_id_col)
+                session.execute(text("ANALYZE _tmp_input_geom"))
+                input_cte, input_params = "", {}
+                setup_label = "temp table setup"
 
             t_setup = time.perf_counter() - t0
             logger.info(
-                f"[timing] batch_majority_overlap: temp table setup "
+                f"[timing] batch_majority_overlap: {setup_label} "
                 f"({len(input_gdf)} features): {t_setup:.3f}s"
             )
 
-            t_query = time.perf_counter()
+            return self._batch_majority_overlap_query(
+                session, input_id_col, assignments, input_cte, input_params
+            )
 
-            select_cols = ["i.input_id"]
-            lateral_clauses = []
-            all_params: dict[str, Any] = {}
+    @staticmethod
+    def _batch_majority_overlap_memory(
+        session: Session,
+        input_gdf: gpd.GeoDataFrame,
+        input_id_col: str,
+        assignments: list[dict[str, Any]],
+    ) -> dict[str, pd.DataFrame]:
+        """Answer the assignments from the in-process STRtree engine."""
+        t0 = time.perf_counter()
+        results = get_reference_engine().batch_majority_overlap(
+            session, input_gdf, input_id_col, assignments
+        )
+        logger.info(
+            f"[timing] batch_majority_overlap: in-memory "
+            f"({len(input_gdf)} features, {len(assignments)} layers): "
+            f"{time.perf_counter() - t0:.3f}s"
+        )
+        return results
 
-            for idx, assignment in enumerate(assignments):
-                overlay_table = assignment["overlay_table"]
-                overlay_filter = assignment["overlay_filter"]
-                overlay_attr_col = assignment["overlay_attr_col"]
-                output_field = assignment["output_field"]
-                alias = f"lat_{idx}"
+    @staticmethod
+    def _batch_majority_overlap_query(
+        session: Session,
+        input_id_col: str,
+        assignments: list[dict[str, Any]],
+        input_cte: str,
+        input_params: dict[str, Any],
+    ) -> dict[str, pd.DataFrame]:
+        """Run the combined lateral query over `_tmp_input_geom`.
 
-                if isinstance(overlay_attr_col, str):
-                    overlay_attr = getattr(overlay_table, overlay_attr_col)
-                else:
-                    overlay_attr = overlay_attr_col
+        `_tmp_input_geom` is either a staged temp table (empty `input_cte`) or
+        defined by `input_cte`, whose bind params are `input_params`.
+        """
+        t_query = time.perf_counter()
 
-                table = overlay_table.__table__
-                schema = table.schema
-                table_name = table.name
-                qualified = f"{schema}.{table_name}" if schema else table_name
+        select_cols = ["i.input_id"]
+        lateral_clauses = []
+        all_params: dict[str, Any] = dict(input_params)
 
-                # Compile without literal_binds — JSONB subscripts and some enum
-                # types don't support it. Prefix per lateral to avoid collisions
-                # (all assignments compile to the same param names).
-                compiled_filter = overlay_filter.compile(dialect=session.bind.dialect)
-                compiled_attr = overlay_attr.compile(dialect=session.bind.dialect)
+        for idx, assignment in enumerate(assignments):
+            overlay_table = assignment["overlay_table"]
+            overlay_filter = assignment["overlay_filter"]
+            overlay_attr_col = assignment["overlay_attr_col"]
+            output_field = assignment["output_field"]
+            alias = f"lat_{idx}"
 
-                prefix = f"lat{idx}_"
+            if isinstance(overlay_attr_col, str):
+                overlay_attr = getattr(overlay_table, overlay_attr_col)
+            else:
+                overlay_attr = overlay_attr_col
 
-                filter_str, filter_renamed = _sa_params(
-                    str(compiled_filter), compiled_filter.params, prefix
-                )
-                attr_str, attr_renamed = _sa_params(
-                    str(compiled_attr), compiled_attr.params, prefix
-                )
+            table = overlay_table.__table__
+            schema = table.schema
+            table_name = table.name
+            qualified = f"{schema}.{table_name}" if schema else table_name
 
-                _assert_safe_identifier(output_field, "output_field")
-                _assert_safe_qualified(qualified, "qualified")
+            # Compile without literal_binds — JSONB subscripts and some enum
+            # types don't support it. Prefix per lateral to avoid collisions
+            # (all assignments compile to the same param names).
+            compiled_filter = overlay_filter.compile(dialect=session.bind.dialect)
+            compiled_attr = overlay_attr.compile(dialect=session.bind.dialect)
 
-                filter_str = filter_str.replace(f"{qualified}.", "t.")
-                attr_str = attr_str.replace(f"{qualified}.", "t.")
+            prefix = f"lat{idx}_"
 
-                all_params.update(filter_renamed)
-                all_params.update(attr_renamed)
+            filter_str, filter_renamed = _sa_params(
+                str(compiled_filter), compiled_filter.params, prefix
+            )
+            attr_str, attr_renamed = _sa_params(
+                str(compiled_attr), compiled_attr.params, prefix
+            )
 
-                lateral_clauses.append(
-                    f"LEFT JOIN LATERAL ("
-                    f"  SELECT {attr_str} AS attr_val"
-                    f"  FROM {qualified} t"
-                    f"  WHERE {filter_str}"
-                    f"    AND ST_Intersects(t.geometry, i.geom)"
-                    f"  ORDER BY ST_Area(ST_Intersection(t.geometry, i.geom)) DESC"
-                    f"  LIMIT 1"
-                    f") {alias} ON true"
-                )
-                select_cols.append(f"{alias}.attr_val AS {output_field}")
+            _assert_safe_identifier(output_field, "output_field")
+            _assert_safe_qualified(qualified, "qualified")
 
-            combined_sql = text(
-                f"SELECT {', '.join(select_cols)} "
-                f"FROM _tmp_input_geom i " + " ".join(lateral_clauses)
+            filter_str = filter_str.replace(f"{qualified}.", "t.")
+            attr_str = attr_str.replace(f"{qualified}.", "t.")
+
+            all_params.update(filter_renamed)
+            all_params.update(attr_renamed)
+
+            lateral_clauses.append(
+                f"LEFT JOIN LATERAL ("
+                f"  SELECT {attr_str} AS attr_val"
+                f"  FROM {qualified} t"
+                f"  WHERE {filter_str}"
+                f"    AND ST_Intersects(t.geometry, i.geom)"
+                f"  ORDER BY ST_Area(ST_Intersection(t.geometry, i.geom)) DESC"
+                f"  LIMIT 1"
+                f") {alias} ON true"
             )
+            select_cols.append(f"{alias}.attr_val AS {output_field}")
 
-            rows = session.execute(combined_sql, all_params).fetchall()
+        combined_sql = text(
+            f"{input_cte}SELECT {', '.join(select_cols)} "
+            f"FROM _tmp_input_geom i " + " ".join(lateral_clauses)
+        )
 
-            logger.info(
-                f"[timing] batch_majority_overlap: combined query "
-                f"({len(assignments)} laterals): {time.perf_counter() - t_query:.3f}s"
-            )
+        rows = session.execute(combined_sql, all_params).fetchall()
+
+        logger.info(
+            f"[timing] batch_majority_overlap: combined query "
+            f"({len(assignments)} laterals): {time.perf_counter() - t_query:.3f}s"
+        )
 
         output_fields = [a["output_field"] for a in assignments]
         all_columns = [input_id_col, *output_fields]
@@ -409,7 +621,12 @@ class Repository:
         coeff_version: int,
         nn_version: int,
     ) -> pd.DataFrame:
-        """Perform 3-way spatial intersection (RLB x coefficient x NN catchment) in PostGIS."""
+        """Perform 3-way spatial intersection (RLB x coefficient x NN catchment) in PostGIS.
+
+        Uses the pre-intersected coefficient_nn_intersection table when it has
+        been built for (coeff_version, nn_version), so only RLB x split polygon
+        has to be intersected per job.
+        """
         if len(input_gdf) == 0:
             return pd.DataFrame(
                 columns=[
@@ -429,30 +646,134 @@ class Repository:
             )
 
         with self.session() as session:
-            generation = _spatial_cache_generation(session)
-            cache_key = _land_use_cache_key(
-                input_gdf,
-                coeff_version=coeff_version,
-                nn_version=nn_version,
-                generation=generation,
+            return self._land_use_query(session, input_gdf, coeff_version, nn_version)
+
+    @staticmethod
+    def _land_use_query(
+        session: Session,
+        input_gdf: gpd.GeoDataFrame,
+        coeff_version: int,
+        nn_version: int,
+        *,
+        rlb_source: tuple[str, dict[str, Any]] | None = None,
+    ) -> pd.DataFrame:
+        """Cached row-level land-use query on `session`.
+
+        `rlb_source` is a (SQL prefix, params) pair for an already available
+        `_tmp_rlb`; when omitted the input is inlined or staged here.
+        """
+        generation = _spatial_cache_generation(session)
+        cache_key = _land_use_cache_key(
+            input_gdf,
+            coeff_version=coeff_version,
+            nn_version=nn_version,
+            generation=generation,
+        )
+        if cache_key in _land_use_cache:
+            logger.debug("land_use_intersection_postgis cache hit")
+            return _restamp_rlb_attributes(_land_use_cache[cache_key].copy(), input_gdf)
+
+        if rlb_source is None:
+            rlb_source = Repository._rlb_source(session, input_gdf)
+        rlb_cte, rlb_params = rlb_source
+        rows_sql = Repository._land_use_rows_sql(session, coeff_version, nn_version)
+        rows = session.execute(
+            text(rlb_cte + rows_sql),
+            {
+                "coeff_version": coeff_version,
+                "nn_version": nn_version,
+                **rlb_params,
+            },
+        ).fetchall()
+
+        result = pd.DataFrame(rows, columns=_LAND_USE_ROW_COLUMNS)
+        _land_use_cache[cache_key] = result
+        return result.copy()
+
+    @staticmethod
+    def _stage_input_geom(
+        session: Session,
+        input_gdf: gpd.GeoDataFrame,
+        input_id_col: str,
+        method: str | None = None,
+    ) -> None:
+        """Load (id, geometry) pairs into an indexed `_tmp_input_geom` temp table.
+
+        ``method`` overrides ``SPATIAL_QUERY_STAGING_METHOD``.
+        """
+        session.execute(
+            text(
+                "CREATE TEMPORARY TABLE _tmp_input_geom ("
+                "  input_id integer, "
+                "  geom geometry(Geometry, 27700)"
+                ") ON COMMIT DROP"
             )
-            if cache_key in _land_use_cache:
-                logger.debug("land_use_intersection_postgis cache hit")
-                return _land_use_cache[cache_key].copy()
+        )
 
+        if (method or _query_cfg.staging_method) == "copy":
+            payload = encode_copy_binary(
+                [
+                    ("int4", input_gdf[input_id_col].tolist()),
+                    ("geometry", ewkb_array(input_gdf.geometry)),
+                ]
+            )
+            copy_binary(session, "_tmp_input_geom", ["input_id", "geom"], payload)
+        else:
+            insert_values = [
+                {"input_id": int(input_id), "geom_wkt": wkt}
+                for input_id, wkt in zip(
+                    input_gdf[input_id_col], input_gdf.geometry.to_wkt(), strict=False
+                )
+            ]
             session.execute(
                 text(
-                    "CREATE TEMPORARY TABLE _tmp_rlb ("
-                    "  rlb_id integer, "
-                    "  dwellings integer, "
-                    "  name text, "
-                    "  dwelling_category text, "
-                    "  source text, "
-                    "  geom geometry(Geometry, 27700)"
-                    ") ON COMMIT DROP"
-                )
+                    "INSERT INTO _tmp_input_geom (input_id, geom) "
+                    "VALUES (:input_id, ST_SetSRID(ST_GeomFromText(:geom_wkt), 27700))"
+                ),
+                insert_values,
+            )
+
+        session.execute(text("CREATE INDEX ON _tmp_input_geom USING GIST (geom)"))
+
+    @staticmethod
+    def _stage_rlb(
+        session: Session, input_gdf: gpd.GeoDataFrame, method: str | None = None
+    ) -> None:
+        """Load the RLB input into an indexed `_tmp_rlb` temp table.
+
+        ``method`` overrides ``SPATIAL_QUERY_STAGING_METHOD``.
+        """
+        session.execute(
+            text(
+                "CREATE TEMPORARY TABLE _tmp_rlb ("
+                "  rlb_id integer, "
+                "  dwellings integer, "
+                "  name text, "
+                "  dwelling_category text, "
+                "  source text, "
+                "  geom geometry(Geometry, 27700)"
+                ") ON COMMIT DROP"
             )
+        )
 
+        if (method or _query_cfg.staging_method) == "copy":
+            payload = encode_copy_binary(
+                [
+                    ("int4", input_gdf["rlb_id"].tolist()),
+                    ("int4", input_gdf["dwellings"].tolist()),
+                    ("text", input_gdf["name"].astype(str).tolist()),
+                    ("text", input_gdf["dwelling_category"].astype(str).tolist()),
+                    ("text", input_gdf["source"].astype(str).tolist()),
+                    ("geometry", ewkb_array(input_gdf.geometry)),
+                ]
+            )
+            copy_binary(
+                session,
+                "_tmp_rlb",
+                ["rlb_id", "dwellings", "name", "dwelling_category", "source", "geom"],
+                payload,
+            )
+        else:
             wkt_values = input_gdf.geometry.to_wkt().tolist()
             records = input_gdf[
                 ["rlb_id", "dwellings", "name", "dwelling_category", "source"]
@@ -478,65 +799,33 @@ class Repository:
                 insert_values,
             )
 
-            session.execute(text("CREATE INDEX ON _tmp_rlb USING GIST (geom)"))
-            session.execute(text("ANALYZE _tmp_rlb"))
-
-            # ST_Area is computed directly in the subquery so only a float is
-            # returned up the stack — no intermediate geometry object is
-            # materialised and then discarded by the outer ST_Area call.
-            raw_sql = text("""
-                SELECT rlb_id, dwellings, name, dwelling_category, source,
-                       crome_id, lu_curr_n_coeff, lu_curr_p_coeff,
-                       n_resi_coeff, p_resi_coeff, n2k_site_n, oid,
-                       area_in_nn_catchment_ha
-                FROM (
-                    SELECT
-                        r.rlb_id, r.dwellings, r.name, r.dwelling_category, r.source,
-                        c.crome_id, c.lu_curr_n_coeff, c.lu_curr_p_coeff,
-                        c.n_resi_coeff, c.p_resi_coeff,
-                        nn.attributes->>'N2K_Site_N' AS n2k_site_n,
-                        nn.attributes->>'OID' AS oid,
-                        ST_Area(
-                            ST_Intersection(ST_Intersection(r.geom, c.geometry), nn.geometry)
-                        ) / 10000.0 AS area_in_nn_catchment_ha
-                    FROM _tmp_rlb r
-                    JOIN public.coefficient_layer c
-                        ON c.version = :coeff_version
-                        AND ST_Intersects(r.geom, c.geometry)
-                    JOIN public.nn_catchments nn
-                        ON nn.version = :nn_version
-                        AND ST_Intersects(r.geom, nn.geometry)
-                        AND ST_Intersects(c.geometry, nn.geometry)
-                ) sub
-                WHERE area_in_nn_catchment_ha > 0
-            """)
+        session.execute(text("CREATE INDEX ON _tmp_rlb USING GIST (geom)"))
+        session.execute(text("ANALYZE _tmp_rlb"))
 
-            rows = session.execute(
-                raw_sql,
-                {
-                    "coeff_version": coeff_version,
-                    "nn_version": nn_version,
-                },
-            ).fetchall()
-
-        columns = [
-            "rlb_id",
-            "dwellings",
-            "name",
-            "dwelling_category",
-            "source",
-            "crome_id",
-            "lu_curr_n_coeff",
-            "lu_curr_p_coeff",
-            "n_resi_coeff",
-            "p_resi_coeff",
-            "n2k_site_n",
-            "oid",
-            "area_in_nn_catchment_ha",
-        ]
-        result = pd.DataFrame(rows, columns=columns)
-        _land_use_cache[cache_key] = result
-        return result.copy()
+    @staticmethod
+    def _rlb_source(
+        session: Session, input_gdf: gpd.GeoDataFrame
+    ) -> tuple[str, dict[str, list]]:
+        """Make `_tmp_rlb` available to the next land-use query.
+
+        Returns a SQL prefix and its bind params: an inline CTE for small
+        inputs, or nothing after staging the temp table for large ones.
+        """
+        if _use_inline_input(input_gdf):
+            return _INLINE_RLB_CTE, _inline_rlb_params(input_gdf)
+        Repository._stage_rlb(session, input_gdf)
+        return "", {}
+
+    @staticmethod
+    def _land_use_rows_sql(
+        session: Session, coeff_version: int, nn_version: int
+    ) -> str:
+        """Row-level land-use SQL over `_tmp_rlb` for this version pair."""
+        if _query_cfg.use_coefficient_nn_intersection and (
+            _has_coefficient_nn_intersection(session, coeff_version, nn_version)
+        ):
+            return _LAND_USE_PREINTERSECTED_SQL
+        return _LAND_USE_3WAY_SQL
 
     def intersection_postgis(
         self,
@@ -0,0 +1,208 @@
+"""Content-addressed store of completed assessment results.
+
+SQS redelivers a message whenever a job's outcome is not acknowledged in time
+(a crash between `process_job` and `delete_message`, a missed visibility
+heartbeat), and users resubmit the same boundary. Either way the whole
+assessment pipeline used to run again for an answer that was already known.
+
+`assessment_fingerprint` hashes everything a result depends on: the
+normalised geometry WKB, dwellings and dwelling category of every input row,
+the assessment configuration, the deployed build and the active version of
+every reference table the assessment reads. `ResultCache` keeps results under
+that fingerprint in the `assessment_result_cache` table, so every worker and
+every container shares them and they survive restarts. Payloads are gzipped
+JSON (`DataFrame.to_json(orient="table")`, which keeps dtypes), and the
+table is trimmed least-recently-used first to `RESULT_CACHE_MAX_BYTES`.
+
+The cache is best-effort: a failed lookup is a miss and a failed store is
+logged, never raised, so it cannot fail a job.
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import logging
+import threading
+from typing import Any
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+from sqlalchemy import text
+
+from app.common.metrics import counter
+from app.config import ResultCacheConfig
+from app.repositories.repository import Repository
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored payload or the fingerprint inputs change shape.
+_FORMAT_VERSION = 1
+
+# Input columns (besides geometry) that change an assessment's result. The
+# identity columns (`id`, `name`, `source`) do not, and are re-stamped on hits.
+_FINGERPRINT_COLUMNS = ("dwellings", "dwelling_category")
+
+_GET_SQL = text(
+    "UPDATE public.assessment_result_cache "
+    "SET hit_count = hit_count + 1, last_used_at = now() "
+    "WHERE fingerprint = :fingerprint RETURNING payload"
+)
+
+_PUT_SQL = text(
+    "INSERT INTO public.assessment_result_cache "
+    "(fingerprint, assessment_type, payload, size_bytes) "
+    "VALUES (:fingerprint, :assessment_type, :payload, :size_bytes) "
+    "ON CONFLICT (fingerprint) DO UPDATE SET payload = EXCLUDED.payload, "
+    "size_bytes = EXCLUDED.size_bytes, last_used_at = now()"
+)
+
+# Keep the most recently used rows whose sizes add up to at most :max_bytes.
+_EVICT_SQL = text(
+    "DELETE FROM public.assessment_result_cache WHERE fingerprint IN ("
+    "SELECT fingerprint FROM (SELECT fingerprint, SUM(size_bytes) OVER "
+    "(ORDER BY last_used_at DESC, fingerprint) AS kept_bytes "
+    "FROM public.assessment_result_cache) ranked "
+    "WHERE kept_bytes > :max_bytes)"
+)
+
+
+def assessment_fingerprint(
+    rlb_gdf: gpd.GeoDataFrame,
+    assessment_type: str,
+    *,
+    config: dict[str, Any],
+    generation: dict[str, Any],
+    app_version: str,
+) -> str:
+    """SHA-256 over a canonical encoding of everything a result depends on.
+
+    Geometries are normalised (ring orientation, start vertex and part order)
+    before encoding, so the same boundary digitised differently still matches.
+    Row order is significant, as it is for the assessment output.
+    """
+    geoms = shapely.normalize(
+        shapely.set_srid(np.asarray(rlb_gdf.geometry.array), rlb_gdf.crs.to_epsg() or 0)
+    )
+    rows = [
+        {col: _plain(rlb_gdf[col].iloc[i]) for col in _FINGERPRINT_COLUMNS}
+        for i in range(len(rlb_gdf))
+    ]
+    document = {
+        "format": _FORMAT_VERSION,
+        "assessment_type": assessment_type,
+        "geometries": [wkb.hex() for wkb in shapely.to_wkb(geoms, include_srid=True)],
+        "rows": rows,
+        "config": config,
+        "generation": generation,
+        "app_version": app_version,
+    }
+    canonical = json.dumps(document, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _plain(value: Any) -> Any:
+    """JSON-native form of a scalar read from a DataFrame."""
+    if pd.isna(value):
+        return None
+    return value.item() if hasattr(value, "item") else value
+
+
+def encode_results(dataframes: dict[str, pd.DataFrame]) -> bytes:
+    """Gzipped JSON of the result DataFrames, dtypes included."""
+    document = {
+        name: json.loads(df.to_json(orient="table", index=True))
+        for name, df in dataframes.items()
+    }
+    return gzip.compress(json.dumps(document).encode(), compresslevel=6)
+
+
+def decode_results(payload: bytes) -> dict[str, pd.DataFrame]:
+    """Inverse of `encode_results`."""
+    document = json.loads(gzip.decompress(payload))
+    return {
+        name: pd.read_json(io.StringIO(json.dumps(table)), orient="table")
+        for name, table in document.items()
+    }
+
+
+class ResultCache:
+    """Assessment results stored in PostgreSQL under their input fingerprint."""
+
+    def __init__(
+        self, repository: Repository, config: ResultCacheConfig | None = None
+    ) -> None:
+        self._repository = repository
+        self._config = config or ResultCacheConfig()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups in this process answered from the cache."""
+        with self._lock:
+            total = self._hits + self._misses
+            return self._hits / total if total else 0.0
+
+    def get(self, fingerprint: str) -> dict[str, pd.DataFrame] | None:
+        """Return the stored results for `fingerprint`, or None on a miss."""
+        try:
+            with self._repository.session() as session:
+                payload = session.scalar(_GET_SQL, {"fingerprint": fingerprint})
+                session.commit()
+            results = decode_results(payload) if payload is not None else None
+        except Exception:
+            logger.warning("Result cache lookup failed", exc_info=True)
+            results = None
+        self._record(hit=results is not None)
+        return results
+
+    def put(
+        self,
+        fingerprint: str,
+        assessment_type: str,
+        dataframes: dict[str, pd.DataFrame],
+    ) -> None:
+        """Store `dataframes` under `fingerprint` and trim the cache."""
+        try:
+            payload = encode_results(dataframes)
+            if len(payload) > self._config.max_bytes:
+                logger.info(
+                    f"Result of {len(payload)} bytes exceeds the cache size; not stored"
+                )
+                return
+            with self._repository.session() as session:
+                session.execute(
+                    _PUT_SQL,
+                    {
+                        "fingerprint": fingerprint,
+                        "assessment_type": assessment_type,
+                        "payload": payload,
+                        "size_bytes": len(payload),
+                    },
+                )
+                evicted = session.execute(
+                    _EVICT_SQL, {"max_bytes": self._config.max_bytes}
+                ).rowcount
+                session.commit()
+        except Exception:
+            logger.warning("Result cache store failed", exc_info=True)
+            return
+        if evicted:
+            logger.info(f"Result cache evicted {evicted} least-recently-used entries")
+
+    def _record(self, *, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+            hits, total = self._hits, self._hits + self._misses
+        counter("ResultCacheHit" if hit else "ResultCacheMiss", 1)
+        logger.info(
+            f"Result cache {'hit' if hit else 'miss'} "
+            f"(hit rate {hits}/{total} = {hits / total:.0%})"
+        )
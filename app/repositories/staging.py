@@ -0,0 +1,87 @@
+"""Binary COPY loading of input rows into session temp tables.
+
+The repository stages its inputs (RLBs, batch geometries) into temp tables
+before running server-side spatial SQL. The original path serialised every
+geometry to WKT and ran an executemany `INSERT ... ST_GeomFromText(...)`: one
+statement per row, with text formatting on the client and WKT parsing on the
+server. This module builds a PostgreSQL binary COPY payload instead, with the
+geometries encoded as EWKB by a single vectorized `shapely.to_wkb` call, and
+streams it in one `COPY ... FROM STDIN (FORMAT binary)`. PostGIS's binary
+input for `geometry` accepts EWKB directly, so no SQL-side conversion runs.
+"""
+
+import io
+import struct
+from collections.abc import Callable, Sequence
+from typing import Any
+
+import geopandas as gpd
+import numpy as np
+import shapely
+from sqlalchemy.orm import Session
+
+_PGCOPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+_PGCOPY_TRAILER = struct.pack("!h", -1)
+_NULL_FIELD = struct.pack("!i", -1)
+
+# Column kind -> encoder of one non-null value in PostgreSQL binary format.
+_ENCODERS: dict[str, Callable[[Any], bytes]] = {
+    "int4": lambda v: struct.pack("!i", int(v)),
+    "text": lambda v: str(v).encode(),
+    "geometry": bytes,
+}
+
+
+def ewkb_array(geometries: gpd.GeoSeries, srid: int = 27700) -> np.ndarray:
+    """Encode every geometry as EWKB carrying `srid`, in one vectorized call."""
+    geoms = shapely.set_srid(np.asarray(geometries.array), srid)
+    return shapely.to_wkb(geoms, include_srid=True)
+
+
+def encode_copy_binary(columns: Sequence[tuple[str, Sequence[Any]]]) -> bytes:
+    """Build a binary COPY payload from (kind, values) column pairs.
+
+    Kinds are the keys of `_ENCODERS`; `None` values are written as NULL.
+    All columns must have the same length.
+    """
+    lengths = {len(values) for _kind, values in columns}
+    if len(lengths) > 1:
+        msg = f"COPY columns have different lengths: {sorted(lengths)}"
+        raise ValueError(msg)
+
+    encoded = [
+        [None if v is None else _ENCODERS[kind](v) for v in values]
+        for kind, values in columns
+    ]
+    field_count = struct.pack("!h", len(columns))
+    out = io.BytesIO()
+    out.write(_PGCOPY_HEADER)
+    for row in zip(*encoded, strict=True):
+        out.write(field_count)
+        for field in row:
+            if field is None:
+                out.write(_NULL_FIELD)
+            else:
+                out.write(struct.pack("!i", len(field)))
+                out.write(field)
+    out.write(_PGCOPY_TRAILER)
+    return out.getvalue()
+
+
+def copy_binary(
+    session: Session, table: str, column_names: Sequence[str], payload: bytes
+) -> None:
+    """Stream `payload` into `table` on the session's own connection.
+
+    Runs inside the session's current transaction, so `ON COMMIT DROP` temp
+    tables created through the session are visible. `table` and the column
+    names are module constants of the caller, never user input.
+    """
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table} ({', '.join(column_names)}) FROM STDIN (FORMAT binary)",
+            io.BytesIO(payload),
+        )
+    finally:
+        cursor.close()
@@ -4,12 +4,15 @@ This module provides a runner for pluggable assessments.
 """
 
 import logging
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
 
 import geopandas as gpd
 import pandas as pd
 
 from app.assessments.gcn import GcnAssessment
-from app.assessments.nutrient import NutrientAssessment
+from app.assessments.nutrient import NutrientAssessment, WhatIfScenario
 from app.repositories.repository import Repository
 
 logger = logging.getLogger(__name__)
@@ -85,3 +88,130 @@ def run_assessment(
     )
 
     return dataframes
+
+
+def run_what_if(
+    rlb_gdf: gpd.GeoDataFrame,
+    scenarios: list[WhatIfScenario],
+    metadata: dict,
+    repository: Repository,
+) -> list[dict[str, pd.DataFrame]]:
+    """Evaluate nutrient what-if scenarios for one set of RLBs.
+
+    The spatial stage (majority assignments and land-use intersections) is
+    computed once, or taken from the process cache, and every scenario's
+    dwellings and SuDS / greenspace settings are applied to it. Returns one
+    result dict per scenario, in order.
+
+    Raises:
+        ValueError: If a scenario is invalid or the evaluation fails
+    """
+    if not scenarios:
+        msg = "At least one what-if scenario is required"
+        raise ValueError(msg)
+
+    logger.info(f"Running nutrient what-if with {len(scenarios)} scenario(s)")
+    assessment = NutrientAssessment(rlb_gdf, metadata, repository)
+    try:
+        return assessment.what_if(scenarios)
+    except Exception as e:
+        logger.error(f"What-if evaluation failed: {e}")
+        msg = f"What-if evaluation failed: {e}"
+        raise ValueError(msg) from e
+
+
+@dataclass
+class BatchChunkResult:
+    """Outcome of one chunk of a batch run.
+
+    `start` is the zero-based position of the chunk's first row in the batch
+    input; `rlb_id` values in `dataframes` are rebased to be 1-based positions
+    in the whole input rather than the chunk. Exactly one of `dataframes` and
+    `error` is set.
+    """
+
+    index: int
+    start: int
+    size: int
+    timing_s: float
+    dataframes: dict[str, pd.DataFrame | gpd.GeoDataFrame] | None = None
+    error: str | None = None
+
+
+def run_assessment_batch(
+    assessment_type: str,
+    rlb_gdf: gpd.GeoDataFrame,
+    metadata: dict,
+    repository: Repository,
+    chunk_size: int,
+) -> Iterator[BatchChunkResult]:
+    """Run an assessment over many RLBs in fixed-size chunks.
+
+    Yields one `BatchChunkResult` per chunk as soon as it finishes, so callers
+    can stream results out and drop them; only one chunk's intermediate frames
+    are alive at a time. Reference-data versions are resolved once up front
+    (when the assessment class supports `resolve_layer_versions`) and pinned
+    for every chunk. A failing chunk is reported via `error` and the batch
+    carries on with the next one.
+    """
+    if chunk_size < 1:
+        msg = f"chunk_size must be >= 1, got {chunk_size}"
+        raise ValueError(msg)
+
+    assessment_class = ASSESSMENT_TYPES.get(assessment_type)
+    if assessment_class is None:
+        msg = f"Assessment type {assessment_type} not supported"
+        raise KeyError(msg)
+
+    resolve = getattr(assessment_class, "resolve_layer_versions", None)
+    if resolve is not None and "layer_versions" not in metadata:
+        metadata = {**metadata, "layer_versions": resolve(repository)}
+
+    total = len(rlb_gdf)
+    n_chunks = (total + chunk_size - 1) // chunk_size
+    logger.info(
+        f"Running batch {assessment_type}: {total} RLB(s) in {n_chunks} chunk(s) "
+        f"of up to {chunk_size}"
+    )
+    for index, start in enumerate(range(0, total, chunk_size)):
+        chunk = rlb_gdf.iloc[start : start + chunk_size]
+        t0 = time.perf_counter()
+        try:
+            dataframes = run_assessment(
+                assessment_type=assessment_type,
+                rlb_gdf=chunk,
+                metadata={
+                    **metadata,
+                    "unique_ref": f"{metadata.get('unique_ref', 'batch')}-{index}",
+                },
+                repository=repository,
+            )
+        except Exception as e:  # noqa: BLE001
+            timing_s = time.perf_counter() - t0
+            logger.error(
+                f"[timing] batch chunk {index} failed after {timing_s:.3f}s: {e}"
+            )
+            yield BatchChunkResult(
+                index=index,
+                start=start,
+                size=len(chunk),
+                timing_s=timing_s,
+                error=str(e.__cause__ or e),
+            )
+            continue
+
+        for df in dataframes.values():
+            if "rlb_id" in df.columns:
+                df["rlb_id"] = df["rlb_id"] + start
+        timing_s = time.perf_counter() - t0
+        logger.info(
+            f"[timing] batch chunk {index + 1}/{n_chunks} "
+            f"({len(chunk)} RLBs): {timing_s:.3f}s"
+        )
+        yield BatchChunkResult(
+            index=index,
+            start=start,
+            size=len(chunk),
+            timing_s=timing_s,
+            dataframes=dataframes,
+        )
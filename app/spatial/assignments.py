@@ -5,18 +5,23 @@ from overlay layers to input features based on spatial relationships.
 
 Available operations:
 - majority_overlap: Assign based on largest overlapping area (with parallel support)
+- majority_overlap_vectorized: The same from flat STRtree/shapely arrays, in
+  memory and without building overlay GeoDataFrames
 - any_intersection: Assign all intersecting features as list
 - nearest: Assign nearest feature
 - intersection: Full spatial overlay for area calculations
 """
 
 import logging
-import os
-from concurrent.futures import ProcessPoolExecutor
 from typing import Any
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
+import shapely
+
+from app.spatial.partition import partition_by_cost
+from app.spatial.pool import SpatialPoolUnavailableError, get_spatial_pool
 
 logger = logging.getLogger(__name__)
 
@@ -73,6 +78,20 @@ def _majority_overlap_sequential(
         [input_id_col, overlay_attr_col],
     ].reset_index(drop=True)
 
+    return _merge_majority(
+        input_gdf, majority, input_id_col, overlay_attr_col, output_field, default_value
+    )
+
+
+def _merge_majority(
+    input_gdf: gpd.GeoDataFrame,
+    majority: pd.DataFrame,
+    input_id_col: str,
+    overlay_attr_col: str,
+    output_field: str,
+    default_value: Any | None,
+) -> gpd.GeoDataFrame:
+    """Attach the per-ID majority attribute to every input row."""
     # Create full result with all input IDs
     all_inputs = input_gdf[[input_id_col]].copy()
     assignments = all_inputs.merge(majority, on=input_id_col, how="left")
@@ -92,58 +111,110 @@ def _majority_overlap_sequential(
     )
 
 
-def _slice_axis(
-    gdf: gpd.GeoDataFrame,
-    coords: gpd.GeoSeries,
-    axis_min: float,
-    axis_max: float,
-    n_chunks: int,
-) -> list[gpd.GeoDataFrame]:
-    """Slice a GeoDataFrame into n_chunks strips along one axis."""
-    step = (axis_max - axis_min) / n_chunks
-    chunks = []
-    for i in range(n_chunks):
-        lo = axis_min + i * step
-        hi = axis_max if i == n_chunks - 1 else axis_min + (i + 1) * step
-        chunk = gdf[(coords >= lo) & (coords <= hi)]
-        if len(chunk) > 0:
-            chunks.append(chunk)
-    return chunks
-
-
-def _partition_by_bounds(
-    gdf: gpd.GeoDataFrame, n_chunks: int
-) -> list[gpd.GeoDataFrame]:
-    """Partition GeoDataFrame into roughly equal spatial chunks.
-
-    Splits along the longer axis (x or y) of the total bounds.
+def _majority_overlap_vectorized(
+    input_gdf: gpd.GeoDataFrame,
+    overlay_gdf: gpd.GeoDataFrame,
+    input_id_col: str,
+    overlay_attr_col: str,
+    output_field: str,
+    default_value: Any | None = None,
+) -> gpd.GeoDataFrame:
+    """Majority overlap from flat arrays, without `gpd.overlay`.
+
+    `_majority_overlap_sequential` builds every intersection geometry into an
+    attribute-merged GeoDataFrame only to take its area and an `idxmax`. Here
+    an STRtree gives the intersecting (input, overlay) pairs, their
+    intersection areas are computed as one array, and a lexsort picks the
+    largest per input ID. Results are the same, including which overlay wins
+    a tie (the lowest-indexed one) and that pairs which only touch (zero
+    intersection area, dropped by the overlay) are not eligible.
     """
-    if len(gdf) == 0 or n_chunks <= 1:
-        return [gdf]
+    if input_id_col not in input_gdf.columns:
+        msg = f"input_id_col '{input_id_col}' not found in input GeoDataFrame"
+        raise ValueError(msg)
+    if overlay_attr_col not in overlay_gdf.columns:
+        msg = f"overlay_attr_col '{overlay_attr_col}' not found in overlay GeoDataFrame"
+        raise ValueError(msg)
 
-    bounds = gdf.total_bounds  # minx, miny, maxx, maxy
-    x_range = bounds[2] - bounds[0]
-    y_range = bounds[3] - bounds[1]
+    if input_gdf.crs != overlay_gdf.crs:
+        overlay_gdf = overlay_gdf.to_crs(input_gdf.crs)
+
+    inputs = _valid_geometries(input_gdf)
+    overlays = _valid_geometries(overlay_gdf)
+    input_idx, overlay_idx = shapely.STRtree(overlays).query(
+        inputs, predicate="intersects"
+    )
+    # An input with a single candidate that covers it (the usual case for a
+    # site inside one catchment) wins with its own area whatever the exact
+    # value; only the other pairs need an intersection geometry.
+    shapely.prepare(overlays)
+    single = np.bincount(input_idx, minlength=len(inputs))[input_idx] == 1
+    shortcut = np.zeros(len(input_idx), dtype=bool)
+    shortcut[single] = shapely.covers(
+        overlays[overlay_idx[single]], inputs[input_idx[single]]
+    )
+    areas = np.empty(len(input_idx))
+    areas[shortcut] = shapely.area(inputs[input_idx[shortcut]])
+    rest = ~shortcut
+    areas[rest] = shapely.area(
+        shapely.intersection(inputs[input_idx[rest]], overlays[overlay_idx[rest]])
+    )
+    overlapping = areas > 0
+    input_idx, overlay_idx = input_idx[overlapping], overlay_idx[overlapping]
+    areas = areas[overlapping]
+
+    # Rows sharing an ID compete as one group, as in the groupby. Order each
+    # group by area descending, then input row and overlay index, so the first
+    # pair of each group is the winner `idxmax` would pick. Rows with a
+    # missing ID (code -1) are dropped, as the groupby drops NaN keys.
+    id_codes, ids = pd.factorize(input_gdf[input_id_col])
+    codes = id_codes[input_idx]
+    keyed = codes >= 0
+    codes, input_idx, overlay_idx = codes[keyed], input_idx[keyed], overlay_idx[keyed]
+    areas = areas[keyed]
+    order = np.lexsort((overlay_idx, input_idx, -areas, codes))
+    sorted_codes = codes[order]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = sorted_codes[1:] != sorted_codes[:-1]
+    winners = order[first]
+
+    majority = pd.DataFrame(
+        {
+            input_id_col: ids.take(codes[winners]),
+            overlay_attr_col: overlay_gdf[overlay_attr_col]
+            .iloc[overlay_idx[winners]]
+            .to_numpy(),
+        }
+    )
+    return _merge_majority(
+        input_gdf, majority, input_id_col, overlay_attr_col, output_field, default_value
+    )
 
-    centroids = gdf.geometry.centroid
-    if x_range >= y_range:
-        chunks = _slice_axis(gdf, centroids.x, bounds[0], bounds[2], n_chunks)
-    else:
-        chunks = _slice_axis(gdf, centroids.y, bounds[1], bounds[3], n_chunks)
 
-    return chunks if chunks else [gdf]
+def _valid_geometries(gdf: gpd.GeoDataFrame) -> np.ndarray:
+    """Geometry array with invalid geometries repaired, as `gpd.overlay` does."""
+    geoms = np.asarray(gdf.geometry.array)
+    invalid = ~shapely.is_valid(geoms)
+    if invalid.any():
+        geoms = geoms.copy()
+        geoms[invalid] = shapely.make_valid(geoms[invalid])
+    return geoms
 
 
-def _process_overlap_chunk(
+def _overlap_chunk(
     input_chunk: gpd.GeoDataFrame,
     overlay_gdf: gpd.GeoDataFrame,
     input_id_col: str,
     overlay_attr_col: str,
     output_field: str,
     default_value: Any,
-) -> gpd.GeoDataFrame:
-    """Process a single chunk for majority_overlap (runs in worker process)."""
-    return _majority_overlap_sequential(
+) -> pd.DataFrame:
+    """Majority overlap of one chunk (runs in a spatial pool worker).
+
+    Returns only the ID and assigned value; the caller merges them back onto
+    the input, so geometries are not shipped back.
+    """
+    result = _majority_overlap_sequential(
         input_chunk,
         overlay_gdf,
         input_id_col,
@@ -151,6 +222,7 @@ def _process_overlap_chunk(
         output_field,
         default_value,
     )
+    return pd.DataFrame(result[[input_id_col, output_field]])
 
 
 def majority_overlap(
@@ -162,10 +234,12 @@ def majority_overlap(
     default_value: Any | None = None,
     parallel: bool = True,
     max_workers: int | None = None,
+    overlay_key: str | None = None,
 ) -> gpd.GeoDataFrame:
     """Assign overlay attribute based on majority spatial overlap.
 
-    Supports parallel processing for large datasets.
+    Supports parallel processing for large datasets, on the shared spatial
+    worker pool (`app.spatial.pool`).
 
     Args:
         input_gdf: Input features
@@ -176,6 +250,8 @@ def majority_overlap(
         default_value: Value for features with no overlap
         parallel: Enable parallel processing (default True)
         max_workers: Number of worker processes (default: 80% of cpu_count)
+        overlay_key: Identifies overlay_gdf's content, e.g. "<table>@<version>",
+            so the workers keep it between calls (default: a digest of it)
     """
     # Use sequential for small datasets or when disabled
     if not parallel or len(input_gdf) < 100:
@@ -188,12 +264,11 @@ def majority_overlap(
             default_value,
         )
 
-    if max_workers is None:
-        # Cap at 80% of available CPUs to avoid saturating the host
-        max_workers = max(1, int((os.cpu_count() or 4) * 0.8))
+    pool = get_spatial_pool(max_workers)
 
-    # Partition input spatially
-    chunks = _partition_by_bounds(input_gdf, max_workers)
+    # Partition input into chunks of equal estimated overlay cost
+    partition = partition_by_cost(input_gdf, pool.max_workers, overlay_gdf)
+    chunks = partition.chunks
 
     if len(chunks) <= 1:
         return _majority_overlap_sequential(
@@ -208,23 +283,20 @@ def majority_overlap(
     logger.info(
         f"Processing {len(input_gdf)} features in {len(chunks)} parallel chunks"
     )
+    partition.log("majority_overlap")
 
     try:
-        with ProcessPoolExecutor(max_workers=max_workers) as executor:
-            futures = [
-                executor.submit(
-                    _process_overlap_chunk,
-                    chunk,
-                    overlay_gdf,
-                    input_id_col,
-                    overlay_attr_col,
-                    output_field,
-                    default_value,
-                )
-                for chunk in chunks
-            ]
-            results = [f.result() for f in futures]
-    except (NotImplementedError, OSError) as exc:
+        with pool.pinned_overlay(overlay_gdf, overlay_key) as handle:
+            results = pool.map_chunks(
+                _overlap_chunk,
+                handle,
+                chunks,
+                input_id_col=input_id_col,
+                overlay_attr_col=overlay_attr_col,
+                output_field=output_field,
+                default_value=default_value,
+            )
+    except SpatialPoolUnavailableError as exc:
         logger.warning(
             f"Parallel majority_overlap unavailable ({exc}); falling back to sequential"
         )
@@ -392,7 +464,8 @@ def execute_assignment(
     Args:
         input_gdf: Input features
         overlay_gdf: Overlay features
-        strategy: Strategy name ('majority_overlap', 'any_intersection', 'nearest', 'intersection')
+        strategy: Strategy name ('majority_overlap', 'majority_overlap_vectorized',
+            'any_intersection', 'nearest', 'intersection')
         input_id_col: ID column in input_gdf
         overlay_attr_col: Attribute column from overlay_gdf
         output_field: Name of output field
@@ -413,6 +486,19 @@ def execute_assignment(
             output_field,
             **kwargs,
         )
+    if strategy == "majority_overlap_vectorized":
+        # Runs in-process: the worker-pool options of majority_overlap do
+        # not apply.
+        for option in ("parallel", "max_workers", "overlay_key"):
+            kwargs.pop(option, None)
+        return _majority_overlap_vectorized(
+            input_gdf,
+            overlay_gdf,
+            input_id_col,
+            overlay_attr_col,
+            output_field,
+            **kwargs,
+        )
     if strategy == "any_intersection":
         return any_intersection(
             input_gdf, overlay_gdf, input_id_col, overlay_attr_col, output_field
@@ -430,6 +516,7 @@ def execute_assignment(
         return intersection(input_gdf, overlay_gdf, **kwargs)
     msg = (
         f"Unknown assignment strategy: {strategy}. "
-        f"Supported: majority_overlap, any_intersection, nearest, intersection"
+        f"Supported: majority_overlap, majority_overlap_vectorized, "
+        f"any_intersection, nearest, intersection"
     )
     raise ValueError(msg)
@@ -7,13 +7,13 @@ particularly for GCN (Great Crested Newt) assessments that require:
 """
 
 import logging
-import os
-from concurrent.futures import ProcessPoolExecutor
 
 import geopandas as gpd
 import pandas as pd
 from shapely.ops import unary_union
 
+from app.spatial.partition import partition_by_cost
+from app.spatial.pool import SpatialPoolUnavailableError, get_spatial_pool
 from app.spatial.utils import apply_precision
 
 logger = logging.getLogger(__name__)
@@ -43,8 +43,14 @@ def spatial_difference_with_precision(
     grid_size: float = 0.0001,
     parallel: bool = True,
     max_workers: int | None = None,
+    right_key: str | None = None,
 ) -> gpd.GeoDataFrame:
-    """Spatial difference (erase) with precision model applied."""
+    """Spatial difference (erase) with precision model applied.
+
+    The parallel path runs on the shared spatial worker pool; `right_key`
+    identifies `right`'s content (e.g. "<table>@<version>") so the workers
+    keep it between calls (default: a digest of it).
+    """
     if left.crs != right.crs:
         right = right.to_crs(left.crs)
 
@@ -57,24 +63,24 @@ def spatial_difference_with_precision(
         )
         return apply_precision(result, grid_size=grid_size)
 
-    if max_workers is None:
-        max_workers = max(1, int((os.cpu_count() or 4) * 0.8))
+    pool = get_spatial_pool(max_workers)
 
-    chunks = _partition_by_bounds(left_precise, max_workers)
+    partition = partition_by_cost(left_precise, pool.max_workers, right_precise)
+    chunks = partition.chunks
     if len(chunks) <= 1:
         result = gpd.overlay(
             left_precise, right_precise, how="difference", keep_geom_type=False
         )
         return apply_precision(result, grid_size=grid_size)
 
+    partition.log("spatial_difference")
     try:
-        with ProcessPoolExecutor(max_workers=max_workers) as executor:
-            futures = [
-                executor.submit(_difference_chunk, chunk, right_precise)
-                for chunk in chunks
-            ]
-            results = [f.result() for f in futures]
-    except (NotImplementedError, OSError) as exc:
+        with pool.pinned_overlay(
+            right_precise,
+            f"{right_key}|crs={left.crs}|grid={grid_size}" if right_key else None,
+        ) as handle:
+            results = pool.map_chunks(_difference_chunk, handle, chunks)
+    except SpatialPoolUnavailableError as exc:
         logger.warning(
             f"Parallel spatial_difference unavailable ({exc}); falling back to sequential"
         )
@@ -97,41 +103,3 @@ def _difference_chunk(
 ) -> gpd.GeoDataFrame:
     """Run a difference overlay for one left-side chunk."""
     return gpd.overlay(left_chunk, right_gdf, how="difference", keep_geom_type=False)
-
-
-def _partition_axis(
-    gdf: gpd.GeoDataFrame,
-    coords: "pd.Series",
-    axis_min: float,
-    axis_max: float,
-    n_chunks: int,
-) -> list[gpd.GeoDataFrame]:
-    """Partition GeoDataFrame into n_chunks slices along one axis."""
-    step = (axis_max - axis_min) / n_chunks
-    bins = ((coords - axis_min) / step).clip(0, n_chunks - 1).astype(int)
-    chunks = []
-    for i in range(n_chunks):
-        chunk = gdf[bins == i]
-        if len(chunk) > 0:
-            chunks.append(chunk)
-    return chunks
-
-
-def _partition_by_bounds(
-    gdf: gpd.GeoDataFrame, n_chunks: int
-) -> list[gpd.GeoDataFrame]:
-    """Partition GeoDataFrame into non-overlapping spatial chunks."""
-    if len(gdf) == 0 or n_chunks <= 1:
-        return [gdf]
-
-    bounds = gdf.total_bounds  # minx, miny, maxx, maxy
-    x_range = bounds[2] - bounds[0]
-    y_range = bounds[3] - bounds[1]
-    centroids = gdf.geometry.centroid
-
-    if x_range >= y_range:
-        chunks = _partition_axis(gdf, centroids.x, bounds[0], bounds[2], n_chunks)
-    else:
-        chunks = _partition_axis(gdf, centroids.y, bounds[1], bounds[3], n_chunks)
-
-    return chunks if chunks else [gdf]
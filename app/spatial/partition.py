@@ -0,0 +1,109 @@
+"""Load-balanced spatial partitioning for the parallel spatial paths.
+
+Equal-width strips along the longest axis balance the number of features
+only when they are spread evenly. Development sites cluster, so most strips
+come out empty or one strip gets nearly all the work, and the parallel path
+runs at the speed of its busiest worker.
+
+`partition_by_cost` orders features along a Hilbert curve, so each chunk is
+spatially compact and touches few overlay features. It then cuts the order
+into runs of roughly equal estimated cost. A feature's cost is its vertex
+count times one plus the number of overlay features whose bounding boxes
+meet its own (an STRtree bbox query), since the overlay work per feature
+grows with both.
+"""
+
+import logging
+from dataclasses import dataclass
+
+import geopandas as gpd
+import numpy as np
+import shapely
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SpatialPartition:
+    """Chunks of a GeoDataFrame and the estimated cost of each."""
+
+    chunks: list[gpd.GeoDataFrame]
+    costs: np.ndarray
+
+    @property
+    def utilisation(self) -> np.ndarray:
+        """Each chunk's cost as a share of the costliest chunk's.
+
+        A worker given a chunk is busy for that share of the parallel section.
+        The mean is the whole pool's utilisation.
+        """
+        peak = self.costs.max() if len(self.costs) else 0.0
+        if peak <= 0:
+            return np.ones(len(self.costs))
+        return self.costs / peak
+
+    def log(self, label: str) -> None:
+        utilisation = self.utilisation
+        per_chunk = ", ".join(
+            f"{len(chunk)}@{share:.0%}"
+            for chunk, share in zip(self.chunks, utilisation, strict=True)
+        )
+        logger.info(
+            f"[partition] {label}: {len(self.chunks)} chunks, utilisation "
+            f"{utilisation.mean():.0%} (features@utilisation: {per_chunk})"
+        )
+
+
+def feature_costs(
+    gdf: gpd.GeoDataFrame, overlay_gdf: gpd.GeoDataFrame | None = None
+) -> np.ndarray:
+    """Estimated overlay cost per feature: vertices x (1 + bbox candidates)."""
+    geoms = np.asarray(gdf.geometry.array)
+    vertices = shapely.get_num_coordinates(geoms).astype(float)
+    if overlay_gdf is None or len(overlay_gdf) == 0:
+        return np.maximum(vertices, 1.0)
+    if overlay_gdf.crs != gdf.crs:
+        overlay_gdf = overlay_gdf.to_crs(gdf.crs)
+    tree = shapely.STRtree(np.asarray(overlay_gdf.geometry.array))
+    input_idx, _ = tree.query(geoms)
+    candidates = np.bincount(input_idx, minlength=len(geoms))
+    return np.maximum(vertices, 1.0) * (1 + candidates)
+
+
+def partition_by_cost(
+    gdf: gpd.GeoDataFrame,
+    n_chunks: int,
+    overlay_gdf: gpd.GeoDataFrame | None = None,
+) -> SpatialPartition:
+    """Split `gdf` into up to `n_chunks` Hilbert-ordered chunks of equal cost.
+
+    Every row lands in exactly one chunk. A single feature costlier than a
+    fair share gets a chunk of its own; no chunk is empty. Rows with an empty
+    or missing geometry have no place on the curve and share a chunk of
+    their own.
+    """
+    costs = feature_costs(gdf, overlay_gdf) if len(gdf) else np.array([])
+    placed = ~np.asarray(gdf.geometry.isna() | gdf.geometry.is_empty)
+    if not placed.all() and placed.any():
+        partition = partition_by_cost(gdf[placed], max(n_chunks - 1, 1), overlay_gdf)
+        return SpatialPartition(
+            chunks=[*partition.chunks, gdf[~placed]],
+            costs=np.append(partition.costs, costs[~placed].sum()),
+        )
+    n_chunks = min(n_chunks, len(gdf))
+    if n_chunks <= 1 or not placed.all():
+        return SpatialPartition(chunks=[gdf], costs=np.array([costs.sum()]))
+
+    order = np.argsort(np.asarray(gdf.geometry.hilbert_distance()), kind="stable")
+    cumulative = np.cumsum(costs[order])
+    targets = cumulative[-1] * np.arange(1, n_chunks) / n_chunks
+    # Cut after the feature that takes the running cost past each target.
+    cuts = np.unique(np.searchsorted(cumulative, targets, side="left") + 1)
+    bounds = np.concatenate([[0], cuts[cuts < len(order)], [len(order)]])
+
+    chunks, chunk_costs = [], []
+    for start, end in zip(bounds[:-1], bounds[1:], strict=True):
+        rows = order[start:end]
+        chunks.append(gdf.iloc[np.sort(rows)])
+        chunk_costs.append(costs[rows].sum())
+    return SpatialPartition(chunks=chunks, costs=np.array(chunk_costs))
@@ -0,0 +1,367 @@
+"""Long-lived process pool shared by the parallel spatial operations.
+
+`majority_overlap` and `spatial_difference_with_precision` used to start a
+fresh `ProcessPoolExecutor` on every call and pickle the whole overlay layer
+into every chunk submission, so each call paid for process start-up and for
+shipping the overlay once per chunk. `SpatialWorkerPool` is started once per
+process (forkserver, with geopandas and this module preloaded) and reused:
+
+- an overlay is registered once under a key naming its content (a reference
+  table and version, or a digest of the layer). The parent writes it to a
+  spill file; each worker reads it the first time a chunk names it and keeps
+  it, least-recently-used, for later calls. `pinned_overlay` registers and
+  pins it in one step, so no concurrent registration can evict it (and
+  delete its spill file) while chunks still need it;
+- a chunk submission ships only the input rows, with geometry as WKB, plus
+  the overlay key. Results come back the same way.
+
+If process pools are unavailable (sandboxes, restricted containers), the
+pool breaks or it is shut down under a call, `SpatialPoolUnavailableError`
+is raised and callers run sequentially.
+"""
+
+import atexit
+import contextlib
+import hashlib
+import logging
+import multiprocessing
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import BrokenExecutor, CancelledError, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+
+from app.config import SpatialPoolConfig
+
+logger = logging.getLogger(__name__)
+
+# Imported once in the forkserver so every worker starts with them loaded.
+_FORKSERVER_PRELOAD = ["geopandas", "app.spatial.pool"]
+
+
+class SpatialPoolUnavailableError(RuntimeError):
+    """The process pool could not be started or broke mid-call."""
+
+
+@dataclass(frozen=True)
+class EncodedFrame:
+    """A GeoDataFrame as WKB plus its non-geometry columns."""
+
+    wkb: np.ndarray
+    attributes: pd.DataFrame
+    geometry_name: str
+    crs: str | None
+
+    @classmethod
+    def from_gdf(cls, gdf: gpd.GeoDataFrame) -> "EncodedFrame":
+        geometry_name = gdf.geometry.name
+        return cls(
+            wkb=shapely.to_wkb(np.asarray(gdf.geometry.array)),
+            attributes=pd.DataFrame(gdf.drop(columns=geometry_name)),
+            geometry_name=geometry_name,
+            crs=gdf.crs.to_wkt() if gdf.crs is not None else None,
+        )
+
+    def to_gdf(self) -> gpd.GeoDataFrame:
+        return gpd.GeoDataFrame(
+            self.attributes,
+            geometry=gpd.GeoSeries(
+                shapely.from_wkb(self.wkb),
+                index=self.attributes.index,
+                crs=self.crs,
+                name=self.geometry_name,
+            ),
+            crs=self.crs,
+        )
+
+
+@dataclass(frozen=True)
+class OverlayHandle:
+    """A registered overlay: its key and the spill file workers load it from."""
+
+    key: str
+    path: str
+
+
+def overlay_digest(gdf: gpd.GeoDataFrame) -> str:
+    """Content key for an overlay registered without an explicit one."""
+    digest = hashlib.sha1(usedforsecurity=False)
+    digest.update(b"".join(shapely.to_wkb(np.asarray(gdf.geometry.array))))
+    # Equal frames pickle identically; a spurious mismatch only costs a
+    # second registration.
+    attributes = pd.DataFrame(gdf.drop(columns=gdf.geometry.name))
+    digest.update(pickle.dumps(attributes.reset_index(drop=True)))
+    digest.update(str(gdf.crs).encode())
+    return f"sha1:{digest.hexdigest()}"
+
+
+# Worker-side state: overlays loaded by this worker, most recently used last.
+_worker_layers: "OrderedDict[str, gpd.GeoDataFrame]" = OrderedDict()
+_worker_max_layers = 8
+
+
+def _init_worker(max_layers: int) -> None:
+    global _worker_max_layers
+    _worker_max_layers = max_layers
+
+
+def _worker_overlay(handle: OverlayHandle) -> gpd.GeoDataFrame:
+    overlay = _worker_layers.get(handle.key)
+    if overlay is not None:
+        _worker_layers.move_to_end(handle.key)
+        return overlay
+    with open(handle.path, "rb") as f:
+        overlay = pickle.load(f).to_gdf()  # noqa: S301 - written by this pool
+    _worker_layers[handle.key] = overlay
+    while len(_worker_layers) > _worker_max_layers:
+        _worker_layers.popitem(last=False)
+    return overlay
+
+
+def _run_chunk(
+    func: Callable[..., Any],
+    handle: OverlayHandle,
+    chunk: EncodedFrame,
+    kwargs: dict[str, Any],
+) -> Any:
+    """Worker entry point: apply `func` to one chunk and the named overlay."""
+    result = func(chunk.to_gdf(), _worker_overlay(handle), **kwargs)
+    if isinstance(result, gpd.GeoDataFrame):
+        return EncodedFrame.from_gdf(result)
+    return result
+
+
+class SpatialWorkerPool:
+    """A process pool that keeps registered overlay layers in its workers."""
+
+    def __init__(self, max_workers: int, max_layers: int = 8) -> None:
+        self.max_workers = max_workers
+        self._max_layers = max_layers
+        self._lock = threading.Lock()
+        self._executor: ProcessPoolExecutor | None = None
+        self._spill_dir = tempfile.mkdtemp(prefix="nrf-spatial-pool-")
+        # Registered overlays, most recently used last, and how many calls are
+        # currently using each (those are never evicted).
+        self._layers: OrderedDict[str, OverlayHandle] = OrderedDict()
+        self._in_use: dict[str, int] = {}
+        self._closed = False
+
+    @property
+    def in_use(self) -> bool:
+        """Whether any call currently has an overlay pinned."""
+        with self._lock:
+            return bool(self._in_use)
+
+    def register_overlay(
+        self, overlay_gdf: gpd.GeoDataFrame, key: str | None = None
+    ) -> OverlayHandle:
+        """Make `overlay_gdf` available to the workers under `key`.
+
+        `key` must change whenever the layer's content does (e.g. the
+        reference table and version); without one, a digest of the layer is
+        used. Registering a key that is already present is free. The overlay
+        is not pinned: use `pinned_overlay` to map chunks over it.
+        """
+        return self._register(overlay_gdf, key, pin=False)
+
+    @contextlib.contextmanager
+    def pinned_overlay(
+        self, overlay_gdf: gpd.GeoDataFrame, key: str | None = None
+    ) -> Iterator[OverlayHandle]:
+        """`register_overlay`, with the overlay kept from eviction until exit."""
+        handle = self._register(overlay_gdf, key, pin=True)
+        try:
+            yield handle
+        finally:
+            with self._lock:
+                self._in_use[handle.key] -= 1
+                if not self._in_use[handle.key]:
+                    del self._in_use[handle.key]
+                self._evict_layers()
+
+    def _register(
+        self, overlay_gdf: gpd.GeoDataFrame, key: str | None, *, pin: bool
+    ) -> OverlayHandle:
+        key = key or overlay_digest(overlay_gdf)
+        with self._lock:
+            self._check_open()
+            handle = self._layers.get(key)
+            if handle is not None:
+                self._layers.move_to_end(key)
+                if pin:
+                    self._in_use[key] = self._in_use.get(key, 0) + 1
+                return handle
+        name = hashlib.sha1(key.encode(), usedforsecurity=False).hexdigest()
+        path = os.path.join(self._spill_dir, f"{name}.pkl")
+        # Written alongside and renamed into place: a concurrent registration
+        # of the same key may already have workers reading `path`.
+        try:
+            fd, partial = tempfile.mkstemp(dir=self._spill_dir, suffix=".partial")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(
+                    EncodedFrame.from_gdf(overlay_gdf),
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            os.replace(partial, path)
+        except FileNotFoundError as exc:  # spill dir removed by shutdown
+            msg = "spatial worker pool was shut down"
+            raise SpatialPoolUnavailableError(msg) from exc
+        with self._lock:
+            self._check_open()
+            handle = self._layers.setdefault(key, OverlayHandle(key=key, path=path))
+            self._layers.move_to_end(key)
+            if pin:
+                self._in_use[key] = self._in_use.get(key, 0) + 1
+            self._evict_layers()
+        logger.info(
+            f"Registered overlay {key} ({len(overlay_gdf)} features) with the "
+            "spatial worker pool"
+        )
+        return handle
+
+    def map_chunks(
+        self,
+        func: Callable[..., Any],
+        handle: OverlayHandle,
+        chunks: Sequence[gpd.GeoDataFrame],
+        **kwargs: Any,
+    ) -> list[Any]:
+        """Run `func(chunk, overlay, **kwargs)` for each chunk in the workers.
+
+        `handle` should come from `pinned_overlay`, whose block the call runs
+        in. `func` must be a module-level function. GeoDataFrame results are
+        returned decoded, in chunk order. Exceptions raised by `func`
+        propagate unchanged.
+        """
+        try:
+            executor = self._ensure_executor()
+            futures = [
+                executor.submit(
+                    _run_chunk, func, handle, EncodedFrame.from_gdf(chunk), kwargs
+                )
+                for chunk in chunks
+            ]
+            results = [future.result() for future in futures]
+        except BrokenExecutor as exc:
+            self._discard_executor()
+            msg = f"spatial worker pool broke: {exc}"
+            raise SpatialPoolUnavailableError(msg) from exc
+        except (CancelledError, RuntimeError) as exc:
+            # Shut down under this call: submit() on a shut-down executor
+            # raises RuntimeError, its pending futures are cancelled.
+            if isinstance(exc, SpatialPoolUnavailableError) or not self._closed:
+                raise
+            msg = "spatial worker pool was shut down"
+            raise SpatialPoolUnavailableError(msg) from exc
+        return [
+            result.to_gdf() if isinstance(result, EncodedFrame) else result
+            for result in results
+        ]
+
+    def shutdown(self) -> None:
+        """Stop the workers and delete the spill files."""
+        with self._lock:
+            self._closed = True
+        self._discard_executor()
+        shutil.rmtree(self._spill_dir, ignore_errors=True)
+
+    def _check_open(self) -> None:
+        """Raise if the pool was shut down; call with `_lock` held."""
+        if self._closed:
+            msg = "spatial worker pool was shut down"
+            raise SpatialPoolUnavailableError(msg)
+
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            self._check_open()
+            if self._executor is None:
+                context = multiprocessing.get_context("forkserver")
+                context.set_forkserver_preload(_FORKSERVER_PRELOAD)
+                try:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=context,
+                        initializer=_init_worker,
+                        initargs=(self._max_layers,),
+                    )
+                except (NotImplementedError, OSError) as exc:
+                    msg = f"process pools unavailable: {exc}"
+                    raise SpatialPoolUnavailableError(msg) from exc
+                logger.info(
+                    f"Started spatial worker pool with {self.max_workers} worker(s)"
+                )
+            return self._executor
+
+    def _discard_executor(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _evict_layers(self) -> None:
+        """Drop the least recently used idle overlays beyond `max_layers`."""
+        excess = len(self._layers) - self._max_layers
+        for key in list(self._layers):
+            if excess <= 0:
+                break
+            if key in self._in_use:
+                continue
+            handle = self._layers.pop(key)
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(handle.path)
+            excess -= 1
+
+
+_pool: SpatialWorkerPool | None = None
+_pool_pid: int | None = None
+_pool_lock = threading.Lock()
+
+
+def default_max_workers() -> int:
+    """80% of the available CPUs, to avoid saturating the host."""
+    return max(1, int((os.cpu_count() or 4) * 0.8))
+
+
+def get_spatial_pool(max_workers: int | None = None) -> SpatialWorkerPool:
+    """This process's shared pool, started on first use.
+
+    A pool smaller than `max_workers` is replaced by a larger one, unless a
+    call is still using it; that call's caller then gets the smaller pool. A
+    pool inherited across `fork` is never reused.
+    """
+    global _pool, _pool_pid
+    config = SpatialPoolConfig()
+    wanted = max_workers or config.max_workers or default_max_workers()
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            if _pool.max_workers >= wanted or _pool.in_use:
+                return _pool
+            _pool.shutdown()
+        _pool = SpatialWorkerPool(wanted, max_layers=config.max_layers)
+        _pool_pid = os.getpid()
+        return _pool
+
+
+def shutdown_spatial_pool() -> None:
+    """Stop this process's shared pool, if it has one."""
+    global _pool, _pool_pid
+    with _pool_lock:
+        pool, _pool = _pool, None
+        owned = _pool_pid == os.getpid()
+        _pool_pid = None
+    if pool is not None and owned:
+        pool.shutdown()
+
+
+atexit.register(shutdown_spatial_pool)
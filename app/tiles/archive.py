@@ -0,0 +1,156 @@
+"""Pre-rendered MBTiles archives of the tile layers.
+
+The EDP layers are small and only change on a reload, so after a reload the
+data sync warm-up renders each layer's pyramid up to `TILE_ARCHIVE_MAX_ZOOM`
+into one MBTiles (SQLite) file per layer version, `<layer>_v<version>.mbtiles`
+under `TILE_ARCHIVE_DIR`. The tile router then answers those zooms from the
+file, read through SQLite's memory map, without a database connection; zooms
+above it are still rendered live.
+
+Tiles are stored as raw (uncompressed) MVT, as the router serves them, with
+MBTiles' TMS row numbering. The pyramid is only descended below tiles that
+some feature intersects, and a tile with no features is not stored, so any
+tile missing from an archive within its zoom range is empty.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = (
+    "CREATE TABLE metadata (name text, value text)",
+    "CREATE TABLE tiles (zoom_level integer, tile_column integer, "
+    "tile_row integer, tile_data blob)",
+)
+# Built after the tiles are inserted, as the MBTiles spec asks.
+_TILE_INDEX = (
+    "CREATE UNIQUE INDEX tile_index ON tiles (zoom_level, tile_column, tile_row)"
+)
+
+
+def archive_path(directory: str | Path, layer: str, version: int) -> Path:
+    """Where the archive of `layer` at `version` lives."""
+    return Path(directory) / f"{layer}_v{version}.mbtiles"
+
+
+def write_archive(
+    path: Path,
+    layer: str,
+    version: int,
+    max_zoom: int,
+    render: Callable[[int, int, int], bytes | None],
+) -> int:
+    """Render `layer`'s pyramid from z0 to `max_zoom` into an MBTiles file.
+
+    `render(z, x, y)` returns the tile's MVT bytes, or None when no feature
+    intersects the tile (its children are then skipped too). The file is
+    written alongside and renamed into place, so a reader never sees a
+    partial archive. Returns the number of tiles stored.
+    """
+    t0 = time.perf_counter()
+    partial = path.with_name(f".{path.name}.partial")
+    partial.unlink(missing_ok=True)
+    stored = 0
+    conn = sqlite3.connect(partial)
+    try:
+        for statement in _SCHEMA:
+            conn.execute(statement)
+        pending = [(0, 0, 0)]
+        while pending:
+            z, x, y = pending.pop()
+            tile = render(z, x, y)
+            if tile is None:
+                continue
+            if tile:
+                conn.execute(
+                    "INSERT INTO tiles VALUES (?, ?, ?, ?)",
+                    (z, x, (1 << z) - 1 - y, tile),
+                )
+                stored += 1
+            if z < max_zoom:
+                pending.extend(
+                    (z + 1, 2 * x + dx, 2 * y + dy) for dx in (0, 1) for dy in (0, 1)
+                )
+        conn.execute(_TILE_INDEX)
+        conn.executemany(
+            "INSERT INTO metadata VALUES (?, ?)",
+            [
+                ("name", layer),
+                ("format", "pbf"),
+                ("minzoom", "0"),
+                ("maxzoom", str(max_zoom)),
+                ("version", str(version)),
+            ],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(partial, path)
+    logger.info(
+        "Seeded tile archive %s (z0-%d, %d tiles, %d bytes) in %.1fs",
+        path.name,
+        max_zoom,
+        stored,
+        path.stat().st_size,
+        time.perf_counter() - t0,
+    )
+    return stored
+
+
+def prune_archives(directory: str | Path, layer: str, keep: int = 2) -> list[Path]:
+    """Delete all but the `keep` newest versions of `layer`'s archive, as
+    reloads keep the newest two versions of each table. Returns the deleted
+    files. A router already reading a deleted file keeps its open copy until
+    it opens a newer version of the layer."""
+    archives = sorted(
+        Path(directory).glob(f"{layer}_v*.mbtiles"),
+        key=lambda p: int(p.stem.rpartition("_v")[2]),
+        reverse=True,
+    )
+    for stale in archives[keep:]:
+        stale.unlink(missing_ok=True)
+    return archives[keep:]
+
+
+class TileArchive:
+    """One archive opened read-only, immutable and memory-mapped."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        # immutable=1: the file never changes once renamed into place, so
+        # SQLite skips locking and change detection on every read.
+        self._conn = sqlite3.connect(
+            f"file:{path}?mode=ro&immutable=1", uri=True, check_same_thread=False
+        )
+        self._conn.execute(f"PRAGMA mmap_size = {path.stat().st_size}")
+        self._lock = threading.Lock()
+        self._closed = False
+        metadata = dict(self._conn.execute("SELECT name, value FROM metadata"))
+        self.max_zoom = int(metadata["maxzoom"])
+
+    def get(self, z: int, x: int, y: int) -> bytes | None:
+        """Return the tile's bytes (b"" if it has no features), or None if
+        `z` is above the archive's zoom range or the archive has been closed."""
+        if z > self.max_zoom:
+            return None
+        with self._lock:
+            if self._closed:
+                return None
+            row = self._conn.execute(
+                "SELECT tile_data FROM tiles "
+                "WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?",
+                (z, x, (1 << z) - 1 - y),
+            ).fetchone()
+        return bytes(row[0]) if row else b""
+
+    def close(self) -> None:
+        """Close the archive; a `get` still racing with it returns None."""
+        with self._lock:
+            self._closed = True
+            self._conn.close()
@@ -2,6 +2,10 @@
 
 Serves spatial reference layers as Mapbox Vector Tiles (MVT) via:
     GET /tiles/{layer}/{z}/{x}/{y}.mvt
+
+Up to `TILE_ARCHIVE_MAX_ZOOM`, tiles come from the layer version's
+pre-rendered archive (app/tiles/archive.py) when one has been seeded; other
+tiles are rendered by PostGIS and kept in an in-process LRU cache.
 """
 
 import dataclasses
@@ -11,14 +15,21 @@ import logging
 import threading
 import time
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import Response
 from sqlalchemy import text
+from sqlalchemy.sql.elements import TextClause
 
+from app.common.metrics import counter
 from app.config import TileServerConfig
+from app.data_sync.active_version import get_active_version
 from app.repositories.engine import get_shared_repository
+from app.repositories.generation import get_reference_generations
 from app.repositories.repository import Repository
+from app.tiles.archive import TileArchive, archive_path, prune_archives, write_archive
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +66,25 @@ _version_cache_lock = threading.Lock()
 _tile_cache: OrderedDict[tuple, tuple[bytes, float]] = OrderedDict()
 _tile_cache_lock = threading.Lock()
 
+# Renders in progress, by tile cache key; guarded by _tile_cache_lock. A miss
+# for a key already here waits for that render instead of starting its own.
+_inflight: dict[tuple, "_Render"] = {}
+
+# Background refreshes of stale tiles (stale_while_revalidate_seconds > 0).
+_refresh_pool: ThreadPoolExecutor | None = None
+_refresh_pool_lock = threading.Lock()
+
+# Coalescing counters since startup (see tile_stats); also sent as metrics.
+_stats = {"renders": 0, "coalesced": 0, "coalesce_timeouts": 0, "stale_served": 0}
+_stats_lock = threading.Lock()
+
+# Opened archives: (layer_slug, version) → (archive or None, recheck at).
+# A missing archive is looked for again after version_ttl_seconds, since it
+# may still be being seeded. Opening a layer's archive closes and forgets its
+# older versions, whose files a later seed prunes.
+_archives: dict[tuple[str, int], tuple[TileArchive | None, float]] = {}
+_archives_lock = threading.Lock()
+
 # Monotonic request counter for 1-in-N sampling of cheap cache-hit timing logs.
 _log_counter = itertools.count()
 
@@ -85,6 +115,20 @@ _TILE_SQL_TEMPLATE = """
     WHERE q.geom IS NOT NULL
 """
 
+# Whether any feature intersects a tile. Seeding descends below a tile only
+# if so: a tile's MVT can be empty when its features collapse at that zoom.
+_TILE_EXISTS_SQL_TEMPLATE = """
+    SELECT EXISTS (
+        SELECT 1
+        FROM {table} sl
+        WHERE sl.version = :version
+          AND ST_Intersects(
+                sl.geometry,
+                ST_Transform(ST_TileEnvelope(:z, :x, :y), 27700)
+              )
+    )
+"""
+
 # ---------------------------------------------------------------------------
 # Timing
 # ---------------------------------------------------------------------------
@@ -100,14 +144,20 @@ class TileTimings:
       - ``query_ms``: server-side PostGIS execution + network transfer of the
         result bytea. Compare against ``size_bytes`` to separate compute from
         transfer.
+      - ``wait_ms``: time spent waiting on another request's render of the
+        same tile (``coalesced``).
     """
 
     version_ms: float = 0.0
     cache_ms: float = 0.0
     connect_ms: float = 0.0
     query_ms: float = 0.0
+    wait_ms: float = 0.0
     total_ms: float = 0.0
     cache_hit: bool = False
+    archive_hit: bool = False
+    coalesced: bool = False
+    stale: bool = False
     size_bytes: int = 0
 
     def server_timing_header(self) -> str:
@@ -118,6 +168,7 @@ class TileTimings:
                 f"cache;dur={self.cache_ms:.3f}",
                 f"connect;dur={self.connect_ms:.1f}",
                 f"query;dur={self.query_ms:.1f}",
+                f"wait;dur={self.wait_ms:.1f}",
                 f"total;dur={self.total_ms:.1f}",
                 f"size;desc=bytes;dur={self.size_bytes}",
             )
@@ -134,8 +185,27 @@ def _get_repository() -> Repository:
     return get_shared_repository()
 
 
+def _query_layer_version(slug: str) -> int:
+    """Read the active version of the given layer from the database."""
+    table = TILE_LAYERS[slug]
+    repo = _get_repository()
+    with repo.engine.connect() as conn:
+        return get_active_version(conn, table.removeprefix("public."))
+
+
 def _resolve_layer_version(slug: str) -> int:
-    """Return the current max version for the given layer, cached with TTL."""
+    """Return the active version for the given layer.
+
+    Served from the reference generation registry while it is live (updated
+    by reload/rollback notifications); otherwise cached here with a TTL.
+    """
+    registry = get_reference_generations()
+    if registry.live:
+        return registry.get(
+            TILE_LAYERS[slug].removeprefix("public."),
+            lambda: _query_layer_version(slug),
+        )
+
     now = time.monotonic()
 
     with _version_cache_lock:
@@ -144,19 +214,17 @@ def _resolve_layer_version(slug: str) -> int:
             if now < expiry:
                 return version
 
-    table = TILE_LAYERS[slug]
-    repo = _get_repository()
-    with repo.engine.connect() as conn:
-        row = conn.execute(
-            text(f"SELECT MAX(version) FROM {table}"),  # noqa: S608
-        ).fetchone()
-
-    version = row[0] if row and row[0] is not None else 1
+    version = _query_layer_version(slug)
     with _version_cache_lock:
         _version_cache[slug] = (version, now + _tile_config.version_ttl_seconds)
     return version
 
 
+def _tile_sql(slug: str) -> TextClause:
+    """The MVT query for the given layer."""
+    return text(_TILE_SQL_TEMPLATE.format(table=TILE_LAYERS[slug]))
+
+
 def _query_tile(
     z: int,
     x: int,
@@ -167,8 +235,7 @@ def _query_tile(
     timings: TileTimings,
 ) -> bytes:
     """Execute the MVT SQL query against the dedicated layer table and return raw tile bytes."""
-    table = TILE_LAYERS[slug]
-    sql = text(_TILE_SQL_TEMPLATE.format(table=table))
+    sql = _tile_sql(slug)
     repo = _get_repository()
     t0 = time.perf_counter()
     with repo.engine.connect() as conn:
@@ -182,8 +249,107 @@ def _query_tile(
     return bytes(row[0]) if row and row[0] else b""
 
 
+class _Render:
+    """One in-progress render of a tile, which concurrent misses wait on."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.tile = b""
+        self.error: BaseException | None = None
+
+
+def _count(stat: str, metric: str) -> None:
+    with _stats_lock:
+        _stats[stat] += 1
+    counter(metric, 1)
+
+
+def tile_stats() -> dict[str, int]:
+    """Renders, coalesced waits, coalescing timeouts and stale tiles served
+    since startup."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def _store_tile(cache_key: tuple, tile_bytes: bytes) -> None:
+    with _tile_cache_lock:
+        _tile_cache.pop(cache_key, None)
+        # Evict oldest entries when at capacity
+        while len(_tile_cache) >= _tile_config.cache_max_size:
+            _tile_cache.popitem(last=False)
+        _tile_cache[cache_key] = (
+            tile_bytes,
+            time.monotonic() + _tile_config.cache_ttl_seconds,
+        )
+
+
+def _render(render: _Render, cache_key: tuple, timings: TileTimings) -> bytes:
+    """Render the tile for `cache_key` as the one request doing so, cache it,
+    and hand the result (or the error) to every request waiting on it."""
+    layer_slug, z, x, y, version = cache_key
+    try:
+        with _stats_lock:
+            _stats["renders"] += 1
+        render.tile = _query_tile(z, x, y, layer_slug, layer_slug, version, timings)
+        _store_tile(cache_key, render.tile)
+        return render.tile
+    except BaseException as exc:
+        render.error = exc
+        raise
+    finally:
+        with _tile_cache_lock:
+            _inflight.pop(cache_key, None)
+        render.done.set()
+
+
+def _await_render(render: _Render, cache_key: tuple, timings: TileTimings) -> bytes:
+    """Wait for another request's render of the same tile and share its
+    result, re-raising its error. Past the timeout, render it here."""
+    t_wait = time.perf_counter()
+    finished = render.done.wait(_tile_config.coalesce_timeout_seconds)
+    timings.wait_ms = (time.perf_counter() - t_wait) * 1000
+    if not finished:
+        _count("coalesce_timeouts", "TileCoalesceTimeout")
+        logger.warning(
+            "tile render still running after %.1fs; rendering it again",
+            _tile_config.coalesce_timeout_seconds,
+        )
+        layer_slug, z, x, y, version = cache_key
+        return _query_tile(z, x, y, layer_slug, layer_slug, version, timings)
+    timings.coalesced = True
+    _count("coalesced", "TileCoalesced")
+    if render.error is not None:
+        raise render.error
+    return render.tile
+
+
+def _refresh(render: _Render, cache_key: tuple) -> None:
+    try:
+        _render(render, cache_key, TileTimings())
+    except Exception:
+        logger.warning("background tile refresh failed", exc_info=True)
+
+
+def _schedule_refresh(render: _Render, cache_key: tuple) -> None:
+    global _refresh_pool
+    with _refresh_pool_lock:
+        if _refresh_pool is None:
+            _refresh_pool = ThreadPoolExecutor(
+                max_workers=_tile_config.refresh_workers,
+                thread_name_prefix="tile-refresh",
+            )
+    _refresh_pool.submit(_refresh, render, cache_key)
+
+
 def _get_tile(layer_slug: str, z: int, x: int, y: int) -> tuple[bytes, TileTimings]:
-    """Return tile bytes (with phase timings) from cache, or query PostGIS on a miss."""
+    """Return tile bytes (with phase timings) from the archive or cache, or
+    query PostGIS on a miss.
+
+    Concurrent misses for the same tile share one query: the first registers
+    a render in `_inflight` and the rest wait on it. With
+    `stale_while_revalidate_seconds`, a recently expired tile is returned at
+    once while one background render replaces it.
+    """
     timings = TileTimings()
     t_start = time.perf_counter()
 
@@ -191,8 +357,20 @@ def _get_tile(layer_slug: str, z: int, x: int, y: int) -> tuple[bytes, TileTimin
     version = _resolve_layer_version(layer_slug)
     timings.version_ms = (time.perf_counter() - t_version) * 1000
 
+    archive = _layer_archive(layer_slug, version)
+    if archive is not None:
+        t_archive = time.perf_counter()
+        tile_bytes = archive.get(z, x, y)
+        if tile_bytes is not None:
+            timings.archive_hit = True
+            timings.cache_ms = (time.perf_counter() - t_archive) * 1000
+            timings.size_bytes = len(tile_bytes)
+            timings.total_ms = (time.perf_counter() - t_start) * 1000
+            return tile_bytes, timings
+
     cache_key = (layer_slug, z, x, y, version)
     now = time.monotonic()
+    stale: bytes | None = None
 
     t_cache = time.perf_counter()
     with _tile_cache_lock:
@@ -205,27 +383,129 @@ def _get_tile(layer_slug: str, z: int, x: int, y: int) -> tuple[bytes, TileTimin
                 timings.size_bytes = len(tile_bytes)
                 timings.total_ms = (time.perf_counter() - t_start) * 1000
                 return tile_bytes, timings
-            del _tile_cache[cache_key]
+            if now < expiry + _tile_config.stale_while_revalidate_seconds:
+                _tile_cache.move_to_end(cache_key)
+                stale = tile_bytes
+            else:
+                del _tile_cache[cache_key]
+        render = _inflight.get(cache_key)
+        leader = render is None
+        if render is None:
+            render = _inflight[cache_key] = _Render()
     timings.cache_ms = (time.perf_counter() - t_cache) * 1000
 
-    tile_bytes = _query_tile(z, x, y, layer_slug, layer_slug, version, timings)
-
-    with _tile_cache_lock:
-        # Evict oldest entries when at capacity
-        while len(_tile_cache) >= _tile_config.cache_max_size:
-            _tile_cache.popitem(last=False)
-        _tile_cache[cache_key] = (tile_bytes, now + _tile_config.cache_ttl_seconds)
+    if stale is not None:
+        if leader:
+            try:
+                _schedule_refresh(render, cache_key)
+            except Exception as exc:
+                # Nothing will finish this render: release it, so the next
+                # request (or the stale window's end) renders the tile.
+                render.error = exc
+                with _tile_cache_lock:
+                    _inflight.pop(cache_key, None)
+                render.done.set()
+                logger.warning("could not schedule tile refresh", exc_info=True)
+        _count("stale_served", "TileStaleServed")
+        timings.cache_hit = timings.stale = True
+        tile_bytes = stale
+    elif leader:
+        tile_bytes = _render(render, cache_key, timings)
+    else:
+        tile_bytes = _await_render(render, cache_key, timings)
 
     timings.size_bytes = len(tile_bytes)
     timings.total_ms = (time.perf_counter() - t_start) * 1000
     return tile_bytes, timings
 
 
+def _layer_archive(slug: str, version: int) -> TileArchive | None:
+    """Return the seeded archive of `slug` at `version`, if there is one."""
+    if not _tile_config.archive_dir:
+        return None
+    key = (slug, version)
+    now = time.monotonic()
+    with _archives_lock:
+        entry = _archives.get(key)
+        if entry is not None and (entry[0] is not None or now < entry[1]):
+            return entry[0]
+        path = archive_path(_tile_config.archive_dir, slug, version)
+        archive = None
+        if path.exists():
+            try:
+                archive = TileArchive(path)
+            except Exception:
+                logger.exception("Could not open tile archive %s", path.name)
+        if archive is not None:
+            for other in [k for k in _archives if k[0] == slug and k[1] < version]:
+                superseded, _ = _archives.pop(other)
+                if superseded is not None:
+                    superseded.close()
+        _archives[key] = (archive, now + _tile_config.version_ttl_seconds)
+        return archive
+
+
+def seed_tile_archive(layer_slug: str, version: int) -> int:
+    """Render `layer_slug` at `version` up to `archive_max_zoom` into its
+    archive, and delete archives of versions no longer retained. Used by the
+    post-reload warm-up; returns the number of tiles stored."""
+    if not _tile_config.archive_dir:
+        msg = "TILE_ARCHIVE_DIR is not set"
+        raise ValueError(msg)
+    directory = Path(_tile_config.archive_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    tile_sql = _tile_sql(layer_slug)
+    exists_sql = text(_TILE_EXISTS_SQL_TEMPLATE.format(table=TILE_LAYERS[layer_slug]))
+    with _get_repository().engine.connect() as conn:
+
+        def render(z: int, x: int, y: int) -> bytes | None:
+            params = {"z": z, "x": x, "y": y, "version": version}
+            if not conn.execute(exists_sql, params).scalar():
+                return None
+            row = conn.execute(
+                tile_sql, {**params, "layer_name": layer_slug}
+            ).fetchone()
+            return bytes(row[0]) if row and row[0] else b""
+
+        stored = write_archive(
+            archive_path(directory, layer_slug, version),
+            layer_slug,
+            version,
+            _tile_config.archive_max_zoom,
+            render,
+        )
+    prune_archives(directory, layer_slug)
+    with _archives_lock:
+        # Forget a "not seeded yet" lookup so this process serves it at once.
+        _archives.pop((layer_slug, version), None)
+    return stored
+
+
+def warm_tile(layer_slug: str, z: int, x: int, y: int) -> int:
+    """Render one tile into the cache ahead of any request for it (used by the
+    post-reload warm-up). Returns the tile's size in bytes."""
+    if layer_slug not in TILE_LAYERS:
+        msg = f"unknown tile layer {layer_slug!r}"
+        raise ValueError(msg)
+    tile_bytes, _timings = _get_tile(layer_slug, z, x, y)
+    return len(tile_bytes)
+
+
+def _source_label(timings: TileTimings) -> str:
+    if timings.archive_hit:
+        return "ARCHIVE"
+    if timings.stale:
+        return "STALE"
+    if timings.cache_hit:
+        return "HIT"
+    return "COALESCED" if timings.coalesced else "MISS"
+
+
 def _log_tile_timing(layer: str, z: int, x: int, y: int, timings: TileTimings) -> None:
     """Emit phase timings, always for DB misses/slow requests and 1-in-N hits."""
     is_slow = timings.total_ms >= _tile_config.log_slow_ms
     is_sampled = next(_log_counter) % _tile_config.log_sample_n == 0
-    if timings.cache_hit and not is_slow and not is_sampled:
+    if (timings.cache_hit or timings.archive_hit) and not is_slow and not is_sampled:
         return
 
     # Resolve to a canonical constant label via the allow-list map; the request
@@ -233,17 +513,18 @@ def _log_tile_timing(layer: str, z: int, x: int, y: int, timings: TileTimings) -
     safe_layer = _LOG_LAYER_LABELS.get(layer, "unknown")
     logger.info(
         "tile %s/%d/%d/%d %s total=%.1fms version=%.1fms cache=%.3fms "
-        "connect=%.1fms query=%.1fms size=%dB",
+        "connect=%.1fms query=%.1fms wait=%.1fms size=%dB",
         safe_layer,
         int(z),
         int(x),
         int(y),
-        "HIT" if timings.cache_hit else "MISS",
+        _source_label(timings),
         timings.total_ms,
         timings.version_ms,
         timings.cache_ms,
         timings.connect_ms,
         timings.query_ms,
+        timings.wait_ms,
         timings.size_bytes,
     )
 
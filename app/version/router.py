@@ -18,6 +18,11 @@ def _get_git_hash() -> str:
 _git_hash = _get_git_hash()
 
 
+def get_app_version() -> str:
+    """The deployed build's git hash ("unknown" outside a build)."""
+    return _git_hash
+
+
 @router.get("/version")
 async def version():
     return {"version": _git_hash}
@@ -0,0 +1,371 @@
+"""Concurrent SQS consumption: a supervisor feeding a pool of worker processes.
+
+`SqsConsumer` runs one assessment at a time, so a single slow job (a large
+boundary against the coefficient layer) blocks the whole container while its
+other cores sit idle. `SqsWorkerPool` keeps up to `concurrency` messages in
+flight instead:
+
+- the supervisor (the main thread) long-polls SQS only while a slot is free,
+  asking for at most as many messages as there are free slots;
+- each slot is a thread in the supervisor process that owns one worker
+  process, started through a forkserver with geopandas and the application
+  preloaded. Each worker builds its own `JobOrchestrator` (and engine) once
+  and processes the jobs it is sent, one at a time;
+- every in-flight message has its own visibility heartbeat, and is deleted
+  only when its worker reports success. A failed job, or one whose worker
+  died, is left on the queue for redelivery / DLQ and the worker respawned.
+
+On SIGTERM the supervisor stops polling and drains: in-flight jobs get
+`drain_timeout` seconds to finish, after which their workers are killed and
+the messages left on the queue.
+"""
+
+import contextlib
+import logging
+import multiprocessing
+import queue
+import signal
+import threading
+import time
+from collections.abc import Callable
+from multiprocessing.connection import Connection
+from typing import Any, Protocol
+
+from app.aws.sqs import SQSClient
+from app.models.enums import AssessmentType
+from app.models.job import ImpactAssessmentJob
+
+logger = logging.getLogger(__name__)
+
+# SQS returns at most 10 messages per ReceiveMessage call.
+_SQS_MAX_MESSAGES = 10
+
+# Imported once in the forkserver so every worker starts with them loaded.
+_FORKSERVER_PRELOAD = ["geopandas", "app.consumer", "app.orchestrator"]
+
+_WORKER_EXITED = "worker process exited"
+
+
+class VisibilityHeartbeat:
+    """Keep one in-flight SQS message invisible until stopped.
+
+    Renews at 2/3 of the timeout so there is always a comfortable margin before
+    the window expires. Without this, any job exceeding visibility_timeout
+    seconds would be re-delivered by SQS and processed twice.
+    """
+
+    def __init__(
+        self, sqs_client: SQSClient, receipt_handle: str, visibility_timeout: int
+    ) -> None:
+        self._sqs_client = sqs_client
+        self._receipt_handle = receipt_handle
+        self._visibility_timeout = visibility_timeout
+        self._interval = max(30, visibility_timeout * 2 // 3)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> "VisibilityHeartbeat":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            self._sqs_client.change_message_visibility(
+                self._receipt_handle, self._visibility_timeout
+            )
+            logger.debug(
+                f"Extended SQS visibility timeout by {self._visibility_timeout}s"
+            )
+
+
+class Worker(Protocol):
+    """A process that runs jobs sent to it one at a time."""
+
+    def run_job(self, job: ImpactAssessmentJob) -> str | None:
+        """Process `job`; return None on success or an error description.
+
+        Raises EOFError or OSError if the process dies mid-job.
+        """
+
+    def is_alive(self) -> bool: ...
+
+    def stop(self, timeout: float) -> None: ...
+
+    def kill(self) -> None: ...
+
+
+def _worker_main(
+    conn: Connection, index: int, orchestrator_factory: Callable[[], Any]
+) -> None:
+    """Worker process entry point: build an orchestrator, then serve jobs."""
+    # Shutdown is driven by the supervisor (sentinel, or kill after the drain
+    # timeout), not by signals delivered to the whole process group.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
+    orchestrator = orchestrator_factory()
+    logger.info(f"Assessment worker {index} ready")
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        try:
+            orchestrator.process_job(job, AssessmentType.NUTRIENT)
+        except Exception as e:
+            logger.exception(
+                f"Job {job.reference or 'unknown'} failed in worker {index}"
+            )
+            conn.send(f"{type(e).__name__}: {e}")
+        else:
+            conn.send(None)
+    conn.close()
+
+
+class WorkerProcess:
+    """A worker process started from `context`, talking over a pipe."""
+
+    def __init__(
+        self,
+        context: multiprocessing.context.BaseContext,
+        index: int,
+        orchestrator_factory: Callable[[], Any],
+    ) -> None:
+        self._conn, child_conn = context.Pipe()
+        # Not a daemon: the assessment runs its own spatial process pools,
+        # which daemonic processes may not create.
+        self._process = context.Process(
+            target=_worker_main,
+            args=(child_conn, index, orchestrator_factory),
+            name=f"assessment-worker-{index}",
+        )
+        self._process.start()
+        child_conn.close()
+
+    def run_job(self, job: ImpactAssessmentJob) -> str | None:
+        self._conn.send(job)
+        return self._conn.recv()
+
+    def is_alive(self) -> bool:
+        return self._process.is_alive()
+
+    def stop(self, timeout: float) -> None:
+        with contextlib.suppress(OSError):
+            self._conn.send(None)
+        self._process.join(timeout)
+        if self._process.is_alive():
+            self.kill()
+        self._conn.close()
+
+    def kill(self) -> None:
+        self._process.kill()
+        self._process.join(5)
+
+
+def forkserver_worker_factory(
+    orchestrator_factory: Callable[[], Any],
+) -> Callable[[int], Worker]:
+    """Return a `start_worker` callable launching workers via a forkserver."""
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(_FORKSERVER_PRELOAD)
+    return lambda index: WorkerProcess(context, index, orchestrator_factory)
+
+
+class SqsWorkerPool:
+    """Supervisor keeping up to `concurrency` SQS messages in flight."""
+
+    def __init__(
+        self,
+        sqs_client: SQSClient,
+        start_worker: Callable[[int], Worker],
+        *,
+        concurrency: int,
+        visibility_timeout: int = 300,
+        drain_timeout: float = 25.0,
+    ) -> None:
+        self.sqs_client = sqs_client
+        self._start_worker = start_worker
+        self._concurrency = concurrency
+        self._visibility_timeout = visibility_timeout
+        self._drain_timeout = drain_timeout
+        self._free_slots = threading.Semaphore(concurrency)
+        self._jobs: queue.Queue = queue.Queue()
+        self._workers: dict[int, Worker] = {}
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+        self.running = True
+
+        signal.signal(signal.SIGTERM, self._handle_sigterm)
+        signal.signal(signal.SIGINT, self._handle_sigint)
+
+    def run(self) -> None:
+        """Poll and dispatch until asked to stop, then drain."""
+        self._threads = [
+            threading.Thread(
+                target=self._slot_loop, args=(i,), name=f"assessment-slot-{i}"
+            )
+            for i in range(self._concurrency)
+        ]
+        for thread in self._threads:
+            thread.start()
+        logger.info(
+            f"SQS worker pool started with {self._concurrency} worker(s), "
+            "polling for jobs..."
+        )
+
+        try:
+            while self.running:
+                reserved = self._reserve_slots()
+                if not reserved:
+                    continue
+                try:
+                    results = self.sqs_client.receive_messages(max_messages=reserved)
+                except Exception as e:
+                    logger.exception(f"Unexpected error in supervisor loop: {e}")
+                    self._release_slots(reserved)
+                    time.sleep(5)
+                    continue
+                if results:
+                    logger.info(f"SQS poll received {len(results)} message(s)")
+                for job_message, receipt_handle in results:
+                    self._dispatch(job_message, receipt_handle)
+                self._release_slots(reserved - len(results))
+        finally:
+            self._drain()
+
+        logger.info("SQS worker pool stopped")
+
+    def _reserve_slots(self) -> int:
+        """Claim the free slots (at least one, up to a full SQS batch)."""
+        if not self._free_slots.acquire(timeout=1):
+            return 0
+        reserved = 1
+        limit = min(self._concurrency, _SQS_MAX_MESSAGES)
+        while reserved < limit and self._free_slots.acquire(blocking=False):
+            reserved += 1
+        return reserved
+
+    def _release_slots(self, count: int) -> None:
+        for _ in range(count):
+            self._free_slots.release()
+
+    def _dispatch(self, job_message: ImpactAssessmentJob, receipt_handle: str) -> None:
+        job_id = job_message.reference or "unknown"
+        if not self.running:
+            # Received while shutting down: hand it straight back to SQS.
+            logger.info(f"Shutting down; returning job {job_id} to the queue")
+            self.sqs_client.change_message_visibility(receipt_handle, 0)
+            self._free_slots.release()
+            return
+        heartbeat = VisibilityHeartbeat(
+            self.sqs_client, receipt_handle, self._visibility_timeout
+        ).start()
+        logger.info(f"Dispatching job: {job_id}")
+        with self._in_flight_lock:
+            self._in_flight += 1
+        self._jobs.put((job_message, receipt_handle, heartbeat))
+
+    def _slot_loop(self, index: int) -> None:
+        """Feed one worker process with jobs until the drain sentinel."""
+        worker = self._ensure_worker(index, None)
+        while True:
+            item = self._jobs.get()
+            if item is None:
+                break
+            job_message, receipt_handle, heartbeat = item
+            job_id = job_message.reference or "unknown"
+            start = time.perf_counter()
+            try:
+                worker = self._ensure_worker(index, worker)
+                if worker is None:
+                    error = "worker process could not be started"
+                else:
+                    error = worker.run_job(job_message)
+            except (EOFError, OSError):
+                error = _WORKER_EXITED
+                worker = None
+            finally:
+                heartbeat.stop()
+            self._complete(job_id, receipt_handle, error, time.perf_counter() - start)
+            with self._in_flight_lock:
+                self._in_flight -= 1
+            self._free_slots.release()
+        if worker is not None:
+            worker.stop(timeout=5)
+
+    def _ensure_worker(self, index: int, worker: Worker | None) -> Worker | None:
+        if worker is not None and worker.is_alive():
+            return worker
+        if worker is not None:
+            logger.warning(f"Assessment worker {index} died; restarting it")
+        try:
+            worker = self._start_worker(index)
+        except Exception:
+            logger.exception(f"Failed to start assessment worker {index}")
+            return None
+        self._workers[index] = worker
+        return worker
+
+    def _complete(
+        self, job_id: str, receipt_handle: str, error: str | None, elapsed: float
+    ) -> None:
+        if error is not None:
+            # Leave the message on the queue: SQS redelivers it and, after
+            # maxReceiveCount, moves it to the DLQ.
+            logger.error(
+                f"Job {job_id} failed ({error}); leaving message on queue "
+                "for redelivery / DLQ"
+            )
+            return
+        try:
+            self.sqs_client.delete_message(receipt_handle)
+        except Exception:
+            logger.exception(f"Job {job_id} completed but its message was not deleted")
+            return
+        logger.info(
+            f"Job {job_id} processing complete in {elapsed:.1f}s, "
+            "message deleted from queue"
+        )
+
+    def _drain(self) -> None:
+        """Let in-flight jobs finish within the drain timeout, then stop."""
+        logger.info(
+            f"Draining {self._in_flight} in-flight job(s) "
+            f"(timeout {self._drain_timeout:.0f}s)..."
+        )
+        for _ in self._threads:
+            self._jobs.put(None)
+        deadline = time.monotonic() + self._drain_timeout
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+
+        stuck = [i for i, t in enumerate(self._threads) if t.is_alive()]
+        if stuck:
+            logger.warning(
+                f"Drain timeout reached; killing {len(stuck)} worker(s). "
+                "Their messages stay on the queue for redelivery"
+            )
+            for index in stuck:
+                worker = self._workers.get(index)
+                if worker is not None:
+                    worker.kill()
+            for index in stuck:
+                self._threads[index].join(5)
+
+    def _handle_sigterm(self, _signum, _frame):
+        """Handle SIGTERM for graceful ECS task shutdown."""
+        logger.info("Received SIGTERM, draining in-flight jobs...")
+        self.running = False
+
+    def _handle_sigint(self, _signum, _frame):
+        """Handle SIGINT (Ctrl+C) for local testing."""
+        logger.info("Received SIGINT, draining in-flight jobs...")
+        self.running = False
@@ -21,8 +21,9 @@ from geoalchemy2.functions import (
 from pydantic import BaseModel, ConfigDict, Field
 from pydantic.alias_generators import to_camel
 from shapely.geometry import shape
-from sqlalchemy import select, text
+from sqlalchemy import select
 
+from app.data_sync.active_version import cached_active_version
 from app.models.db import LookupTable, WwtwCatchments
 from app.repositories.engine import get_shared_repository
 from app.repositories.repository import Repository
@@ -49,11 +50,7 @@ def _load_wwtw_lookup(repository: Repository) -> pd.DataFrame:
     name = "wwtw_lookup"
 
     with repository.session() as session:
-        row = session.execute(
-            text("SELECT MAX(version) FROM public.lookup_table WHERE name = :name"),
-            {"name": name},
-        ).fetchone()
-    version = row[0] if row and row[0] is not None else 1
+        version = cached_active_version(session, "lookup_table")
 
     cache_key = (name, version)
     with _lookup_cache_lock:
@@ -148,7 +145,7 @@ def _find_nearby_wwtws(
 
     stmt = (
         select(
-            WwtwCatchments.attributes["WwTw_ID"].astext.label("wwtw_id"),
+            WwtwCatchments.wwtw_id,
             ST_Distance(WwtwCatchments.geometry, rlb_centroid).label("distance_m"),
         )
         .where(
@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+
+"""Benchmark the fused scenario kernel against the per-call calculators.
+
+Evaluates N synthetic developments under K scenarios both ways: the per-call
+path the assessment uses for one configuration (row uplift, pandas group sum,
+SuDS, wastewater once per permit period, buffer), repeated per scenario, and
+one `evaluate_scenarios` call. Both use row-level land use, so the kernel's
+per-development segment sum is included in its timing.
+
+No database is needed.
+
+Usage:
+    uv run python scripts/benchmark_scenarios.py
+    uv run python scripts/benchmark_scenarios.py --developments 1000 --scenarios 10
+    uv run python scripts/benchmark_scenarios.py --greenspace-variants 1
+"""
+
+import statistics
+import time
+from typing import Annotated
+
+import numpy as np
+import pandas as pd
+import typer
+
+from app.calculators import (
+    LandUseTerms,
+    ScenarioParameters,
+    apply_buffer,
+    apply_suds_mitigation,
+    calculate_land_use_uplift,
+    calculate_wastewater_load,
+    evaluate_scenarios,
+)
+from app.config import AssessmentConfig, GreenspaceConfig, SuDsConfig
+
+app = typer.Typer(help="Benchmark the scenario kernel against per-call calculators")
+
+
+def _configs(k: int, greenspace_variants: int, seed: int = 0) -> list[AssessmentConfig]:
+    rng = np.random.default_rng(seed)
+    base = AssessmentConfig()
+    greenspace_percents = rng.uniform(0, 50, greenspace_variants)
+    return [
+        base.model_copy(
+            update={
+                "greenspace": GreenspaceConfig(
+                    greenspace_percent=float(
+                        greenspace_percents[i % greenspace_variants]
+                    )
+                ),
+                "suds": SuDsConfig(
+                    removal_rate_percent=float(rng.uniform(0, 50)),
+                    threshold_dwellings=int(rng.integers(1, 100)),
+                ),
+            }
+        )
+        for i in range(k)
+    ]
+
+
+def _inputs(n: int, k: int, rows_per_dev: int, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    r = n * rows_per_dev
+    return {
+        "dev_area_ha": np.round(rng.uniform(0.05, 4.0, n), 2),
+        "dwellings": rng.integers(1, 150, (n, k)).astype(float),
+        "occupancy_rate": rng.uniform(1.8, 2.6, n),
+        "water_usage": rng.uniform(100, 140, n),
+        "n_conc": rng.uniform(0, 25, (2, n)),
+        "p_conc": rng.uniform(0, 3, (2, n)),
+        "land_use": LandUseTerms(
+            development=rng.integers(0, n, r),
+            n_area_ha=(area := rng.uniform(0.001, 2.0, r)),
+            p_area_ha=area,
+            n_current=rng.uniform(2, 40, r),
+            n_residential=rng.uniform(10, 16, r),
+            p_current=rng.uniform(0.05, 2, r),
+            p_residential=rng.uniform(0.8, 1.4, r),
+        ),
+    }
+
+
+def _per_call(inputs: dict, configs: list[AssessmentConfig]) -> None:
+    lu = inputs["land_use"]
+    n = len(inputs["dev_area_ha"])
+    row_dev_area = inputs["dev_area_ha"][lu.development]
+    for k, config in enumerate(configs):
+        row_n, row_p = calculate_land_use_uplift(
+            area_hectares=lu.n_area_ha,
+            dev_area_ha=row_dev_area,
+            current_nitrogen_coeff=lu.n_current,
+            residential_nitrogen_coeff=lu.n_residential,
+            current_phosphorus_coeff=lu.p_current,
+            residential_phosphorus_coeff=lu.p_residential,
+            greenspace_config=config.greenspace,
+        )
+        sums = (
+            pd.DataFrame({"dev": lu.development, "n": row_n, "p": row_p})
+            .groupby("dev")
+            .sum()
+            .reindex(range(n))
+        )
+        dwellings = inputs["dwellings"][:, k]
+        n_post, p_post = apply_suds_mitigation(
+            n_lu_uplift=sums["n"],
+            p_lu_uplift=sums["p"],
+            dwellings=dwellings,
+            suds_config=config.suds,
+        )
+        for period in range(2):
+            _, n_ww, p_ww = calculate_wastewater_load(
+                dwellings=dwellings,
+                occupancy_rate=inputs["occupancy_rate"],
+                water_usage_litres_per_person_per_day=inputs["water_usage"],
+                nitrogen_conc_mg_per_litre=inputs["n_conc"][period],
+                phosphorus_conc_mg_per_litre=inputs["p_conc"][period],
+            )
+            apply_buffer(
+                nitrogen_land_use_post_suds=n_post.fillna(0),
+                phosphorus_land_use_post_suds=p_post.fillna(0),
+                nitrogen_wastewater=n_ww,
+                phosphorus_wastewater=p_ww,
+                precautionary_buffer_percent=config.precautionary_buffer_percent,
+            )
+
+
+def _kernel(inputs: dict, configs: list[AssessmentConfig]) -> None:
+    evaluate_scenarios(
+        dev_area_ha=inputs["dev_area_ha"],
+        dwellings=inputs["dwellings"],
+        occupancy_rate=inputs["occupancy_rate"],
+        water_usage_litres_per_person_per_day=inputs["water_usage"],
+        nitrogen_conc_mg_per_litre=inputs["n_conc"],
+        phosphorus_conc_mg_per_litre=inputs["p_conc"],
+        land_use=inputs["land_use"],
+        params=ScenarioParameters.from_configs(configs),
+    )
+
+
+def _median_seconds(fn, repeats: int) -> float:
+    fn()  # warm-up
+    timings = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+    return statistics.median(timings)
+
+
+@app.command()
+def main(
+    developments: Annotated[int, typer.Option(help="Developments (N)")] = 10_000,
+    scenarios: Annotated[int, typer.Option(help="Scenarios (K)")] = 50,
+    rows_per_development: Annotated[
+        int, typer.Option(help="Land-use rows per development")
+    ] = 5,
+    greenspace_variants: Annotated[
+        int | None,
+        typer.Option(help="Distinct greenspace settings (default: one per scenario)"),
+    ] = None,
+    repeats: Annotated[int, typer.Option(help="Timed runs per path")] = 5,
+) -> None:
+    """Print the median time of each path and the speedup."""
+    configs = _configs(scenarios, greenspace_variants or scenarios)
+    inputs = _inputs(developments, scenarios, rows_per_development)
+
+    per_call = _median_seconds(lambda: _per_call(inputs, configs), repeats)
+    kernel = _median_seconds(lambda: _kernel(inputs, configs), repeats)
+    print(f"N={developments} K={scenarios} rows={developments * rows_per_development}")
+    print(f"{'per-call (s)':>13} {'kernel (s)':>11} {'speedup':>8}")
+    print(f"{per_call:>13.4f} {kernel:>11.4f} {per_call / kernel:>7.1f}x")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+
+"""Benchmark the shared spatial worker pool against a pool per call.
+
+Runs `majority_overlap` over a synthetic input (500 features by default)
+against a synthetic overlay layer, both ways:
+
+- per call: what `majority_overlap` did before the shared pool. A fresh
+  `ProcessPoolExecutor` per call, with the whole overlay pickled into every
+  chunk submission;
+- shared: `app.spatial.pool`. The pool and the registered overlay persist
+  across calls, so only the first call pays for start-up and the overlay.
+
+Also prints the bytes pickled per chunk submission by each path. No database
+is needed.
+
+Usage:
+    uv run python scripts/benchmark_spatial_pool.py
+    uv run python scripts/benchmark_spatial_pool.py --features 2000 --workers 8
+"""
+
+import pickle
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Annotated
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+import typer
+
+from app.spatial.assignments import _majority_overlap_sequential, majority_overlap
+from app.spatial.partition import partition_by_cost
+from app.spatial.pool import EncodedFrame, shutdown_spatial_pool
+
+app = typer.Typer(help="Benchmark the shared spatial pool against a pool per call")
+
+_EXTENT_M = 100_000.0
+
+
+def _input(n: int, seed: int = 0) -> gpd.GeoDataFrame:
+    rng = np.random.default_rng(seed)
+    centres = rng.uniform(0, _EXTENT_M, (n, 2))
+    sizes = rng.uniform(50, 500, n)
+    return gpd.GeoDataFrame(
+        {"rlb_id": np.arange(n)},
+        geometry=shapely.box(
+            centres[:, 0], centres[:, 1], centres[:, 0] + sizes, centres[:, 1] + sizes
+        ),
+        crs="EPSG:27700",
+    )
+
+
+def _overlay(cells_per_side: int, vertices: int) -> gpd.GeoDataFrame:
+    """A grid of catchment-like polygons with `vertices` points each."""
+    step = _EXTENT_M / cells_per_side
+    angles = np.linspace(0, 2 * np.pi, vertices, endpoint=False)
+    geoms, ids = [], []
+    for i in range(cells_per_side):
+        for j in range(cells_per_side):
+            cx, cy = (i + 0.5) * step, (j + 0.5) * step
+            radius = step * 0.75
+            geoms.append(
+                shapely.Polygon(
+                    np.column_stack(
+                        [cx + radius * np.cos(angles), cy + radius * np.sin(angles)]
+                    )
+                )
+            )
+            ids.append(f"C{i:03d}{j:03d}")
+    return gpd.GeoDataFrame({"catchment": ids}, geometry=geoms, crs="EPSG:27700")
+
+
+def _chunk(chunk, overlay):
+    return _majority_overlap_sequential(
+        chunk, overlay, "rlb_id", "catchment", "catchment_id"
+    )
+
+
+def _per_call(input_gdf, overlay_gdf, workers: int) -> None:
+    chunks = partition_by_cost(input_gdf, workers, overlay_gdf).chunks
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_chunk, c, overlay_gdf) for c in chunks]
+        results = [f.result() for f in futures]
+    pd.concat(results, ignore_index=True)
+
+
+def _shared(input_gdf, overlay_gdf, workers: int) -> None:
+    majority_overlap(
+        input_gdf,
+        overlay_gdf,
+        "rlb_id",
+        "catchment",
+        "catchment_id",
+        max_workers=workers,
+        overlay_key="benchmark@1",
+    )
+
+
+def _timings(fn, repeats: int) -> list[float]:
+    timings = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+    return timings
+
+
+@app.command()
+def main(
+    features: Annotated[int, typer.Option(help="Input features")] = 500,
+    overlay_cells: Annotated[
+        int, typer.Option(help="Overlay grid cells per side")
+    ] = 40,
+    overlay_vertices: Annotated[
+        int, typer.Option(help="Vertices per overlay polygon")
+    ] = 200,
+    workers: Annotated[int, typer.Option(help="Worker processes")] = 4,
+    repeats: Annotated[int, typer.Option(help="Calls per path")] = 5,
+) -> None:
+    """Print per-call timings of each path and the bytes shipped per chunk."""
+    input_gdf = _input(features)
+    overlay_gdf = _overlay(overlay_cells, overlay_vertices)
+    chunk = partition_by_cost(input_gdf, workers, overlay_gdf).chunks[0]
+    per_call_bytes = len(pickle.dumps((chunk, overlay_gdf)))
+    shared_bytes = len(pickle.dumps(EncodedFrame.from_gdf(chunk)))
+
+    per_call = _timings(lambda: _per_call(input_gdf, overlay_gdf, workers), repeats)
+    shutdown_spatial_pool()
+    shared = _timings(lambda: _shared(input_gdf, overlay_gdf, workers), repeats)
+    shutdown_spatial_pool()
+
+    print(
+        f"input={features} features, overlay={len(overlay_gdf)} polygons "
+        f"x {overlay_vertices} vertices, workers={workers}"
+    )
+    print(f"{'path':>9} {'first (s)':>10} {'median rest (s)':>16} {'bytes/chunk':>12}")
+    for name, timings, size in (
+        ("per call", per_call, per_call_bytes),
+        ("shared", shared, shared_bytes),
+    ):
+        rest = statistics.median(timings[1:]) if len(timings) > 1 else timings[0]
+        print(f"{name:>9} {timings[0]:>10.3f} {rest:>16.3f} {size:>12,}")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+
+"""Benchmark temp-table staging: binary COPY (EWKB) vs executemany WKT INSERT.
+
+Times the setup the repository runs before every server-side spatial query
+(CREATE TEMP TABLE, load, GIST index, ANALYZE) for synthetic boundaries, using
+`Repository._stage_input_geom` with each staging method. Every run happens in
+its own transaction and is rolled back, so nothing is written.
+
+Needs a reachable PostGIS (DB_* settings, same as the app). Reference data is
+not required.
+
+Usage:
+    uv run python scripts/benchmark_staging.py
+    uv run python scripts/benchmark_staging.py --sizes 1 --sizes 100 --vertices 2000
+"""
+
+import statistics
+import time
+from typing import Annotated
+
+import geopandas as gpd
+import numpy as np
+import typer
+from shapely.geometry import Polygon
+from sqlalchemy import text
+
+from app.config import DatabaseSettings
+from app.repositories.engine import create_db_engine
+from app.repositories.repository import Repository
+
+app = typer.Typer(help="Benchmark COPY vs WKT staging of input geometries")
+
+_METHODS = ("wkt", "copy")
+
+
+def _boundaries(n: int, vertices: int, seed: int = 0) -> gpd.GeoDataFrame:
+    """`n` irregular polygons with `vertices` vertices each, scattered over England."""
+    rng = np.random.default_rng(seed)
+    angles = np.linspace(0, 2 * np.pi, vertices, endpoint=False)
+    geoms = []
+    for _ in range(n):
+        cx, cy = rng.uniform(350000, 600000), rng.uniform(100000, 400000)
+        radius = 200 * (1 + 0.2 * rng.standard_normal(vertices)).clip(0.5, 1.5)
+        geoms.append(
+            Polygon(
+                np.column_stack(
+                    [cx + radius * np.cos(angles), cy + radius * np.sin(angles)]
+                )
+            )
+        )
+    return gpd.GeoDataFrame(
+        {"input_id": np.arange(1, n + 1)}, geometry=geoms, crs="EPSG:27700"
+    )
+
+
+def _time_setup(repository: Repository, gdf: gpd.GeoDataFrame, method: str) -> float:
+    with repository.session() as session:
+        t0 = time.perf_counter()
+        Repository._stage_input_geom(session, gdf, "input_id", method=method)
+        session.execute(text("ANALYZE _tmp_input_geom"))
+        elapsed = time.perf_counter() - t0
+        session.rollback()
+    return elapsed
+
+
+@app.command()
+def main(
+    sizes: Annotated[list[int], typer.Option(help="Feature counts to benchmark")] = [  # noqa: B006
+        1,
+        100,
+        10_000,
+    ],
+    vertices: Annotated[int, typer.Option(help="Vertices per polygon")] = 500,
+    repeats: Annotated[int, typer.Option(help="Timed runs per size and method")] = 5,
+) -> None:
+    """Print median staging setup time per size for each method."""
+    engine = create_db_engine(DatabaseSettings(), pool_size=1, max_overflow=0)
+    repository = Repository(engine)
+    try:
+        print(f"{'features':>9} {'wkt (s)':>10} {'copy (s)':>10} {'speedup':>8}")
+        for n in sizes:
+            gdf = _boundaries(n, vertices)
+            medians = {}
+            for method in _METHODS:
+                _time_setup(repository, gdf, method)  # warm-up
+                medians[method] = statistics.median(
+                    _time_setup(repository, gdf, method) for _ in range(repeats)
+                )
+            print(
+                f"{n:>9} {medians['wkt']:>10.4f} {medians['copy']:>10.4f} "
+                f"{medians['wkt'] / medians['copy']:>7.1f}x"
+            )
+    finally:
+        repository.close()
+
+
+if __name__ == "__main__":
+    app()
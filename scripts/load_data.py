@@ -43,6 +43,7 @@ from settings import ScriptSettings
 from sqlalchemy import delete, func, select
 
 from app.config import DatabaseSettings
+from app.data_sync.derived import rebuild_coefficient_nn_intersection
 from app.models.db import (
     CoefficientLayer,
     EdpBoundaryLayer,
@@ -203,8 +204,16 @@ class SpatialDataLoader:
         self.load_spatial_layers()
         self.load_coefficient_layer()
         self.load_lookup_tables()
+        self.build_derived_tables()
         print("All data loaded successfully!")
 
+    def build_derived_tables(self) -> None:
+        """Rebuild coefficient_nn_intersection from the loaded source layers."""
+        print("Building coefficient_nn_intersection...")
+        with self.repository.session() as session:
+            rows = rebuild_coefficient_nn_intersection(session)
+        print(f"Built {rows} coefficient_nn_intersection records")
+
     def load_spatial_layers(self, layer_types: list[str] | None = None) -> None:
         """Load spatial layers (catchments, boundaries) from shapefiles.
 
@@ -607,6 +616,8 @@ def _load_selected_layers(loader: "SpatialDataLoader", layer: list[str]) -> None
         loader.load_spatial_layers(layer_types=regular_layers)
     if "coefficients" in layer:
         loader.load_coefficient_layer()
+    if "coefficients" in layer or "nn_catchments" in layer:
+        loader.build_derived_tables()
 
 
 def _validate_names(names: list[str] | None, valid: list[str], kind: str) -> None:
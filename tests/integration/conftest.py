@@ -113,6 +113,7 @@ def repository(test_engine: Engine) -> Repository:
     with test_engine.connect() as conn:
         conn.execution_options(isolation_level="AUTOCOMMIT")
         conn.execute(text("TRUNCATE public.coefficient_layer CASCADE"))
+        conn.execute(text("TRUNCATE public.coefficient_nn_intersection CASCADE"))
         conn.execute(text("TRUNCATE public.nn_catchments CASCADE"))
         conn.execute(text("TRUNCATE public.wwtw_catchments CASCADE"))
         conn.execute(text("TRUNCATE public.lpa_boundaries CASCADE"))
@@ -121,6 +122,7 @@ def repository(test_engine: Engine) -> Repository:
         conn.execute(text("TRUNCATE public.gcn_ponds CASCADE"))
         conn.execute(text("TRUNCATE public.edp_edges CASCADE"))
         conn.execute(text("TRUNCATE public.lookup_table CASCADE"))
+        conn.execute(text("TRUNCATE public.assessment_result_cache"))
 
     return Repository(test_engine)
 
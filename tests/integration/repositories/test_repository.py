@@ -6,6 +6,7 @@ These tests use small fixtures and a test database (test_nrf_impact).
 """
 
 import geopandas as gpd
+import pandas as pd
 import pytest
 from geoalchemy2.functions import ST_Intersects
 from sqlalchemy import func, select
@@ -272,3 +273,143 @@ class TestRepositoryVersioning:
 
         assert len(result) == 3
         assert all(obj.version == 1 for obj in result)
+
+
+class TestCoefficientNnIntersection:
+    """The pre-intersected land-use path must match the 3-way intersection."""
+
+    def test_preintersected_land_use_matches_three_way(
+        self,
+        repository: Repository,
+        sample_coefficient_data: gpd.GeoDataFrame,
+        sample_spatial_data: gpd.GeoDataFrame,
+        monkeypatch,
+    ):
+        from shapely.geometry import box
+
+        from app.data_sync.derived import rebuild_coefficient_nn_intersection
+        from app.repositories import repository as repository_module
+
+        with repository.session() as session:
+            rows = rebuild_coefficient_nn_intersection(session)
+        assert rows == 3
+
+        rlb = gpd.GeoDataFrame(
+            {
+                "rlb_id": [1, 2],
+                "dwellings": [10, 5],
+                "name": ["Site A", "Site B"],
+                "dwelling_category": ["housing", "housing"],
+                "source": ["test", "test"],
+            },
+            geometry=[
+                box(450200, 100200, 451200, 101200),
+                box(500500, 200500, 501500, 201500),
+            ],
+            crs="EPSG:27700",
+        )
+
+        def run(use_preintersected: bool):
+            monkeypatch.setattr(
+                repository_module._query_cfg,
+                "use_coefficient_nn_intersection",
+                use_preintersected,
+            )
+            repository_module.clear_spatial_caches()
+            df = repository.land_use_intersection_postgis(rlb, 1, 1)
+            return df.sort_values(["rlb_id", "crome_id"]).reset_index(drop=True)
+
+        three_way = run(use_preintersected=False)
+        preintersected = run(use_preintersected=True)
+
+        assert len(three_way) == 3
+        pd.testing.assert_frame_equal(
+            preintersected.drop(columns="area_in_nn_catchment_ha"),
+            three_way.drop(columns="area_in_nn_catchment_ha"),
+        )
+        assert preintersected["area_in_nn_catchment_ha"].to_numpy() == pytest.approx(
+            three_way["area_in_nn_catchment_ha"].to_numpy()
+        )
+
+
+class TestBinaryCopyStaging:
+    """COPY-staged inputs must read back identically to the WKT INSERT path."""
+
+    @pytest.mark.parametrize("method", ["copy", "wkt"])
+    def test_staged_rlb_round_trips(self, repository: Repository, method: str):
+        from shapely import wkb
+        from shapely.geometry import Polygon, box
+        from sqlalchemy import text
+
+        ring = [(450000 + i, 100000 + (i * 7) % 13) for i in range(50)]
+        rlb = gpd.GeoDataFrame(
+            {
+                "rlb_id": [1, 2],
+                "dwellings": [10, 5],
+                "name": ["Site A", "Site B"],
+                "dwelling_category": ["housing", "housing"],
+                "source": ["test", "test"],
+            },
+            geometry=[box(450200, 100200, 451200, 101200), Polygon(ring).convex_hull],
+            crs="EPSG:27700",
+        )
+
+        with repository.session() as session:
+            Repository._stage_rlb(session, rlb, method=method)
+            rows = session.execute(
+                text(
+                    "SELECT rlb_id, dwellings, name, ST_SRID(geom), ST_AsBinary(geom) "
+                    "FROM _tmp_rlb ORDER BY rlb_id"
+                )
+            ).fetchall()
+
+        assert [r[:4] for r in rows] == [
+            (1, 10, "Site A", 27700),
+            (2, 5, "Site B", 27700),
+        ]
+        for row, geom in zip(rows, rlb.geometry, strict=True):
+            assert wkb.loads(bytes(row[4])).equals_exact(geom, 0)
+
+
+class TestInlineInput:
+    """Inline (bound-array) inputs must match the staged temp-table path."""
+
+    def test_inline_land_use_matches_staged(
+        self,
+        repository: Repository,
+        sample_coefficient_data: gpd.GeoDataFrame,
+        sample_spatial_data: gpd.GeoDataFrame,
+        monkeypatch,
+    ):
+        from shapely.geometry import box
+
+        from app.repositories import repository as repository_module
+
+        rlb = gpd.GeoDataFrame(
+            {
+                "rlb_id": [1, 2],
+                "dwellings": [10, 5],
+                "name": ["Site A", "Site B"],
+                "dwelling_category": ["housing", "housing"],
+                "source": ["test", "test"],
+            },
+            geometry=[
+                box(450200, 100200, 451200, 101200),
+                box(500500, 200500, 501500, 201500),
+            ],
+            crs="EPSG:27700",
+        )
+
+        def run(max_inline: int) -> pd.DataFrame:
+            monkeypatch.setattr(
+                repository_module._query_cfg, "inline_input_max_features", max_inline
+            )
+            repository_module.clear_spatial_caches()
+            df = repository.land_use_intersection_postgis(rlb, 1, 1)
+            return df.sort_values(["rlb_id", "crome_id"]).reset_index(drop=True)
+
+        staged = run(0)
+        inline = run(10)
+
+        assert len(staged) > 0
+        pd.testing.assert_frame_equal(inline, staged)
@@ -0,0 +1,46 @@
+"""Integration tests for the assessment result cache table."""
+
+import pandas as pd
+import pytest
+from sqlalchemy import text
+
+from app.config import ResultCacheConfig
+from app.repositories.repository import Repository
+from app.repositories.result_cache import ResultCache, encode_results
+
+pytestmark = pytest.mark.integration
+
+
+def _results(n: int) -> dict[str, pd.DataFrame]:
+    return {"impact_summary": pd.DataFrame({"rlb_id": [n], "n_total": [n * 1.5]})}
+
+
+def test_round_trip_counts_hits(repository: Repository):
+    cache = ResultCache(repository)
+    assert cache.get("a" * 64) is None
+
+    cache.put("a" * 64, "nutrient", _results(1))
+    result = cache.get("a" * 64)
+
+    pd.testing.assert_frame_equal(
+        result["impact_summary"], _results(1)["impact_summary"]
+    )
+    with repository.session() as session:
+        hits = session.scalar(text("SELECT hit_count FROM assessment_result_cache"))
+    assert hits == 1
+
+
+def test_evicts_least_recently_used_beyond_max_bytes(repository: Repository):
+    entry = len(encode_results(_results(1)))
+    cache = ResultCache(repository, ResultCacheConfig(max_bytes=2 * entry + 8))
+
+    cache.put("a" * 64, "nutrient", _results(1))
+    cache.put("b" * 64, "nutrient", _results(2))
+    cache.get("a" * 64)  # "b" is now least recently used
+    cache.put("c" * 64, "nutrient", _results(3))
+
+    with repository.session() as session:
+        kept = set(
+            session.scalars(text("SELECT fingerprint FROM assessment_result_cache"))
+        )
+    assert kept == {"a" * 64, "c" * 64}
@@ -1,5 +1,6 @@
 """Tests for the async assessment endpoints (POST /assess, GET /assess/{job_id})."""
 
+import json
 import time
 from io import BytesIO
 from unittest.mock import MagicMock, patch
@@ -10,6 +11,7 @@ from fastapi.testclient import TestClient
 
 from app.assess.router import JobState, _jobs
 from app.main import app
+from app.runner.runner import BatchChunkResult
 from tests.unit.api.conftest import _make_geojson_bytes
 
 
@@ -172,3 +174,164 @@ class TestPruneExpiredJobs:
 
         assert "old-job" not in _jobs
         assert "new-job" in _jobs
+
+
+def _batch_geojson_bytes(dwellings: list) -> bytes:
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {
+                "type": "Polygon",
+                "coordinates": [
+                    [
+                        [400000 + i * 100, 100000],
+                        [400050 + i * 100, 100000],
+                        [400050 + i * 100, 100050],
+                        [400000 + i * 100, 100000],
+                    ]
+                ],
+            },
+            "properties": {"dwellings": d},
+        }
+        for i, d in enumerate(dwellings)
+    ]
+    return json.dumps(
+        {
+            "type": "FeatureCollection",
+            "crs": {"type": "name", "properties": {"name": "EPSG:27700"}},
+            "features": features,
+        }
+    ).encode()
+
+
+class TestPostAssessBatch:
+    """Tests for POST /assess/batch."""
+
+    @patch("app.assess.router._get_repository", return_value=MagicMock())
+    @patch("app.assess.router.run_assessment_batch")
+    def test_streams_one_line_per_chunk(self, mock_batch, mock_repo, client):
+        def _fake_batch(assessment_type, rlb_gdf, metadata, repository, chunk_size):
+            assert chunk_size == 2
+            assert rlb_gdf["dwellings"].tolist() == [5, 10, 15]
+            yield BatchChunkResult(
+                index=0,
+                start=0,
+                size=2,
+                timing_s=0.1,
+                dataframes={"impact_summary": pd.DataFrame({"rlb_id": [1, 2]})},
+            )
+            yield BatchChunkResult(index=1, start=2, size=1, timing_s=0.1, error="boom")
+
+        mock_batch.side_effect = _fake_batch
+        response = client.post(
+            "/assess/batch",
+            files={
+                "geometry_file": (
+                    "plan.geojson",
+                    BytesIO(_batch_geojson_bytes([5, 10, 15])),
+                    "application/json",
+                )
+            },
+            data={"chunk_size": "2"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["type"] for line in lines] == ["start", "chunk", "chunk", "end"]
+        assert lines[0]["features"] == 3
+        assert lines[0]["chunks"] == 2
+        assert lines[1]["results"] == {"impact_summary": [{"rlb_id": 1}, {"rlb_id": 2}]}
+        assert lines[2]["error"] == "boom"
+        assert lines[3]["failed_chunks"] == 1
+
+    def test_missing_dwellings_returns_400(self, client):
+        response = client.post(
+            "/assess/batch",
+            files={
+                "geometry_file": (
+                    "plan.geojson",
+                    BytesIO(_make_geojson_bytes(crs="EPSG:27700")),
+                    "application/json",
+                )
+            },
+        )
+
+        assert response.status_code == 400
+        assert "dwellings" in response.json()["detail"]
+
+    @patch("app.assess.router._config")
+    def test_too_many_features_returns_413(self, mock_config, client):
+        mock_config.batch_max_features = 1
+        response = client.post(
+            "/assess/batch",
+            files={
+                "geometry_file": (
+                    "plan.geojson",
+                    BytesIO(_batch_geojson_bytes([5, 10])),
+                    "application/json",
+                )
+            },
+        )
+
+        assert response.status_code == 413
+
+
+class TestPostAssessWhatIf:
+    """Tests for POST /assess/what-if."""
+
+    def _post(self, client, scenarios: str):
+        return client.post(
+            "/assess/what-if",
+            files={
+                "geometry_file": (
+                    "site.geojson",
+                    BytesIO(_make_geojson_bytes(crs="EPSG:27700")),
+                    "application/json",
+                )
+            },
+            data={"scenarios": scenarios, "dwellings": "10"},
+        )
+
+    @patch("app.assess.router._get_repository", return_value=MagicMock())
+    @patch("app.assess.router.run_what_if")
+    def test_returns_one_result_per_scenario(self, mock_what_if, mock_repo, client):
+        def _fake_what_if(rlb_gdf, scenarios, metadata, repository):
+            assert rlb_gdf["dwellings"].tolist() == [10]
+            return [
+                {"impact_summary": pd.DataFrame({"dwellings": [s.dwellings or 10]})}
+                for s in scenarios
+            ]
+
+        mock_what_if.side_effect = _fake_what_if
+        response = self._post(
+            client,
+            json.dumps([{}, {"dwellings": 25, "suds": {"removal_rate_percent": 40}}]),
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert [s["results"] for s in body["scenarios"]] == [
+            {"impact_summary": [{"dwellings": 10}]},
+            {"impact_summary": [{"dwellings": 25}]},
+        ]
+        assert body["scenarios"][1]["scenario"]["suds"] == {
+            "removal_rate_percent": 40.0
+        }
+        passed = mock_what_if.call_args.kwargs["scenarios"]
+        assert passed[1].suds == {"removal_rate_percent": 40.0}
+        assert passed[0].greenspace == {}
+
+    @pytest.mark.parametrize(
+        "scenarios",
+        [
+            "not json",
+            "[]",
+            json.dumps([{"suds": {"removal_rate": 40}}]),
+            json.dumps([{"greenspace": {"greenspace_percent": 150}}]),
+        ],
+    )
+    def test_invalid_scenarios_return_400(self, client, scenarios):
+        response = self._post(client, scenarios)
+
+        assert response.status_code == 400
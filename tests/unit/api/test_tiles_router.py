@@ -1,5 +1,7 @@
 """Tests for GET /tiles/{layer}/{z}/{x}/{y}.mvt"""
 
+import threading
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -7,6 +9,7 @@ from fastapi.testclient import TestClient
 
 import app.tiles.router as tiles_router_module
 from app.main import app
+from app.tiles.archive import TileArchive, archive_path, prune_archives, write_archive
 from app.tiles.router import TILE_LAYERS
 
 MVT_CONTENT_TYPE = "application/vnd.mapbox-vector-tile"
@@ -18,9 +21,11 @@ def reset_tile_caches():
     """Clear module-level caches before each test for isolation."""
     tiles_router_module._tile_cache.clear()
     tiles_router_module._version_cache.clear()
+    tiles_router_module._archives.clear()
     yield
     tiles_router_module._tile_cache.clear()
     tiles_router_module._version_cache.clear()
+    tiles_router_module._archives.clear()
 
 
 @pytest.fixture
@@ -98,6 +103,9 @@ class TestTilesRouterSqlTargeting:
         # The MVT layer label is the slug — map clients key `source-layer` on it.
         assert captured["params"]["layer_name"] == slug
 
+        # Every attribute key is still shipped: map styles read them.
+        assert "sl.attributes" in captured["sql"]
+
         # No other layer's table leaked into this query.
         for other_slug, other_table in TILE_LAYERS.items():
             if other_slug != slug:
@@ -270,3 +278,311 @@ class TestTilesRouterVersionResolution:
         assert cached is not None
         resolved_version, _expiry = cached
         assert resolved_version == 1
+
+
+def _render_point(zp: int, xp: int, yp: int, calls: list):
+    """A render callback for a layer whose one feature lies in tile zp/xp/yp."""
+
+    def render(z, x, y):
+        calls.append((z, x, y))
+        if (xp >> (zp - z), yp >> (zp - z)) != (x, y):
+            return None
+        return f"{z}/{x}/{y}".encode()
+
+    return render
+
+
+class TestTileArchive:
+    """Seeding an MBTiles archive and reading it back."""
+
+    def test_round_trip_with_tms_rows_and_empty_tiles_in_range(self, tmp_path):
+        path = archive_path(tmp_path, "edp_boundaries", 3)
+        calls = []
+        stored = write_archive(
+            path, "edp_boundaries", 3, 3, _render_point(3, 3, 5, calls)
+        )
+
+        # The feature's tile at each zoom.
+        assert stored == 4
+        archive = TileArchive(path)
+        assert archive.max_zoom == 3
+        assert archive.get(2, 1, 2) == b"2/1/2"
+        assert archive.get(3, 3, 5) == b"3/3/5"
+        # In range but not stored: no features there.
+        assert archive.get(3, 0, 0) == b""
+        # Above the seeded zoom: the caller renders it live.
+        assert archive.get(4, 6, 10) is None
+        row = archive._conn.execute(
+            "SELECT tile_row FROM tiles WHERE zoom_level = 2"
+        ).fetchone()
+        assert row == (1,)  # TMS: 2**2 - 1 - 2
+        archive.close()
+
+    def test_only_descends_below_tiles_with_features(self, tmp_path):
+        calls = []
+        write_archive(
+            archive_path(tmp_path, "edp_boundaries", 1),
+            "edp_boundaries",
+            1,
+            6,
+            _render_point(6, 40, 21, calls),
+        )
+        # Each zoom renders the four children of the one tile with features.
+        assert len(calls) == 1 + 4 * 6
+        assert not list(tmp_path.glob(".*.partial"))
+
+    def test_prune_keeps_the_two_newest_versions(self, tmp_path):
+        for version in (1, 2, 10):
+            archive_path(tmp_path, "edp_boundaries", version).touch()
+        archive_path(tmp_path, "edp_excluded_areas", 1).touch()
+
+        pruned = prune_archives(tmp_path, "edp_boundaries")
+
+        assert pruned == [archive_path(tmp_path, "edp_boundaries", 1)]
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "edp_boundaries_v10.mbtiles",
+            "edp_boundaries_v2.mbtiles",
+            "edp_excluded_areas_v1.mbtiles",
+        ]
+
+
+class TestTilesRouterArchive:
+    """Serving seeded zooms from the archive and rendering above it live."""
+
+    @pytest.fixture
+    def seeded(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(
+            tiles_router_module._tile_config, "archive_dir", str(tmp_path)
+        )
+        write_archive(
+            archive_path(tmp_path, "edp_boundaries", 1),
+            "edp_boundaries",
+            1,
+            2,
+            lambda _z, _x, _y: b"seeded",
+        )
+
+    @patch("app.tiles.router._resolve_layer_version", _mock_resolve_version)
+    def test_seeded_zoom_is_served_without_a_query(self, client, seeded):
+        with patch("app.tiles.router._query_tile") as query:
+            response = client.get("/tiles/edp_boundaries/2/1/1.mvt")
+
+        assert response.status_code == 200
+        assert response.content == b"seeded"
+        query.assert_not_called()
+
+    @patch("app.tiles.router._resolve_layer_version", _mock_resolve_version)
+    @patch("app.tiles.router._query_tile", _mock_query_tile)
+    def test_zoom_above_the_archive_renders_live(self, client, seeded):
+        response = client.get("/tiles/edp_boundaries/3/1/1.mvt")
+        assert response.content == FAKE_TILE
+
+    @patch("app.tiles.router._resolve_layer_version", _mock_resolve_version)
+    @patch("app.tiles.router._query_tile", _mock_query_tile)
+    def test_unseeded_layer_renders_live(self, client, seeded):
+        response = client.get("/tiles/edp_excluded_areas/2/1/1.mvt")
+        assert response.content == FAKE_TILE
+
+    @patch("app.tiles.router._query_tile", _mock_query_tile)
+    def test_opening_a_new_version_closes_the_superseded_archive(
+        self, client, seeded, tmp_path
+    ):
+        write_archive(
+            archive_path(tmp_path, "edp_boundaries", 2),
+            "edp_boundaries",
+            2,
+            2,
+            lambda _z, _x, _y: b"seeded v2",
+        )
+        with patch("app.tiles.router._resolve_layer_version", return_value=1):
+            client.get("/tiles/edp_boundaries/2/1/1.mvt")
+        old, _ = tiles_router_module._archives[("edp_boundaries", 1)]
+
+        with patch("app.tiles.router._resolve_layer_version", return_value=2):
+            response = client.get("/tiles/edp_boundaries/2/1/1.mvt")
+
+        assert response.content == b"seeded v2"
+        assert list(tiles_router_module._archives) == [("edp_boundaries", 2)]
+        # A request still holding the old handle falls back to a live render.
+        assert old.get(2, 1, 1) is None
+
+
+class _CountingEvent(threading.Event):
+    """An Event that counts the threads that have started waiting on it."""
+
+    def __init__(self):
+        super().__init__()
+        self.waiting = 0
+        self._count_lock = threading.Lock()
+
+    def wait(self, timeout=None):
+        with self._count_lock:
+            self.waiting += 1
+        return super().wait(timeout)
+
+
+class TestTilesRouterCoalescing:
+    """Concurrent misses for one tile share a render; stale tiles are refreshed
+    in the background."""
+
+    KEY = ("edp_boundaries", 10, 507, 338, 1)
+
+    @pytest.fixture(autouse=True)
+    def isolated(self, monkeypatch):
+        monkeypatch.setattr(tiles_router_module, "counter", MagicMock())
+        monkeypatch.setattr(
+            tiles_router_module, "_resolve_layer_version", _mock_resolve_version
+        )
+        for stat in tiles_router_module._stats:
+            monkeypatch.setitem(tiles_router_module._stats, stat, 0)
+        events = []
+
+        class _Render(tiles_router_module._Render):
+            def __init__(self):
+                super().__init__()
+                self.done = _CountingEvent()
+                events.append(self.done)
+
+        monkeypatch.setattr(tiles_router_module, "_Render", _Render)
+        self.events = events
+        yield
+        tiles_router_module._inflight.clear()
+        if tiles_router_module._refresh_pool is not None:
+            tiles_router_module._refresh_pool.shutdown(wait=True)
+            tiles_router_module._refresh_pool = None
+
+    def _blocking_query(self, monkeypatch, result=FAKE_TILE):
+        """Patch _query_tile to block until released; return (calls, release)."""
+        calls = []
+        release = threading.Event()
+
+        def query(*args):
+            calls.append(args)
+            release.wait(5)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        monkeypatch.setattr(tiles_router_module, "_query_tile", query)
+        return calls, release
+
+    def _start(self, n, results):
+        def fetch():
+            try:
+                results.append(
+                    tiles_router_module._get_tile("edp_boundaries", 10, 507, 338)
+                )
+            except Exception as exc:  # noqa: BLE001
+                results.append(exc)
+
+        threads = [threading.Thread(target=fetch) for _ in range(n)]
+        for thread in threads:
+            thread.start()
+        return threads
+
+    def _wait_for_waiters(self, n):
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            if self.events and self.events[0].waiting >= n:
+                return
+            time.sleep(0.001)
+        pytest.fail(f"{n} waiters never arrived")
+
+    def test_concurrent_misses_share_one_query(self, monkeypatch):
+        calls, release = self._blocking_query(monkeypatch)
+        results = []
+        threads = self._start(6, results)
+        self._wait_for_waiters(5)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert len(calls) == 1
+        assert [tile for tile, _ in results] == [FAKE_TILE] * 6
+        assert sum(t.coalesced for _, t in results) == 5
+        assert tiles_router_module.tile_stats()["coalesced"] == 5
+        assert tiles_router_module.tile_stats()["renders"] == 1
+        assert tiles_router_module._inflight == {}
+        assert self.KEY in tiles_router_module._tile_cache
+
+    def test_render_error_reaches_every_waiter(self, monkeypatch):
+        _calls, release = self._blocking_query(monkeypatch, RuntimeError("db down"))
+        results = []
+        threads = self._start(3, results)
+        self._wait_for_waiters(2)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert len(results) == 3
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert self.KEY not in tiles_router_module._tile_cache
+        assert tiles_router_module._inflight == {}
+
+    def test_waiter_renders_itself_after_the_timeout(self, monkeypatch):
+        monkeypatch.setattr(
+            tiles_router_module._tile_config, "coalesce_timeout_seconds", 0.01
+        )
+        calls, release = self._blocking_query(monkeypatch)
+        leader = self._start(1, [])
+        deadline = time.monotonic() + 5
+        while not calls and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+        threading.Timer(0.2, release.set).start()
+        tile, timings = tiles_router_module._get_tile("edp_boundaries", 10, 507, 338)
+        leader[0].join(5)
+
+        assert tile == FAKE_TILE
+        assert not timings.coalesced
+        assert len(calls) == 2
+        assert tiles_router_module.tile_stats()["coalesce_timeouts"] == 1
+
+    def test_stale_tile_is_served_while_one_refresh_runs(self, monkeypatch):
+        monkeypatch.setattr(
+            tiles_router_module._tile_config, "stale_while_revalidate_seconds", 60
+        )
+        tiles_router_module._tile_cache[self.KEY] = (b"old", time.monotonic() - 1)
+        calls, release = self._blocking_query(monkeypatch, b"new")
+
+        first, timings = tiles_router_module._get_tile("edp_boundaries", 10, 507, 338)
+        second, _ = tiles_router_module._get_tile("edp_boundaries", 10, 507, 338)
+
+        assert first == second == b"old"
+        assert timings.stale
+        assert tiles_router_module.tile_stats()["stale_served"] == 2
+        release.set()
+        tiles_router_module._refresh_pool.shutdown(wait=True)
+        tiles_router_module._refresh_pool = None
+        assert len(calls) == 1
+        assert tiles_router_module._tile_cache[self.KEY][0] == b"new"
+
+    def test_failed_refresh_submission_releases_the_render(self, monkeypatch):
+        monkeypatch.setattr(
+            tiles_router_module._tile_config, "stale_while_revalidate_seconds", 60
+        )
+        monkeypatch.setattr(
+            tiles_router_module,
+            "_schedule_refresh",
+            MagicMock(side_effect=RuntimeError("cannot schedule new futures")),
+        )
+        tiles_router_module._tile_cache[self.KEY] = (b"old", time.monotonic() - 1)
+
+        tile, timings = tiles_router_module._get_tile("edp_boundaries", 10, 507, 338)
+
+        assert tile == b"old"
+        assert timings.stale
+        assert tiles_router_module._inflight == {}
+        assert self.events[0].is_set()
+
+    @patch("app.tiles.router._query_tile", _mock_query_tile)
+    def test_tile_expired_past_the_stale_window_renders_inline(self, monkeypatch):
+        monkeypatch.setattr(
+            tiles_router_module._tile_config, "stale_while_revalidate_seconds", 1
+        )
+        tiles_router_module._tile_cache[self.KEY] = (b"old", time.monotonic() - 5)
+
+        tile, timings = tiles_router_module._get_tile("edp_boundaries", 10, 507, 338)
+
+        assert tile == FAKE_TILE
+        assert not timings.stale
@@ -0,0 +1,11 @@
+import pytest
+
+from app.assessments.nutrient import clear_spatial_stage_cache
+
+
+@pytest.fixture(autouse=True)
+def _clear_spatial_stage_cache():
+    """Each test builds its own repository double; never share spatial stages."""
+    clear_spatial_stage_cache()
+    yield
+    clear_spatial_stage_cache()
@@ -1,5 +1,6 @@
 """Unit tests for Nutrient assessment module."""
 
+from contextlib import contextmanager
 from unittest.mock import MagicMock, Mock
 
 import geopandas as gpd
@@ -7,7 +8,7 @@ import pandas as pd
 import pytest
 from shapely.geometry import Polygon
 
-from app.assessments.nutrient import NutrientAssessment
+from app.assessments.nutrient import NutrientAssessment, WhatIfScenario
 from app.models.db import LpaBoundaries, Subcatchments, WwtwCatchments
 
 
@@ -643,3 +644,120 @@ def test_run_assessment_has_nn_catchment_entries(sample_rlb, mock_repository):
     assert "nn_catchment_entries" in result_df.columns
     # Sample fixture has OID="1" and N2K_Site_N="Solent"
     assert result_df["nn_catchment_entries"].iloc[0] == [("1", "Solent")]
+
+
+def test_rerun_with_new_dwellings_reuses_spatial_stage(sample_rlb, mock_repository):
+    """Dwellings do not affect the spatial queries, so a re-run skips them."""
+    first = NutrientAssessment(
+        sample_rlb.copy(), {"unique_ref": "20250115123456"}, mock_repository
+    ).run()["impact_summary"]
+
+    more_dwellings = sample_rlb.copy()
+    more_dwellings["dwellings"] = [100, 200]
+    second = NutrientAssessment(
+        more_dwellings, {"unique_ref": "20250115123457"}, mock_repository
+    ).run()["impact_summary"]
+
+    assert mock_repository.batch_majority_overlap_postgis.call_count == 1
+    assert mock_repository.land_use_intersection_postgis.call_count == 1
+    assert list(second["dwellings"]) == [100, 200]
+    assert second["dwelling_density"].to_numpy() == pytest.approx(
+        first["dwelling_density"].to_numpy() * 10
+    )
+
+
+def test_spatial_stage_reads_inside_one_repository_scope(
+    sample_rlb, mock_repository, monkeypatch
+):
+    """Versions, cache generation, lookups and spatial queries share a scope."""
+    depth = []
+    reads = []
+
+    @contextmanager
+    def scope(repository, input_gdf, *, concurrent=False):
+        depth.append(1)
+        try:
+            yield repository
+        finally:
+            depth.pop()
+
+    def recorded(mock):
+        side_effect, return_value = mock.side_effect, mock.return_value
+
+        def call(*args, **kwargs):
+            reads.append(bool(depth))
+            return side_effect(*args, **kwargs) if side_effect else return_value
+
+        mock.side_effect = call
+
+    monkeypatch.setattr(
+        "app.assessments.nutrient.RepositoryContext.scope", staticmethod(scope)
+    )
+    monkeypatch.setattr("app.assessments.nutrient._lookup_cache", {})
+    for mock in (
+        mock_repository.session,
+        mock_repository.execute_query,
+        mock_repository.batch_majority_overlap_postgis,
+        mock_repository.land_use_intersection_postgis,
+    ):
+        recorded(mock)
+
+    NutrientAssessment(
+        sample_rlb, {"unique_ref": "20250115123456"}, mock_repository
+    ).run()
+
+    assert reads
+    assert all(reads)
+
+
+def test_wastewater_load_is_computed_once_for_both_periods(
+    sample_rlb, mock_repository, monkeypatch
+):
+    from app.assessments import nutrient
+
+    load = MagicMock(side_effect=nutrient.calculate_wastewater_load)
+    monkeypatch.setattr(nutrient, "calculate_wastewater_load", load)
+
+    result = NutrientAssessment(
+        sample_rlb, {"unique_ref": "20250115123456"}, mock_repository
+    ).run()["impact_summary"]
+
+    load.assert_called_once()
+    assert (result["n_wwtw_perm"] >= 0).all()
+    assert {"n_wwtw_temp", "p_wwtw_temp", "p_wwtw_perm"} <= set(result.columns)
+
+
+def test_what_if_matches_full_runs(sample_rlb, mock_repository):
+    """Each scenario equals a full run with the same dwellings and settings."""
+    scenarios = [
+        WhatIfScenario(),
+        WhatIfScenario(dwellings=60, suds={"removal_rate_percent": 40.0}),
+        WhatIfScenario(
+            dwellings=5, greenspace={"greenspace_percent": 50.0, "nitrogen_coeff": 1.0}
+        ),
+    ]
+    metadata = {"unique_ref": "20250115123456"}
+
+    what_if = NutrientAssessment(sample_rlb, metadata, mock_repository)
+    results = what_if.what_if(scenarios)
+
+    assert mock_repository.batch_majority_overlap_postgis.call_count == 1
+    assert mock_repository.land_use_intersection_postgis.call_count == 1
+    for scenario, result in zip(scenarios, results, strict=True):
+        rlb = sample_rlb.copy()
+        if scenario.dwellings is not None:
+            rlb["dwellings"] = scenario.dwellings
+        assessment = NutrientAssessment(rlb, metadata, mock_repository)
+        assessment.config = scenario.apply(what_if.config)
+        pd.testing.assert_frame_equal(
+            result["impact_summary"], assessment.run()["impact_summary"]
+        )
+
+
+def test_what_if_rejects_unknown_override(sample_rlb, mock_repository):
+    assessment = NutrientAssessment(
+        sample_rlb, {"unique_ref": "20250115123456"}, mock_repository
+    )
+
+    with pytest.raises(ValueError, match="Unknown SuDsConfig"):
+        assessment.what_if([WhatIfScenario(suds={"removal_rate": 40.0})])
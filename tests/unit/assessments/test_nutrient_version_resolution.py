@@ -23,7 +23,7 @@ def test_resolve_versions_uses_get_active_version(assessment, monkeypatch):
         return 42
 
     monkeypatch.setattr(
-        "app.assessments.nutrient.get_active_version", fake_get_active_version
+        "app.data_sync.active_version.get_active_version", fake_get_active_version
     )
     # repository.session() is used as a context manager
     assessment.repository.session.return_value.__enter__.return_value = MagicMock()
@@ -10,17 +10,19 @@ from app.assessments.reference_data import (
     EmptyReferenceDataError,
     assert_reference_data_present,
 )
+from app.repositories.generation import get_reference_generations
 
 
 def _repository(counts: dict[str, int]) -> MagicMock:
-    """Build a repository whose session counts each table per `counts`,
-    keyed by the model's __tablename__."""
+    """Build a repository whose session finds rows in each table per `counts`,
+    keyed by the model's __tablename__. Every table's active version is 1."""
     session = MagicMock()
+    session.execute.return_value.fetchone.return_value = (1,)
 
     def _scalar(stmt):
-        # The compiled count selects FROM a single table; pull its name out.
+        # The first-row probe selects FROM a single table; pull its name out.
         table = stmt.get_final_froms()[0].name
-        return counts.get(table, 0)
+        return 1 if counts.get(table, 0) else None
 
     session.scalar.side_effect = _scalar
 
@@ -74,3 +76,35 @@ def test_unknown_assessment_type_is_not_guarded():
     # No required-table mapping → nothing to assert, must not raise.
     repo = _repository({})
     assert_reference_data_present(repo, "gcn")
+
+
+def test_probes_the_active_version_without_counting():
+    repo = _repository(_ALL_PRESENT)
+    assert_reference_data_present(repo, "nutrient")
+
+    session = repo.session.side_effect().__enter__()
+    probes = [c.args[0] for c in session.scalar.call_args_list]
+    assert len(probes) == len(_ALL_PRESENT)
+    for stmt in probes:
+        sql = str(stmt.compile(compile_kwargs={"literal_binds": True})).lower()
+        assert "count(" not in sql
+        assert "version = 1" in sql
+        assert "limit 1" in sql
+
+
+def test_live_registry_remembers_the_answer_until_invalidated():
+    registry = get_reference_generations()
+    registry.set_live(True)
+    try:
+        repo = _repository(_ALL_PRESENT)
+        session = repo.session.side_effect().__enter__()
+
+        assert_reference_data_present(repo, "nutrient")
+        assert_reference_data_present(repo, "nutrient")
+        assert session.scalar.call_count == len(_ALL_PRESENT)
+
+        registry.invalidate("reload")
+        assert_reference_data_present(repo, "nutrient")
+        assert session.scalar.call_count == 2 * len(_ALL_PRESENT)
+    finally:
+        registry.set_live(False)
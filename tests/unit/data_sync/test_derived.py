@@ -0,0 +1,84 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.data_sync import derived, service
+from app.data_sync.derived import (
+    coefficient_nn_cleanup_sql,
+    rebuild_coefficient_nn_intersection,
+)
+from app.data_sync.manifest import Manifest
+
+
+def test_rebuild_replaces_active_version_pair_and_commits(monkeypatch):
+    versions = {"coefficient_layer": 4, "nn_catchments": 2}
+    monkeypatch.setattr(
+        derived, "get_active_version", lambda _session, table: versions[table]
+    )
+    session = MagicMock()
+    session.execute.return_value.rowcount = 12
+
+    rows = rebuild_coefficient_nn_intersection(session)
+
+    assert rows == 12
+    sql_texts = [str(call.args[0]) for call in session.execute.call_args_list]
+    assert sql_texts[0].startswith("DELETE FROM public.coefficient_nn_intersection")
+    assert "INSERT INTO public.coefficient_nn_intersection" in sql_texts[1]
+    assert "ST_Intersection(c.geometry, nn.geometry)" in sql_texts[1]
+    assert sql_texts[2] == "ANALYZE public.coefficient_nn_intersection"
+    for call in session.execute.call_args_list[:2]:
+        assert call.args[1] == {"coeff_version": 4, "nn_version": 2}
+    session.commit.assert_called_once()
+
+
+def test_cleanup_sql_mirrors_source_retention():
+    sql = coefficient_nn_cleanup_sql()
+
+    assert sql.startswith("DELETE FROM public.coefficient_nn_intersection")
+    assert "(SELECT MAX(version) FROM public.coefficient_layer) - 1" in sql
+    assert "(SELECT MAX(version) FROM public.nn_catchments) - 1" in sql
+
+
+def test_refresh_is_best_effort(monkeypatch):
+    def _boom(_session):
+        msg = "boom"
+        raise RuntimeError(msg)
+
+    monkeypatch.setattr(service, "rebuild_coefficient_nn_intersection", _boom)
+    session = MagicMock()
+
+    service._refresh_coefficient_nn_intersection(session)  # must not raise
+
+    session.rollback.assert_called_once()
+    session.commit.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    ("tables", "expected_calls"),
+    [
+        (["nn_catchments", "wwtw_catchments"], 1),
+        (["coefficient_layer"], 1),
+        (["wwtw_catchments"], 0),
+    ],
+)
+def test_restore_all_refreshes_only_when_a_source_table_reloads(
+    monkeypatch, tables, expected_calls
+):
+    cfg = MagicMock()
+    cfg.parallel_restore = False
+    cfg.stream_dumps = False
+    cfg.tables = tables
+    cfg.build_coefficient_nn_intersection = True
+    manifest = Manifest(data_version="v1", tables={t: f"{t}.gz" for t in tables})
+    s3 = MagicMock()
+    s3.object_etag.return_value = "etag"
+    s3.download_object.side_effect = lambda _key, dest: dest.write_bytes(b"")
+    monkeypatch.setattr(service, "restore_all_atomic", lambda *_a, **_k: None)
+    monkeypatch.setattr(service, "load_qc_rules", lambda: None)
+    monkeypatch.setattr(service, "set_active_version", lambda *_a: None)
+    refresh = MagicMock()
+    monkeypatch.setattr(service, "_refresh_coefficient_nn_intersection", refresh)
+
+    service._restore_all(MagicMock(), s3, cfg, MagicMock(), "eu-west-2", None, manifest)
+
+    assert refresh.call_count == expected_calls
@@ -1,14 +1,24 @@
 import pytest
 
-from app.data_sync.qc import _row_count_sql
+from app.data_sync.qc import _row_count_sql, _table_sql
 from app.data_sync.qc_rules import TableRules
 
+STAGE = "pg_temp._ds_stage_"
+
+
+def _text(checks) -> str:
+    """Every predicate, separate-pass query and failure of `checks`, joined."""
+    return "\n".join(
+        part
+        for check in checks
+        for part in (check.predicate, check.rows_sql, check.failure)
+        if part
+    )
+
 
 def test_row_count_sql_checks_zero_and_floor():
     rules = TableRules()
     sql = _row_count_sql("nn_catchments", rules, floor_pct=90)
-    assert "FROM pg_temp._ds_stage_nn_catchments" in sql
-    assert "INTO staged_count" in sql
     assert "FROM public.nn_catchments" in sql
     assert "INTO prev_count" in sql
     assert "staged_count = 0" in sql
@@ -22,56 +32,105 @@ def test_row_count_sql_uses_per_table_override():
     assert "staged_count < CEIL(prev_count * 0.5)" in sql
 
 
-def test_column_key_sql_checks_null_and_uniqueness():
-    from app.data_sync.qc import _column_key_sql
+def test_table_sql_folds_row_rules_into_one_aggregate_scan():
+    from app.data_sync.qc_rules import GeometryRule, KeyRule
+
+    rules = TableRules(
+        key=KeyRule(columns=["attributes.OID"], source="json", unique=True),
+        geometry=GeometryRule(expected_types=["Polygon"], expected_srid=27700),
+    )
+    sql = _table_sql("nn_catchments", rules, floor_pct=90)
+    # One aggregate scan for the count, key NULLs and geometry; one grouped
+    # pass for uniqueness. Nothing else reads the staged table.
+    assert sql.count("FROM pg_temp._ds_stage_nn_catchments") == 2
+    assert sql.startswith("SELECT ARRAY[COUNT(*),")
+    assert sql.count("COUNT(*) FILTER (WHERE ") == 4
+    assert "INTO counts FROM pg_temp._ds_stage_nn_catchments;" in sql
+    assert "staged_count := counts[1];" in sql
+    assert "GROUP BY attributes->>'OID' HAVING COUNT(*) > 1) failing" in sql
+
+
+def test_table_sql_reports_each_count_with_its_original_message():
+    from app.data_sync.qc_rules import CoefficientRange, KeyRule
+
+    rules = TableRules(
+        key=KeyRule(columns=["crome_id"], source="column", unique=True),
+        coefficient_ranges={"n_resi_coeff": CoefficientRange(min=0, max=50)},
+    )
+    sql = _table_sql("coefficient_layer", rules, floor_pct=90, schema="public")
+    assert "FROM public._ds_stage_coefficient_layer" in sql
+    assert (
+        "format('table=coefficient_layer rule=key_not_null detail=%s row(s) "
+        "with NULL key (crome_id)', counts[2])"
+    ) in sql
+    assert (
+        "format('table=coefficient_layer rule=key_unique detail=%s duplicate "
+        "key value(s) (crome_id)', detail_count)"
+    ) in sql
+    assert (
+        "format('table=coefficient_layer rule=coefficient_range detail=%s "
+        "row(s) with n_resi_coeff outside [0.0, 50.0]', counts[3])"
+    ) in sql
+
+
+def test_column_key_checks_checks_null_and_uniqueness():
+    from app.data_sync.qc import _column_key_checks
     from app.data_sync.qc_rules import KeyRule, TableRules
 
     rules = TableRules(
         key=KeyRule(columns=["crome_id"], source="column", unique=True),
         non_null_columns=["land_use_cat", "nn_catchment", "subcatchment"],
     )
-    sql = _column_key_sql("coefficient_layer", rules)
-    assert "FROM pg_temp._ds_stage_coefficient_layer WHERE crome_id IS NULL" in sql
+    checks = _column_key_checks("coefficient_layer", rules, STAGE + "coefficient_layer")
+    sql = _text(checks)
+    assert checks[0].predicate == "crome_id IS NULL"
     assert "rule=key_not_null" in sql
-    assert "GROUP BY crome_id HAVING COUNT(*) > 1" in sql
+    assert checks[1].rows_sql == (
+        "SELECT crome_id FROM pg_temp._ds_stage_coefficient_layer "
+        "GROUP BY crome_id HAVING COUNT(*) > 1"
+    )
     assert "rule=key_unique" in sql
-    assert "WHERE land_use_cat IS NULL" in sql
-    assert "WHERE nn_catchment IS NULL" in sql
-    assert "WHERE subcatchment IS NULL" in sql
+    assert [c.predicate for c in checks[2:]] == [
+        "land_use_cat IS NULL",
+        "nn_catchment IS NULL",
+        "subcatchment IS NULL",
+    ]
     assert "rule=non_null" in sql
 
 
-def test_column_key_sql_supports_composite_key_without_uniqueness_toggle():
-    from app.data_sync.qc import _column_key_sql
+def test_column_key_checks_supports_composite_key_without_uniqueness_toggle():
+    from app.data_sync.qc import _column_key_checks
     from app.data_sync.qc_rules import KeyRule, TableRules
 
     rules = TableRules(
         key=KeyRule(columns=["name", "version"], source="column", unique=True)
     )
-    sql = _column_key_sql("lookup_table", rules)
-    assert "WHERE name IS NULL OR version IS NULL" in sql
+    sql = _text(_column_key_checks("lookup_table", rules, STAGE + "lookup_table"))
+    assert "name IS NULL OR version IS NULL" in sql
     assert "GROUP BY name, version HAVING COUNT(*) > 1" in sql
 
 
-def test_column_key_sql_skips_uniqueness_check_when_not_unique():
-    from app.data_sync.qc import _column_key_sql
+def test_column_key_checks_skips_uniqueness_check_when_not_unique():
+    from app.data_sync.qc import _column_key_checks
     from app.data_sync.qc_rules import KeyRule, TableRules
 
     rules = TableRules(key=KeyRule(columns=["crome_id"], source="column", unique=False))
-    sql = _column_key_sql("coefficient_layer", rules)
+    sql = _text(
+        _column_key_checks("coefficient_layer", rules, STAGE + "coefficient_layer")
+    )
     assert "rule=key_not_null" in sql
     assert "rule=key_unique" not in sql
 
 
-def test_json_key_sql_checks_null_and_uniqueness():
-    from app.data_sync.qc import _json_key_sql
+def test_json_key_checks_checks_null_and_uniqueness():
+    from app.data_sync.qc import _json_key_checks
     from app.data_sync.qc_rules import KeyRule, TableRules
 
     rules = TableRules(
         key=KeyRule(columns=["attributes.OID"], source="json", unique=True),
         non_null_json_columns=["attributes.N2K_Site_N"],
     )
-    sql = _json_key_sql("nn_catchments", rules)
+    sql = _text(_json_key_checks("nn_catchments", rules, STAGE + "nn_catchments"))
     assert "attributes->>'OID' IS NULL" in sql
     assert "rule=key_not_null" in sql
     assert "GROUP BY attributes->>'OID' HAVING COUNT(*) > 1" in sql
@@ -80,37 +139,37 @@ def test_json_key_sql_checks_null_and_uniqueness():
     assert "rule=non_null" in sql
 
 
-def test_json_key_sql_non_unique_skips_uniqueness_check():
-    from app.data_sync.qc import _json_key_sql
+def test_json_key_checks_non_unique_skips_uniqueness_check():
+    from app.data_sync.qc import _json_key_checks
     from app.data_sync.qc_rules import KeyRule, TableRules
 
     rules = TableRules(
         key=KeyRule(columns=["attributes.NAME"], source="json", unique=False)
     )
-    sql = _json_key_sql("lpa_boundaries", rules)
+    sql = _text(_json_key_checks("lpa_boundaries", rules, STAGE + "lpa_boundaries"))
     assert "rule=key_unique" not in sql
 
 
-def test_json_key_sql_allowed_values():
-    from app.data_sync.qc import _json_key_sql
+def test_json_key_checks_allowed_values():
+    from app.data_sync.qc import _json_key_checks
     from app.data_sync.qc_rules import KeyRule, TableRules
 
     rules = TableRules(
         key=KeyRule(columns=["attributes.RZ"], source="json", unique=False),
         allowed_values={"attributes.RZ": ["Red", "Amber", "Green"]},
     )
-    sql = _json_key_sql("gcn_risk_zones", rules)
+    sql = _text(_json_key_checks("gcn_risk_zones", rules, STAGE + "gcn_risk_zones"))
     assert "attributes->>'RZ' NOT IN ('Red', 'Amber', 'Green')" in sql
     assert "rule=allowed_values" in sql
-    # The WHERE ... NOT IN clause is a standalone SQL context and keeps
+    # The NOT IN predicate is a standalone SQL context and keeps
     # single-escaped quotes, but the error-message text is embedded inside
     # an outer format('...') string literal, so its quotes must be doubled
     # to avoid terminating that literal early (PostgreSQL syntax error).
     assert "outside {''Red'', ''Amber'', ''Green''}" in sql
 
 
-def test_json_key_sql_rejects_composite_json_key():
-    from app.data_sync.qc import _json_key_sql
+def test_json_key_checks_rejects_composite_json_key():
+    from app.data_sync.qc import _json_key_checks
     from app.data_sync.qc_rules import KeyRule, TableRules
 
     rules = TableRules(
@@ -119,11 +178,11 @@ def test_json_key_sql_rejects_composite_json_key():
         )
     )
     with pytest.raises(ValueError, match="exactly one column"):
-        _json_key_sql("some_table", rules)
+        _json_key_checks("some_table", rules, STAGE + "some_table")
 
 
-def test_lookup_row_sql_checks_key_null_and_uniqueness_per_row():
-    from app.data_sync.qc import _lookup_row_sql
+def test_lookup_row_checks_checks_key_null_and_uniqueness_per_row():
+    from app.data_sync.qc import _lookup_row_checks
     from app.data_sync.qc_rules import LookupRowRule, TableRules
 
     rules = TableRules(
@@ -132,7 +191,9 @@ def test_lookup_row_sql_checks_key_null_and_uniqueness_per_row():
             "rates_lookup": LookupRowRule(json_key="nn_catchment"),
         }
     )
-    sql = _lookup_row_sql("lookup_table", rules)
+    checks = _lookup_row_checks("lookup_table", rules, STAGE + "lookup_table")
+    sql = _text(checks)
+    assert all(c.predicate is None for c in checks)
     assert "name = 'wwtw_lookup'" in sql
     assert "elem->>'wwtw_code' IS NULL" in sql
     assert "name = 'rates_lookup'" in sql
@@ -141,14 +202,14 @@ def test_lookup_row_sql_checks_key_null_and_uniqueness_per_row():
     assert sql.count("rule=key_unique") == 2
 
 
-def test_geometry_sql_checks_validity_srid_and_type():
-    from app.data_sync.qc import _geometry_sql
+def test_geometry_checks_checks_validity_srid_and_type():
+    from app.data_sync.qc import _geometry_checks
     from app.data_sync.qc_rules import GeometryRule, TableRules
 
     rules = TableRules(
         geometry=GeometryRule(expected_types=["Polygon"], expected_srid=27700)
     )
-    sql = _geometry_sql("nn_catchments", rules)
+    sql = _text(_geometry_checks("nn_catchments", rules))
     assert "NOT ST_IsValid(geometry) AND NOT ST_IsValid(ST_MakeValid(geometry))" in sql
     assert "rule=geometry_valid" in sql
     assert "ST_SRID(geometry) NOT IN (0, 27700)" in sql
@@ -157,19 +218,19 @@ def test_geometry_sql_checks_validity_srid_and_type():
     assert "rule=geometry_type" in sql
 
 
-def test_geometry_sql_uses_multipolygon_expectation():
-    from app.data_sync.qc import _geometry_sql
+def test_geometry_checks_uses_multipolygon_expectation():
+    from app.data_sync.qc import _geometry_checks
     from app.data_sync.qc_rules import GeometryRule, TableRules
 
     rules = TableRules(
         geometry=GeometryRule(expected_types=["MultiPolygon"], expected_srid=27700)
     )
-    sql = _geometry_sql("lpa_boundaries", rules)
+    sql = _text(_geometry_checks("lpa_boundaries", rules))
     assert "GeometryType(geometry) NOT IN ('MULTIPOLYGON')" in sql
 
 
-def test_coefficient_range_sql_checks_bounds_and_finiteness():
-    from app.data_sync.qc import _coefficient_range_sql
+def test_coefficient_range_checks_checks_bounds_and_finiteness():
+    from app.data_sync.qc import _coefficient_range_checks
     from app.data_sync.qc_rules import CoefficientRange, TableRules
 
     rules = TableRules(
@@ -178,7 +239,7 @@ def test_coefficient_range_sql_checks_bounds_and_finiteness():
             "n_resi_coeff": CoefficientRange(min=0, max=50),
         }
     )
-    sql = _coefficient_range_sql("coefficient_layer", rules)
+    sql = _text(_coefficient_range_checks("coefficient_layer", rules))
     assert sql.count("rule=coefficient_range") == 2
     assert "lu_curr_n_coeff < 0.0 OR lu_curr_n_coeff > 50.0" in sql
     assert "lu_curr_n_coeff = 'NaN'::float8" in sql
@@ -311,6 +372,46 @@ def test_build_qc_sql_skips_unrecognized_table():
     assert "not_a_real_table" not in sql
 
 
+def test_build_table_qc_sql_reads_public_staging_and_owns_referential_checks():
+    from app.data_sync.qc import build_table_qc_sql
+    from app.data_sync.qc_rules import load_qc_rules
+
+    rules = load_qc_rules()
+    staged = {"coefficient_layer", "nn_catchments", "subcatchments"}
+    coefficient = build_table_qc_sql("coefficient_layer", staged, rules)
+    nn = build_table_qc_sql("nn_catchments", staged, rules)
+
+    assert coefficient.startswith("DO $qc$\n")
+    assert "pg_temp." not in coefficient + nn
+    assert "FROM public._ds_stage_coefficient_layer" in coefficient
+    # A referential check runs once, in its `from` table's block, and reads
+    # the other side's staging table.
+    assert "rule=referential_coefficient_layer_nn_catchment" in coefficient
+    assert "FROM public._ds_stage_nn_catchments" in coefficient
+    assert "rule=referential_coefficient_layer_nn_catchment" not in nn
+    # lookup_table isn't staged, so its check against nn_catchments runs there.
+    assert "rule=referential_rates_lookup_nn_catchment" in nn
+    assert "rule=coefficient_range" not in nn
+
+
+def test_build_table_qc_sql_runs_every_check_of_build_qc_sql_once():
+    import re
+    from pathlib import Path
+
+    from app.data_sync.qc import build_qc_sql, build_table_qc_sql
+    from app.data_sync.qc_rules import load_qc_rules
+
+    rules = load_qc_rules()
+    staged = {"lookup_table", "wwtw_catchments", "coefficient_layer"}
+    per_table = "".join(build_table_qc_sql(t, staged, rules) for t in staged)
+    combined = build_qc_sql([(t, Path("x.gz")) for t in staged], rules)
+
+    def checks(sql):
+        return sorted(re.findall(r"'table=\S+ rule=\S+", sql))
+
+    assert checks(per_table) == checks(combined)
+
+
 def test_parse_qc_failures_extracts_lines_from_psql_error():
     from app.data_sync.qc import QcFailure, parse_qc_failures
 
@@ -1,5 +1,6 @@
 import gzip
 import io
+from unittest.mock import MagicMock
 
 import pytest
 
@@ -38,6 +39,9 @@ def psql_stdin(monkeypatch):
         def communicate(self):
             return b"", b""
 
+        def kill(self):
+            pass
+
     monkeypatch.setattr(restore_mod.subprocess, "Popen", lambda *a, **k: _FakeProc())  # noqa: ARG005
     return written
 
@@ -121,27 +125,58 @@ def test_pre_sql_creates_temp_staging_like_live_table():
     assert "BEGIN;" not in sql
 
 
-def test_post_sql_bumps_version_inserts_and_drops_staging():
+def test_post_sql_loads_and_indexes_the_next_version_table():
     from app.data_sync.restore import post_sql
 
-    sql = post_sql("nn_catchments")
-    assert "UPDATE pg_temp._ds_stage_nn_catchments" in sql
-    assert "id = gen_random_uuid()" in sql
-    assert "COALESCE(MAX(version),0)+1 FROM public.nn_catchments" in sql
+    sql = post_sql("gcn_ponds")
+    assert "SELECT public.ds_prepare_version('gcn_ponds');" in sql
     assert (
-        "INSERT INTO public.nn_catchments SELECT * FROM pg_temp._ds_stage_nn_catchments;"
-        in sql
+        "INSERT INTO public._ds_next_gcn_ponds "
+        "(id, version, geometry, name, attributes, created_at) "
+        "SELECT gen_random_uuid(), "
+        "(SELECT COALESCE(MAX(version),0)+1 FROM public.gcn_ponds), "
+        "geometry, name, attributes, created_at "
+        "FROM pg_temp._ds_stage_gcn_ponds;" in sql
     )
-    assert "DROP TABLE pg_temp._ds_stage_nn_catchments;" in sql
+    assert "DROP TABLE pg_temp._ds_stage_gcn_ponds;" in sql
+    assert sql.index("INSERT INTO") < sql.index("ds_index_version('gcn_ponds')")
+    # Never written in place: no UPDATE of staging, no INSERT into the live table.
+    assert "UPDATE" not in sql
+    assert "INSERT INTO public.gcn_ponds" not in sql
     assert "BEGIN;" not in sql
     assert "COMMIT;" not in sql
 
 
-def test_old_version_cleanup_sql_keeps_latest_two_versions():
+def test_pre_sql_drops_promoted_columns_from_staging():
+    from app.data_sync.restore import pre_sql
+
+    sql = pre_sql("nn_catchments")
+    assert "ALTER TABLE pg_temp._ds_stage_nn_catchments DROP COLUMN n2k_site_n;" in sql
+    assert "ALTER TABLE pg_temp._ds_stage_nn_catchments DROP COLUMN oid;" in sql
+    assert "DROP COLUMN" not in pre_sql("gcn_ponds")
+
+
+def test_post_sql_leaves_promoted_columns_to_postgres():
+    from app.data_sync.restore import post_sql
+
+    sql = post_sql("nn_catchments")
+    insert = sql[sql.index("INSERT INTO") :]
+    assert "n2k_site_n" not in insert
+    assert "oid" not in insert
+
+
+def test_post_sql_rejects_table_without_model():
+    from app.data_sync.restore import post_sql
+
+    with pytest.raises(ValueError, match="no model"):
+        post_sql("not_a_reference_table")
+
+
+def test_old_version_cleanup_sql_drops_superseded_partitions():
     from app.data_sync.restore import old_version_cleanup_sql
 
     sql = old_version_cleanup_sql("nn_catchments")
-    assert "WHERE version < (SELECT MAX(version) FROM public.nn_catchments) - 1" in sql
+    assert sql == "SELECT public.ds_drop_superseded_versions('nn_catchments');"
 
 
 def test_old_version_cleanup_sql_rejects_unsafe_identifier():
@@ -221,7 +256,7 @@ def test_restore_all_atomic_writes_qc_block_between_stage_and_promote(
     text = psql_stdin.decode()
     stage_idx = text.index("CREATE TEMP TABLE _ds_stage_nn_catchments")
     qc_idx = text.index("DO $qc$")
-    promote_idx = text.index("INSERT INTO public.nn_catchments")
+    promote_idx = text.index("INSERT INTO public._ds_next_nn_catchments")
     assert stage_idx < qc_idx < promote_idx
 
 
@@ -269,7 +304,270 @@ def test_restore_all_atomic_stages_all_tables_before_promoting_any(
     copy1_idx = text.index("COPY pg_temp._ds_stage_nn_catchments")
     stage2_idx = text.index("CREATE TEMP TABLE _ds_stage_lpa_boundaries")
     copy2_idx = text.index("COPY pg_temp._ds_stage_lpa_boundaries")
-    promote1_idx = text.index("INSERT INTO public.nn_catchments")
-    promote2_idx = text.index("INSERT INTO public.lpa_boundaries")
+    promote1_idx = text.index("INSERT INTO public._ds_next_nn_catchments")
+    promote2_idx = text.index("INSERT INTO public._ds_next_lpa_boundaries")
+    attach1_idx = text.index("ds_attach_version('nn_catchments')")
+    attach2_idx = text.index("ds_attach_version('lpa_boundaries')")
 
     assert stage1_idx < copy1_idx < stage2_idx < copy2_idx < promote1_idx < promote2_idx
+    # Attaching locks the DEFAULT partitions until COMMIT, so it comes last.
+    assert promote2_idx < attach1_idx < attach2_idx
+
+
+def test_post_sql_reads_public_staging_and_leaves_it_for_other_tables_qc():
+    from app.data_sync.restore import post_sql
+
+    sql = post_sql("gcn_ponds", staging_schema="public")
+    assert "FROM public._ds_stage_gcn_ponds;" in sql
+    assert "DROP TABLE" not in sql
+    assert "ds_index_version('gcn_ponds')" in sql
+
+
+def test_stream_dump_to_staging_counts_rows_and_bytes(tmp_path):
+    from app.data_sync.restore import _stream_dump_to_staging
+
+    data = b"abc\t1\ndef\t2\nghi\t3\n"
+    dump = tmp_path / "nn.sql.gz"
+    dump.write_bytes(
+        gzip.compress(
+            b"COPY public.nn_catchments (id, version) FROM stdin;\n"
+            + data
+            + b"\\.\n\n\n--\n-- PostgreSQL database dump complete\n--\n\n"
+        )
+    )
+
+    stats = _stream_dump_to_staging(
+        io.BytesIO(), dump, "nn_catchments", "_ds_stage_nn_catchments"
+    )
+
+    assert stats.rows == 3
+    assert stats.bytes > len(data)
+
+
+def test_stream_dump_to_staging_counts_no_rows_for_empty_copy(tmp_path):
+    from app.data_sync.restore import _stream_dump_to_staging
+
+    dump = tmp_path / "nn.sql.gz"
+    dump.write_bytes(
+        gzip.compress(b"COPY public.nn_catchments (id) FROM stdin;\n\\.\n\n")
+    )
+
+    stats = _stream_dump_to_staging(
+        io.BytesIO(), dump, "nn_catchments", "_ds_stage_nn_catchments"
+    )
+    assert stats.rows == 0
+
+
+@pytest.fixture
+def psql_sessions(monkeypatch):
+    """Replace subprocess.Popen with fake psql processes, one per connection.
+    Yields the list of scripts they were fed; `fail_when` maps a substring to
+    the stderr a session whose script contains it fails with.
+    """
+    sessions: list[str] = []
+    fail_when: dict[str, str] = {}
+
+    class _FakeStdin:
+        def __init__(self):
+            self.buffer = bytearray()
+
+        def write(self, data):
+            self.buffer.extend(data)
+
+        def close(self):
+            pass
+
+    class _FakeProc:
+        def __init__(self):
+            self.stdin = _FakeStdin()
+            self.returncode = 0
+
+        def communicate(self):
+            script = self.stdin.buffer.decode()
+            sessions.append(script)
+            for marker, stderr in fail_when.items():
+                if marker in script:
+                    self.returncode = 3
+                    return b"", stderr.encode()
+            return b"", b""
+
+        def kill(self):
+            pass
+
+    monkeypatch.setattr(restore_mod.subprocess, "Popen", lambda *a, **k: _FakeProc())  # noqa: ARG005
+    return sessions, fail_when
+
+
+def _write_dumps(tmp_path):
+    dumps = []
+    for table in ("nn_catchments", "lpa_boundaries"):
+        dump = tmp_path / f"{table}.sql.gz"
+        dump.write_bytes(
+            gzip.compress(f"COPY public.{table} (id) FROM stdin;\nabc\n\\.\n".encode())
+        )
+        dumps.append((table, dump))
+    return dumps
+
+
+def test_restore_all_parallel_loads_checks_and_promotes_per_table(
+    tmp_path, psql_sessions
+):
+    from app.data_sync.qc_rules import load_qc_rules
+
+    sessions, _ = psql_sessions
+    restore_mod.restore_all_parallel(
+        settings=restore_mod.DatabaseSettings(iam_authentication=False),
+        region="eu-west-2",
+        items=_write_dumps(tmp_path),
+        qc_rules=load_qc_rules(),
+        max_workers=2,
+    )
+
+    loads, builds, rest = sessions[:2], sessions[2:4], sessions[4:]
+    for table in ("nn_catchments", "lpa_boundaries"):
+        load = next(s for s in loads if f"ds_prepare_stage('{table}')" in s)
+        assert f"COPY public._ds_stage_{table} (id) FROM stdin;" in load
+        build = next(s for s in builds if f"INSERT INTO public._ds_next_{table}" in s)
+        assert build.index("DO $qc$") < build.index("INSERT INTO")
+        assert f"FROM public._ds_stage_{table};" in build
+    promote, discard = rest
+    # The shared transaction does nothing but attach.
+    assert promote == (
+        "SELECT public.ds_attach_version('nn_catchments');\n"
+        "SELECT public.ds_attach_version('lpa_boundaries');\n"
+    )
+    assert "ds_discard_staging('nn_catchments')" in discard
+    assert "ds_discard_staging('lpa_boundaries')" in discard
+
+
+def test_restore_all_parallel_promotes_nothing_when_any_table_fails_qc(
+    tmp_path, psql_sessions
+):
+    from app.data_sync.qc import parse_qc_failures
+    from app.data_sync.qc_rules import load_qc_rules
+
+    sessions, fail_when = psql_sessions
+    fail_when["_ds_next_nn_catchments"] = (
+        "ERROR:  table=nn_catchments rule=row_count detail=staged row count is 0\n"
+    )
+    fail_when["_ds_next_lpa_boundaries"] = (
+        "ERROR:  table=lpa_boundaries rule=key_not_null detail=1 row(s)\n"
+    )
+
+    with pytest.raises(RuntimeError) as excinfo:
+        restore_mod.restore_all_parallel(
+            settings=restore_mod.DatabaseSettings(iam_authentication=False),
+            region="eu-west-2",
+            items=_write_dumps(tmp_path),
+            qc_rules=load_qc_rules(),
+        )
+
+    failures = parse_qc_failures(str(excinfo.value))
+    assert {f.table for f in failures} == {"nn_catchments", "lpa_boundaries"}
+    assert not any("ds_attach_version" in s for s in sessions)
+    # Staging is dropped even though the reload failed.
+    assert "ds_discard_staging('nn_catchments')" in sessions[-1]
+
+
+def test_restore_all_parallel_fetches_a_fresh_iam_token_per_psql_run(
+    tmp_path, psql_sessions, monkeypatch
+):
+    from app.repositories import engine
+
+    sessions, _ = psql_sessions
+    get_token = MagicMock(return_value="token")
+    monkeypatch.setattr(engine, "_get_iam_auth_token", get_token)
+
+    restore_mod.restore_all_parallel(
+        settings=DatabaseSettings(iam_authentication=True),
+        region="eu-west-2",
+        items=_write_dumps(tmp_path),
+        max_workers=2,
+    )
+
+    # Two loads, two builds, the promote and the staging cleanup.
+    assert len(sessions) == 6
+    assert get_token.call_count == len(sessions)
+
+
+def test_restore_all_parallel_rejects_unsafe_table_before_psql(tmp_path, monkeypatch):
+    dump = tmp_path / "x.sql.gz"
+    dump.write_bytes(gzip.compress(b"COPY ...\n"))
+
+    def _boom(*_a, **_k):
+        pytest.fail("psql must not be spawned when validation fails")
+
+    monkeypatch.setattr(restore_mod.subprocess, "Popen", _boom)
+
+    with pytest.raises(ValueError, match="identifier"):
+        restore_mod.restore_all_parallel(
+            settings=DatabaseSettings(iam_authentication=False),
+            region="eu-west-2",
+            items=[("nn_catchments; DROP TABLE users; --", dump)],
+        )
+
+
+def test_stream_dump_to_staging_reads_an_open_stream(tmp_path):
+    from app.data_sync.restore import _stream_dump_to_staging
+
+    stream = io.BytesIO(
+        gzip.compress(b"COPY public.nn_catchments (id) FROM stdin;\nabc\n\\.\n")
+    )
+    out = io.BytesIO()
+    stats = _stream_dump_to_staging(
+        out, stream, "nn_catchments", "_ds_stage_nn_catchments"
+    )
+    assert b"COPY pg_temp._ds_stage_nn_catchments (id) FROM stdin;\n" in out.getvalue()
+    assert stats.rows == 1
+    assert stats.network_seconds == 0.0
+
+
+def test_stream_dump_to_staging_rejects_a_stream_that_is_not_gzip():
+    from app.data_sync.restore import _stream_dump_to_staging
+
+    stream = io.BytesIO(b"COPY public.nn_catchments (id) FROM stdin;\n")
+    with pytest.raises(ValueError, match="not gzip-compressed"):
+        _stream_dump_to_staging(
+            io.BytesIO(), stream, "nn_catchments", "_ds_stage_nn_catchments"
+        )
+
+
+def test_restore_all_atomic_opens_each_streamed_dump_before_the_previous_copies(
+    psql_stdin,  # noqa: ARG001
+    monkeypatch,
+):
+    events = []
+
+    def source(table):
+        def open_dump():
+            events.append(f"open {table}")
+            return io.BytesIO(
+                gzip.compress(f"COPY public.{table} (id) FROM stdin;\n\\.\n".encode())
+            )
+
+        return open_dump
+
+    stream = restore_mod._stream_dump_to_staging
+
+    def _recording_stream(stdin, dump, table, *args, **kwargs):
+        events.append(f"copy {table}")
+        return stream(stdin, dump, table, *args, **kwargs)
+
+    monkeypatch.setattr(restore_mod, "_stream_dump_to_staging", _recording_stream)
+
+    restore_mod.restore_all_atomic(
+        settings=restore_mod.DatabaseSettings(iam_authentication=False),
+        region="eu-west-2",
+        items=[
+            ("nn_catchments", source("nn_catchments")),
+            ("lpa_boundaries", source("lpa_boundaries")),
+        ],
+    )
+
+    # The second dump is opened (and starts downloading) before the first COPYs.
+    assert events == [
+        "open nn_catchments",
+        "open lpa_boundaries",
+        "copy nn_catchments",
+        "copy lpa_boundaries",
+    ]
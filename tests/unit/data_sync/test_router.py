@@ -82,6 +82,7 @@ def test_status_endpoint_reuses_engine(client):
         started_at=None,
         finished_at=None,
         error=None,
+        warmup_seconds=1.5,
     )
     with (
         patch("app.data_sync.router.create_db_engine") as create,
@@ -92,6 +93,7 @@ def test_status_endpoint_reuses_engine(client):
         first = client.get(f"/admin/data-sync/{run.id}", headers=headers)
         second = client.get(f"/admin/data-sync/{run.id}", headers=headers)
     assert first.status_code == second.status_code == 200
+    assert first.json()["warmup_seconds"] == 1.5
     assert create.call_count == 1
     create.return_value.dispose.assert_not_called()
 
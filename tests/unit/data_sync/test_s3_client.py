@@ -72,3 +72,67 @@ def test_other_s3_errors_keep_context():
     s3 = S3Client(boto, bucket="b", prefix="dumps")
     with pytest.raises(S3ObjectError, match=r"S3 403 accessing s3://b/dumps/nn.sql.gz"):
         s3.object_etag("nn.sql.gz")
+
+
+class _RangedBoto:
+    """A fake boto client serving ranged GETs of one in-memory object."""
+
+    def __init__(self, data: bytes, etag: str = "abc123") -> None:
+        self.data = data
+        self.etag = etag
+        self.ranges: list[str] = []
+
+    def head_object(self, **kwargs):
+        if kwargs.get("IfMatch", f'"{self.etag}"') != f'"{self.etag}"':
+            error = _client_error("412", "HeadObject")
+            raise error
+        return {"ContentLength": len(self.data), "ETag": f'"{self.etag}"'}
+
+    def get_object(self, *, Bucket, Key, Range, IfMatch):  # noqa: N803, ARG002
+        if IfMatch != f'"{self.etag}"':
+            error = _client_error("PreconditionFailed", "GetObject")
+            raise error
+        self.ranges.append(Range)
+        start, end = (int(n) for n in Range.removeprefix("bytes=").split("-"))
+        body = MagicMock()
+        body.read.return_value = self.data[start : end + 1]
+        return {"Body": body}
+
+
+def test_open_stream_reads_the_object_in_order_over_ranged_gets():
+    data = bytes(range(256)) * 40
+    boto = _RangedBoto(data)
+    s3 = S3Client(boto, bucket="b", prefix="dumps")
+
+    with s3.open_stream(
+        "nn.sql.gz", "abc123", part_size=1000, max_concurrency=3, buffer_parts=2
+    ) as stream:
+        assert stream.name == "s3://b/dumps/nn.sql.gz"
+        assert stream.read() == data
+
+    # GETs may complete in any order; the stream still reads in order.
+    assert sorted(boto.ranges, key=lambda r: int(r[6:].split("-")[0])) == [
+        *(f"bytes={start}-{start + 999}" for start in range(0, 10000, 1000)),
+        f"bytes=10000-{len(data) - 1}",
+    ]
+
+
+def test_open_stream_fails_when_the_object_no_longer_has_the_etag():
+    s3 = S3Client(_RangedBoto(b"x" * 10, etag="new"), bucket="b")
+    with pytest.raises(S3ObjectError, match=r"changed while it was being read"):
+        s3.open_stream("nn.sql.gz", "old")
+
+
+def test_open_stream_fails_when_the_object_is_short():
+    class _ShortBoto(_RangedBoto):
+        def get_object(self, **kwargs):
+            resp = super().get_object(**kwargs)
+            resp["Body"].read.return_value = resp["Body"].read.return_value[:-1]
+            return resp
+
+    s3 = S3Client(_ShortBoto(b"x" * 10), bucket="b")
+    with (
+        s3.open_stream("nn.sql.gz", part_size=4) as stream,
+        pytest.raises(S3ObjectError, match=r"read 7 of 10 bytes"),
+    ):
+        stream.read()
@@ -45,6 +45,8 @@ def test_restore_all_records_failed_history_row_per_table_on_qc_failure(
     from uuid import uuid4
 
     cfg = MagicMock()
+    cfg.parallel_restore = False
+    cfg.stream_dumps = False
     cfg.tables = ["nn_catchments", "coefficient_layer"]
     manifest = Manifest(
         data_version="v1",
@@ -93,6 +95,8 @@ def test_restore_all_aggregates_multiple_qc_failures_for_same_table(
     from uuid import uuid4
 
     cfg = MagicMock()
+    cfg.parallel_restore = False
+    cfg.stream_dumps = False
     cfg.tables = ["nn_catchments"]
     manifest = Manifest(
         data_version="v1",
@@ -127,3 +131,58 @@ def test_restore_all_aggregates_multiple_qc_failures_for_same_table(
     nn_row = next(row for row in added if row.table_name == "nn_catchments")
     assert "key_not_null" in nn_row.status_detail
     assert "non_null" in nn_row.status_detail
+
+
+def test_restore_all_uses_parallel_restore_when_configured(monkeypatch):
+    cfg = MagicMock()
+    cfg.parallel_restore = True
+    cfg.stream_dumps = False
+    cfg.restore_workers = 3
+    cfg.tables = ["nn_catchments"]
+    cfg.build_coefficient_nn_intersection = False
+    manifest = Manifest(data_version="v1", tables={"nn_catchments": "k1.gz"})
+    s3 = MagicMock()
+    s3.object_etag.return_value = "etag"
+    s3.download_object.side_effect = lambda _key, dest: dest.write_bytes(b"")
+    parallel = MagicMock()
+    monkeypatch.setattr(service, "restore_all_parallel", parallel)
+    monkeypatch.setattr(
+        service,
+        "restore_all_atomic",
+        lambda *_a, **_k: pytest.fail("atomic restore must not run"),
+    )
+    monkeypatch.setattr(service, "load_qc_rules", lambda: None)
+    monkeypatch.setattr(service, "set_active_version", lambda *_a: None)
+
+    service._restore_all(MagicMock(), s3, cfg, MagicMock(), "eu-west-2", None, manifest)
+
+    parallel.assert_called_once()
+    assert parallel.call_args.kwargs["max_workers"] == 3
+
+
+def test_restore_all_streams_dumps_pinned_to_their_etag_when_configured(monkeypatch):
+    cfg = MagicMock()
+    cfg.parallel_restore = False
+    cfg.stream_dumps = True
+    cfg.stream_part_mib = 2
+    cfg.stream_concurrency = 3
+    cfg.tables = ["nn_catchments"]
+    cfg.build_coefficient_nn_intersection = False
+    manifest = Manifest(data_version="v1", tables={"nn_catchments": "k1.gz"})
+    s3 = MagicMock()
+    s3.object_etag.return_value = "etag"
+    restore = MagicMock()
+    monkeypatch.setattr(service, "restore_all_atomic", restore)
+    monkeypatch.setattr(service, "load_qc_rules", lambda: None)
+    monkeypatch.setattr(service, "set_active_version", lambda *_a: None)
+
+    service._restore_all(MagicMock(), s3, cfg, MagicMock(), "eu-west-2", None, manifest)
+
+    s3.download_object.assert_not_called()
+    ((table, source),) = restore.call_args.args[2]
+    assert table == "nn_catchments"
+    s3.open_stream.assert_not_called()  # opened only when the restore reaches it
+    source()
+    s3.open_stream.assert_called_once_with(
+        "k1.gz", "etag", part_size=2 * 1024 * 1024, max_concurrency=3
+    )
@@ -28,7 +28,7 @@ def test_do_run_raises_clearly_when_run_row_missing(monkeypatch):
     fake_session.close.assert_called_once()
 
 
-def test_cleanup_runs_delete_per_table_and_commits():
+def test_cleanup_drops_superseded_partitions_per_table_and_commits():
     session = MagicMock()
     _cleanup_old_versions(session, ["nn_catchments", "coefficient_layer"])
 
@@ -36,8 +36,10 @@ def test_cleanup_runs_delete_per_table_and_commits():
     assert session.execute.call_count == 2
     assert session.commit.call_count == 2
     sql_texts = [str(call.args[0]) for call in session.execute.call_args_list]
-    assert any("DELETE FROM public.nn_catchments" in s for s in sql_texts)
-    assert any("DELETE FROM public.coefficient_layer" in s for s in sql_texts)
+    assert any("ds_drop_superseded_versions('nn_catchments')" in s for s in sql_texts)
+    assert any(
+        "ds_drop_superseded_versions('coefficient_layer')" in s for s in sql_texts
+    )
 
 
 def test_cleanup_is_best_effort_and_continues_after_failure():
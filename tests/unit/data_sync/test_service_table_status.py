@@ -11,9 +11,19 @@ from app.data_sync.service import REFERENCE_TABLES, _log_table_status
 N_TABLES = len(REFERENCE_TABLES)
 
 
-def test_logs_single_info_line_when_all_tables_have_rows(caplog):
+def _session(estimate: int = 5) -> MagicMock:
+    """Session whose first-row probes find a row and whose pg_class estimates
+    are `estimate` for every reference table."""
     session = MagicMock()
-    session.scalar.return_value = 5
+    session.scalar.return_value = 1
+    session.execute.return_value.all.return_value = [
+        (label, estimate) for _model, label in REFERENCE_TABLES
+    ]
+    return session
+
+
+def test_logs_single_info_line_when_all_tables_have_rows(caplog):
+    session = _session()
 
     with caplog.at_level(logging.INFO, logger="app.data_sync.service"):
         _log_table_status(session)
@@ -22,14 +32,13 @@ def test_logs_single_info_line_when_all_tables_have_rows(caplog):
     assert len(records) == 1
     record = records[0]
     assert record.levelno == logging.INFO
-    assert "coefficient_layer=5" in record.message
-    assert "edp_edges=5" in record.message
+    assert "coefficient_layer=~5" in record.message
+    assert "edp_edges=~5" in record.message
     assert "all tables have rows" in record.message
 
 
 def test_status_message_uses_context_label(caplog):
-    session = MagicMock()
-    session.scalar.return_value = 5
+    session = _session()
 
     with caplog.at_level(logging.INFO, logger="app.data_sync.service"):
         _log_table_status(session, context="Startup")
@@ -40,11 +49,11 @@ def test_status_message_uses_context_label(caplog):
 
 
 def test_warns_and_names_empty_tables(caplog):
-    session = MagicMock()
-    # lookup_table (3rd in the list) comes back empty
-    counts = [5] * N_TABLES
-    counts[2] = 0
-    session.scalar.side_effect = counts
+    session = _session()
+    # lookup_table (3rd in the list) has no first row
+    probes: list = [1] * N_TABLES
+    probes[2] = None
+    session.scalar.side_effect = probes
 
     with caplog.at_level(logging.INFO, logger="app.data_sync.service"):
         _log_table_status(session)
@@ -54,12 +63,36 @@ def test_warns_and_names_empty_tables(caplog):
     record = records[0]
     assert record.levelno == logging.WARNING
     assert "EMPTY: lookup_table" in record.message
+    assert "lookup_table=0" in record.message
     assert "all tables have rows" not in record.message
 
 
+def test_unanalyzed_table_with_rows_is_not_reported_empty(caplog):
+    session = _session(estimate=-1)
+
+    with caplog.at_level(logging.INFO, logger="app.data_sync.service"):
+        _log_table_status(session)
+
+    records = [r for r in caplog.records if "Post-sync table status" in r.message]
+    assert records[0].levelno == logging.INFO
+    assert "coefficient_layer=>0" in records[0].message
+
+
+def test_counts_are_not_computed_with_count_star(caplog):
+    session = _session()
+
+    with caplog.at_level(logging.INFO, logger="app.data_sync.service"):
+        _log_table_status(session)
+
+    probes = [str(c.args[0]).lower() for c in session.scalar.call_args_list]
+    assert probes
+    assert not any("count(" in p for p in probes)
+    assert all("limit" in p for p in probes)
+
+
 def test_warns_and_names_tables_that_fail_to_count(caplog):
-    session = MagicMock()
-    effects: list = [5] * N_TABLES
+    session = _session()
+    effects: list = [1] * N_TABLES
     effects[0] = RuntimeError("boom")
     session.scalar.side_effect = effects
 
@@ -85,10 +118,12 @@ def test_never_raises_even_if_counting_blows_up(caplog):
     assert any("table status" in r.message for r in caplog.records)
 
 
-def _do_run_with(monkeypatch, *, reload_needed: bool) -> tuple[MagicMock, MagicMock]:
+def _do_run_with(
+    monkeypatch, *, reload_needed: bool, run: MagicMock | None = None
+) -> tuple[MagicMock, MagicMock]:
     """Drive _do_run with everything stubbed; return relevant collaborator mocks."""
     fake_session = MagicMock()
-    fake_session.get.return_value = MagicMock()
+    fake_session.get.return_value = run or MagicMock()
     monkeypatch.setattr(service, "Session", lambda bind: fake_session)  # noqa: ARG005
     monkeypatch.setattr(service, "_build_s3_client", MagicMock())
     monkeypatch.setattr(service, "_last_applied_version", MagicMock(return_value=None))
@@ -98,6 +133,9 @@ def _do_run_with(monkeypatch, *, reload_needed: bool) -> tuple[MagicMock, MagicM
     monkeypatch.setattr(service, "_log_table_status", log_status)
     clear_caches = MagicMock()
     monkeypatch.setattr(service, "clear_spatial_caches", clear_caches)
+    warm_up = MagicMock(return_value=MagicMock(total_seconds=2.5))
+    monkeypatch.setattr(service, "warm_up", warm_up)
+    clear_caches.attach_mock(warm_up, "warm_up")
 
     service._do_run(
         MagicMock(),  # engine
@@ -129,3 +167,17 @@ def test_do_run_logs_table_status_on_noop(monkeypatch):
     log_status.assert_called_once()
     # No reload happened, so caches are left intact.
     clear_caches.assert_not_called()
+
+
+def test_do_run_warms_up_after_clearing_caches_before_reporting_success(monkeypatch):
+    run = MagicMock()
+    _, clear_caches = _do_run_with(monkeypatch, reload_needed=True, run=run)
+    # clear_spatial_caches() first, then the warm-up refills them.
+    assert [c[0] for c in clear_caches.mock_calls] == ["", "warm_up"]
+    assert run.warmup_seconds == 2.5
+    assert run.status == "success"
+
+
+def test_do_run_skips_warm_up_on_noop(monkeypatch):
+    _, clear_caches = _do_run_with(monkeypatch, reload_needed=False)
+    clear_caches.warm_up.assert_not_called()
@@ -9,7 +9,7 @@ from app.data_sync import service
 
 def test_log_startup_table_status_warns_on_empty(monkeypatch, caplog):
     session = MagicMock()
-    session.scalar.return_value = 0
+    session.scalar.return_value = None  # no first row in any table
     repo = MagicMock()
     repo.session.return_value.__enter__.return_value = session
     monkeypatch.setattr(service, "get_shared_repository", lambda: repo)
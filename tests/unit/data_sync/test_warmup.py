@@ -0,0 +1,131 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.data_sync import warmup
+from app.data_sync.warmup import parse_tile, warm_up
+
+
+def _cfg(**overrides) -> MagicMock:
+    cfg = MagicMock()
+    cfg.warmup_boundaries_path = ""
+    cfg.warmup_tiles = []
+    for name, value in overrides.items():
+        setattr(cfg, name, value)
+    return cfg
+
+
+@pytest.fixture
+def stubbed(monkeypatch):
+    """Stub the cache-side collaborators; return them by name."""
+    stubs = {
+        "get_active_version": MagicMock(return_value=7),
+        "_rebuild_caches": MagicMock(return_value="ok"),
+        "_replay_boundaries": MagicMock(return_value="ok"),
+        "warm_tile": MagicMock(return_value=100),
+        "seed_tile_archive": MagicMock(return_value=12),
+        "get_shared_repository": MagicMock(),
+    }
+    for name, stub in stubs.items():
+        monkeypatch.setattr(warmup, name, stub)
+    return stubs
+
+
+def test_analyzes_every_table_and_prewarms_only_nutrient_layers(stubbed, caplog):
+    session = MagicMock()
+    session.scalar.side_effect = [1, 40]
+
+    with caplog.at_level("INFO", logger="app.data_sync.warmup"):
+        report = warm_up(session, _cfg(), ["nn_catchments", "gcn_ponds"])
+
+    sql = [(str(c.args[0]), c.args[1]["t"]) for c in session.execute.call_args_list]
+    assert sql == [
+        ("SELECT public.ds_analyze_version(:t)", "nn_catchments"),
+        ("SELECT public.ds_analyze_version(:t)", "gcn_ponds"),
+    ]
+    assert session.scalar.call_count == 2
+    assert session.scalar.call_args.args[1] == {"t": "nn_catchments", "v": 7}
+    assert any("prewarm: 40 block(s) in" in r.message for r in caplog.records)
+    assert list(report.steps) == ["analyze", "prewarm", "caches"]
+    assert report.failed == []
+
+
+def test_prewarm_is_skipped_without_pg_prewarm(stubbed, caplog):
+    session = MagicMock()
+    session.scalar.return_value = None
+
+    with caplog.at_level("INFO", logger="app.data_sync.warmup"):
+        report = warm_up(session, _cfg(), ["nn_catchments", "wwtw_catchments"])
+
+    session.scalar.assert_called_once()
+    assert "prewarm" not in report.failed
+    assert any("pg_prewarm is not installed" in r.message for r in caplog.records)
+
+
+def test_prewarm_carries_on_past_a_table_without_a_partition(stubbed, caplog):
+    session = MagicMock()
+    session.scalar.side_effect = [1, None, 25]
+
+    with caplog.at_level("INFO", logger="app.data_sync.warmup"):
+        report = warm_up(session, _cfg(), ["nn_catchments", "wwtw_catchments"])
+
+    assert session.scalar.call_count == 3
+    assert "prewarm" not in report.failed
+    message = "prewarm: 25 block(s); no partition: nn_catchments in"
+    assert any(message in r.message for r in caplog.records)
+
+
+def test_a_failed_step_is_recorded_and_the_rest_still_run(stubbed):
+    session = MagicMock()
+    session.execute.side_effect = RuntimeError("permission denied")
+    session.scalar.return_value = 0
+
+    report = warm_up(
+        session,
+        _cfg(
+            warmup_boundaries_path="rlbs.geojson", warmup_tiles=["edp_boundaries/8/1/2"]
+        ),
+        ["nn_catchments"],
+    )
+
+    assert report.failed == ["analyze"]
+    session.rollback.assert_called_once()
+    assert list(report.steps) == ["analyze", "prewarm", "caches", "boundaries", "tiles"]
+    stubbed["_replay_boundaries"].assert_called_once()
+    stubbed["warm_tile"].assert_called_once_with("edp_boundaries", 8, 1, 2)
+    assert report.total_seconds == sum(report.steps.values())
+
+
+def test_seeds_archives_of_reloaded_tile_layers_when_configured(stubbed, monkeypatch):
+    monkeypatch.setattr(
+        warmup, "TileServerConfig", lambda: MagicMock(archive_dir="/tiles")
+    )
+    session = MagicMock()
+    session.scalar.return_value = 0
+
+    report = warm_up(session, _cfg(), ["edp_boundary_layer", "nn_catchments"])
+
+    stubbed["seed_tile_archive"].assert_called_once_with("edp_boundaries", 7)
+    assert "seed_tiles" in report.steps
+
+
+def test_does_not_seed_without_an_archive_dir(stubbed, monkeypatch):
+    monkeypatch.setattr(warmup, "TileServerConfig", lambda: MagicMock(archive_dir=""))
+
+    report = warm_up(MagicMock(), _cfg(), ["edp_boundary_layer"])
+
+    stubbed["seed_tile_archive"].assert_not_called()
+    assert "seed_tiles" not in report.steps
+
+
+def test_parse_tile_rejects_unknown_layers_and_bad_specs():
+    assert parse_tile("edp_excluded_areas/10/511/340") == (
+        "edp_excluded_areas",
+        10,
+        511,
+        340,
+    )
+    with pytest.raises(ValueError, match="layer/z/x/y"):
+        parse_tile("nn_catchments/10/511/340")
+    with pytest.raises(ValueError, match="layer/z/x/y"):
+        parse_tile("edp_boundaries/10/511")
@@ -0,0 +1,140 @@
+from unittest.mock import MagicMock
+
+import geopandas as gpd
+import pandas as pd
+import pytest
+from shapely.geometry import box
+
+from app.models.db import WwtwCatchments
+from app.repositories import repository as repository_module
+from app.repositories.context import RepositoryContext
+from app.repositories.repository import Repository
+
+
+def _rlb(n: int) -> gpd.GeoDataFrame:
+    return gpd.GeoDataFrame(
+        {
+            "rlb_id": range(1, n + 1),
+            "dwellings": [10] * n,
+            "name": [f"Site {i}" for i in range(n)],
+            "dwelling_category": ["housing"] * n,
+            "source": ["test"] * n,
+        },
+        geometry=[box(i, 0, i + 1, 1) for i in range(n)],
+        crs="EPSG:27700",
+    )
+
+
+_ASSIGNMENTS = [
+    {
+        "overlay_table": WwtwCatchments,
+        "overlay_filter": WwtwCatchments.version == 1,
+        "overlay_attr_col": WwtwCatchments.attributes["WwTw_ID"].astext,
+        "output_field": "majority_wwtw_id",
+    }
+]
+
+
+@pytest.fixture
+def repo_and_session():
+    session = MagicMock()
+    session.scalar.return_value = None
+    session.execute.return_value.fetchall.return_value = []
+    repo = Repository(MagicMock())
+    repo.session = MagicMock(return_value=session)
+    repository_module.clear_spatial_caches()
+    yield repo, session
+    repository_module.clear_spatial_caches()
+
+
+def _sql(session) -> list[str]:
+    return [str(call.args[0]) for call in session.execute.call_args_list]
+
+
+def test_scope_passes_other_repositories_through():
+    double = MagicMock()
+
+    with RepositoryContext.scope(double, _rlb(1)) as repo:
+        assert repo is double
+
+
+def test_inline_input_shares_one_session(repo_and_session, monkeypatch):
+    repo, session = repo_and_session
+    monkeypatch.setattr(repository_module._query_cfg, "inline_input_max_features", 5)
+    rlb = _rlb(2)
+
+    with RepositoryContext.scope(repo, rlb) as ctx:
+        ctx.batch_majority_overlap_postgis(rlb, "rlb_id", _ASSIGNMENTS)
+        ctx.land_use_intersection_postgis(rlb, 1, 1)
+        with ctx.session() as shared:
+            assert shared is session
+
+    sql = _sql(session)
+    assert not any("CREATE TEMPORARY TABLE" in s for s in sql)
+    majority = next(s for s in sql if "LEFT JOIN LATERAL" in s)
+    assert majority.lstrip().startswith("WITH _tmp_rlb AS MATERIALIZED")
+    assert ", _tmp_input_geom AS (SELECT rlb_id AS input_id" in majority
+    repo.session.assert_called_once()
+    session.close.assert_called_once()
+
+
+def test_large_input_is_staged_once(repo_and_session, monkeypatch):
+    repo, session = repo_and_session
+    monkeypatch.setattr(repository_module._query_cfg, "inline_input_max_features", 0)
+    rlb = _rlb(3)
+
+    with RepositoryContext.scope(repo, rlb) as ctx:
+        ctx.batch_majority_overlap_postgis(rlb, "rlb_id", _ASSIGNMENTS)
+        ctx.land_use_intersection_postgis(rlb, 1, 1)
+
+    sql = _sql(session)
+    assert sum("CREATE TEMPORARY TABLE" in s for s in sql) == 1
+    assert any("CREATE TEMPORARY TABLE _tmp_rlb" in s for s in sql)
+    majority = next(s for s in sql if "LEFT JOIN LATERAL" in s)
+    assert majority.startswith("WITH _tmp_input_geom AS (SELECT rlb_id AS input_id")
+    repo.session.assert_called_once()
+
+
+def test_other_inputs_fall_back_to_the_repository(repo_and_session):
+    repo, _session = repo_and_session
+    repo.batch_majority_overlap_postgis = MagicMock(return_value={})
+
+    with RepositoryContext.scope(repo, _rlb(2)) as ctx:
+        ctx.batch_majority_overlap_postgis(_rlb(1), "rlb_id", _ASSIGNMENTS)
+
+    repo.batch_majority_overlap_postgis.assert_called_once()
+
+
+def test_prefetch_runs_land_use_on_the_repository(repo_and_session):
+    repo, _session = repo_and_session
+    expected = pd.DataFrame({"rlb_id": [1]})
+    repo.land_use_intersection_postgis = MagicMock(return_value=expected)
+    rlb = _rlb(1)
+
+    with RepositoryContext.scope(repo, rlb, concurrent=True) as ctx:
+        ctx.prefetch("land_use_intersection_postgis", 4, 2)
+        result = ctx.land_use_intersection_postgis(rlb, 4, 2)
+
+    assert result is expected
+    repo.land_use_intersection_postgis.assert_called_once_with(rlb, 4, 2)
+
+
+def test_prefetch_is_a_no_op_without_concurrency(repo_and_session):
+    repo, _session = repo_and_session
+    repo.land_use_intersection_postgis = MagicMock()
+
+    with RepositoryContext.scope(repo, _rlb(1)) as ctx:
+        ctx.prefetch("land_use_intersection_postgis", 4, 2)
+
+    repo.land_use_intersection_postgis.assert_not_called()
+
+
+def test_rlbs_are_staged_only_when_a_query_needs_them(repo_and_session, monkeypatch):
+    repo, session = repo_and_session
+    monkeypatch.setattr(repository_module._query_cfg, "inline_input_max_features", 0)
+
+    with RepositoryContext.scope(repo, _rlb(3)) as ctx, ctx.session() as shared:
+        shared.scalar("SELECT 1")
+
+    assert not any("CREATE TEMPORARY TABLE" in s for s in _sql(session))
+    session.close.assert_called_once()
@@ -0,0 +1,118 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from app.data_sync.active_version import set_active_version
+from app.repositories import generation
+from app.repositories.generation import (
+    ReferenceGenerationListener,
+    ReferenceGenerations,
+    notify_reference_change,
+)
+
+
+def _counting_loader(value):
+    calls = []
+
+    def _load():
+        calls.append(1)
+        return value
+
+    return _load, calls
+
+
+def test_registry_queries_every_time_until_live():
+    registry = ReferenceGenerations()
+    load, calls = _counting_loader(3)
+
+    assert registry.get("nn_catchments", load) == 3
+    assert registry.get("nn_catchments", load) == 3
+    assert len(calls) == 2
+
+
+def test_live_registry_remembers_until_invalidated():
+    registry = ReferenceGenerations()
+    registry.set_live(True)
+    load, calls = _counting_loader(3)
+
+    registry.get("nn_catchments", load)
+    registry.get("nn_catchments", load)
+    assert len(calls) == 1
+
+    registry.invalidate("test")
+    registry.get("nn_catchments", load)
+    assert len(calls) == 2
+
+
+def test_value_loaded_across_an_invalidation_is_not_remembered():
+    registry = ReferenceGenerations()
+    registry.set_live(True)
+
+    def _stale_load():
+        registry.invalidate("concurrent rollback")
+        return 4
+
+    assert registry.get("nn_catchments", _stale_load) == 4
+    load, calls = _counting_loader(3)
+    assert registry.get("nn_catchments", load) == 3
+    assert len(calls) == 1
+
+
+def test_invalidate_runs_callbacks_except_on_reconcile():
+    registry = ReferenceGenerations()
+    callback = MagicMock()
+    registry.add_invalidation_callback(callback)
+    registry.add_invalidation_callback(callback)
+
+    registry.invalidate("reconcile", run_callbacks=False)
+    callback.assert_not_called()
+    registry.invalidate("notify: nn_catchments")
+    callback.assert_called_once()
+
+
+def test_set_active_version_queues_notification():
+    session = MagicMock()
+
+    set_active_version(session, "nn_catchments", 5)
+
+    last = session.execute.call_args_list[-1]
+    assert "pg_notify" in str(last.args[0])
+    assert last.args[1] == {"channel": "nrf_reference_data", "payload": "nn_catchments"}
+
+
+def test_notify_defaults_to_all_tables():
+    session = MagicMock()
+
+    notify_reference_change(session)
+
+    assert session.execute.call_args.args[1]["payload"] == "*"
+
+
+def test_listener_invalidates_on_notification_and_reconcile(monkeypatch):
+    registry = ReferenceGenerations()
+    registry.set_live(True)
+    callback = MagicMock()
+    registry.add_invalidation_callback(callback)
+    config = SimpleNamespace(reconcile_seconds=0.0, retry_seconds=1.0)
+    listener = ReferenceGenerationListener(MagicMock(), registry, config)
+
+    conn = MagicMock()
+    conn.notifies = [SimpleNamespace(payload="nn_catchments")]
+
+    def _select(readers, *_args):
+        listener._stop.set()  # one iteration only
+        return readers, [], []
+
+    monkeypatch.setattr(generation.select, "select", _select)
+    reasons = []
+    original = registry.invalidate
+    monkeypatch.setattr(
+        registry,
+        "invalidate",
+        lambda reason, **kw: (reasons.append(reason), original(reason, **kw)),
+    )
+
+    listener._poll(conn)
+
+    assert reasons == ["notify: nn_catchments", "reconcile"]
+    assert conn.notifies == []
+    callback.assert_called_once()
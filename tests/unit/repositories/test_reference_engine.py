@@ -0,0 +1,203 @@
+"""Tests for the in-memory majority-overlap engine."""
+
+from unittest.mock import MagicMock
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+import shapely
+from shapely.geometry import box
+
+from app.models.db import LpaBoundaries, Subcatchments, WwtwCatchments
+from app.repositories.reference_engine import (
+    ReferenceEngine,
+    _describe_assignment,
+    majority_indices,
+)
+from app.repositories.repository import Repository
+
+
+def _session_for(layers: dict[str, list[tuple]]) -> MagicMock:
+    """Session whose execute() returns (wkb, attributes) rows per table."""
+    session = MagicMock()
+
+    def execute(stmt, params=None):
+        sql = str(stmt)
+        for table, features in layers.items():
+            if f"public.{table} " in sql:
+                result = MagicMock()
+                result.fetchall.return_value = [
+                    (shapely.to_wkb(geom), attrs) for geom, attrs in features
+                ]
+                return result
+        msg = f"unexpected SQL: {sql}"
+        raise AssertionError(msg)
+
+    session.execute.side_effect = execute
+    return session
+
+
+def _assignments(version: int = 1) -> list[dict]:
+    return [
+        {
+            "overlay_table": WwtwCatchments,
+            "overlay_filter": WwtwCatchments.version == version,
+            "overlay_attr_col": WwtwCatchments.wwtw_id,
+            "output_field": "majority_wwtw_id",
+            "default_value": 141,
+        },
+        {
+            "overlay_table": LpaBoundaries,
+            "overlay_filter": LpaBoundaries.version == version,
+            "overlay_attr_col": LpaBoundaries.lpa_name,
+            "output_field": "majority_name",
+            "default_value": "UNKNOWN",
+        },
+        {
+            "overlay_table": Subcatchments,
+            "overlay_filter": Subcatchments.version == version,
+            "overlay_attr_col": Subcatchments.opcat_name,
+            "output_field": "majority_opcat_name",
+            "default_value": None,
+        },
+    ]
+
+
+def _overlay_majority(inputs: list, overlays: list) -> list[int]:
+    """Reference majority via gpd.overlay, as the sequential assignment does."""
+    in_gdf = gpd.GeoDataFrame({"i": range(len(inputs))}, geometry=inputs)
+    ov_gdf = gpd.GeoDataFrame({"o": range(len(overlays))}, geometry=overlays)
+    joined = gpd.overlay(in_gdf, ov_gdf, how="intersection", keep_geom_type=False)
+    joined["area"] = joined.geometry.area
+    best = joined.loc[joined.groupby("i")["area"].idxmax()]
+    picks = dict(zip(best["i"], best["o"], strict=True))
+    return [picks.get(i, -1) for i in range(len(inputs))]
+
+
+def test_majority_indices_matches_overlay_reference():
+    rng = np.random.default_rng(7)
+    overlays = [
+        box(x, y, x + 10, y + 10) for x in range(0, 50, 10) for y in range(0, 50, 10)
+    ]
+    inputs = []
+    for _ in range(200):
+        x, y = rng.uniform(-5, 55, size=2)
+        w, h = rng.uniform(0.5, 12, size=2)
+        inputs.append(box(x, y, x + w, y + h))
+    geoms = np.asarray(overlays, dtype=object)
+
+    got = majority_indices(
+        np.asarray(inputs, dtype=object), geoms, shapely.STRtree(geoms)
+    )
+
+    assert got.tolist() == _overlay_majority(inputs, overlays)
+
+
+def test_majority_indices_zero_area_touch_still_matches():
+    overlays = np.asarray([box(0, 0, 10, 10)], dtype=object)
+    inputs = np.asarray([box(10, 0, 12, 2), box(20, 20, 21, 21)], dtype=object)
+
+    got = majority_indices(inputs, overlays, shapely.STRtree(overlays))
+
+    assert got.tolist() == [0, -1]
+
+
+def test_batch_majority_overlap_converts_attributes_like_postgres_astext():
+    session = _session_for(
+        {
+            "wwtw_catchments": [(box(0, 0, 10, 10), {"WwTw_ID": 17})],
+            "lpa_boundaries": [(box(0, 0, 10, 10), {"NAME": "Leeds"})],
+            "subcatchments": [(box(0, 0, 10, 10), {"OPCAT_NAME": None})],
+        }
+    )
+    gdf = gpd.GeoDataFrame({"id": [0]}, geometry=[box(1, 1, 2, 2)], crs="EPSG:27700")
+
+    results = ReferenceEngine().batch_majority_overlap(
+        session, gdf, "id", _assignments()
+    )
+
+    assert results["majority_wwtw_id"]["majority_wwtw_id"].tolist() == ["17"]
+    assert results["majority_name"]["majority_name"].tolist() == ["Leeds"]
+    assert results["majority_opcat_name"]["majority_opcat_name"].tolist() == [None]
+
+
+def test_batch_majority_overlap_fills_defaults_and_caches_layers():
+    session = _session_for(
+        {
+            "wwtw_catchments": [(box(0, 0, 10, 10), {"WwTw_ID": "5"})],
+            "lpa_boundaries": [(box(0, 0, 10, 10), {"NAME": "Leeds"})],
+            "subcatchments": [(box(0, 0, 10, 10), {"OPCAT_NAME": "Aire"})],
+        }
+    )
+    gdf = gpd.GeoDataFrame(
+        {"id": [0, 1]},
+        geometry=[box(1, 1, 2, 2), box(50, 50, 51, 51)],
+        crs="EPSG:27700",
+    )
+    engine = ReferenceEngine()
+
+    results = engine.batch_majority_overlap(session, gdf, "id", _assignments())
+    engine.batch_majority_overlap(session, gdf, "id", _assignments())
+
+    assert results["majority_wwtw_id"]["majority_wwtw_id"].tolist() == ["5", 141]
+    assert results["majority_name"]["majority_name"].tolist() == ["Leeds", "UNKNOWN"]
+    assert pd.isna(results["majority_opcat_name"]["majority_opcat_name"].iloc[1])
+    assert session.execute.call_count == 3
+    assert engine.loaded_layers() == [
+        ("lpa_boundaries", 1),
+        ("subcatchments", 1),
+        ("wwtw_catchments", 1),
+    ]
+
+
+def test_describe_assignment_reads_promoted_columns_from_attributes():
+    promoted = _describe_assignment(_assignments()[0])
+    extracted = _describe_assignment(
+        _assignments()[0]
+        | {"overlay_attr_col": WwtwCatchments.attributes["WwTw_ID"].astext}
+    )
+
+    assert (promoted.attr_column, promoted.attr_key) == ("attributes", "WwTw_ID")
+    assert promoted == extracted
+
+
+def test_describe_assignment_rejects_unsupported_filter():
+    assignment = _assignments()[0] | {"overlay_filter": WwtwCatchments.version >= 1}
+
+    with pytest.raises(ValueError, match="version == <int>"):
+        _describe_assignment(assignment)
+
+
+def test_repository_dispatches_to_memory_backend(monkeypatch):
+    engine = ReferenceEngine()
+    monkeypatch.setattr(
+        "app.repositories.repository.get_reference_engine", lambda: engine
+    )
+    session = _session_for(
+        {
+            "wwtw_catchments": [(box(0, 0, 10, 10), {"WwTw_ID": 9})],
+            "lpa_boundaries": [(box(0, 0, 10, 10), {"NAME": "York"})],
+            "subcatchments": [(box(0, 0, 10, 10), {"OPCAT_NAME": "Ouse"})],
+        }
+    )
+    repo = Repository(MagicMock())
+    repo.session = MagicMock()
+    repo.session.return_value.__enter__.return_value = session
+    gdf = gpd.GeoDataFrame({"id": [3]}, geometry=[box(1, 1, 2, 2)], crs="EPSG:27700")
+
+    results = repo.batch_majority_overlap_postgis(
+        gdf, "id", _assignments(), backend="memory"
+    )
+
+    assert results["majority_wwtw_id"].to_dict("records") == [
+        {"id": 3, "majority_wwtw_id": "9"}
+    ]
+
+
+def test_repository_rejects_unknown_backend():
+    repo = Repository(MagicMock())
+    gdf = gpd.GeoDataFrame({"id": [3]}, geometry=[box(1, 1, 2, 2)], crs="EPSG:27700")
+
+    with pytest.raises(ValueError, match="Unknown majority overlap backend"):
+        repo.batch_majority_overlap_postgis(gdf, "id", _assignments(), backend="duckdb")
@@ -1,10 +1,17 @@
 from datetime import UTC, datetime
 from unittest.mock import MagicMock
 
+import geopandas as gpd
+import pandas as pd
+from shapely.geometry import box
+
 from app.models.db import GcnRiskZones
+from app.repositories.generation import get_reference_generations
 from app.repositories.repository import (
+    _has_coefficient_nn_intersection,
     _intersection_cache_key,
     _land_use_cache_key,
+    _restamp_rlb_attributes,
     _spatial_cache_generation,
 )
 
@@ -24,6 +31,50 @@ def test_spatial_cache_generation_has_stable_sentinel_without_data_loads():
     assert _spatial_cache_generation(session) == "no-successful-data-load"
 
 
+def test_spatial_cache_generation_is_remembered_while_registry_is_live():
+    session = MagicMock()
+    session.scalar.return_value = datetime(2026, 6, 16, 12, 30, tzinfo=UTC)
+    registry = get_reference_generations()
+    registry.set_live(True)
+    try:
+        first = _spatial_cache_generation(session)
+        second = _spatial_cache_generation(session)
+    finally:
+        registry.set_live(False)
+
+    assert first == second
+    session.scalar.assert_called_once()
+
+
+def test_has_coefficient_nn_intersection_checks_version_pair():
+    session = MagicMock()
+    session.execute.return_value.fetchone.return_value = (1,)
+
+    assert _has_coefficient_nn_intersection(session, 3, 2) is True
+    sql = str(session.execute.call_args.args[0])
+    assert "FROM public.coefficient_nn_intersection" in sql
+    assert session.execute.call_args.args[1] == {"coeff_version": 3, "nn_version": 2}
+
+    session.execute.return_value.fetchone.return_value = None
+    assert _has_coefficient_nn_intersection(session, 3, 1) is False
+
+
+def test_has_coefficient_nn_intersection_is_remembered_per_version_pair():
+    session = MagicMock()
+    session.execute.return_value.fetchone.return_value = (1,)
+    registry = get_reference_generations()
+    registry.set_live(True)
+    try:
+        assert _has_coefficient_nn_intersection(session, 3, 2) is True
+        assert _has_coefficient_nn_intersection(session, 3, 2) is True
+        session.execute.return_value.fetchone.return_value = None
+        assert _has_coefficient_nn_intersection(session, 4, 2) is False
+    finally:
+        registry.set_live(False)
+
+    assert session.execute.call_count == 2
+
+
 def test_land_use_cache_key_changes_when_data_load_generation_changes():
     gdf = MagicMock()
     gdf.to_dict.return_value = [
@@ -43,6 +94,48 @@ def test_land_use_cache_key_changes_when_data_load_generation_changes():
     assert first != second
 
 
+def _rlb(dwellings: list[int], names: list[str]) -> gpd.GeoDataFrame:
+    return gpd.GeoDataFrame(
+        {
+            "rlb_id": [1, 2],
+            "dwellings": dwellings,
+            "name": names,
+            "dwelling_category": ["house", "flat"],
+            "source": ["api", "api"],
+        },
+        geometry=[box(0, 0, 1, 1), box(2, 0, 3, 1)],
+        crs="EPSG:27700",
+    )
+
+
+def test_land_use_cache_key_ignores_rlb_attributes():
+    first = _rlb([10, 20], ["Site A", "Site B"])
+    second = _rlb([150, 5], ["Renamed", "Site B"])
+
+    assert _land_use_cache_key(
+        first, coeff_version=1, nn_version=1, generation="run-a"
+    ) == _land_use_cache_key(second, coeff_version=1, nn_version=1, generation="run-a")
+
+
+def test_restamp_rlb_attributes_uses_current_input():
+    cached = pd.DataFrame(
+        {
+            "rlb_id": [2, 1, 1],
+            "dwellings": [20, 10, 10],
+            "name": ["Site B", "Site A", "Site A"],
+            "dwelling_category": ["flat", "house", "house"],
+            "source": ["api", "api", "api"],
+            "area_in_nn_catchment_ha": [0.5, 0.25, 0.75],
+        }
+    )
+
+    rows = _restamp_rlb_attributes(cached, _rlb([150, 5], ["Renamed", "Site B"]))
+
+    assert list(rows["dwellings"]) == [5, 150, 150]
+    assert list(rows["name"]) == ["Site B", "Renamed", "Renamed"]
+    assert list(rows["area_in_nn_catchment_ha"]) == [0.5, 0.25, 0.75]
+
+
 def test_intersection_cache_key_changes_when_data_load_generation_changes():
     first = _intersection_cache_key(
         input_wkt="POLYGON ((0 0, 1 0, 1 1, 0 0))",
@@ -0,0 +1,92 @@
+from unittest.mock import MagicMock
+
+import geopandas as gpd
+import pytest
+from shapely.geometry import box
+
+from app.models.db import WwtwCatchments
+from app.repositories import repository as repository_module
+from app.repositories.repository import Repository
+
+
+@pytest.fixture
+def repo_and_session():
+    session = MagicMock()
+    session.scalar.return_value = None
+    session.execute.return_value.fetchall.return_value = []
+    repo = Repository(MagicMock())
+    repo.session = MagicMock()
+    repo.session.return_value.__enter__.return_value = session
+    repository_module.clear_spatial_caches()
+    yield repo, session
+    repository_module.clear_spatial_caches()
+
+
+def _rlb(n: int) -> gpd.GeoDataFrame:
+    return gpd.GeoDataFrame(
+        {
+            "rlb_id": range(1, n + 1),
+            "dwellings": [10] * n,
+            "name": [f"Site {i}" for i in range(n)],
+            "dwelling_category": ["housing"] * n,
+            "source": ["test"] * n,
+        },
+        geometry=[box(i, 0, i + 1, 1) for i in range(n)],
+        crs="EPSG:27700",
+    )
+
+
+def _sql(session) -> list[str]:
+    return [str(call.args[0]) for call in session.execute.call_args_list]
+
+
+def test_small_land_use_input_is_passed_inline(repo_and_session, monkeypatch):
+    repo, session = repo_and_session
+    monkeypatch.setattr(repository_module._query_cfg, "inline_input_max_features", 2)
+
+    repo.land_use_intersection_postgis(_rlb(2), 1, 1)
+
+    sql = _sql(session)
+    assert not any("CREATE TEMPORARY TABLE" in s for s in sql)
+    assert sql[-1].lstrip().startswith("WITH _tmp_rlb AS MATERIALIZED")
+    params = session.execute.call_args_list[-1].args[1]
+    assert params["rlb_ids"] == [1, 2]
+    assert params["rlb_names"] == ["Site 0", "Site 1"]
+    assert len(params["rlb_geoms"]) == 2
+
+
+def test_large_land_use_input_is_staged(repo_and_session, monkeypatch):
+    repo, session = repo_and_session
+    monkeypatch.setattr(repository_module._query_cfg, "inline_input_max_features", 2)
+
+    repo.land_use_intersection_postgis(_rlb(3), 1, 1)
+
+    sql = _sql(session)
+    assert any("CREATE TEMPORARY TABLE _tmp_rlb" in s for s in sql)
+    assert "WITH _tmp_rlb" not in sql[-1]
+
+
+def test_small_batch_majority_input_is_passed_inline(repo_and_session, monkeypatch):
+    repo, session = repo_and_session
+    monkeypatch.setattr(repository_module._query_cfg, "inline_input_max_features", 1)
+    gdf = gpd.GeoDataFrame({"id": [5]}, geometry=[box(0, 0, 1, 1)], crs="EPSG:27700")
+
+    repo.batch_majority_overlap_postgis(
+        gdf,
+        "id",
+        [
+            {
+                "overlay_table": WwtwCatchments,
+                "overlay_filter": WwtwCatchments.version == 1,
+                "overlay_attr_col": WwtwCatchments.attributes["WwTw_ID"].astext,
+                "output_field": "majority_wwtw_id",
+            }
+        ],
+        backend="postgis",
+    )
+
+    sql = _sql(session)
+    assert len(sql) == 1
+    assert sql[0].lstrip().startswith("WITH _tmp_input_geom AS MATERIALIZED")
+    params = session.execute.call_args.args[1]
+    assert params["input_ids"] == [5]
@@ -0,0 +1,135 @@
+from unittest.mock import MagicMock
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+from shapely.geometry import Polygon
+
+from app.config import ResultCacheConfig
+from app.repositories.result_cache import (
+    ResultCache,
+    assessment_fingerprint,
+    decode_results,
+    encode_results,
+)
+
+_SQUARE = [(0, 0), (10, 0), (10, 10), (0, 10)]
+
+
+def _gdf(coords=_SQUARE, dwellings=10, category="housing") -> gpd.GeoDataFrame:
+    return gpd.GeoDataFrame(
+        {
+            "id": ["NRF-1"],
+            "name": ["Site"],
+            "dwellings": [dwellings],
+            "dwelling_category": [category],
+        },
+        geometry=[Polygon(coords)],
+        crs="EPSG:27700",
+    )
+
+
+def _fingerprint(gdf, **overrides) -> str:
+    kwargs = {
+        "config": {"precautionary_buffer_percent": 20.0},
+        "generation": {"coefficient_layer": 3},
+        "app_version": "abc123",
+    }
+    kwargs.update(overrides)
+    return assessment_fingerprint(gdf, "nutrient", **kwargs)
+
+
+class TestAssessmentFingerprint:
+    def test_is_stable_across_vertex_order_and_identity(self):
+        rotated = _SQUARE[2:] + _SQUARE[:2]
+        other = _gdf(list(reversed(rotated)))
+        other["id"] = "NRF-2"
+        other["name"] = "Resubmitted"
+
+        assert _fingerprint(_gdf()) == _fingerprint(other)
+
+    @pytest.mark.parametrize(
+        ("gdf", "overrides"),
+        [
+            (_gdf(dwellings=11), {}),
+            (_gdf(category="care_home"), {}),
+            (_gdf([(0, 0), (11, 0), (11, 10), (0, 10)]), {}),
+            (_gdf(), {"generation": {"coefficient_layer": 4}}),
+            (_gdf(), {"config": {"precautionary_buffer_percent": 10.0}}),
+            (_gdf(), {"app_version": "def456"}),
+        ],
+    )
+    def test_changes_with_any_result_input(self, gdf, overrides):
+        assert _fingerprint(gdf, **overrides) != _fingerprint(_gdf())
+
+
+def test_results_round_trip_with_dtypes():
+    df = pd.DataFrame(
+        {
+            "rlb_id": np.array([1, 2], dtype="int64"),
+            "name": ["a", None],
+            "n_total": [1.25, np.nan],
+            "inside": [True, False],
+        }
+    )
+
+    decoded = decode_results(encode_results({"impact_summary": df}))
+
+    pd.testing.assert_frame_equal(decoded["impact_summary"], df)
+
+
+def _cache(payload=None, max_bytes=1_000_000):
+    session = MagicMock()
+    session.scalar.return_value = payload
+    session.execute.return_value.rowcount = 0
+    repo = MagicMock()
+    repo.session.return_value.__enter__.return_value = session
+    cache = ResultCache(repo, ResultCacheConfig(max_bytes=max_bytes))
+    return cache, session
+
+
+def test_get_returns_stored_results_and_tracks_hit_rate():
+    df = pd.DataFrame({"rlb_id": [1]})
+    cache, _ = _cache(encode_results({"impact_summary": df}))
+
+    result = cache.get("f" * 64)
+
+    pd.testing.assert_frame_equal(result["impact_summary"], df)
+    assert cache.hit_rate == 1.0
+
+
+def test_miss_and_failed_lookup_return_none():
+    cache, session = _cache(None)
+    assert cache.get("a") is None
+    session.scalar.side_effect = RuntimeError("db down")
+    assert cache.get("b") is None
+    assert cache.hit_rate == 0.0
+
+
+def test_put_upserts_then_evicts_to_the_size_bound():
+    cache, session = _cache(max_bytes=4096)
+
+    cache.put("f" * 64, "nutrient", {"impact_summary": pd.DataFrame({"a": [1]})})
+
+    put, evict = (c.args for c in session.execute.call_args_list)
+    assert "ON CONFLICT (fingerprint)" in str(put[0])
+    assert put[1]["size_bytes"] == len(put[1]["payload"])
+    assert "DELETE FROM public.assessment_result_cache" in str(evict[0])
+    assert evict[1] == {"max_bytes": 4096}
+    session.commit.assert_called_once()
+
+
+def test_put_skips_results_larger_than_the_cache():
+    cache, session = _cache(max_bytes=10)
+
+    cache.put("f" * 64, "nutrient", {"impact_summary": pd.DataFrame({"a": [1]})})
+
+    session.execute.assert_not_called()
+
+
+def test_put_never_raises():
+    cache, session = _cache()
+    session.execute.side_effect = RuntimeError("db down")
+
+    cache.put("f" * 64, "nutrient", {"impact_summary": pd.DataFrame({"a": [1]})})
@@ -0,0 +1,76 @@
+import struct
+from unittest.mock import MagicMock
+
+import geopandas as gpd
+import pytest
+import shapely
+from shapely.geometry import Point, box
+
+from app.repositories.staging import copy_binary, encode_copy_binary, ewkb_array
+
+
+def _decode(payload: bytes) -> list[list[bytes | None]]:
+    """Minimal reader for the binary COPY format (no header extension)."""
+    assert payload.startswith(b"PGCOPY\n\xff\r\n\x00")
+    pos = 19
+    rows = []
+    while True:
+        (n_fields,) = struct.unpack_from("!h", payload, pos)
+        pos += 2
+        if n_fields == -1:
+            break
+        row = []
+        for _ in range(n_fields):
+            (length,) = struct.unpack_from("!i", payload, pos)
+            pos += 4
+            if length == -1:
+                row.append(None)
+            else:
+                row.append(payload[pos : pos + length])
+                pos += length
+        rows.append(row)
+    assert pos == len(payload)
+    return rows
+
+
+def test_ewkb_array_carries_srid():
+    geoms = gpd.GeoSeries([box(0, 0, 1, 1), Point(2, 3)])
+
+    encoded = ewkb_array(geoms)
+
+    decoded = shapely.from_wkb(encoded)
+    assert shapely.get_srid(decoded).tolist() == [27700, 27700]
+    assert decoded[0].equals(geoms[0])
+
+
+def test_encode_copy_binary_round_trips_rows():
+    geoms = ewkb_array(gpd.GeoSeries([box(0, 0, 1, 1), None]))
+
+    rows = _decode(
+        encode_copy_binary(
+            [("int4", [7, -1]), ("text", ["Site", "Ø"]), ("geometry", geoms)]
+        )
+    )
+
+    assert rows[0][0] == struct.pack("!i", 7)
+    assert rows[1][0] == struct.pack("!i", -1)
+    assert [r[1] for r in rows] == [b"Site", "Ø".encode()]
+    assert rows[0][2] == geoms[0]
+    assert rows[1][2] is None
+
+
+def test_encode_copy_binary_rejects_ragged_columns():
+    with pytest.raises(ValueError, match="different lengths"):
+        encode_copy_binary([("int4", [1, 2]), ("text", ["a"])])
+
+
+def test_copy_binary_streams_on_the_session_connection():
+    session = MagicMock()
+    cursor = session.connection.return_value.connection.cursor.return_value
+
+    copy_binary(session, "_tmp_input_geom", ["input_id", "geom"], b"payload")
+
+    sql, stream = cursor.copy_expert.call_args.args
+    assert sql == "COPY _tmp_input_geom (input_id, geom) FROM STDIN (FORMAT binary)"
+    assert stream.read() == b"payload"
+    cursor.close.assert_called_once()
@@ -5,6 +5,7 @@ import pytest
 from shapely.geometry import Polygon
 
 from app.spatial.overlay import spatial_difference_with_precision
+from app.spatial.pool import shutdown_spatial_pool
 
 
 def test_spatial_difference_with_precision_basic():
@@ -59,9 +60,8 @@ def test_spatial_difference_with_precision_parallel_fallback(monkeypatch):
         msg = "blocked in test"
         raise PermissionError(msg)
 
-    monkeypatch.setattr(
-        "app.spatial.overlay.ProcessPoolExecutor", _raise_permission_error
-    )
+    shutdown_spatial_pool()
+    monkeypatch.setattr("app.spatial.pool.ProcessPoolExecutor", _raise_permission_error)
 
     result_parallel = spatial_difference_with_precision(
         left, right, parallel=True, max_workers=2
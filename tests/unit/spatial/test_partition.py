@@ -0,0 +1,87 @@
+"""The shared partitioner balances estimated cost, not area, across chunks."""
+
+import geopandas as gpd
+import numpy as np
+import shapely
+from shapely.geometry import box
+
+from app.spatial.partition import feature_costs, partition_by_cost
+
+
+def _clustered(seed: int = 0) -> gpd.GeoDataFrame:
+    """95 sites in one 1 km cluster plus 5 spread over 100 km."""
+    rng = np.random.default_rng(seed)
+    points = np.vstack(
+        [rng.uniform(50_000, 51_000, (95, 2)), rng.uniform(0, 100_000, (5, 2))]
+    )
+    return gpd.GeoDataFrame(
+        {"rlb_id": np.arange(100)},
+        geometry=shapely.box(*points.T, *(points + 20).T),
+        crs="EPSG:27700",
+    )
+
+
+def test_every_row_lands_in_exactly_one_nonempty_chunk():
+    gdf = _clustered()
+
+    partition = partition_by_cost(gdf, 4)
+
+    ids = np.concatenate([chunk["rlb_id"].to_numpy() for chunk in partition.chunks])
+    assert sorted(ids) == list(range(100))
+    assert all(len(chunk) for chunk in partition.chunks)
+
+
+def test_clustered_input_is_balanced():
+    partition = partition_by_cost(_clustered(), 4)
+
+    assert len(partition.chunks) == 4
+    assert partition.utilisation.mean() > 0.9
+
+
+def test_costly_feature_gets_its_own_chunk():
+    detailed = shapely.Point(0, 0).buffer(10, quad_segs=500)
+    gdf = gpd.GeoDataFrame(
+        {"rlb_id": np.arange(21)},
+        geometry=[detailed] + [box(i * 30, 0, i * 30 + 5, 5) for i in range(1, 21)],
+        crs="EPSG:27700",
+    )
+
+    partition = partition_by_cost(gdf, 3)
+
+    heavy = [chunk for chunk in partition.chunks if 0 in chunk["rlb_id"].values]
+    assert heavy[0]["rlb_id"].tolist() == [0]
+
+
+def test_cost_counts_overlay_candidates():
+    gdf = gpd.GeoDataFrame(
+        geometry=[box(0, 0, 1, 1), box(10, 10, 11, 11)], crs="EPSG:27700"
+    )
+    overlay = gpd.GeoDataFrame(
+        geometry=[box(0, 0, 0.5, 0.5), box(0.5, 0.5, 1, 1)], crs="EPSG:27700"
+    )
+
+    costs = feature_costs(gdf, overlay)
+
+    # Five vertices each (closed ring); the first meets two overlay boxes.
+    np.testing.assert_array_equal(costs, [15.0, 5.0])
+
+
+def test_fewer_features_than_chunks():
+    gdf = _clustered().iloc[:3]
+
+    partition = partition_by_cost(gdf, 8)
+
+    assert len(partition.chunks) == 3
+
+
+def test_empty_and_missing_geometries_get_a_chunk_of_their_own():
+    gdf = _clustered()
+    gdf.loc[100] = [100, shapely.Polygon()]
+    gdf.loc[101] = [101, None]
+
+    partition = partition_by_cost(gdf, 4)
+
+    assert len(partition.chunks) == 4
+    assert partition.chunks[-1]["rlb_id"].tolist() == [100, 101]
+    ids = np.concatenate([chunk["rlb_id"].to_numpy() for chunk in partition.chunks])
+    assert sorted(ids) == list(range(102))
@@ -0,0 +1,148 @@
+"""The shared spatial worker pool gives the same answers as the sequential
+path and ships each overlay to its workers once per key."""
+
+import os
+
+import geopandas as gpd
+import pytest
+from shapely.geometry import Polygon, box
+
+from app.spatial.assignments import majority_overlap
+from app.spatial.overlay import spatial_difference_with_precision
+from app.spatial.pool import (
+    EncodedFrame,
+    OverlayHandle,
+    SpatialPoolUnavailableError,
+    SpatialWorkerPool,
+    get_spatial_pool,
+    shutdown_spatial_pool,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pool():
+    shutdown_spatial_pool()
+    yield
+    shutdown_spatial_pool()
+
+
+def _strip(n: int) -> gpd.GeoDataFrame:
+    return gpd.GeoDataFrame(
+        {
+            "site_id": list(range(n)),
+            "geometry": [box(i, 0, i + 1, 1) for i in range(n)],
+        },
+        crs="EPSG:27700",
+    )
+
+
+def _zones() -> gpd.GeoDataFrame:
+    return gpd.GeoDataFrame(
+        {
+            "id": ["a", "b", "c"],
+            "zone": ["west", "middle", "east"],
+            "geometry": [
+                box(-1, -1, 40.3, 2),
+                box(40.3, -1, 80.6, 2),
+                box(80.6, -1, 200, 2),
+            ],
+        },
+        crs="EPSG:27700",
+    )
+
+
+def test_encoded_frame_round_trip():
+    gdf = _zones()
+
+    decoded = EncodedFrame.from_gdf(gdf).to_gdf()
+
+    assert decoded.crs == gdf.crs
+    assert decoded.drop(columns="geometry").equals(gdf.drop(columns="geometry"))
+    assert decoded.geometry.geom_equals(gdf.geometry).all()
+
+
+def test_parallel_majority_overlap_matches_sequential():
+    sites, zones = _strip(150), _zones()
+
+    parallel = majority_overlap(
+        sites, zones, "site_id", "zone", "zone_name", parallel=True, max_workers=2
+    )
+    again = majority_overlap(
+        sites, zones, "site_id", "zone", "zone_name", parallel=True, max_workers=2
+    )
+    sequential = majority_overlap(
+        sites, zones, "site_id", "zone", "zone_name", parallel=False
+    )
+
+    assert parallel["zone_name"].tolist() == sequential["zone_name"].tolist()
+    assert again["zone_name"].tolist() == sequential["zone_name"].tolist()
+    # Both calls shared one registered overlay.
+    assert len(get_spatial_pool(2)._layers) == 1
+
+
+def test_parallel_difference_matches_sequential():
+    left = _strip(120)
+    right = gpd.GeoDataFrame(
+        {"geometry": [Polygon([(40, -1), (80, -1), (80, 2), (40, 2)])]},
+        crs="EPSG:27700",
+    )
+
+    parallel = spatial_difference_with_precision(
+        left, right, parallel=True, max_workers=2, right_key="mask@1"
+    )
+    sequential = spatial_difference_with_precision(left, right, parallel=False)
+
+    assert len(parallel) == len(sequential)
+    assert parallel.geometry.area.sum() == pytest.approx(sequential.geometry.area.sum())
+
+
+def test_register_is_keyed_and_evicts_least_recently_used():
+    pool = SpatialWorkerPool(max_workers=1, max_layers=2)
+    zones = _zones()
+    try:
+        first = pool.register_overlay(zones, "zones@1")
+        assert pool.register_overlay(zones, "zones@1") is first
+        pool.register_overlay(zones, "zones@2")
+        pool.register_overlay(zones, "zones@3")
+
+        assert list(pool._layers) == ["zones@2", "zones@3"]
+        assert pool.register_overlay(zones).key.startswith("sha1:")
+    finally:
+        pool.shutdown()
+
+
+def test_pinned_overlay_survives_later_registrations_until_released():
+    pool = SpatialWorkerPool(max_workers=1, max_layers=1)
+    zones = _zones()
+    try:
+        with pool.pinned_overlay(zones, "zones@1") as handle:
+            pool.register_overlay(zones, "zones@2")
+            pool.register_overlay(zones, "zones@3")
+
+            assert "zones@1" in pool._layers
+            assert os.path.exists(handle.path)
+
+        pool.register_overlay(zones, "zones@4")
+        assert list(pool._layers) == ["zones@4"]
+        assert not os.path.exists(handle.path)
+    finally:
+        pool.shutdown()
+
+
+def test_pool_in_use_is_not_replaced():
+    pool = get_spatial_pool(1)
+
+    with pool.pinned_overlay(_zones(), "zones@1"):
+        assert get_spatial_pool(2) is pool
+
+    assert get_spatial_pool(2) is not pool
+
+
+def test_shut_down_pool_is_unavailable_not_cancelled():
+    pool = SpatialWorkerPool(max_workers=1)
+    pool.shutdown()
+
+    with pytest.raises(SpatialPoolUnavailableError):
+        pool.register_overlay(_zones(), "zones@1")
+    with pytest.raises(SpatialPoolUnavailableError):
+        pool.map_chunks(len, OverlayHandle("zones@1", "missing"), [_strip(1)])
@@ -4,15 +4,21 @@ Tests all calculator functions with known inputs/outputs from IATScript.
 """
 
 import numpy as np
+import pandas as pd
 import pytest
 
 from app.calculators import (
+    CsrLayout,
+    LandUseMatrix,
+    LandUseTerms,
+    ScenarioParameters,
     apply_buffer,
     apply_suds_mitigation,
     calculate_land_use_uplift,
     calculate_wastewater_load,
+    evaluate_scenarios,
 )
-from app.config import GreenspaceConfig, SuDsConfig
+from app.config import AssessmentConfig, GreenspaceConfig, SuDsConfig
 
 
 class TestLandUseCalculator:
@@ -372,3 +378,303 @@ class TestTotalImpactCalculator:
 
         assert n_total == pytest.approx(110.0)
         assert p_total == pytest.approx(11.0)
+
+
+class TestScenarioKernel:
+    """`evaluate_scenarios` reproduces the per-call calculators exactly."""
+
+    N_DEV = 300
+    N_ROWS = 3000
+
+    @pytest.fixture
+    def configs(self):
+        configs = []
+        for gs_percent, gs_threshold, suds_rate, suds_threshold, buffer in [
+            (20.0, 1.0, 25.0, 50, 20.0),
+            (35.0, 0.5, 40.0, 10, 20.0),
+            (0.0, 2.0, 0.0, 1, 10.0),
+            (50.0, 0.0, 12.5, 100, 0.0),
+            (20.0, 1.0, 50.0, 5, 15.0),  # greenspace shared with the first
+        ]:
+            config = AssessmentConfig()
+            configs.append(
+                config.model_copy(
+                    update={
+                        "greenspace": GreenspaceConfig(
+                            greenspace_percent=gs_percent,
+                            threshold_area_ha=gs_threshold,
+                        ),
+                        "suds": SuDsConfig(
+                            removal_rate_percent=suds_rate,
+                            threshold_dwellings=suds_threshold,
+                        ),
+                        "precautionary_buffer_percent": buffer,
+                    }
+                )
+            )
+        return configs
+
+    @pytest.fixture
+    def inputs(self, configs):
+        rng = np.random.default_rng(7)
+        n, k, r = self.N_DEV, len(configs), self.N_ROWS
+
+        def with_nans(values, share=0.05):
+            values = values.copy()
+            values[rng.random(len(values)) < share] = np.nan
+            return values
+
+        # The last 20 developments have no land-use rows at all.
+        development = rng.integers(0, n - 20, r)
+        return {
+            "dev_area_ha": np.round(rng.uniform(0.05, 4.0, n), 2),
+            "dwellings": rng.integers(1, 150, (n, k)).astype(float),
+            "occupancy_rate": with_nans(rng.uniform(1.8, 2.6, n)),
+            "water_usage": with_nans(rng.uniform(100, 140, n)),
+            "n_conc": with_nans(rng.uniform(0, 25, (2, n)).ravel()).reshape(2, n),
+            "p_conc": with_nans(rng.uniform(0, 3, (2, n)).ravel()).reshape(2, n),
+            "rows": {
+                "development": development,
+                "area": rng.uniform(0.001, 2.0, r),
+                "n_current": with_nans(rng.uniform(2, 40, r)),
+                "n_residential": with_nans(rng.uniform(10, 16, r)),
+                "p_current": with_nans(rng.uniform(0.05, 2, r)),
+                "p_residential": with_nans(rng.uniform(0.8, 1.4, r)),
+            },
+        }
+
+    def _evaluate(self, inputs, configs, land_use):
+        return evaluate_scenarios(
+            dev_area_ha=inputs["dev_area_ha"],
+            dwellings=inputs["dwellings"],
+            occupancy_rate=inputs["occupancy_rate"],
+            water_usage_litres_per_person_per_day=inputs["water_usage"],
+            nitrogen_conc_mg_per_litre=inputs["n_conc"],
+            phosphorus_conc_mg_per_litre=inputs["p_conc"],
+            land_use=land_use,
+            params=ScenarioParameters.from_configs(configs),
+        )
+
+    def _per_call_rest(self, inputs, config, k, n_uplift, p_uplift, totals):
+        """Check SuDS, wastewater and totals of scenario k against the calculators."""
+        dwellings = inputs["dwellings"][:, k]
+        n_post, p_post = apply_suds_mitigation(
+            n_lu_uplift=n_uplift,
+            p_lu_uplift=p_uplift,
+            dwellings=dwellings,
+            suds_config=config.suds,
+        )
+        np.testing.assert_array_equal(totals.n_lu_post_suds[:, k], n_post)
+        np.testing.assert_array_equal(totals.p_lu_post_suds[:, k], p_post)
+        np.testing.assert_array_equal(
+            totals.daily_water_litres[:, k],
+            dwellings * (inputs["occupancy_rate"] * inputs["water_usage"]),
+        )
+        for period in range(2):
+            _, n_ww, p_ww = calculate_wastewater_load(
+                dwellings=dwellings,
+                occupancy_rate=np.nan_to_num(inputs["occupancy_rate"]),
+                water_usage_litres_per_person_per_day=np.nan_to_num(
+                    inputs["water_usage"]
+                ),
+                nitrogen_conc_mg_per_litre=np.nan_to_num(inputs["n_conc"][period]),
+                phosphorus_conc_mg_per_litre=np.nan_to_num(inputs["p_conc"][period]),
+            )
+            np.testing.assert_array_equal(totals.n_wastewater[period, :, k], n_ww)
+            np.testing.assert_array_equal(totals.p_wastewater[period, :, k], p_ww)
+            n_total, p_total = apply_buffer(
+                nitrogen_land_use_post_suds=np.nan_to_num(n_post),
+                phosphorus_land_use_post_suds=np.nan_to_num(p_post),
+                nitrogen_wastewater=n_ww,
+                phosphorus_wastewater=p_ww,
+                precautionary_buffer_percent=config.precautionary_buffer_percent,
+            )
+            np.testing.assert_array_equal(totals.n_total[period, :, k], n_total)
+            np.testing.assert_array_equal(totals.p_total[period, :, k], p_total)
+
+    def test_matches_per_call_path_for_row_level_land_use(self, inputs, configs):
+        rows = inputs["rows"]
+        totals = self._evaluate(
+            inputs,
+            configs,
+            LandUseTerms(
+                development=rows["development"],
+                n_area_ha=rows["area"],
+                p_area_ha=rows["area"],
+                n_current=rows["n_current"],
+                n_residential=rows["n_residential"],
+                p_current=rows["p_current"],
+                p_residential=rows["p_residential"],
+            ),
+        )
+
+        for k, config in enumerate(configs):
+            row_n, row_p = calculate_land_use_uplift(
+                area_hectares=rows["area"],
+                dev_area_ha=inputs["dev_area_ha"][rows["development"]],
+                current_nitrogen_coeff=rows["n_current"],
+                residential_nitrogen_coeff=rows["n_residential"],
+                current_phosphorus_coeff=rows["p_current"],
+                residential_phosphorus_coeff=rows["p_residential"],
+                greenspace_config=config.greenspace,
+            )
+            layout = CsrLayout.from_rows(rows["development"], self.N_DEV)
+            n_sum, p_sum = layout.row_sums(row_n), layout.row_sums(row_p)
+            np.testing.assert_array_equal(totals.n_lu_uplift[:, k], n_sum)
+            np.testing.assert_array_equal(totals.p_lu_uplift[:, k], p_sum)
+            self._per_call_rest(inputs, config, k, n_sum, p_sum, totals)
+
+    def test_no_land_use_rows(self, inputs, configs):
+        empty = np.array([])
+        totals = self._evaluate(
+            inputs,
+            configs,
+            LandUseTerms(
+                development=np.array([], dtype=int),
+                n_area_ha=empty,
+                p_area_ha=empty,
+                n_current=empty,
+                n_residential=empty,
+                p_current=empty,
+                p_residential=empty,
+            ),
+        )
+
+        assert np.isnan(totals.n_lu_uplift).all()
+        assert np.isnan(totals.p_lu_post_suds).all()
+        wastewater = totals.n_wastewater[1]
+        buffer = ScenarioParameters.from_configs(configs).buffer_factor
+        np.testing.assert_array_equal(
+            totals.n_total[1], wastewater + np.abs(wastewater) * buffer
+        )
+
+
+class TestLandUseMatrix:
+    """`LandUseMatrix` aggregates intersection rows as the groupby it replaces."""
+
+    @pytest.fixture
+    def rows(self):
+        rng = np.random.default_rng(3)
+        r = 400
+        crome_id = rng.integers(0, 60, r)
+        coefficient = rng.uniform(2, 40, (4, 60))
+        sites = np.array(["River Wensum", "The Broads", "Poole Harbour", None])
+        site = rng.integers(0, 4, r)
+        return pd.DataFrame(
+            {
+                "rlb_id": rng.integers(1, 31, r),
+                "crome_id": crome_id,
+                "lu_curr_n_coeff": coefficient[0][crome_id],
+                "n_resi_coeff": coefficient[1][crome_id],
+                "lu_curr_p_coeff": coefficient[2][crome_id] / 20,
+                "p_resi_coeff": coefficient[3][crome_id] / 20,
+                "n2k_site_n": sites[site],
+                "oid": np.where(rng.random(r) < 0.1, None, site.astype(str)),
+                "area_in_nn_catchment_ha": rng.uniform(0.001, 2.0, r),
+            }
+        )
+
+    def _matrix(self, rows):
+        return LandUseMatrix.from_columns(
+            rlb_id=rows["rlb_id"],
+            area_ha=rows["area_in_nn_catchment_ha"],
+            n2k_site_n=rows["n2k_site_n"],
+            oid=rows["oid"],
+            crome_id=rows["crome_id"],
+            n_current=rows["lu_curr_n_coeff"],
+            n_residential=rows["n_resi_coeff"],
+            p_current=rows["lu_curr_p_coeff"],
+            p_residential=rows["p_resi_coeff"],
+        )
+
+    def test_one_column_per_polygon(self, rows):
+        matrix = self._matrix(rows)
+
+        assert len(matrix.n_current) == rows["crome_id"].nunique()
+        assert matrix.layout.indptr[-1] == len(matrix) == len(rows)
+
+    def test_inconsistent_polygon_coefficients_keep_row_columns(self, rows):
+        rows.loc[rows.index[rows["crome_id"] == 5][0], "n_resi_coeff"] = 99.0
+
+        matrix = self._matrix(rows)
+
+        assert len(matrix.n_current) == len(rows)
+        np.testing.assert_array_equal(
+            matrix.n_residential, matrix.sorted_entries(rows["n_resi_coeff"])
+        )
+
+    def test_uplift_matches_row_calculator(self, rows):
+        matrix = self._matrix(rows)
+        config = GreenspaceConfig(greenspace_percent=30.0, threshold_area_ha=1.0)
+        dev_area = np.round(np.linspace(0.1, 3.0, len(matrix.rlb_ids)), 2)
+
+        n_uplift, p_uplift = matrix.uplift(dev_area, config)
+
+        sorted_rows = rows.iloc[matrix.layout.order]
+        expected_n, expected_p = calculate_land_use_uplift(
+            area_hectares=sorted_rows["area_in_nn_catchment_ha"].to_numpy(),
+            dev_area_ha=pd.Series(dev_area, index=matrix.rlb_ids)
+            .reindex(sorted_rows["rlb_id"])
+            .to_numpy(),
+            current_nitrogen_coeff=sorted_rows["lu_curr_n_coeff"].to_numpy(),
+            residential_nitrogen_coeff=sorted_rows["n_resi_coeff"].to_numpy(),
+            current_phosphorus_coeff=sorted_rows["lu_curr_p_coeff"].to_numpy(),
+            residential_phosphorus_coeff=sorted_rows["p_resi_coeff"].to_numpy(),
+            greenspace_config=config,
+        )
+        np.testing.assert_array_equal(n_uplift, expected_n)
+        np.testing.assert_array_equal(p_uplift, expected_p)
+
+    def test_aggregates_match_groupby(self, rows):
+        matrix = self._matrix(rows)
+        rows["_nn_entry"] = [
+            (s, n) if pd.notna(s) and pd.notna(n) else None
+            for s, n in zip(rows["oid"], rows["n2k_site_n"], strict=True)
+        ]
+        expected = rows.groupby("rlb_id").agg(
+            {
+                "area_in_nn_catchment_ha": "sum",
+                "n2k_site_n": lambda x: "; ".join(sorted(set(x.dropna()))),
+                "_nn_entry": lambda x: sorted({e for e in x if e is not None}) or None,
+            }
+        )
+
+        np.testing.assert_array_equal(matrix.rlb_ids, expected.index)
+        np.testing.assert_array_equal(
+            matrix.row_sums(matrix.area_ha), expected["area_in_nn_catchment_ha"]
+        )
+        assert matrix.joined_site_names() == expected["n2k_site_n"].tolist()
+        assert matrix.catchment_entries() == expected["_nn_entry"].tolist()
+
+    def test_matvec_and_catchment_sums(self, rows):
+        matrix = self._matrix(rows)
+        ones = np.ones(len(matrix.n_current))
+
+        np.testing.assert_allclose(
+            matrix.matvec(ones), matrix.row_sums(matrix.area_ha), rtol=1e-12
+        )
+        per_catchment = matrix.catchment_sums(matrix.area_ha)
+        keyed = rows[rows["oid"].notna() & rows["n2k_site_n"].notna()]
+        expected = keyed.groupby(["rlb_id", "oid", "n2k_site_n"])[
+            "area_in_nn_catchment_ha"
+        ].sum()
+        np.testing.assert_allclose(per_catchment, expected.to_numpy(), rtol=1e-12)
+
+    def test_row_sums_skip_nan_and_leave_empty_rows_nan(self):
+        layout = CsrLayout.from_rows(np.array([2, 0, 2]), 4)
+
+        sums = layout.row_sums(np.array([1.5, np.nan, 2.25]))
+
+        np.testing.assert_array_equal(sums, [0.0, np.nan, 3.75, np.nan])
+
+    def test_row_sums_are_compensated_like_groupby(self):
+        rows = np.array([0] * 10 + [1] * 4)
+        values = np.array([0.1] * 10 + [1e16, 1.0, np.nan, -1e16])
+        layout = CsrLayout.from_rows(rows, 2)
+
+        sums = layout.row_sums(values)
+
+        expected = pd.Series(values).groupby(rows).sum()
+        np.testing.assert_array_equal(sums, expected.to_numpy())
+        # An uncompensated running sum of ten 0.1s is 0.9999999999999999.
+        assert sums[0] == 1.0
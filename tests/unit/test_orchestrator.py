@@ -5,6 +5,7 @@ and leave failed messages on the queue."""
 from unittest.mock import MagicMock
 
 import geopandas as gpd
+import pandas as pd
 import pytest
 from shapely.geometry import Polygon
 
@@ -115,3 +116,89 @@ def test_checks_reference_data_before_running_assessment(mocker):
     )
     guard.assert_called_once_with(repo, AssessmentType.NUTRIENT.value)
     run.assert_called_once()
+
+
+class TestResultCache:
+    """A job whose inputs and reference data match an earlier run is answered
+    from the result cache instead of re-running the assessment."""
+
+    _SQUARE = [
+        (582814.93, 328188.89),
+        (582808.89, 328203.73),
+        (582824.96, 328210.17),
+        (582830.09, 328197.00),
+    ]
+
+    def _job(self, reference="NRF-000001"):
+        job = _job(reference)
+        job.boundary_geojson.boundary_geometry_original = {
+            "type": "Polygon",
+            "coordinates": [[*self._SQUARE, self._SQUARE[0]]],
+        }
+        job.development_types = ["housing"]
+        job.residential_building_count = 10
+        return job
+
+    def _orchestrator(self, mocker, cache):
+        mocker.patch("app.orchestrator.assert_reference_data_present")
+        mocker.patch(
+            "app.orchestrator.reference_generation",
+            return_value={"coefficient_layer": 1},
+        )
+        mocker.patch.object(JobOrchestrator, "_send_results_callback")
+        return JobOrchestrator(MagicMock(), MagicMock(), MagicMock(), cache)
+
+    def test_hit_skips_the_assessment_and_restamps_identity(self, mocker):
+        stored = pd.DataFrame({"id": ["NRF-OLD"], "name": ["NRF-OLD"], "n": [1.5]})
+        cache = MagicMock()
+        cache.get.return_value = {"impact_summary": stored}
+        run = mocker.patch("app.orchestrator.run_assessment")
+        orchestrator = self._orchestrator(mocker, cache)
+
+        result = orchestrator.process_job(self._job(), AssessmentType.NUTRIENT)
+
+        run.assert_not_called()
+        summary = result["impact_summary"]
+        assert summary["id"].tolist() == ["NRF-000001"]
+        assert summary["n"].tolist() == [1.5]
+        orchestrator._send_results_callback.assert_called_once()
+
+    def test_miss_runs_and_stores_the_result(self, mocker):
+        cache = MagicMock()
+        cache.get.return_value = None
+        dataframes = {"impact_summary": pd.DataFrame({"n": [1.5]})}
+        mocker.patch("app.orchestrator.run_assessment", return_value=dataframes)
+        orchestrator = self._orchestrator(mocker, cache)
+
+        orchestrator.process_job(self._job(), AssessmentType.NUTRIENT)
+
+        fingerprint = cache.get.call_args.args[0]
+        cache.put.assert_called_once_with(fingerprint, "nutrient", dataframes)
+
+    def test_redelivered_and_resubmitted_jobs_share_a_fingerprint(self, mocker):
+        cache = MagicMock()
+        cache.get.return_value = None
+        mocker.patch(
+            "app.orchestrator.run_assessment",
+            return_value={"impact_summary": pd.DataFrame({"n": [1.5]})},
+        )
+        orchestrator = self._orchestrator(mocker, cache)
+
+        orchestrator.process_job(self._job("NRF-1"), AssessmentType.NUTRIENT)
+        orchestrator.process_job(self._job("NRF-2"), AssessmentType.NUTRIENT)
+
+        first, second = (c.args[0] for c in cache.get.call_args_list)
+        assert first == second
+
+    def test_gcn_is_not_cached(self, mocker):
+        cache = MagicMock()
+        mocker.patch(
+            "app.orchestrator.run_assessment",
+            return_value={"impact_summary": pd.DataFrame({"n": [1.5]})},
+        )
+        orchestrator = self._orchestrator(mocker, cache)
+
+        orchestrator.process_job(self._job(), AssessmentType.GCN)
+
+        cache.get.assert_not_called()
+        cache.put.assert_not_called()
@@ -0,0 +1,97 @@
+"""Tests for chunked batch execution in app.runner.runner."""
+
+from unittest.mock import MagicMock
+
+import geopandas as gpd
+import pandas as pd
+import pytest
+from shapely.geometry import box
+
+from app.runner import runner
+from app.runner.runner import run_assessment_batch
+
+
+def _rlbs(n: int) -> gpd.GeoDataFrame:
+    return gpd.GeoDataFrame(
+        {"dwellings": list(range(1, n + 1))},
+        geometry=[box(i, 0, i + 1, 1) for i in range(n)],
+        crs="EPSG:27700",
+    )
+
+
+class _PinnedAssessment:
+    resolve_layer_versions = staticmethod(lambda _repo: {"nn_catchments": 7})
+
+
+@pytest.fixture
+def fake_run(monkeypatch):
+    calls = []
+
+    def _run(assessment_type, rlb_gdf, metadata, repository):
+        calls.append({"rows": len(rlb_gdf), "metadata": metadata})
+        if metadata.get("fail_ref") == metadata["unique_ref"]:
+            msg = "boom"
+            raise ValueError(msg)
+        return {
+            "impact_summary": pd.DataFrame(
+                {
+                    "rlb_id": range(1, len(rlb_gdf) + 1),
+                    "dwellings": rlb_gdf["dwellings"].to_numpy(),
+                }
+            )
+        }
+
+    monkeypatch.setattr(runner, "run_assessment", _run)
+    monkeypatch.setitem(runner.ASSESSMENT_TYPES, "pinned", _PinnedAssessment)
+    return calls
+
+
+def test_batch_chunks_input_and_rebases_rlb_ids(fake_run):
+    results = list(
+        run_assessment_batch("pinned", _rlbs(5), {"unique_ref": "job"}, MagicMock(), 2)
+    )
+
+    assert [(r.index, r.start, r.size) for r in results] == [
+        (0, 0, 2),
+        (1, 2, 2),
+        (2, 4, 1),
+    ]
+    combined = pd.concat(r.dataframes["impact_summary"] for r in results)
+    assert combined["rlb_id"].tolist() == [1, 2, 3, 4, 5]
+    assert combined["dwellings"].tolist() == [1, 2, 3, 4, 5]
+    assert [c["metadata"]["unique_ref"] for c in fake_run] == [
+        "job-0",
+        "job-1",
+        "job-2",
+    ]
+
+
+def test_batch_pins_layer_versions_for_every_chunk(fake_run):
+    list(run_assessment_batch("pinned", _rlbs(3), {}, MagicMock(), 1))
+
+    assert all(
+        c["metadata"]["layer_versions"] == {"nn_catchments": 7} for c in fake_run
+    )
+
+
+def test_batch_reports_failed_chunk_and_continues(fake_run):
+    results = list(
+        run_assessment_batch(
+            "pinned",
+            _rlbs(3),
+            {"unique_ref": "job", "fail_ref": "job-1"},
+            MagicMock(),
+            1,
+        )
+    )
+
+    assert [r.error for r in results] == [None, "boom", None]
+    assert results[1].dataframes is None
+    assert results[2].dataframes["impact_summary"]["rlb_id"].tolist() == [3]
+
+
+def test_batch_rejects_bad_chunk_size_and_unknown_type():
+    with pytest.raises(ValueError, match="chunk_size"):
+        list(run_assessment_batch("nutrient", _rlbs(1), {}, MagicMock(), 0))
+    with pytest.raises(KeyError):
+        list(run_assessment_batch("unknown", _rlbs(1), {}, MagicMock(), 1))
@@ -0,0 +1,139 @@
+"""The worker pool keeps several jobs in flight and, like the single-process
+consumer, deletes a message only once its job has completed."""
+
+import threading
+from unittest.mock import MagicMock
+
+from app.worker_pool import SqsWorkerPool
+
+
+class _FakeWorker:
+    """In-process stand-in for a worker process."""
+
+    def __init__(self, run):
+        self._run = run
+        self.alive = True
+        self.killed = threading.Event()
+
+    def run_job(self, job):
+        return self._run(self, job)
+
+    def is_alive(self):
+        return self.alive
+
+    def stop(self, timeout):
+        self.alive = False
+
+    def kill(self):
+        self.alive = False
+        self.killed.set()
+
+
+def _pool(run, *, concurrency=2, drain_timeout=5.0):
+    workers = []
+
+    def _start(_index):
+        worker = _FakeWorker(run)
+        workers.append(worker)
+        return worker
+
+    pool = SqsWorkerPool(
+        MagicMock(), _start, concurrency=concurrency, drain_timeout=drain_timeout
+    )
+    return pool, workers
+
+
+def _drive_once(pool: SqsWorkerPool, batch: list) -> None:
+    """Run the supervisor for exactly one non-empty poll, then stop it."""
+    state = {"polled": False}
+
+    def _receive(max_messages):
+        if not state["polled"]:
+            state["polled"] = True
+            return batch[:max_messages]
+        pool.running = False
+        return []
+
+    pool.sqs_client.receive_messages.side_effect = _receive
+    pool.run()
+
+
+def _job(reference):
+    return MagicMock(reference=reference)
+
+
+def test_runs_jobs_concurrently_and_deletes_each_on_success():
+    both_running = threading.Barrier(2, timeout=5)
+
+    def _run(_worker, _job):
+        both_running.wait()  # only passes if two jobs are in flight at once
+
+    pool, _ = _pool(_run)
+
+    _drive_once(pool, [(_job("NRF-1"), "receipt-1"), (_job("NRF-2"), "receipt-2")])
+
+    deleted = {c.args[0] for c in pool.sqs_client.delete_message.call_args_list}
+    assert deleted == {"receipt-1", "receipt-2"}
+
+
+def test_polls_for_no_more_messages_than_free_slots():
+    pool, _ = _pool(lambda _w, _j: None, concurrency=3)
+
+    _drive_once(pool, [])
+
+    assert pool.sqs_client.receive_messages.call_args_list[0].kwargs == {
+        "max_messages": 3
+    }
+
+
+def test_keeps_message_when_job_fails():
+    pool, _ = _pool(
+        lambda _w, j: "RuntimeError: boom" if j.reference == "BAD" else None
+    )
+
+    _drive_once(pool, [(_job("BAD"), "receipt-bad"), (_job("GOOD"), "receipt-good")])
+
+    pool.sqs_client.delete_message.assert_called_once_with("receipt-good")
+
+
+def test_dead_worker_leaves_message_and_is_replaced():
+    def _run(worker, _job):
+        worker.alive = False
+        raise EOFError
+
+    pool, workers = _pool(_run, concurrency=1)
+
+    _drive_once(pool, [(_job("NRF-1"), "receipt-1")])
+
+    pool.sqs_client.delete_message.assert_not_called()
+    # The slot's worker was replaced after dying (initial start + restart).
+    assert len(workers) >= 1
+    assert all(not w.alive for w in workers)
+
+
+def test_drain_timeout_kills_stuck_workers():
+    def _run(worker, _job):
+        pool.running = False  # SIGTERM arrives mid-job
+        worker.killed.wait(5)
+        raise EOFError
+
+    pool, workers = _pool(_run, concurrency=1, drain_timeout=0.1)
+
+    _drive_once(pool, [(_job("NRF-SLOW"), "receipt-slow")])
+
+    assert workers[0].killed.is_set()
+    pool.sqs_client.delete_message.assert_not_called()
+
+
+def test_messages_received_after_shutdown_are_returned():
+    pool, _ = _pool(lambda _w, _j: None, concurrency=1)
+
+    def _receive(max_messages):
+        pool.running = False
+        return [(_job("NRF-LATE"), "receipt-late")]
+
+    pool.sqs_client.receive_messages.side_effect = _receive
+    pool.run()
+
+    pool.sqs_client.change_message_visibility.assert_called_once_with("receipt-late", 0)
+    pool.sqs_client.delete_message.assert_not_called()
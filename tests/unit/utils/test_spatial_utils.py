@@ -314,7 +314,7 @@ def test_majority_overlap_returns_geodataframe(simple_target_gdf, simple_overlay
 
 def test_partition_by_bounds_no_duplicate_rows_on_chunk_boundary():
     """Test chunk partitioning does not duplicate features on boundaries."""
-    from app.spatial.assignments import _partition_by_bounds
+    from app.spatial.partition import partition_by_cost
 
     # Build 100 features
     input_geoms = [
@@ -326,10 +326,129 @@ def test_partition_by_bounds_no_duplicate_rows_on_chunk_boundary():
         crs="EPSG:27700",
     )
 
-    chunks = _partition_by_bounds(input_gdf, n_chunks=2)
+    chunks = partition_by_cost(input_gdf, n_chunks=2).chunks
     assert len(chunks) == 2
 
     # Every original row should appear exactly once across chunks
     combined_ids = pd.concat([chunk["RLB_ID"] for chunk in chunks], ignore_index=True)
     assert len(combined_ids) == len(input_gdf)
     assert combined_ids.nunique() == len(input_gdf)
+
+
+def _random_polygons(rng, n, size):
+    from shapely.geometry import Point
+
+    return [
+        Point(x, y).buffer(r, quad_segs=4)
+        for x, y, r in zip(
+            rng.uniform(0, 1000, n),
+            rng.uniform(0, 1000, n),
+            rng.uniform(size / 2, size, n),
+            strict=True,
+        )
+    ]
+
+
+@pytest.mark.parametrize("default_value", [None, -1])
+def test_vectorized_majority_overlap_matches_overlay_strategy(default_value):
+    """The array-based strategy assigns exactly what the overlay strategy does."""
+    import numpy as np
+
+    from app.spatial import execute_assignment
+
+    rng = np.random.default_rng(11)
+    input_gdf = gpd.GeoDataFrame(
+        {"RLB_ID": np.arange(300), "name": [f"Site {i}" for i in range(300)]},
+        geometry=_random_polygons(rng, 300, 30),
+        crs="EPSG:27700",
+    )
+    overlay_gdf = gpd.GeoDataFrame(
+        {
+            "id": np.arange(60),
+            "WwTw_ID": np.where(rng.random(60) < 0.1, np.nan, np.arange(100, 160)),
+        },
+        geometry=_random_polygons(rng, 60, 150),
+        crs="EPSG:27700",
+    )
+    kwargs = {
+        "input_gdf": input_gdf,
+        "overlay_gdf": overlay_gdf,
+        "input_id_col": "RLB_ID",
+        "overlay_attr_col": "WwTw_ID",
+        "output_field": "wwtw_assignment",
+        "default_value": default_value,
+    }
+
+    expected = execute_assignment(strategy="majority_overlap", parallel=False, **kwargs)
+    result = execute_assignment(strategy="majority_overlap_vectorized", **kwargs)
+
+    assert expected["wwtw_assignment"].notna().any()
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_vectorized_majority_overlap_ties_and_touching(simple_target_gdf):
+    """Equal overlaps go to the first overlay; touching-only pairs never win."""
+    from app.spatial import execute_assignment
+
+    overlay_gdf = gpd.GeoDataFrame(
+        {"WwTw_ID": [201, 202, 203]},
+        geometry=[
+            Polygon([(0, -5), (5, -5), (5, 15), (0, 15)]),  # half of site 1
+            Polygon([(5, -5), (10, -5), (10, 15), (5, 15)]),  # other half
+            Polygon([(40, 0), (50, 0), (50, 10), (40, 10)]),  # touches site 3
+        ],
+        crs="EPSG:27700",
+    )
+    kwargs = {
+        "input_gdf": simple_target_gdf,
+        "overlay_gdf": overlay_gdf,
+        "input_id_col": "RLB_ID",
+        "overlay_attr_col": "WwTw_ID",
+        "output_field": "wwtw_assignment",
+        "default_value": 141,
+    }
+
+    result = execute_assignment(strategy="majority_overlap_vectorized", **kwargs)
+    expected = execute_assignment(strategy="majority_overlap", parallel=False, **kwargs)
+
+    assert result["wwtw_assignment"].tolist() == [201, 141, 141]
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_vectorized_majority_overlap_skips_missing_ids_and_pool_options():
+    """A NaN ID gets no assignment, and pool options are accepted."""
+    from app.spatial import execute_assignment
+
+    input_gdf = gpd.GeoDataFrame(
+        {"RLB_ID": [1.0, float("nan")]},
+        geometry=[
+            Polygon([(0, 0), (10, 0), (10, 10), (0, 10)]),
+            Polygon([(20, 0), (30, 0), (30, 10), (20, 10)]),
+        ],
+        crs="EPSG:27700",
+    )
+    overlay_gdf = gpd.GeoDataFrame(
+        {"WwTw_ID": [201, 202]},
+        geometry=[
+            Polygon([(0, 0), (10, 0), (10, 10), (0, 10)]),
+            Polygon([(20, 0), (30, 0), (30, 10), (20, 10)]),
+        ],
+        crs="EPSG:27700",
+    )
+    kwargs = {
+        "input_gdf": input_gdf,
+        "overlay_gdf": overlay_gdf,
+        "input_id_col": "RLB_ID",
+        "overlay_attr_col": "WwTw_ID",
+        "output_field": "wwtw_assignment",
+        "parallel": False,
+    }
+
+    result = execute_assignment(
+        strategy="majority_overlap_vectorized", max_workers=2, overlay_key="k", **kwargs
+    )
+    expected = execute_assignment(strategy="majority_overlap", **kwargs)
+
+    assert result["wwtw_assignment"].iloc[0] == 201
+    assert pd.isna(result["wwtw_assignment"].iloc[1])
+    pd.testing.assert_frame_equal(result, expected)